@@ -4,6 +4,7 @@ from ._client import (
     UploadedBytesTransferredCallback,
 )
 from ._constants import PRESIGNED_LINK_MAX_SIZE, S3_MAX_FILE_SIZE
+from ._copy_budget import S3CopyBudget
 from ._errors import (
     S3AccessError,
     S3BucketInvalidError,
@@ -28,6 +29,7 @@ __all__: tuple[str, ...] = (
     "MultiPartUploadLinks",
     "S3AccessError",
     "S3BucketInvalidError",
+    "S3CopyBudget",
     "S3DestinationNotEmptyError",
     "S3DirectoryMetaData",
     "S3KeyNotFoundError",
@@ -35,10 +35,12 @@ from types_aiobotocore_s3.type_defs import (
 )
 
 from ._constants import (
+    MULTIPART_COPY_PART_SIZE,
     MULTIPART_COPY_THRESHOLD,
     MULTIPART_UPLOADS_MIN_TOTAL_SIZE,
     S3_OBJECT_DELIMITER,
 )
+from ._copy_budget import S3CopyBudget
 from ._error_handler import s3_exception_handler, s3_exception_handler_async_gen
 from ._errors import S3DestinationNotEmptyError, S3KeyNotFoundError
 from ._models import (
@@ -50,15 +52,21 @@ from ._models import (
     S3ObjectPrefix,
     UploadID,
 )
-from ._utils import compute_num_file_chunks, create_final_prefix
+from ._utils import (
+    batch_objects_by_size,
+    compute_copy_part_ranges,
+    compute_num_file_chunks,
+    create_final_prefix,
+)
 
 _logger = logging.getLogger(__name__)
 
 _S3_MAX_CONCURRENCY_DEFAULT: Final[int] = 10
 _DEFAULT_AWS_REGION: Final[str] = "us-east-1"
 _MAX_ITEMS_PER_PAGE: Final[int] = 500
-_MAX_CONCURRENT_COPY: Final[int] = 4
+_MAX_COPY_BATCH_LENGTH: Final[int] = 50
 _AWS_MAX_ITEMS_PER_PAGE: Final[int] = 1000
+_MAX_CONCURRENT_ABORTS: Final[int] = 10
 
 
 ListAnyUrlTypeAdapter: Final[TypeAdapter[list[AnyUrl]]] = TypeAdapter(list[AnyUrl])
@@ -174,9 +182,11 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
     @s3_exception_handler(_logger)
     async def get_directory_metadata(self, *, bucket: S3BucketName, prefix: str) -> S3DirectoryMetaData:
         size = 0
+        num_objects = 0
         async for s3_object in self._list_all_objects(bucket=bucket, prefix=prefix):
             size += s3_object.size
-        return S3DirectoryMetaData(prefix=S3ObjectPrefix(prefix), size=ByteSize(size))
+            num_objects += 1
+        return S3DirectoryMetaData(prefix=S3ObjectPrefix(prefix), size=ByteSize(size), num_objects=num_objects)
 
     @s3_exception_handler(_logger)
     async def count_objects(
@@ -272,13 +282,18 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
         prefix: str,
         *,
         items_per_page: int = _MAX_ITEMS_PER_PAGE,
+        use_delimiter: bool = False,
     ) -> AsyncGenerator[list[S3MetaData]]:
+        """lists objects under prefix page by page.
+        if use_delimiter is set, only the objects directly under prefix are listed (non-recursive)
+        """
         if items_per_page > _AWS_MAX_ITEMS_PER_PAGE:
             msg = f"items_per_page must be <= {_AWS_MAX_ITEMS_PER_PAGE}"
             raise ValueError(msg)
         async for page in self._client.get_paginator("list_objects_v2").paginate(
             Bucket=bucket,
             Prefix=prefix,
+            Delimiter=S3_OBJECT_DELIMITER if use_delimiter else "",
             PaginationConfig={
                 "PageSize": items_per_page,
             },
@@ -477,6 +492,30 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
     ) -> None:
         await self._client.abort_multipart_upload(Bucket=bucket, Key=object_key, UploadId=upload_id)
 
+    @s3_exception_handler(_logger)
+    async def abort_multipart_uploads(self, *, bucket: S3BucketName, prefix: str) -> int:
+        """aborts the ongoing multipart uploads of the object prefix or of the objects in the directory prefix
+        (e.g. the parts left behind by interrupted copies) and returns how many were aborted
+        """
+        directory_prefix = f"{prefix.rstrip('/')}/"
+        uploads_to_abort = [
+            (upload["Key"], upload["UploadId"])
+            async for page in self._client.get_paginator("list_multipart_uploads").paginate(
+                Bucket=bucket, Prefix=prefix
+            )
+            for upload in page.get("Uploads", [])
+            if "UploadId" in upload
+            and (upload.get("Key") == prefix or upload.get("Key", "").startswith(directory_prefix))
+        ]
+        await limited_gather(
+            *(
+                self._client.abort_multipart_upload(Bucket=bucket, Key=object_key, UploadId=upload_id)
+                for object_key, upload_id in uploads_to_abort
+            ),
+            limit=_MAX_CONCURRENT_ABORTS,
+        )
+        return len(uploads_to_abort)
+
     @s3_exception_handler(_logger)
     async def complete_multipart_upload(
         self,
@@ -514,6 +553,136 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
             upload_options |= {"Callback": functools.partial(bytes_transferred_cb, file_name=f"{object_key}")}
         await self._client.upload_file(f"{file}", **upload_options)
 
+    def create_copy_budget(self) -> S3CopyBudget:
+        return S3CopyBudget.create(max_concurrent_requests=self.transfer_max_concurrency)
+
+    async def _copy_objects_batch(
+        self,
+        *,
+        bucket: S3BucketName,
+        objects_to_copy: list[tuple[S3MetaData, S3ObjectKey]],
+        copy_budget: S3CopyBudget,
+        bytes_transferred_cb: CopiedBytesTransferredCallback | None,
+    ) -> None:
+        # NOTE: small objects are copied one after the other using a single reservation,
+        # which keeps most of the budget for the parts of the large objects
+        async with copy_budget.reserve(sum(src_object.size for src_object, _ in objects_to_copy)):
+            for src_object, dst_object_key in objects_to_copy:
+                await self._client.copy_object(
+                    CopySource={"Bucket": bucket, "Key": src_object.object_key},
+                    Bucket=bucket,
+                    Key=dst_object_key,
+                )
+                if bytes_transferred_cb:
+                    bytes_transferred_cb(src_object.size, file_name=f"{dst_object_key}")
+
+    async def _find_resumable_copy(
+        self, *, bucket: S3BucketName, src_object: S3MetaData, dst_object_key: S3ObjectKey
+    ) -> tuple[UploadID, dict[int, tuple[ETag, int]]] | None:
+        """returns the upload ID and the already copied parts (part number -> (etag, size))
+        of an interrupted copy of src_object to dst_object_key
+        """
+        # NOTE: the parts of an interrupted multipart copy are kept by S3 until the upload is aborted,
+        # they can be re-used as long as the source was not modified after the upload was initiated
+        response = await self._client.list_multipart_uploads(Bucket=bucket, Prefix=dst_object_key)
+        resumable_uploads = sorted(
+            (
+                upload
+                for upload in response.get("Uploads", [])
+                if upload.get("Key") == dst_object_key
+                and "UploadId" in upload
+                and "Initiated" in upload
+                and upload["Initiated"] > src_object.last_modified
+            ),
+            key=lambda upload: upload["Initiated"],
+        )
+        if not resumable_uploads:
+            return None
+        upload_id = resumable_uploads[-1]["UploadId"]
+        copied_parts: dict[int, tuple[ETag, int]] = {}
+        async for page in self._client.get_paginator("list_parts").paginate(
+            Bucket=bucket, Key=dst_object_key, UploadId=upload_id
+        ):
+            copied_parts |= {part["PartNumber"]: (part["ETag"], part["Size"]) for part in page.get("Parts", [])}
+        return upload_id, copied_parts
+
+    async def _copy_object_in_parts(
+        self,
+        *,
+        bucket: S3BucketName,
+        src_object: S3MetaData,
+        dst_object_key: S3ObjectKey,
+        copy_budget: S3CopyBudget,
+        bytes_transferred_cb: CopiedBytesTransferredCallback | None,
+    ) -> None:
+        part_ranges = compute_copy_part_ranges(src_object.size)
+        reusable_parts: dict[int, ETag] = {}
+        if resumable_copy := await self._find_resumable_copy(
+            bucket=bucket, src_object=src_object, dst_object_key=dst_object_key
+        ):
+            upload_id, copied_parts = resumable_copy
+            reusable_parts = {
+                part_number: copied_parts[part_number][0]
+                for part_number, (first_byte, last_byte) in enumerate(part_ranges, start=1)
+                if copied_parts.get(part_number, ("", 0))[1] == last_byte - first_byte + 1
+            }
+            _logger.info(
+                "resuming copy of %s to %s with %d/%d parts already copied",
+                src_object.object_key,
+                dst_object_key,
+                len(reusable_parts),
+                len(part_ranges),
+            )
+        else:
+            response = await self._client.create_multipart_upload(Bucket=bucket, Key=dst_object_key)
+            upload_id = response["UploadId"]
+
+        total_bytes_copied = sum(
+            last_byte - first_byte + 1
+            for part_number, (first_byte, last_byte) in enumerate(part_ranges, start=1)
+            if part_number in reusable_parts
+        )
+        if bytes_transferred_cb and total_bytes_copied:
+            bytes_transferred_cb(total_bytes_copied, file_name=f"{dst_object_key}")
+
+        async def _copy_part(part_number: int, first_byte: int, last_byte: int) -> UploadedPart:
+            nonlocal total_bytes_copied
+            if part_number in reusable_parts:
+                return UploadedPart(number=part_number, e_tag=reusable_parts[part_number])
+            part_size = last_byte - first_byte + 1
+            async with copy_budget.reserve(part_size):
+                response = await self._client.upload_part_copy(
+                    Bucket=bucket,
+                    Key=dst_object_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    CopySource={"Bucket": bucket, "Key": src_object.object_key},
+                    CopySourceRange=f"bytes={first_byte}-{last_byte}",
+                )
+            total_bytes_copied += part_size
+            if bytes_transferred_cb:
+                bytes_transferred_cb(total_bytes_copied, file_name=f"{dst_object_key}")
+            assert "CopyPartResult" in response  # nosec
+            assert "ETag" in response["CopyPartResult"]  # nosec
+            return UploadedPart(number=part_number, e_tag=response["CopyPartResult"]["ETag"])
+
+        # NOTE: on failure the upload is not aborted on purpose, the parts that were copied
+        # are picked up again by the next attempt (see _find_resumable_copy). Uploads that are
+        # never resumed must be aborted by the caller (see abort_multipart_uploads)
+        uploaded_parts = await limited_gather(
+            *(
+                _copy_part(part_number, first_byte, last_byte)
+                for part_number, (first_byte, last_byte) in enumerate(part_ranges, start=1)
+            ),
+            limit=copy_budget.max_concurrent_requests,
+        )
+        await self._client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=dst_object_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [{"ETag": part.e_tag, "PartNumber": part.number} for part in uploaded_parts]},
+        )
+
     @s3_exception_handler(_logger)
     async def copy_object(
         self,
@@ -523,27 +692,34 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
         dst_object_key: S3ObjectKey,
         bytes_transferred_cb: CopiedBytesTransferredCallback | None,
         object_metadata: S3MetaData | None = None,
+        copy_budget: S3CopyBudget | None = None,
     ) -> None:
-        """copy a file in S3 using aioboto3 transfer manager (e.g. works >5Gb and creates multiple threads)"""
-        copy_options: dict[str, Any] = {
-            "CopySource": {"Bucket": bucket, "Key": src_object_key},
-            "Bucket": bucket,
-            "Key": dst_object_key,
-            "Config": TransferConfig(
-                max_concurrency=self.transfer_max_concurrency,
-                multipart_threshold=MULTIPART_COPY_THRESHOLD,
-            ),
-        }
-        if bytes_transferred_cb:
-            copy_options |= {"Callback": functools.partial(bytes_transferred_cb, file_name=f"{dst_object_key}")}
-        # NOTE: boto3 copy function uses copy_object until 'multipart_threshold' is reached then switches to multipart copy
-        # copy_object does not provide any callbacks so we can't track progress so we need to ensure
-        # at least the completion of the object is tracked
-        await self._client.copy(**copy_options)
-        if bytes_transferred_cb:
-            if object_metadata is None:
-                object_metadata = await self.get_object_metadata(bucket=bucket, object_key=dst_object_key)
-            bytes_transferred_cb(object_metadata.size, file_name=f"{dst_object_key}")
+        """server-side copy of a file in S3 (objects larger than MULTIPART_COPY_THRESHOLD are copied in parallel parts,
+        e.g. works >5Gb). An interrupted copy of a large object is resumed by the next call.
+
+        Keyword Arguments:
+            copy_budget -- budget to share with other copies (default: {None} creates a new one)
+        """
+        if object_metadata is None:
+            object_metadata = await self.get_object_metadata(bucket=bucket, object_key=src_object_key)
+        if copy_budget is None:
+            copy_budget = self.create_copy_budget()
+
+        if object_metadata.size >= MULTIPART_COPY_THRESHOLD:
+            await self._copy_object_in_parts(
+                bucket=bucket,
+                src_object=object_metadata,
+                dst_object_key=dst_object_key,
+                copy_budget=copy_budget,
+                bytes_transferred_cb=bytes_transferred_cb,
+            )
+        else:
+            await self._copy_objects_batch(
+                bucket=bucket,
+                objects_to_copy=[(object_metadata, dst_object_key)],
+                copy_budget=copy_budget,
+                bytes_transferred_cb=bytes_transferred_cb,
+            )
 
     @s3_exception_handler(_logger)
     async def copy_objects_recursively(
@@ -553,23 +729,70 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
         src_prefix: str,
         dst_prefix: str,
         bytes_transferred_cb: CopiedBytesTransferredCallback | None,
+        copy_budget: S3CopyBudget | None = None,
+        resume: bool = False,
     ) -> None:
-        """copy from 1 location in S3 to another recreating the same structure"""
+        """copy from 1 location in S3 to another recreating the same structure
+
+        Large objects are copied in parts, small objects in batches, all scheduled
+        within the copy budget (largest objects first).
+
+        Keyword Arguments:
+            copy_budget -- budget to share with other copies (default: {None} creates a new one)
+            resume -- if True, the destination may already contain a partial copy (e.g. from an
+                      interrupted attempt), objects already copied are skipped (default: {False})
+        """
         dst_metadata = await self.get_directory_metadata(bucket=bucket, prefix=dst_prefix)
-        if dst_metadata.size and dst_metadata.size > 0:
+        if not resume and dst_metadata.size and dst_metadata.size > 0:
             raise S3DestinationNotEmptyError(dst_prefix=dst_prefix)
+        if copy_budget is None:
+            copy_budget = self.create_copy_budget()
+
+        already_copied: dict[S3ObjectKey, ByteSize] = {}
+        if resume and dst_metadata.size:
+            already_copied = {
+                s3_object.object_key: s3_object.size
+                async for s3_object in self._list_all_objects(bucket=bucket, prefix=dst_prefix)
+            }
+
+        large_objects_to_copy: list[tuple[S3MetaData, S3ObjectKey]] = []
+        small_objects: list[S3MetaData] = []
+        async for s3_object in self._list_all_objects(bucket=bucket, prefix=src_prefix):
+            dst_object_key = s3_object.object_key.replace(src_prefix, dst_prefix)
+            if already_copied.get(dst_object_key) == s3_object.size:
+                if bytes_transferred_cb:
+                    bytes_transferred_cb(s3_object.size, file_name=f"{dst_object_key}")
+            elif s3_object.size >= MULTIPART_COPY_THRESHOLD:
+                large_objects_to_copy.append((s3_object, dst_object_key))
+            else:
+                small_objects.append(s3_object)
+        large_objects_to_copy.sort(key=lambda object_to_copy: object_to_copy[0].size, reverse=True)
+
         await limited_gather(
-            *[
-                self.copy_object(
+            *(
+                self._copy_object_in_parts(
                     bucket=bucket,
-                    src_object_key=s3_object.object_key,
-                    dst_object_key=s3_object.object_key.replace(src_prefix, dst_prefix),
+                    src_object=src_object,
+                    dst_object_key=dst_object_key,
+                    copy_budget=copy_budget,
                     bytes_transferred_cb=bytes_transferred_cb,
-                    object_metadata=s3_object,
                 )
-                async for s3_object in self._list_all_objects(bucket=bucket, prefix=src_prefix)
-            ],
-            limit=_MAX_CONCURRENT_COPY,
+                for src_object, dst_object_key in large_objects_to_copy
+            ),
+            *(
+                self._copy_objects_batch(
+                    bucket=bucket,
+                    objects_to_copy=[
+                        (s3_object, s3_object.object_key.replace(src_prefix, dst_prefix)) for s3_object in batch
+                    ],
+                    copy_budget=copy_budget,
+                    bytes_transferred_cb=bytes_transferred_cb,
+                )
+                for batch in batch_objects_by_size(
+                    small_objects, max_batch_size=MULTIPART_COPY_PART_SIZE, max_batch_length=_MAX_COPY_BATCH_LENGTH
+                )
+            ),
+            limit=copy_budget.max_concurrent_requests,
         )
 
     async def get_bytes_streamer_from_object(
@@ -578,16 +801,22 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
         object_key: S3ObjectKey,
         *,
         chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+        data_size: DataSize | None = None,
     ) -> BytesStreamer:
-        """stream read an object from S3 chunk by chunk"""
+        """stream read an object from S3 chunk by chunk
+
+        Keyword Arguments:
+            data_size -- size of the object if already known (e.g. from a listing), saves a HEAD request
+        """
 
         # NOTE `download_fileobj` cannot be used to implement this because
         # it will buffer the entire file in memory instead of reading it
         # chunk by chunk
 
-        # below is a quick call to get file size
-        head_response = await self._client.head_object(Bucket=bucket_name, Key=object_key)
-        data_size = DataSize(head_response["ContentLength"])
+        if data_size is None:
+            # below is a quick call to get file size
+            head_response = await self._client.head_object(Bucket=bucket_name, Key=object_key)
+            data_size = DataSize(head_response["ContentLength"])
 
         async def _() -> BytesIter:
             # Use a single get_object request and stream from the body
@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from ._constants import MULTIPART_COPY_PART_SIZE
+
+
+@dataclass(kw_only=True)
+class S3CopyBudget:
+    """Bounds the server-side copy requests running at once
+
+    A budget is shared by all the copies of an operation (e.g. copying a whole project), so that the parts
+    of large objects and the batches of small objects are scheduled together. Each request reserves its
+    number of bytes, a few large parts therefore cannot use the whole budget while small objects wait.
+    """
+
+    max_concurrent_requests: int
+    max_concurrent_bytes: int
+
+    _num_requests: int = field(default=0, init=False)
+    _num_bytes: int = field(default=0, init=False)
+    _condition: asyncio.Condition = field(default_factory=asyncio.Condition, init=False)
+
+    @classmethod
+    def create(cls, max_concurrent_requests: int) -> "S3CopyBudget":
+        return cls(
+            max_concurrent_requests=max_concurrent_requests,
+            max_concurrent_bytes=max_concurrent_requests * MULTIPART_COPY_PART_SIZE,
+        )
+
+    def _has_room_for(self, num_bytes: int) -> bool:
+        return (
+            self._num_requests < self.max_concurrent_requests
+            and self._num_bytes + num_bytes <= self.max_concurrent_bytes
+        )
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, num_bytes: int) -> AsyncIterator[None]:
+        # NOTE: a request larger than the whole budget runs once it is alone
+        num_bytes = min(num_bytes, self.max_concurrent_bytes)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._has_room_for(num_bytes))
+            self._num_requests += 1
+            self._num_bytes += num_bytes
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._num_requests -= 1
+                self._num_bytes -= num_bytes
+                self._condition.notify_all()
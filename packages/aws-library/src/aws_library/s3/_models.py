@@ -56,6 +56,10 @@ class S3DirectoryMetaData(BaseModel, frozen=True):
         ByteSize | None,
         Field(description="Size of the directory if computed, None if unknown"),
     ]
+    num_objects: Annotated[
+        int | None,
+        Field(description="Number of objects in the directory if computed, None if unknown"),
+    ] = None
 
     def as_path(self) -> Path:
         return self.prefix
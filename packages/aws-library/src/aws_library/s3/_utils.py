@@ -1,9 +1,11 @@
+import math
+from collections.abc import Iterable
 from typing import Final
 
 from pydantic import ByteSize, TypeAdapter
 
-from ._constants import S3_OBJECT_DELIMITER
-from ._models import S3ObjectPrefix
+from ._constants import MULTIPART_COPY_PART_SIZE, S3_OBJECT_DELIMITER
+from ._models import S3MetaData, S3ObjectPrefix
 
 _MULTIPART_MAX_NUMBER_OF_PARTS: Final[int] = 10000
 
@@ -39,6 +41,40 @@ def compute_num_file_chunks(file_size: ByteSize) -> tuple[int, ByteSize]:
     )
 
 
+def compute_copy_part_ranges(object_size: ByteSize) -> list[tuple[int, int]]:
+    """returns the inclusive byte ranges (first_byte, last_byte) used to copy an object in parts
+
+    parts are MULTIPART_COPY_PART_SIZE large unless the object would need more parts than S3 allows
+    """
+    part_size = max(MULTIPART_COPY_PART_SIZE, math.ceil(object_size / _MULTIPART_MAX_NUMBER_OF_PARTS))
+    return [
+        (first_byte, min(first_byte + part_size, object_size) - 1) for first_byte in range(0, object_size, part_size)
+    ]
+
+
+def batch_objects_by_size(
+    s3_objects: Iterable[S3MetaData], *, max_batch_size: ByteSize, max_batch_length: int
+) -> list[list[S3MetaData]]:
+    """groups objects in batches of at most max_batch_length objects and max_batch_size bytes
+    (an object larger than max_batch_size gets its own batch)
+    """
+    batches: list[list[S3MetaData]] = []
+    current_batch: list[S3MetaData] = []
+    current_batch_size = 0
+    for s3_object in s3_objects:
+        if current_batch and (
+            len(current_batch) >= max_batch_length or current_batch_size + s3_object.size > max_batch_size
+        ):
+            batches.append(current_batch)
+            current_batch = []
+            current_batch_size = 0
+        current_batch.append(s3_object)
+        current_batch_size += s3_object.size
+    if current_batch:
+        batches.append(current_batch)
+    return batches
+
+
 def create_final_prefix(prefix: S3ObjectPrefix | None, *, is_partial_prefix: bool) -> str:
     final_prefix = f"{prefix}" if prefix else ""
     if prefix and not is_partial_prefix:
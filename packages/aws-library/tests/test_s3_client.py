@@ -27,6 +27,7 @@ import pytest
 from aiohttp import ClientSession
 from aws_library.s3._client import _AWS_MAX_ITEMS_PER_PAGE, S3ObjectKey, SimcoreS3API
 from aws_library.s3._constants import (
+    MULTIPART_COPY_PART_SIZE,
     MULTIPART_UPLOADS_MIN_TOTAL_SIZE,
     STREAM_READER_CHUNK_SIZE,
 )
@@ -955,6 +956,42 @@ async def test_list_entries_paginated_nonexistent_prefix(
     assert page_count == 0, "Non-existent prefix should yield no pages"
 
 
+@pytest.mark.parametrize(
+    "directory_size, min_file_size, max_file_size, depth",
+    [
+        (
+            TypeAdapter(ByteSize).validate_python("1Mib"),
+            TypeAdapter(ByteSize).validate_python("1B"),
+            TypeAdapter(ByteSize).validate_python("10Kib"),
+            2,
+        )
+    ],
+    ids=byte_size_ids,
+)
+async def test_list_objects_paginated_with_delimiter(
+    mocked_s3_server_envs: EnvVarsDict,
+    with_s3_bucket: S3BucketName,
+    with_uploaded_folder_on_s3: list[UploadedFile],
+    simcore_s3_api: SimcoreS3API,
+):
+    directories, _ = _get_paths_with_prefix(with_uploaded_folder_on_s3, prefix_level=0, path_prefix=None)
+    assert len(directories) >= 1, "wrong initialization of test!"
+    prefix = f"{next(iter(directories))}/"
+
+    listed_objects: list[S3MetaData] = []
+    async for s3_objects in simcore_s3_api.list_objects_paginated(
+        bucket=with_s3_bucket, prefix=prefix, use_delimiter=True
+    ):
+        listed_objects.extend(s3_objects)
+
+    expected_keys = {
+        file.s3_key
+        for file in with_uploaded_folder_on_s3
+        if file.s3_key.startswith(prefix) and "/" not in file.s3_key.removeprefix(prefix)
+    }
+    assert {s3_object.object_key for s3_object in listed_objects} == expected_keys
+
+
 async def test_get_file_metadata(
     mocked_s3_server_envs: EnvVarsDict,
     with_s3_bucket: S3BucketName,
@@ -1465,6 +1502,70 @@ async def test_copy_file(
     assert uploaded_file.local_path.stat().st_size == dst_file_metadata.size
 
 
+@pytest.mark.parametrize(
+    "file_size",
+    [parametrized_file_size("223Mib")],
+    ids=byte_size_ids,
+)
+async def test_copy_file_resumes_interrupted_copy(
+    mocked_s3_server_envs: EnvVarsDict,
+    simcore_s3_api: SimcoreS3API,
+    with_s3_bucket: S3BucketName,
+    s3_client: S3Client,
+    file_size: ByteSize,
+    upload_file: Callable[[Path], Awaitable[UploadedFile]],
+    copy_file: Callable[[S3ObjectKey, S3ObjectKey], Awaitable[S3ObjectKey]],
+    create_file_of_size: Callable[[ByteSize], Path],
+    faker: Faker,
+    mocker: MockerFixture,
+):
+    file = create_file_of_size(file_size)
+    uploaded_file = await upload_file(file)
+    dst_object_key = faker.file_name()
+
+    # simulate a copy interrupted after its first part
+    response = await s3_client.create_multipart_upload(Bucket=with_s3_bucket, Key=dst_object_key)
+    await s3_client.upload_part_copy(
+        Bucket=with_s3_bucket,
+        Key=dst_object_key,
+        UploadId=response["UploadId"],
+        PartNumber=1,
+        CopySource={"Bucket": with_s3_bucket, "Key": uploaded_file.s3_key},
+        CopySourceRange=f"bytes=0-{MULTIPART_COPY_PART_SIZE - 1}",
+    )
+
+    upload_part_copy_spy = mocker.spy(simcore_s3_api._client, "upload_part_copy")  # noqa: SLF001
+    await copy_file(uploaded_file.s3_key, dst_object_key)
+
+    # only the remaining parts were copied, using the same upload
+    assert upload_part_copy_spy.call_count == 2
+    assert {call.kwargs["PartNumber"] for call in upload_part_copy_spy.call_args_list} == {2, 3}
+    assert {call.kwargs["UploadId"] for call in upload_part_copy_spy.call_args_list} == {response["UploadId"]}
+    dst_file_metadata = await simcore_s3_api.get_object_metadata(bucket=with_s3_bucket, object_key=dst_object_key)
+    assert uploaded_file.local_path.stat().st_size == dst_file_metadata.size
+    ongoing_uploads = await s3_client.list_multipart_uploads(Bucket=with_s3_bucket, Prefix=dst_object_key)
+    assert not ongoing_uploads.get("Uploads")
+
+
+async def test_abort_multipart_uploads(
+    mocked_s3_server_envs: EnvVarsDict,
+    simcore_s3_api: SimcoreS3API,
+    with_s3_bucket: S3BucketName,
+    s3_client: S3Client,
+    faker: Faker,
+):
+    directory = faker.pystr()
+    object_keys = [f"{directory}/{faker.file_name()}", f"{directory}/sub/{faker.file_name()}", directory]
+    other_object_key = f"{directory}2/{faker.file_name()}"
+    for object_key in [*object_keys, other_object_key]:
+        await s3_client.create_multipart_upload(Bucket=with_s3_bucket, Key=object_key)
+
+    assert await simcore_s3_api.abort_multipart_uploads(bucket=with_s3_bucket, prefix=directory) == len(object_keys)
+
+    ongoing_uploads = await s3_client.list_multipart_uploads(Bucket=with_s3_bucket, Prefix=directory)
+    assert [upload.get("Key") for upload in ongoing_uploads.get("Uploads", [])] == [other_object_key]
+
+
 async def test_copy_file_invalid_raises(
     mocked_s3_server_envs: EnvVarsDict,
     simcore_s3_api: SimcoreS3API,
@@ -1520,6 +1621,7 @@ async def test_get_directory_metadata(
     )
     assert metadata
     assert metadata.size == directory_size
+    assert metadata.num_objects == len(with_uploaded_folder_on_s3)
 
 
 @pytest.mark.parametrize(
@@ -1651,6 +1753,48 @@ async def test_copy_files_recursively(
         await copy_files_recursively(src_folder, dst_folder)
 
 
+@pytest.mark.parametrize(
+    "directory_size, min_file_size, max_file_size, depth",
+    [
+        (
+            TypeAdapter(ByteSize).validate_python("1Mib"),
+            TypeAdapter(ByteSize).validate_python("1B"),
+            TypeAdapter(ByteSize).validate_python("10Kib"),
+            None,
+        )
+    ],
+    ids=byte_size_ids,
+)
+async def test_copy_files_recursively_resumes(
+    mocked_s3_server_envs: EnvVarsDict,
+    simcore_s3_api: SimcoreS3API,
+    with_s3_bucket: S3BucketName,
+    with_uploaded_folder_on_s3: list[UploadedFile],
+    copy_file: Callable[[S3ObjectKey, S3ObjectKey], Awaitable[S3ObjectKey]],
+    copy_files_recursively: Callable[[str, str], Awaitable[str]],
+):
+    src_folder = Path(with_uploaded_folder_on_s3[0].s3_key).parts[0]
+    dst_folder = f"{src_folder}-copy"
+    # simulate an interrupted copy where only some of the files were copied
+    for uploaded_file in with_uploaded_folder_on_s3[: len(with_uploaded_folder_on_s3) // 2]:
+        await copy_file(uploaded_file.s3_key, uploaded_file.s3_key.replace(src_folder, dst_folder))
+
+    with pytest.raises(S3DestinationNotEmptyError, match=rf"{dst_folder}"):
+        await copy_files_recursively(src_folder, dst_folder)
+
+    await simcore_s3_api.copy_objects_recursively(
+        bucket=with_s3_bucket,
+        src_prefix=src_folder,
+        dst_prefix=dst_folder,
+        bytes_transferred_cb=None,
+        resume=True,
+    )
+    src_directory_metadata = await simcore_s3_api.get_directory_metadata(bucket=with_s3_bucket, prefix=src_folder)
+    dst_directory_metadata = await simcore_s3_api.get_directory_metadata(bucket=with_s3_bucket, prefix=dst_folder)
+    assert dst_directory_metadata.size == src_directory_metadata.size
+    assert dst_directory_metadata.num_objects == src_directory_metadata.num_objects
+
+
 async def test_copy_files_recursively_raises(
     mocked_s3_server_envs: EnvVarsDict,
     simcore_s3_api: SimcoreS3API,
@@ -1760,16 +1904,21 @@ def test_copy_recursively_performance(
     benchmark.pedantic(run_async_test, setup=dst_folder_setup, rounds=4)
 
 
+@pytest.mark.parametrize("with_known_data_size", [True, False])
 async def test_read_from_bytes_streamer(
     mocked_s3_server_envs: EnvVarsDict,
     with_uploaded_file_on_s3: UploadedFile,
     simcore_s3_api: SimcoreS3API,
     with_s3_bucket: S3BucketName,
     fake_file_name: Path,
+    with_known_data_size: bool,
 ):
     async with aiofiles.open(fake_file_name, "wb") as f:
         bytes_streamer = await simcore_s3_api.get_bytes_streamer_from_object(
-            with_s3_bucket, with_uploaded_file_on_s3.s3_key, chunk_size=1024
+            with_s3_bucket,
+            with_uploaded_file_on_s3.s3_key,
+            chunk_size=1024,
+            data_size=(DataSize(with_uploaded_file_on_s3.local_path.stat().st_size) if with_known_data_size else None),
         )
         assert isinstance(bytes_streamer.data_size, DataSize)
         async for chunk in bytes_streamer.with_progress_bytes_iter(AsyncMock()):
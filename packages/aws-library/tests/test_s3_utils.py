@@ -3,11 +3,17 @@
 # pylint: disable=unused-argument
 # pylint: disable=unused-variable
 
+import datetime
+import itertools
 
 import pytest
+from aws_library.s3._constants import MULTIPART_COPY_PART_SIZE
+from aws_library.s3._models import S3MetaData
 from aws_library.s3._utils import (
     _MULTIPART_MAX_NUMBER_OF_PARTS,
     _MULTIPART_UPLOADS_TARGET_MAX_PART_SIZE,
+    batch_objects_by_size,
+    compute_copy_part_ranges,
     compute_num_file_chunks,
 )
 from pydantic import ByteSize, TypeAdapter
@@ -82,3 +88,46 @@ def test_enormous_file_size_raises_value_error():
     )
     with pytest.raises(ValueError):
         compute_num_file_chunks(enormous_file_size)
+
+
+@pytest.mark.parametrize(
+    "object_size, expected_num_parts",
+    [
+        (TypeAdapter(ByteSize).validate_python("1B"), 1),
+        (MULTIPART_COPY_PART_SIZE, 1),
+        (TypeAdapter(ByteSize).validate_python(MULTIPART_COPY_PART_SIZE + 1), 2),
+        (TypeAdapter(ByteSize).validate_python("50Gib"), 512),
+        (TypeAdapter(ByteSize).validate_python("5Tib"), _MULTIPART_MAX_NUMBER_OF_PARTS),
+    ],
+    ids=byte_size_ids,
+)
+def test_compute_copy_part_ranges(object_size: ByteSize, expected_num_parts: int):
+    part_ranges = compute_copy_part_ranges(object_size)
+    assert len(part_ranges) == expected_num_parts
+    # parts are contiguous and cover the whole object
+    assert part_ranges[0][0] == 0
+    assert part_ranges[-1][1] == object_size - 1
+    for (_, previous_last_byte), (first_byte, _) in itertools.pairwise(part_ranges):
+        assert first_byte == previous_last_byte + 1
+
+
+def _s3_metadata(object_key: str, size: int) -> S3MetaData:
+    return S3MetaData(
+        object_key=object_key,
+        last_modified=datetime.datetime.now(tz=datetime.UTC),
+        e_tag="etag",
+        sha256_checksum=None,
+        size=ByteSize(size),
+    )
+
+
+def test_batch_objects_by_size():
+    s3_objects = [_s3_metadata(f"file_{n}", size) for n, size in enumerate([10, 10, 10, 50, 5, 5, 5, 5])]
+    batches = batch_objects_by_size(s3_objects, max_batch_size=ByteSize(30), max_batch_length=3)
+    assert [[s3_object.size for s3_object in batch] for batch in batches] == [
+        [10, 10, 10],
+        [50],
+        [5, 5, 5],
+        [5],
+    ]
+    assert batch_objects_by_size([], max_batch_size=ByteSize(30), max_batch_length=3) == []
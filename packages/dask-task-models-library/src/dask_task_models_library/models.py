@@ -1,4 +1,4 @@
-from typing import Final, Literal, TypeAlias
+from typing import Any, Final, Literal, TypeAlias, TypedDict
 
 from dask.typing import Key
 from distributed.scheduler import TaskStateState as SchedulerTaskState
@@ -11,6 +11,8 @@ DaskResources: TypeAlias = dict[str, int | float]
 
 TASK_LIFE_CYCLE_EVENT: Final[str] = "task-lifecycle-{key}"
 TASK_RUNNING_PROGRESS_EVENT: Final[str] = "task-progress-{key}"
+TASK_STATES_CHANGED_EVENT: Final[str] = "task-states-changed"
+GET_TASK_STATES_SCHEDULER_HANDLER: Final[str] = "get_task_states"
 _SCHEDULER_TASK_STATE_TO_RUNNING_STATE: Final[dict[SchedulerTaskState, RunningState]] = {
     "released": RunningState.NOT_STARTED,  # Known but not actively computing or in memory
     "waiting": RunningState.PENDING,  # On track to be computed, waiting on dependencies to arrive in memory
@@ -66,3 +68,10 @@ class TaskLifeCycleState(BaseModel):
             worker=worker,
             state=_WORKER_TASK_STATE_TO_RUNNING_STATE[task_state],
         )
+
+
+class TaskStateDict(TypedDict):
+    life_cycle: dict[str, Any] | None  # last TaskLifeCycleState (as json) of the task
+    progress: str | None  # last TaskProgressEvent (as json) of the task
+    exception_text: str | None  # repr of the exception once the task erred on the scheduler
+    cancelled: bool  # the task erred with a TaskCancelledError
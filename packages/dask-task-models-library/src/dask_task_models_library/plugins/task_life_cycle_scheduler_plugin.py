@@ -1,26 +1,74 @@
 # pylint: disable=unused-argument
 import logging
-from typing import Any
+from typing import Any, Final
 
 import click
 from dask.typing import Key
 from distributed import Scheduler, SchedulerPlugin
-from distributed.scheduler import TaskStateState
+from distributed.compatibility import PeriodicCallback
+from distributed.protocol import Serialized, deserialize
+from distributed.scheduler import TaskState, TaskStateState
 
-from ..models import TASK_LIFE_CYCLE_EVENT, TaskLifeCycleState
+from ..container_tasks.errors import TaskCancelledError
+from ..models import (
+    GET_TASK_STATES_SCHEDULER_HANDLER,
+    TASK_LIFE_CYCLE_EVENT,
+    TASK_RUNNING_PROGRESS_EVENT,
+    TASK_STATES_CHANGED_EVENT,
+    TaskLifeCycleState,
+    TaskStateDict,
+)
 
 _logger = logging.getLogger(__name__)
 
+_LIFE_CYCLE_EVENT_PREFIX: Final[str] = TASK_LIFE_CYCLE_EVENT.format(key="")
+_PROGRESS_EVENT_PREFIX: Final[str] = TASK_RUNNING_PROGRESS_EVENT.format(key="")
+_PUBLISH_CHANGED_TASKS_INTERVAL_MS: Final[int] = 500
+
+
+def _is_cancelled(erred_task: TaskState | None) -> bool:
+    if erred_task is None or erred_task.exception is None:
+        return False
+    exception = erred_task.exception
+    if isinstance(exception, Serialized):
+        # NOTE: the scheduler keeps the exceptions as serialized by the workers
+        try:
+            exception = deserialize(exception.header, exception.frames)
+        except Exception:  # pylint: disable=broad-exception-caught
+            _logger.warning("Could not deserialize the exception of task %s", erred_task.key, exc_info=True)
+            return False
+    return isinstance(exception, TaskCancelledError)
+
 
 class TaskLifecycleSchedulerPlugin(SchedulerPlugin):
+    """Publishes the life cycle of the tasks as dask events.
+
+    The last life cycle state and progress of every task (from the scheduler and the workers events)
+    are also kept in a table, clients get them for any number of tasks in one call to
+    the GET_TASK_STATES_SCHEDULER_HANDLER handler instead of reading the events of each task.
+    The keys of the tasks that changed are published in batches on the TASK_STATES_CHANGED_EVENT topic.
+    """
+
     def __init__(self) -> None:
         self.scheduler = None
+        self._task_states: dict[str, TaskStateDict] = {}
+        self._changed_keys: set[str] = set()
+        self._publish_changed_keys_callback: PeriodicCallback | None = None
         _logger.info("initialized TaskLifecycleSchedulerPlugin")
 
     async def start(self, scheduler: Scheduler) -> None:
         self.scheduler = scheduler  # type: ignore[assignment]
+        scheduler.handlers[GET_TASK_STATES_SCHEDULER_HANDLER] = self.get_task_states
+        self._publish_changed_keys_callback = PeriodicCallback(
+            self._publish_changed_keys, _PUBLISH_CHANGED_TASKS_INTERVAL_MS
+        )
+        self._publish_changed_keys_callback.start()
         _logger.info("started TaskLifecycleSchedulerPlugin")
 
+    async def close(self) -> None:
+        if self._publish_changed_keys_callback:
+            self._publish_changed_keys_callback.stop()
+
     def transition(
         self,
         key: Key,
@@ -45,6 +93,41 @@ class TaskLifecycleSchedulerPlugin(SchedulerPlugin):
             TaskLifeCycleState.from_scheduler_task_state(key, kwargs.get("worker"), finish).model_dump(mode="json"),
         )
 
+        if finish == "erred" and (task_state := self._task_states.get(f"{key}")) is not None:
+            erred_task = self.scheduler.tasks.get(key)
+            task_state["exception_text"] = (erred_task.exception_text if erred_task else None) or ""
+            task_state["cancelled"] = _is_cancelled(erred_task)
+        elif finish == "forgotten":
+            self._task_states.pop(f"{key}", None)
+
+    def log_event(self, topic: str, msg: Any) -> None:
+        if topic.startswith(_LIFE_CYCLE_EVENT_PREFIX):
+            key, field = topic.removeprefix(_LIFE_CYCLE_EVENT_PREFIX), "life_cycle"
+        elif topic.startswith(_PROGRESS_EVENT_PREFIX):
+            key, field = topic.removeprefix(_PROGRESS_EVENT_PREFIX), "progress"
+        else:
+            return
+
+        assert self.scheduler  # nosec
+        if key not in self._task_states:
+            if key not in self.scheduler.tasks:
+                # NOTE: late event of a forgotten task
+                return
+            self._task_states[key] = TaskStateDict(life_cycle=None, progress=None, exception_text=None, cancelled=False)
+        self._task_states[key][field] = msg  # type: ignore[literal-required]
+        self._changed_keys.add(key)
+
+    def get_task_states(self, keys: list[str]) -> dict[str, TaskStateDict]:
+        """returns the states of the tasks that are known by the scheduler"""
+        return {key: task_state for key in keys if (task_state := self._task_states.get(key)) is not None}
+
+    def _publish_changed_keys(self) -> None:
+        if not self._changed_keys:
+            return
+        assert self.scheduler  # nosec
+        changed_keys, self._changed_keys = self._changed_keys, set()
+        self.scheduler.log_event(TASK_STATES_CHANGED_EVENT, sorted(changed_keys))
+
 
 @click.command()
 def dask_setup(scheduler):
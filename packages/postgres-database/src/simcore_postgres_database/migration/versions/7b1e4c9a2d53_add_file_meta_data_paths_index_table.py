@@ -0,0 +1,195 @@
+"""add file_meta_data_paths index table
+
+Revision ID: 7b1e4c9a2d53
+Revises: 3f8c0e8d11a4
+Create Date: 2026-10-18 08:12:41.518302+00:00
+
+"""
+
+from typing import Final
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7b1e4c9a2d53"
+down_revision = "3f8c0e8d11a4"
+branch_labels = None
+depends_on = None
+
+
+DB_PROCEDURE_NAME: Final[str] = "update_file_meta_data_paths"
+
+# PROCEDURES ------------------------
+file_meta_data_paths_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {DB_PROCEDURE_NAME}() RETURNS TRIGGER AS $$
+DECLARE
+    changes_sql TEXT;
+    removed_sql TEXT;
+    affected RECORD;
+    affected_path TEXT;
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        changes_sql := 'SELECT file_id, project_id, file_size, 1 AS sign FROM new_rows';
+    ELSIF (TG_OP = 'DELETE') THEN
+        changes_sql := 'SELECT file_id, project_id, file_size, -1 AS sign FROM old_rows';
+        removed_sql := 'SELECT file_id FROM old_rows';
+    ELSE
+        changes_sql := 'SELECT file_id, project_id, file_size, 1 AS sign FROM new_rows'
+            || ' UNION ALL SELECT file_id, project_id, file_size, -1 AS sign FROM old_rows';
+        removed_sql := 'SELECT file_id FROM old_rows EXCEPT SELECT file_id FROM new_rows';
+    END IF;
+
+    -- 1. apply the count/size deltas to every level of every changed file_id
+    EXECUTE format($sql$
+        INSERT INTO file_meta_data_paths AS p
+            (parent_path, child_name, project_id, num_files, total_size, first_file_id)
+        SELECT
+            array_to_string(split.parts[1:lvl.level - 1], '/'),
+            split.parts[lvl.level],
+            min(changes.project_id),
+            sum(changes.sign),
+            sum(changes.sign * GREATEST(COALESCE(changes.file_size, 0), 0)),
+            min(changes.file_id) FILTER (WHERE changes.sign > 0)
+        FROM (%%s) AS changes,
+            LATERAL string_to_array(changes.file_id, '/') AS split(parts),
+            LATERAL generate_series(1, cardinality(split.parts)) AS lvl(level)
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (parent_path, child_name) DO UPDATE SET
+            project_id = COALESCE(p.project_id, EXCLUDED.project_id),
+            num_files = p.num_files + EXCLUDED.num_files,
+            total_size = p.total_size + EXCLUDED.total_size,
+            first_file_id = LEAST(p.first_file_id, EXCLUDED.first_file_id)
+    $sql$, changes_sql);
+
+    IF (TG_OP = 'INSERT') THEN
+        RETURN NULL;
+    END IF;
+
+    -- 2. drop the levels that have no entries anymore
+    DELETE FROM file_meta_data_paths WHERE num_files <= 0;
+
+    -- 3. refresh the representatives that were removed (deepest levels first)
+    FOR affected IN EXECUTE format($sql$
+        SELECT parent_path, child_name FROM file_meta_data_paths
+        WHERE first_file_id IN (%%s)
+        ORDER BY cardinality(string_to_array(parent_path, '/')) DESC
+    $sql$, removed_sql)
+    LOOP
+        affected_path := CASE
+            WHEN affected.parent_path = '' THEN affected.child_name
+            ELSE affected.parent_path || '/' || affected.child_name
+        END;
+        UPDATE file_meta_data_paths SET first_file_id = LEAST(
+            (SELECT min(c.first_file_id) FROM file_meta_data_paths c WHERE c.parent_path = affected_path),
+            (SELECT f.file_id FROM file_meta_data f WHERE f.file_id = affected_path)
+        )
+        WHERE parent_path = affected.parent_path AND child_name = affected.child_name;
+    END LOOP;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""  # noqa: S608
+)
+
+# TRIGGERS ------------------------
+file_meta_data_paths_triggers = sa.DDL(
+    f"""
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_insert on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_insert
+AFTER INSERT ON file_meta_data
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_update on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_update
+AFTER UPDATE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_delete on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_delete
+AFTER DELETE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+"""
+)
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "file_meta_data_paths",
+        sa.Column("parent_path", sa.String(), nullable=False),
+        sa.Column("child_name", sa.String(), nullable=False),
+        sa.Column("project_id", sa.String(), nullable=True),
+        sa.Column("num_files", sa.BigInteger(), nullable=False),
+        sa.Column("total_size", sa.BigInteger(), nullable=False),
+        sa.Column("first_file_id", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("parent_path", "child_name", name="file_meta_data_paths_pk"),
+    )
+    op.create_index(
+        "ix_file_meta_data_paths_project_id",
+        "file_meta_data_paths",
+        ["project_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_file_meta_data_paths_first_file_id",
+        "file_meta_data_paths",
+        ["first_file_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_file_meta_data_paths_empty",
+        "file_meta_data_paths",
+        ["parent_path"],
+        unique=False,
+        postgresql_where=sa.text("num_files <= 0"),
+    )
+    # ### end Alembic commands ###
+
+    # backfill the index with the existing entries
+    op.execute(
+        sa.DDL(
+            """
+INSERT INTO file_meta_data_paths (parent_path, child_name, project_id, num_files, total_size, first_file_id)
+SELECT
+    array_to_string(split.parts[1:lvl.level - 1], '/'),
+    split.parts[lvl.level],
+    min(file_meta_data.project_id),
+    count(*),
+    sum(GREATEST(COALESCE(file_meta_data.file_size, 0), 0)),
+    min(file_meta_data.file_id)
+FROM file_meta_data,
+    LATERAL string_to_array(file_meta_data.file_id, '/') AS split(parts),
+    LATERAL generate_series(1, cardinality(split.parts)) AS lvl(level)
+GROUP BY 1, 2;
+"""
+        )
+    )
+
+    op.execute(file_meta_data_paths_procedure)
+    op.execute(file_meta_data_paths_triggers)
+
+
+def downgrade():
+    op.execute(f"DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_insert on file_meta_data;")
+    op.execute(f"DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_update on file_meta_data;")
+    op.execute(f"DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_delete on file_meta_data;")
+    op.execute(f"DROP FUNCTION {DB_PROCEDURE_NAME}();")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(
+        "ix_file_meta_data_paths_empty",
+        table_name="file_meta_data_paths",
+        postgresql_where=sa.text("num_files <= 0"),
+    )
+    op.drop_index("ix_file_meta_data_paths_first_file_id", table_name="file_meta_data_paths")
+    op.drop_index("ix_file_meta_data_paths_project_id", table_name="file_meta_data_paths")
+    op.drop_table("file_meta_data_paths")
+    # ### end Alembic commands ###
@@ -0,0 +1,235 @@
+"""add num_objects to file_meta_data and its paths index
+
+Revision ID: c4d2a61f8e07
+Revises: 7b1e4c9a2d53
+Create Date: 2026-10-18 10:03:17.204715+00:00
+
+"""
+
+from typing import Final
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4d2a61f8e07"
+down_revision = "7b1e4c9a2d53"
+branch_labels = None
+depends_on = None
+
+
+DB_PROCEDURE_NAME: Final[str] = "update_file_meta_data_paths"
+
+# PROCEDURES ------------------------
+file_meta_data_paths_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {DB_PROCEDURE_NAME}() RETURNS TRIGGER AS $$
+DECLARE
+    changes_columns_sql CONSTANT TEXT := 'SELECT file_id, project_id,'
+        || ' GREATEST(COALESCE(file_size, 0), 0) AS file_size,'
+        || ' COALESCE(num_objects, CASE WHEN is_directory THEN 0 ELSE 1 END) AS num_objects,'
+        || ' (upload_id IS NOT NULL OR upload_expires_at IS NOT NULL OR COALESCE(file_size, -1) < 0'
+        || ' OR (is_directory AND num_objects IS NULL))::int AS unresolved,'
+        || ' %%s AS sign FROM %%s';
+    changes_sql TEXT;
+    removed_sql TEXT;
+    affected RECORD;
+    affected_path TEXT;
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        changes_sql := format(changes_columns_sql, '1', 'new_rows');
+    ELSIF (TG_OP = 'DELETE') THEN
+        changes_sql := format(changes_columns_sql, '-1', 'old_rows');
+        removed_sql := 'SELECT file_id FROM old_rows';
+    ELSE
+        changes_sql := format(changes_columns_sql, '1', 'new_rows')
+            || ' UNION ALL ' || format(changes_columns_sql, '-1', 'old_rows');
+        removed_sql := 'SELECT file_id FROM old_rows EXCEPT SELECT file_id FROM new_rows';
+    END IF;
+
+    -- 1. apply the count/size deltas to every level of every changed file_id
+    EXECUTE format($sql$
+        INSERT INTO file_meta_data_paths AS p
+            (parent_path, child_name, project_id, num_files, total_size, num_objects, num_unresolved, first_file_id)
+        SELECT
+            array_to_string(split.parts[1:lvl.level - 1], '/'),
+            split.parts[lvl.level],
+            min(changes.project_id),
+            sum(changes.sign),
+            sum(changes.sign * changes.file_size),
+            sum(changes.sign * changes.num_objects),
+            sum(changes.sign * changes.unresolved),
+            min(changes.file_id) FILTER (WHERE changes.sign > 0)
+        FROM (%%s) AS changes,
+            LATERAL string_to_array(changes.file_id, '/') AS split(parts),
+            LATERAL generate_series(1, cardinality(split.parts)) AS lvl(level)
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (parent_path, child_name) DO UPDATE SET
+            project_id = COALESCE(p.project_id, EXCLUDED.project_id),
+            num_files = p.num_files + EXCLUDED.num_files,
+            total_size = p.total_size + EXCLUDED.total_size,
+            num_objects = p.num_objects + EXCLUDED.num_objects,
+            num_unresolved = p.num_unresolved + EXCLUDED.num_unresolved,
+            first_file_id = LEAST(p.first_file_id, EXCLUDED.first_file_id)
+    $sql$, changes_sql);
+
+    IF (TG_OP = 'INSERT') THEN
+        RETURN NULL;
+    END IF;
+
+    -- 2. drop the levels that have no entries anymore
+    DELETE FROM file_meta_data_paths WHERE num_files <= 0;
+
+    -- 3. refresh the representatives that were removed (deepest levels first)
+    FOR affected IN EXECUTE format($sql$
+        SELECT parent_path, child_name FROM file_meta_data_paths
+        WHERE first_file_id IN (%%s)
+        ORDER BY cardinality(string_to_array(parent_path, '/')) DESC
+    $sql$, removed_sql)
+    LOOP
+        affected_path := CASE
+            WHEN affected.parent_path = '' THEN affected.child_name
+            ELSE affected.parent_path || '/' || affected.child_name
+        END;
+        UPDATE file_meta_data_paths SET first_file_id = LEAST(
+            (SELECT min(c.first_file_id) FROM file_meta_data_paths c WHERE c.parent_path = affected_path),
+            (SELECT f.file_id FROM file_meta_data f WHERE f.file_id = affected_path)
+        )
+        WHERE parent_path = affected.parent_path AND child_name = affected.child_name;
+    END LOOP;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""  # noqa: S608
+)
+
+previous_file_meta_data_paths_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {DB_PROCEDURE_NAME}() RETURNS TRIGGER AS $$
+DECLARE
+    changes_sql TEXT;
+    removed_sql TEXT;
+    affected RECORD;
+    affected_path TEXT;
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        changes_sql := 'SELECT file_id, project_id, file_size, 1 AS sign FROM new_rows';
+    ELSIF (TG_OP = 'DELETE') THEN
+        changes_sql := 'SELECT file_id, project_id, file_size, -1 AS sign FROM old_rows';
+        removed_sql := 'SELECT file_id FROM old_rows';
+    ELSE
+        changes_sql := 'SELECT file_id, project_id, file_size, 1 AS sign FROM new_rows'
+            || ' UNION ALL SELECT file_id, project_id, file_size, -1 AS sign FROM old_rows';
+        removed_sql := 'SELECT file_id FROM old_rows EXCEPT SELECT file_id FROM new_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        INSERT INTO file_meta_data_paths AS p
+            (parent_path, child_name, project_id, num_files, total_size, first_file_id)
+        SELECT
+            array_to_string(split.parts[1:lvl.level - 1], '/'),
+            split.parts[lvl.level],
+            min(changes.project_id),
+            sum(changes.sign),
+            sum(changes.sign * GREATEST(COALESCE(changes.file_size, 0), 0)),
+            min(changes.file_id) FILTER (WHERE changes.sign > 0)
+        FROM (%%s) AS changes,
+            LATERAL string_to_array(changes.file_id, '/') AS split(parts),
+            LATERAL generate_series(1, cardinality(split.parts)) AS lvl(level)
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (parent_path, child_name) DO UPDATE SET
+            project_id = COALESCE(p.project_id, EXCLUDED.project_id),
+            num_files = p.num_files + EXCLUDED.num_files,
+            total_size = p.total_size + EXCLUDED.total_size,
+            first_file_id = LEAST(p.first_file_id, EXCLUDED.first_file_id)
+    $sql$, changes_sql);
+
+    IF (TG_OP = 'INSERT') THEN
+        RETURN NULL;
+    END IF;
+
+    DELETE FROM file_meta_data_paths WHERE num_files <= 0;
+
+    FOR affected IN EXECUTE format($sql$
+        SELECT parent_path, child_name FROM file_meta_data_paths
+        WHERE first_file_id IN (%%s)
+        ORDER BY cardinality(string_to_array(parent_path, '/')) DESC
+    $sql$, removed_sql)
+    LOOP
+        affected_path := CASE
+            WHEN affected.parent_path = '' THEN affected.child_name
+            ELSE affected.parent_path || '/' || affected.child_name
+        END;
+        UPDATE file_meta_data_paths SET first_file_id = LEAST(
+            (SELECT min(c.first_file_id) FROM file_meta_data_paths c WHERE c.parent_path = affected_path),
+            (SELECT f.file_id FROM file_meta_data f WHERE f.file_id = affected_path)
+        )
+        WHERE parent_path = affected.parent_path AND child_name = affected.child_name;
+    END LOOP;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""  # noqa: S608
+)
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column(
+        "file_meta_data",
+        sa.Column("num_objects", sa.BigInteger(), server_default=sa.null(), nullable=True),
+    )
+    op.add_column(
+        "file_meta_data_paths",
+        sa.Column("num_objects", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+    )
+    op.add_column(
+        "file_meta_data_paths",
+        sa.Column("num_unresolved", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+    )
+    # ### end Alembic commands ###
+
+    op.execute(file_meta_data_paths_procedure)
+
+    # rebuild the index with the new aggregates
+    op.execute(sa.DDL("TRUNCATE file_meta_data_paths;"))
+    op.execute(
+        sa.DDL(
+            """
+INSERT INTO file_meta_data_paths
+    (parent_path, child_name, project_id, num_files, total_size, num_objects, num_unresolved, first_file_id)
+SELECT
+    array_to_string(split.parts[1:lvl.level - 1], '/'),
+    split.parts[lvl.level],
+    min(file_meta_data.project_id),
+    count(*),
+    sum(GREATEST(COALESCE(file_meta_data.file_size, 0), 0)),
+    sum(COALESCE(file_meta_data.num_objects, CASE WHEN file_meta_data.is_directory THEN 0 ELSE 1 END)),
+    sum((
+        file_meta_data.upload_id IS NOT NULL
+        OR file_meta_data.upload_expires_at IS NOT NULL
+        OR COALESCE(file_meta_data.file_size, -1) < 0
+        OR (file_meta_data.is_directory AND file_meta_data.num_objects IS NULL)
+    )::int),
+    min(file_meta_data.file_id)
+FROM file_meta_data,
+    LATERAL string_to_array(file_meta_data.file_id, '/') AS split(parts),
+    LATERAL generate_series(1, cardinality(split.parts)) AS lvl(level)
+GROUP BY 1, 2;
+"""
+        )
+    )
+
+
+def downgrade():
+    op.execute(previous_file_meta_data_paths_procedure)
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_column("file_meta_data_paths", "num_unresolved")
+    op.drop_column("file_meta_data_paths", "num_objects")
+    op.drop_column("file_meta_data", "num_objects")
+    # ### end Alembic commands ###
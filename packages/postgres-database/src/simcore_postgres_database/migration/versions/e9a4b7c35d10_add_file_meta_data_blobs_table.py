@@ -0,0 +1,131 @@
+"""add file_meta_data_blobs table
+
+Revision ID: e9a4b7c35d10
+Revises: c4d2a61f8e07
+Create Date: 2026-10-18 11:12:41.538190+00:00
+
+"""
+
+from typing import Final
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e9a4b7c35d10"
+down_revision = "c4d2a61f8e07"
+branch_labels = None
+depends_on = None
+
+
+DB_PROCEDURE_NAME: Final[str] = "update_file_meta_data_blobs_ref_count"
+
+# PROCEDURES ------------------------
+file_meta_data_blobs_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {DB_PROCEDURE_NAME}() RETURNS TRIGGER AS $$
+DECLARE
+    changes_sql TEXT;
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        changes_sql := 'SELECT object_name, 1 AS sign FROM new_rows';
+    ELSIF (TG_OP = 'DELETE') THEN
+        changes_sql := 'SELECT object_name, -1 AS sign FROM old_rows';
+    ELSE
+        changes_sql := 'SELECT object_name, 1 AS sign FROM new_rows'
+            || ' UNION ALL SELECT object_name, -1 AS sign FROM old_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        UPDATE file_meta_data_blobs AS b
+        SET ref_count = b.ref_count + deltas.delta, modified = now()
+        FROM (
+            SELECT changes.object_name, sum(changes.sign) AS delta
+            FROM (%%s) AS changes
+            GROUP BY changes.object_name
+            HAVING sum(changes.sign) <> 0
+        ) AS deltas
+        WHERE b.object_name = deltas.object_name
+    $sql$, changes_sql);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""  # noqa: S608
+)
+
+# TRIGGERS ------------------------
+file_meta_data_blobs_triggers = sa.DDL(
+    f"""
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_insert on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_insert
+AFTER INSERT ON file_meta_data
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_update on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_update
+AFTER UPDATE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_delete on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_delete
+AFTER DELETE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+"""
+)
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "file_meta_data_blobs",
+        sa.Column("sha256_checksum", sa.String(), nullable=False),
+        sa.Column("entity_tag", sa.String(), nullable=False),
+        sa.Column("object_name", sa.String(), nullable=False),
+        sa.Column("ref_count", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "created",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "modified",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("sha256_checksum", "entity_tag", name="file_meta_data_blobs_pk"),
+        sa.UniqueConstraint("object_name"),
+    )
+    op.create_index(
+        "ix_file_meta_data_blobs_unreferenced",
+        "file_meta_data_blobs",
+        ["modified"],
+        unique=False,
+        postgresql_where=sa.text("ref_count <= 0"),
+    )
+    # ### end Alembic commands ###
+
+    op.execute(file_meta_data_blobs_procedure)
+    op.execute(file_meta_data_blobs_triggers)
+
+
+def downgrade():
+    op.execute(f"DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_insert on file_meta_data;")
+    op.execute(f"DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_update on file_meta_data;")
+    op.execute(f"DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_delete on file_meta_data;")
+    op.execute(f"DROP FUNCTION {DB_PROCEDURE_NAME}();")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(
+        "ix_file_meta_data_blobs_unreferenced",
+        table_name="file_meta_data_blobs",
+        postgresql_where=sa.text("ref_count <= 0"),
+    )
+    op.drop_table("file_meta_data_blobs")
+    # ### end Alembic commands ###
@@ -68,6 +68,14 @@ file_meta_data = sa.Table(
         doc="Set True when file_id is a directory",
         index=True,
     ),
+    sa.Column(
+        "num_objects",
+        sa.BigInteger(),
+        nullable=True,
+        server_default=sa.null(),
+        doc="Number of S3 objects behind this entry (e.g. number of files in a directory)."
+        " NULL if unknown (a file counts as 1 object)",
+    ),
     sa.Column(
         "sha256_checksum",
         sa.String(),
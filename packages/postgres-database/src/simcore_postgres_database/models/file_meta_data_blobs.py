@@ -0,0 +1,118 @@
+"""Content-addressed S3 objects shared by several file_meta_data entries
+
+When a project is copied in copy-on-write mode, the copied entries do not get their own
+S3 object: their file_meta_data.object_name points to a blob identified by its content
+(SHA256 checksum and S3 entity tag).
+The number of entries referencing a blob is maintained by statement-level triggers on file_meta_data,
+blobs that are not referenced anymore are removed by the storage cleaner.
+"""
+
+import sqlalchemy as sa
+
+from ._common import column_created_datetime, column_modified_datetime
+from .base import metadata
+from .file_meta_data import file_meta_data
+
+file_meta_data_blobs = sa.Table(
+    "file_meta_data_blobs",
+    metadata,
+    sa.Column(
+        "sha256_checksum",
+        sa.String(),
+        nullable=False,
+        doc="SHA256 checksum of the content of the blob",
+    ),
+    sa.Column(
+        "entity_tag",
+        sa.String(),
+        nullable=False,
+        doc="S3 entity tag of the content of the blob (computed by S3, unlike the checksum)",
+    ),
+    sa.Column(
+        "object_name",
+        sa.String(),
+        nullable=False,
+        unique=True,
+        doc="S3 object key of the blob (referenced by file_meta_data.object_name)",
+    ),
+    sa.Column(
+        "ref_count",
+        sa.BigInteger(),
+        nullable=False,
+        server_default=sa.text("0"),
+        doc="number of file_meta_data entries referencing this blob",
+    ),
+    column_created_datetime(timezone=True),
+    column_modified_datetime(timezone=True),
+    sa.PrimaryKeyConstraint("sha256_checksum", "entity_tag", name="file_meta_data_blobs_pk"),
+    sa.Index(
+        "ix_file_meta_data_blobs_unreferenced",
+        "modified",
+        postgresql_where=sa.text("ref_count <= 0"),
+    ),
+)
+
+
+# ---------------------- PROCEDURES
+DB_PROCEDURE_NAME: str = "update_file_meta_data_blobs_ref_count"
+
+file_meta_data_blobs_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {DB_PROCEDURE_NAME}() RETURNS TRIGGER AS $$
+DECLARE
+    changes_sql TEXT;
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        changes_sql := 'SELECT object_name, 1 AS sign FROM new_rows';
+    ELSIF (TG_OP = 'DELETE') THEN
+        changes_sql := 'SELECT object_name, -1 AS sign FROM old_rows';
+    ELSE
+        changes_sql := 'SELECT object_name, 1 AS sign FROM new_rows'
+            || ' UNION ALL SELECT object_name, -1 AS sign FROM old_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        UPDATE file_meta_data_blobs AS b
+        SET ref_count = b.ref_count + deltas.delta, modified = now()
+        FROM (
+            SELECT changes.object_name, sum(changes.sign) AS delta
+            FROM (%%s) AS changes
+            GROUP BY changes.object_name
+            HAVING sum(changes.sign) <> 0
+        ) AS deltas
+        WHERE b.object_name = deltas.object_name
+    $sql$, changes_sql);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""  # noqa: S608
+)
+
+
+# ------------------------ TRIGGERS
+file_meta_data_blobs_triggers = sa.DDL(
+    f"""
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_insert on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_insert
+AFTER INSERT ON file_meta_data
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_update on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_update
+AFTER UPDATE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_delete on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_delete
+AFTER DELETE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+"""
+)
+
+sa.event.listen(file_meta_data, "after_create", file_meta_data_blobs_procedure)
+sa.event.listen(file_meta_data, "after_create", file_meta_data_blobs_triggers)
@@ -0,0 +1,223 @@
+"""Materialized directory-tree index of file_meta_data
+
+Every file_meta_data.file_id (e.g. `project_id/node_id/folder/file.txt`) contributes
+one row per path level (`"" -> project_id`, `project_id -> node_id`, ...).
+Each row aggregates the entries below it (count, size, number of S3 objects), so
+listing the children of a path or computing its size is an index lookup instead of
+a scan of all the files a user can read.
+
+The table is maintained by statement-level triggers on file_meta_data.
+"""
+
+from typing import Final
+
+import sqlalchemy as sa
+
+from .base import metadata
+from .file_meta_data import file_meta_data
+
+file_meta_data_paths = sa.Table(
+    "file_meta_data_paths",
+    metadata,
+    sa.Column(
+        "parent_path",
+        sa.String(),
+        nullable=False,
+        doc="path of the parent (empty string for the root level)",
+    ),
+    sa.Column(
+        "child_name",
+        sa.String(),
+        nullable=False,
+        doc="name of this path level (the full path is parent_path/child_name)",
+    ),
+    sa.Column(
+        "project_id",
+        sa.String(),
+        nullable=True,
+        doc="project owning the entries below this path (NULL if not a project path, e.g. api/ or exports/)",
+    ),
+    sa.Column(
+        "num_files",
+        sa.BigInteger(),
+        nullable=False,
+        doc="number of file_meta_data entries at or below this path",
+    ),
+    sa.Column(
+        "total_size",
+        sa.BigInteger(),
+        nullable=False,
+        doc="sum of the (known) sizes of the file_meta_data entries at or below this path",
+    ),
+    sa.Column(
+        "num_objects",
+        sa.BigInteger(),
+        nullable=False,
+        server_default=sa.text("0"),
+        doc="number of S3 objects at or below this path (directory entries count their content)",
+    ),
+    sa.Column(
+        "num_unresolved",
+        sa.BigInteger(),
+        nullable=False,
+        server_default=sa.text("0"),
+        doc="number of entries at or below this path whose size is not known yet (e.g. ongoing uploads)."
+        " When 0, total_size and num_objects are exact",
+    ),
+    sa.Column(
+        "first_file_id",
+        sa.String(),
+        nullable=True,
+        doc="smallest file_id at or below this path, used as representative entry."
+        " If equal to the path, this path is a leaf (a file or a directory entry)",
+    ),
+    sa.PrimaryKeyConstraint("parent_path", "child_name", name="file_meta_data_paths_pk"),
+    sa.Index("ix_file_meta_data_paths_project_id", "project_id"),
+    sa.Index("ix_file_meta_data_paths_first_file_id", "first_file_id"),
+    sa.Index(
+        "ix_file_meta_data_paths_empty",
+        "parent_path",
+        postgresql_where=sa.text("num_files <= 0"),
+    ),
+)
+
+
+# NOTE: contribution of one file_meta_data row to the aggregates of each of its path levels.
+# Shared by the triggers (incremental deltas) and the rebuild of a project (full aggregation)
+_FILE_CONTRIBUTION_COLUMNS: Final[str] = (
+    "file_id, project_id,"
+    " GREATEST(COALESCE(file_size, 0), 0) AS file_size,"
+    " COALESCE(num_objects, CASE WHEN is_directory THEN 0 ELSE 1 END) AS num_objects,"
+    " (upload_id IS NOT NULL OR upload_expires_at IS NOT NULL OR COALESCE(file_size, -1) < 0"
+    " OR (is_directory AND num_objects IS NULL))::int AS unresolved"
+)
+
+# rebuilds the paths of the project bound to :project_id (its previous rows must be deleted first)
+REBUILD_PROJECT_FILE_META_DATA_PATHS_SQL: Final[str] = f"""
+INSERT INTO file_meta_data_paths
+    (parent_path, child_name, project_id, num_files, total_size, num_objects, num_unresolved, first_file_id)
+SELECT
+    array_to_string(split.parts[1:lvl.level - 1], '/'),
+    split.parts[lvl.level],
+    min(contributions.project_id),
+    count(*),
+    sum(contributions.file_size),
+    sum(contributions.num_objects),
+    sum(contributions.unresolved),
+    min(contributions.file_id)
+FROM (SELECT {_FILE_CONTRIBUTION_COLUMNS} FROM file_meta_data WHERE project_id = :project_id) AS contributions,
+    LATERAL string_to_array(contributions.file_id, '/') AS split(parts),
+    LATERAL generate_series(1, cardinality(split.parts)) AS lvl(level)
+GROUP BY 1, 2
+"""  # noqa: S608
+
+
+# ---------------------- PROCEDURES
+DB_PROCEDURE_NAME: str = "update_file_meta_data_paths"
+
+file_meta_data_paths_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {DB_PROCEDURE_NAME}() RETURNS TRIGGER AS $$
+DECLARE
+    changes_columns_sql CONSTANT TEXT := 'SELECT {_FILE_CONTRIBUTION_COLUMNS}, %%s AS sign FROM %%s';
+    changes_sql TEXT;
+    removed_sql TEXT;
+    affected RECORD;
+    affected_path TEXT;
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        changes_sql := format(changes_columns_sql, '1', 'new_rows');
+    ELSIF (TG_OP = 'DELETE') THEN
+        changes_sql := format(changes_columns_sql, '-1', 'old_rows');
+        removed_sql := 'SELECT file_id FROM old_rows';
+    ELSE
+        changes_sql := format(changes_columns_sql, '1', 'new_rows')
+            || ' UNION ALL ' || format(changes_columns_sql, '-1', 'old_rows');
+        removed_sql := 'SELECT file_id FROM old_rows EXCEPT SELECT file_id FROM new_rows';
+    END IF;
+
+    -- 1. apply the count/size deltas to every level of every changed file_id
+    EXECUTE format($sql$
+        INSERT INTO file_meta_data_paths AS p
+            (parent_path, child_name, project_id, num_files, total_size, num_objects, num_unresolved, first_file_id)
+        SELECT
+            array_to_string(split.parts[1:lvl.level - 1], '/'),
+            split.parts[lvl.level],
+            min(changes.project_id),
+            sum(changes.sign),
+            sum(changes.sign * changes.file_size),
+            sum(changes.sign * changes.num_objects),
+            sum(changes.sign * changes.unresolved),
+            min(changes.file_id) FILTER (WHERE changes.sign > 0)
+        FROM (%%s) AS changes,
+            LATERAL string_to_array(changes.file_id, '/') AS split(parts),
+            LATERAL generate_series(1, cardinality(split.parts)) AS lvl(level)
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (parent_path, child_name) DO UPDATE SET
+            project_id = COALESCE(p.project_id, EXCLUDED.project_id),
+            num_files = p.num_files + EXCLUDED.num_files,
+            total_size = p.total_size + EXCLUDED.total_size,
+            num_objects = p.num_objects + EXCLUDED.num_objects,
+            num_unresolved = p.num_unresolved + EXCLUDED.num_unresolved,
+            first_file_id = LEAST(p.first_file_id, EXCLUDED.first_file_id)
+    $sql$, changes_sql);
+
+    IF (TG_OP = 'INSERT') THEN
+        RETURN NULL;
+    END IF;
+
+    -- 2. drop the levels that have no entries anymore
+    DELETE FROM file_meta_data_paths WHERE num_files <= 0;
+
+    -- 3. refresh the representatives that were removed (deepest levels first)
+    FOR affected IN EXECUTE format($sql$
+        SELECT parent_path, child_name FROM file_meta_data_paths
+        WHERE first_file_id IN (%%s)
+        ORDER BY cardinality(string_to_array(parent_path, '/')) DESC
+    $sql$, removed_sql)
+    LOOP
+        affected_path := CASE
+            WHEN affected.parent_path = '' THEN affected.child_name
+            ELSE affected.parent_path || '/' || affected.child_name
+        END;
+        UPDATE file_meta_data_paths SET first_file_id = LEAST(
+            (SELECT min(c.first_file_id) FROM file_meta_data_paths c WHERE c.parent_path = affected_path),
+            (SELECT f.file_id FROM file_meta_data f WHERE f.file_id = affected_path)
+        )
+        WHERE parent_path = affected.parent_path AND child_name = affected.child_name;
+    END LOOP;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""  # noqa: S608
+)
+
+
+# ------------------------ TRIGGERS
+file_meta_data_paths_triggers = sa.DDL(
+    f"""
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_insert on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_insert
+AFTER INSERT ON file_meta_data
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_update on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_update
+AFTER UPDATE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+DROP TRIGGER IF EXISTS {DB_PROCEDURE_NAME}_on_delete on file_meta_data;
+CREATE TRIGGER {DB_PROCEDURE_NAME}_on_delete
+AFTER DELETE ON file_meta_data
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {DB_PROCEDURE_NAME}();
+"""
+)
+
+sa.event.listen(file_meta_data, "after_create", file_meta_data_paths_procedure)
+sa.event.listen(file_meta_data, "after_create", file_meta_data_paths_triggers)
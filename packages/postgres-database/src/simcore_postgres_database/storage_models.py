@@ -6,6 +6,8 @@ the storage service
 
 from .models.base import metadata
 from .models.file_meta_data import file_meta_data
+from .models.file_meta_data_blobs import file_meta_data_blobs
+from .models.file_meta_data_paths import file_meta_data_paths
 from .models.groups import groups, user_to_groups
 from .models.products import products
 from .models.projects import projects
@@ -14,6 +16,8 @@ from .models.users import users
 
 __all__ = [
     "file_meta_data",
+    "file_meta_data_blobs",
+    "file_meta_data_paths",
     "groups",
     "metadata",
     "products",
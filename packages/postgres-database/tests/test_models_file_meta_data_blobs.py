@@ -0,0 +1,78 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import datetime
+from collections.abc import Awaitable, Callable
+
+import sqlalchemy as sa
+from simcore_postgres_database.models.file_meta_data import file_meta_data
+from simcore_postgres_database.models.file_meta_data_blobs import file_meta_data_blobs
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+_BLOB_OBJECT_NAME = "shared/sha256/abcdef"
+
+
+def _fmd(file_id: str, user_id: int, object_name: str) -> dict:
+    now = datetime.datetime.now(tz=datetime.UTC)
+    return {
+        "file_id": file_id,
+        "object_name": object_name,
+        "location_id": "0",
+        "location": "simcore.s3",
+        "bucket_name": "a-bucket",
+        "user_id": user_id,
+        "created_at": now,
+        "last_modified": now,
+        "file_size": 10,
+        "sha256_checksum": "abcdef",
+        "entity_tag": "etag",
+    }
+
+
+async def _get_ref_count(conn: AsyncConnection) -> int:
+    return await conn.scalar(
+        sa.select(file_meta_data_blobs.c.ref_count).where(file_meta_data_blobs.c.sha256_checksum == "abcdef")
+    )
+
+
+async def test_file_meta_data_blobs_ref_count_is_maintained(
+    asyncpg_connection: AsyncConnection,
+    create_fake_user: Callable[..., Awaitable[RowMapping]],
+):
+    user = await create_fake_user(asyncpg_connection)
+    await asyncpg_connection.execute(
+        file_meta_data_blobs.insert().values(sha256_checksum="abcdef", entity_tag="etag", object_name=_BLOB_OBJECT_NAME)
+    )
+    assert await _get_ref_count(asyncpg_connection) == 0
+
+    await asyncpg_connection.execute(
+        file_meta_data.insert().values(
+            [
+                _fmd("api/node/a.txt", user["id"], "api/node/a.txt"),  # the original
+                _fmd("api/node1/a.txt", user["id"], _BLOB_OBJECT_NAME),
+                _fmd("api/node2/a.txt", user["id"], _BLOB_OBJECT_NAME),
+                _fmd("api/node3/a.txt", user["id"], _BLOB_OBJECT_NAME),
+            ]
+        )
+    )
+    assert await _get_ref_count(asyncpg_connection) == 3
+
+    # an entry gets its own object (e.g. it is overwritten)
+    await asyncpg_connection.execute(
+        file_meta_data.update()
+        .where(file_meta_data.c.file_id == "api/node1/a.txt")
+        .values(object_name=file_meta_data.c.file_id)
+    )
+    assert await _get_ref_count(asyncpg_connection) == 2
+
+    # updates not touching the reference do not change the count
+    await asyncpg_connection.execute(file_meta_data.update().values(file_size=20))
+    assert await _get_ref_count(asyncpg_connection) == 2
+
+    await asyncpg_connection.execute(file_meta_data.delete().where(file_meta_data.c.file_id == "api/node2/a.txt"))
+    assert await _get_ref_count(asyncpg_connection) == 1
+
+    await asyncpg_connection.execute(file_meta_data.delete())
+    assert await _get_ref_count(asyncpg_connection) == 0
@@ -0,0 +1,79 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import datetime
+from collections.abc import Awaitable, Callable
+
+import sqlalchemy as sa
+from simcore_postgres_database.models.file_meta_data import file_meta_data
+from simcore_postgres_database.models.file_meta_data_paths import file_meta_data_paths
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+def _fmd(file_id: str, user_id: int, file_size: int) -> dict:
+    now = datetime.datetime.now(tz=datetime.UTC)
+    return {
+        "file_id": file_id,
+        "object_name": file_id,
+        "location_id": "0",
+        "location": "simcore.s3",
+        "bucket_name": "a-bucket",
+        "user_id": user_id,
+        "created_at": now,
+        "last_modified": now,
+        "file_size": file_size,
+    }
+
+
+async def _get_paths(conn: AsyncConnection) -> dict[tuple[str, str], tuple[int, int, str]]:
+    result = await conn.execute(sa.select(file_meta_data_paths))
+    return {
+        (row.parent_path, row.child_name): (row.num_files, row.total_size, row.first_file_id) for row in result.all()
+    }
+
+
+async def test_file_meta_data_paths_are_maintained(
+    asyncpg_connection: AsyncConnection,
+    create_fake_user: Callable[..., Awaitable[RowMapping]],
+):
+    user = await create_fake_user(asyncpg_connection)
+    await asyncpg_connection.execute(
+        file_meta_data.insert().values(
+            [
+                _fmd("api/node/a.txt", user["id"], 10),
+                _fmd("api/node/dir/b.txt", user["id"], 20),
+                _fmd("api/node/dir/c.txt", user["id"], -1),  # pending upload
+            ]
+        )
+    )
+    assert await _get_paths(asyncpg_connection) == {
+        ("", "api"): (3, 30, "api/node/a.txt"),
+        ("api", "node"): (3, 30, "api/node/a.txt"),
+        ("api/node", "a.txt"): (1, 10, "api/node/a.txt"),
+        ("api/node", "dir"): (2, 20, "api/node/dir/b.txt"),
+        ("api/node/dir", "b.txt"): (1, 20, "api/node/dir/b.txt"),
+        ("api/node/dir", "c.txt"): (1, 0, "api/node/dir/c.txt"),
+    }
+
+    # upload completes
+    await asyncpg_connection.execute(
+        file_meta_data.update().where(file_meta_data.c.file_id == "api/node/dir/c.txt").values(file_size=5)
+    )
+    paths = await _get_paths(asyncpg_connection)
+    assert paths[("", "api")] == (3, 35, "api/node/a.txt")
+    assert paths[("api/node", "dir")] == (2, 25, "api/node/dir/b.txt")
+
+    # removing the representative entry refreshes it on every level
+    await asyncpg_connection.execute(file_meta_data.delete().where(file_meta_data.c.file_id == "api/node/a.txt"))
+    assert await _get_paths(asyncpg_connection) == {
+        ("", "api"): (2, 25, "api/node/dir/b.txt"),
+        ("api", "node"): (2, 25, "api/node/dir/b.txt"),
+        ("api/node", "dir"): (2, 25, "api/node/dir/b.txt"),
+        ("api/node/dir", "b.txt"): (1, 20, "api/node/dir/b.txt"),
+        ("api/node/dir", "c.txt"): (1, 5, "api/node/dir/c.txt"),
+    }
+
+    await asyncpg_connection.execute(file_meta_data.delete())
+    assert await _get_paths(asyncpg_connection) == {}
@@ -1,8 +1,10 @@
+import asyncio
 import logging
 from collections.abc import AsyncIterable
 from datetime import UTC, datetime
 from stat import S_IFREG
 
+from common_library.async_tools import cancel_wait_task
 from models_library.bytes_iters import BytesIter, DataSize
 from stream_zip import ZIP_64, AsyncMemberFile, async_stream_zip
 
@@ -16,17 +18,71 @@ type ArchiveFileEntry = tuple[FileNameInArchive, BytesStreamer]
 type ArchiveEntries = list[ArchiveFileEntry]
 
 
+class _BytesStreamerPrefetcher:
+    """reads a BytesStreamer ahead of its consumer, holding at most `max_chunks` chunks in memory"""
+
+    def __init__(self, bytes_streamer: BytesStreamer, *, max_chunks: int) -> None:
+        self._queue: asyncio.Queue[bytes | Exception | None] = asyncio.Queue(maxsize=max_chunks)
+        self._bytes_streamer = bytes_streamer
+        self._task = asyncio.create_task(self._prefetch(), name=f"{__name__}.prefetch")
+
+    async def _prefetch(self) -> None:
+        try:
+            async for chunk in self._bytes_streamer.bytes_iter_callable():
+                await self._queue.put(chunk)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # NOTE: raised to the consumer once it reaches this point of the stream
+            await self._queue.put(exc)
+            return
+        await self._queue.put(None)
+
+    async def _bytes_iter(self) -> BytesIter:
+        while (item := await self._queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def get_bytes_streamer(self) -> BytesStreamer:
+        return BytesStreamer(self._bytes_streamer.data_size, self._bytes_iter)
+
+    async def cancel(self) -> None:
+        await cancel_wait_task(self._task)
+
+
 async def _member_files_iter(
-    archive_entries: ArchiveEntries, progress_bar: ProgressBarData
+    archive_entries: ArchiveEntries,
+    progress_bar: ProgressBarData,
+    *,
+    prefetch_members: int,
+    prefetch_max_chunks: int,
 ) -> AsyncIterable[AsyncMemberFile]:
-    for file_name, byte_streamer in archive_entries:
-        yield (
-            file_name,
-            datetime.now(UTC),
-            S_IFREG | 0o600,
-            ZIP_64,
-            byte_streamer.with_progress_bytes_iter(progress_bar=progress_bar),
-        )
+    # NOTE: the `prefetch_members` entries following the one being archived are already read from
+    # their source, this hides the time to first byte of each source (e.g. an S3 request).
+    # Memory stays bounded by (prefetch_members + 1) * prefetch_max_chunks chunks.
+    prefetchers: dict[int, _BytesStreamerPrefetcher] = {}
+    try:
+        for index, (file_name, byte_streamer) in enumerate(archive_entries):
+            if prefetch_members > 0:
+                for next_index in range(index, min(index + prefetch_members + 1, len(archive_entries))):
+                    if next_index not in prefetchers:
+                        prefetchers[next_index] = _BytesStreamerPrefetcher(
+                            archive_entries[next_index][1], max_chunks=prefetch_max_chunks
+                        )
+                # NOTE: the previous entries were fully consumed by the archive
+                for done_index in [i for i in prefetchers if i < index]:
+                    await prefetchers.pop(done_index).cancel()
+                byte_streamer = prefetchers[index].get_bytes_streamer()  # noqa: PLW2901
+
+            yield (
+                file_name,
+                datetime.now(UTC),
+                S_IFREG | 0o600,
+                ZIP_64,
+                byte_streamer.with_progress_bytes_iter(progress_bar=progress_bar),
+            )
+    finally:
+        for prefetcher in prefetchers.values():
+            await prefetcher.cancel()
 
 
 async def get_zip_bytes_iter(
@@ -34,7 +90,14 @@ async def get_zip_bytes_iter(
     *,
     progress_bar: ProgressBarData | None = None,
     chunk_size: int,
+    prefetch_members: int = 0,
+    prefetch_max_chunks: int = 1,
 ) -> BytesIter:
+    """
+    Keyword Arguments:
+        prefetch_members -- number of entries read ahead of the one being archived (0 disables prefetching)
+        prefetch_max_chunks -- maximum number of chunks buffered per prefetched entry
+    """
     # NOTE: this is CPU bound task, even though the loop is not blocked,
     # the CPU is still used for compressing the content.
     if progress_bar is None:
@@ -48,5 +111,13 @@ async def get_zip_bytes_iter(
     ) as sub_progress:
         # NOTE: do not disable compression or the streams will be
         # loaded fully in memory before yielding their content
-        async for chunk in async_stream_zip(_member_files_iter(archive_entries, sub_progress), chunk_size=chunk_size):
+        async for chunk in async_stream_zip(
+            _member_files_iter(
+                archive_entries,
+                sub_progress,
+                prefetch_members=prefetch_members,
+                prefetch_max_chunks=prefetch_max_chunks,
+            ),
+            chunk_size=chunk_size,
+        ):
             yield chunk
@@ -7,7 +7,14 @@ from fastapi_lifespan_manager import LifespanManager, State
 from settings_library.rabbit import RabbitSettings
 
 from ..logging_utils import log_catch
-from ..rabbitmq import RabbitMQClient, RabbitMQRPCClient, wait_till_rabbitmq_responsive
+from ..prometheus_metrics import PrometheusMetrics
+from ..rabbitmq import (
+    RabbitMQClient,
+    RabbitMQRPCClient,
+    RPCSerializationMetrics,
+    get_rpc_serialization_metrics,
+    wait_till_rabbitmq_responsive,
+)
 from .lifespan_utils import (
     PublisherLifespan,
     create_publisher_lifespan,
@@ -22,6 +29,14 @@ class _RabbitMQLifespanState(StrEnum):
     RABBITMQ_RPC_CLIENT = "rabbitmq.rpc_client"
 
 
+def get_rabbitmq_rpc_client_metrics(app: FastAPI) -> RPCSerializationMetrics | None:
+    """the RPC clients are instrumented when the application exposes prometheus metrics"""
+    prometheus_metrics: PrometheusMetrics | None = getattr(app.state, "prometheus_metrics", None)
+    if prometheus_metrics is None:
+        return None
+    return get_rpc_serialization_metrics(prometheus_metrics.registry)
+
+
 def _create_rabbitmq_client_lifespan(
     settings: RabbitSettings | None,
     *,
@@ -61,7 +76,7 @@ def _create_rabbitmq_rpc_client_lifespan(
     client_name: str,
     wait_for_connectivity: bool,
 ) -> PublisherLifespan:
-    async def _lifespan(_: FastAPI, state: State) -> AsyncIterator[State]:
+    async def _lifespan(app: FastAPI, state: State) -> AsyncIterator[State]:
         _lifespan_name = f"{__name__}._rabbitmq_rpc_client_lifespan[{client_name}]"
 
         with lifespan_context(_logger, logging.INFO, _lifespan_name, state) as called_state:
@@ -75,7 +90,9 @@ def _create_rabbitmq_rpc_client_lifespan(
             if wait_for_connectivity:
                 await wait_till_rabbitmq_responsive(settings.dsn)
 
-            rabbitmq_rpc_client = await RabbitMQRPCClient.create(client_name=client_name, settings=settings)
+            rabbitmq_rpc_client = await RabbitMQRPCClient.create(
+                client_name=client_name, settings=settings, metrics=get_rabbitmq_rpc_client_metrics(app)
+            )
             try:
                 yield {
                     _RabbitMQLifespanState.RABBITMQ_RPC_CLIENT: rabbitmq_rpc_client,
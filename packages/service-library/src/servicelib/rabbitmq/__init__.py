@@ -7,10 +7,18 @@ from ._errors import (
     RemoteMethodNotRegisteredError,
     RPCInterfaceError,
     RPCNotInitializedError,
+    RPCSerializationError,
     RPCServerError,
 )
 from ._models import ConsumerTag, ExchangeName, QueueName
 from ._rpc_router import RPCRouter
+from ._rpc_serialization import (
+    JsonRPCSerializer,
+    PickleRPCSerializer,
+    RPCSerializationMetrics,
+    RPCSerializer,
+    get_rpc_serialization_metrics,
+)
 from ._utils import is_rabbitmq_responsive, wait_till_rabbitmq_responsive
 
 __all__: tuple[str, ...] = (
@@ -18,15 +26,21 @@ __all__: tuple[str, ...] = (
     "RPC_REQUEST_DEFAULT_TIMEOUT_S",
     "ConsumerTag",
     "ExchangeName",
+    "JsonRPCSerializer",
+    "PickleRPCSerializer",
     "QueueName",
     "RPCInterfaceError",
     "RPCNamespace",
     "RPCNotInitializedError",
     "RPCRouter",
+    "RPCSerializationError",
+    "RPCSerializationMetrics",
+    "RPCSerializer",
     "RPCServerError",
     "RabbitMQClient",
     "RabbitMQRPCClient",
     "RemoteMethodNotRegisteredError",
+    "get_rpc_serialization_metrics",
     "is_rabbitmq_responsive",
     "rabbitmq_rpc_client_context",
     "wait_till_rabbitmq_responsive",
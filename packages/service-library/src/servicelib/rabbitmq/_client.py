@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import weakref
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from functools import partial
 from typing import Annotated, Final
@@ -32,6 +34,7 @@ _logger = logging.getLogger(__name__)
 
 _DEFAULT_PREFETCH_VALUE: Final[int] = 10
 _DEFAULT_RABBITMQ_EXECUTION_TIMEOUT_S: Final[int] = 5
+_MAX_UNCONFIRMED_PUBLISHES: Final[int] = 100
 _HEADER_X_DEATH: Final[str] = "x-death"
 
 _DEFAULT_UNEXPECTED_ERROR_RETRY_DELAY_S: Final[float] = 1
@@ -41,6 +44,10 @@ _DELAYED_EXCHANGE_NAME: Final[ExchangeName] = ExchangeName("delayed_{exchange_na
 _DELAYED_QUEUE_NAME: Final[ExchangeName] = ExchangeName("delayed_{queue_name}")
 
 
+def _get_exchange_type(topic: str | None) -> aio_pika.ExchangeType:
+    return aio_pika.ExchangeType.FANOUT if topic is None else aio_pika.ExchangeType.TOPIC
+
+
 def _get_x_death_count(message: aio_pika.abc.AbstractIncomingMessage) -> int:
     count: int = 0
     if (x_death := message.headers.get(_HEADER_X_DEATH, [])) and (
@@ -146,6 +153,11 @@ async def _on_message(
 class RabbitMQClient(RabbitMQClientBase):
     _connection_pool: aio_pika.pool.Pool | None = field(init=False, default=None)
     _channel_pool: aio_pika.pool.Pool | None = field(init=False, default=None)
+    # NOTE: declaring an exchange is a round-trip to the broker, the exchanges used for publishing are
+    # declared once per channel (robust channels re-declare them when reconnecting)
+    _published_exchanges: weakref.WeakKeyDictionary[
+        aio_pika.abc.AbstractChannel, dict[tuple[ExchangeName, aio_pika.ExchangeType], aio_pika.abc.AbstractExchange]
+    ] = field(init=False, default_factory=weakref.WeakKeyDictionary)
 
     def __post_init__(self) -> None:
         # recommendations are 1 connection per process
@@ -364,6 +376,24 @@ class RabbitMQClient(RabbitMQClientBase):
             # NOTE: we force delete here
             await queue.delete(if_unused=False, if_empty=False)
 
+    async def _get_published_exchange(
+        self,
+        channel: aio_pika.abc.AbstractChannel,
+        exchange_name: ExchangeName,
+        exchange_type: aio_pika.ExchangeType,
+    ) -> aio_pika.abc.AbstractExchange:
+        channel_exchanges = self._published_exchanges.setdefault(channel, {})
+        exchange = channel_exchanges.get((exchange_name, exchange_type))
+        if exchange is None:
+            exchange = await channel.declare_exchange(
+                exchange_name,
+                exchange_type,
+                durable=True,
+                timeout=_DEFAULT_RABBITMQ_EXECUTION_TIMEOUT_S,
+            )
+            channel_exchanges[(exchange_name, exchange_type)] = exchange
+        return exchange
+
     async def publish(self, exchange_name: ExchangeName, message: RabbitMessage) -> None:
         """publish message in the exchange exchange_name.
         specifying a topic will use a TOPIC type of RabbitMQ Exchange instead of FANOUT
@@ -374,16 +404,49 @@ class RabbitMQClient(RabbitMQClientBase):
         topic = message.routing_key()
 
         async with self._channel_pool.acquire() as channel:
-            exchange = await channel.declare_exchange(
-                exchange_name,
-                (aio_pika.ExchangeType.FANOUT if topic is None else aio_pika.ExchangeType.TOPIC),
-                durable=True,
-                timeout=_DEFAULT_RABBITMQ_EXECUTION_TIMEOUT_S,
-            )
-            await exchange.publish(
-                aio_pika.Message(message.body()),
-                routing_key=message.routing_key() or "",
-            )
+            exchange = await self._get_published_exchange(channel, exchange_name, _get_exchange_type(topic))
+            await exchange.publish(aio_pika.Message(message.body()), routing_key=topic or "")
+
+    async def publish_many(self, exchange_name: ExchangeName, messages: Sequence[RabbitMessage]) -> None:
+        """publish messages in the exchange exchange_name, in order, on a single channel.
+
+        The messages are pipelined: up to _MAX_UNCONFIRMED_PUBLISHES messages are sent before waiting for
+        the broker to confirm them. Returns once all the messages are confirmed, so that a caller producing
+        messages faster than the broker accepts them is slowed down (backpressure).
+
+        NOTE: changing the type of Exchange will create issues if the name is not changed!
+        """
+        assert self._channel_pool  # nosec
+        topics = [message.routing_key() for message in messages]
+
+        async with self._channel_pool.acquire() as channel:
+            exchanges = {
+                exchange_type: await self._get_published_exchange(channel, exchange_name, exchange_type)
+                for exchange_type in {_get_exchange_type(topic) for topic in topics}
+            }
+            for index in range(0, len(messages), _MAX_UNCONFIRMED_PUBLISHES):
+                await asyncio.gather(
+                    *(
+                        exchanges[_get_exchange_type(topic)].publish(
+                            aio_pika.Message(message.body()), routing_key=topic or ""
+                        )
+                        for message, topic in zip(
+                            messages[index : index + _MAX_UNCONFIRMED_PUBLISHES],
+                            topics[index : index + _MAX_UNCONFIRMED_PUBLISHES],
+                            strict=True,
+                        )
+                    )
+                )
+
+    async def get_queue_message_count(self, queue_name: QueueName) -> NonNegativeInt:
+        """returns the number of messages waiting in the queue (messages delivered to a consumer
+        but not yet acknowledged are not counted)
+        """
+        assert self._channel_pool  # nosec
+        async with self._channel_pool.acquire() as channel:
+            queue = await channel.get_queue(queue_name)
+            assert queue.declaration_result  # nosec
+            return queue.declaration_result.message_count or 0
 
     async def unsubscribe_consumer(self, queue_name: QueueName, consumer_tag: ConsumerTag) -> None:
         """This will only remove the consumers without deleting the queue"""
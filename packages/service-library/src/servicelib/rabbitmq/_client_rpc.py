@@ -17,7 +17,20 @@ from ._client_base import RabbitMQClientBase
 from ._constants import RPC_REQUEST_DEFAULT_TIMEOUT_S
 from ._errors import RemoteMethodNotRegisteredError, RPCNotInitializedError
 from ._models import RPCNamespacedMethodName
+from ._rpc_cache import (
+    RPC_CACHE_INVALIDATION_EXCHANGE_NAME,
+    RPCCacheInvalidationMessage,
+    RPCResultCache,
+    get_rpc_cache_key,
+)
 from ._rpc_router import RPCRouter
+from ._rpc_serialization import (
+    JsonRPCSerializer,
+    PickleRPCSerializer,
+    RPCSerializationMetrics,
+    RPCSerializer,
+    SerializingRPC,
+)
 from ._utils import (
     RabbitMQRetryPolicyUponInitialization,
     get_rabbitmq_client_unique_name,
@@ -31,12 +44,23 @@ class RabbitMQRPCClient(RabbitMQClientBase):
     _connection: aio_pika.abc.AbstractRobustConnection | None = None
     _channel: aio_pika.abc.AbstractChannel | None = None
     _rpc: aio_pika.patterns.RPC | None = None
+    # NOTE: used for the calls of this client (json if RABBIT_RPC_JSON_SERIALIZER), the calls of other clients
+    # are replied with their serializer
+    serializer: RPCSerializer = field(default_factory=PickleRPCSerializer)
+    metrics: RPCSerializationMetrics | None = None
     _registered_handlers: dict[RPCNamespacedMethodName, Callable[..., Any]] = field(default_factory=dict)
+    # NOTE: results of the cached handlers of this client (server side) and of its cached requests (client side)
+    _handler_caches: dict[RPCNamespacedMethodName, RPCResultCache] = field(default_factory=dict)
+    _request_caches: dict[RPCNamespacedMethodName, RPCResultCache] = field(default_factory=dict)
+    _cache_invalidation_exchange: aio_pika.abc.AbstractExchange | None = None
+    _cache_invalidation_queue: aio_pika.abc.AbstractQueue | None = None
 
     _surface_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
     @classmethod
     async def create(cls, *, client_name: str, settings: RabbitSettings, **kwargs) -> "RabbitMQRPCClient":
+        if settings.RABBIT_RPC_JSON_SERIALIZER:
+            kwargs.setdefault("serializer", JsonRPCSerializer())
         client = cls(client_name=client_name, settings=settings, **kwargs)
         await client._rpc_initialize()
         return client
@@ -65,7 +89,7 @@ class RabbitMQRPCClient(RabbitMQClientBase):
         self._channel = await self._connection.channel()
         self._channel.close_callbacks.add(self._channel_close_callback)
 
-        self._rpc = aio_pika.patterns.RPC(self._channel)
+        self._rpc = SerializingRPC(self._channel, serializer=self.serializer, metrics=self.metrics)
         # rely on default queue configuration that should be reasonable
         # if overriding parameters, make sure their combination makes sense
         # See https://github.com/ITISFoundation/osparc-simcore/pull/8573 for more details
@@ -76,6 +100,9 @@ class RabbitMQRPCClient(RabbitMQClientBase):
         # detach references first so a partial/failed close cannot leave stale objects behind
         rpc, self._rpc = self._rpc, None
         channel, self._channel = self._channel, None
+        # NOTE: the exclusive queue is deleted with its channel
+        self._cache_invalidation_exchange = None
+        self._cache_invalidation_queue = None
         try:
             if rpc is not None:
                 await rpc.close()
@@ -103,6 +130,11 @@ class RabbitMQRPCClient(RabbitMQClientBase):
         ):
             for namespaced_method_name, handler in handlers:
                 await self._rpc.register(namespaced_method_name, handler, auto_delete=True)
+        if caches := (*self._handler_caches.values(), *self._request_caches.values()):
+            # NOTE: the invalidations broadcast while disconnected were missed
+            for cache in caches:
+                cache.invalidate()
+            await self._subscribe_to_cache_invalidations()
 
     async def _on_reconnect(self, _connection: aio_pika.abc.AbstractRobustConnection | None = None) -> None:
         with log_context(
@@ -179,6 +211,87 @@ class RabbitMQRPCClient(RabbitMQClientBase):
             )
             raise
 
+    async def cached_request(
+        self,
+        namespace: RPCNamespace,
+        method_name: RPCMethodName,
+        *,
+        cache_ttl_s: float,
+        timeout_s: PositiveInt | None = RPC_REQUEST_DEFAULT_TIMEOUT_S,
+        **kwargs,
+    ) -> Any:
+        """
+        Same as `request` but ONLY for read-only remote methods: identical concurrent requests
+        are sent once and their result is reused for `cache_ttl_s` seconds (set by the first call of
+        the method) or until `invalidate_cached_results`.
+
+        NOTE: the same result object is returned to all the callers, it must not be modified
+        """
+        namespaced_method_name = RPCNamespacedMethodName.from_namespace_and_method(namespace, method_name)
+        cache = self._request_caches.get(namespaced_method_name)
+        if cache is None:
+            cache = self._request_caches[namespaced_method_name] = RPCResultCache(ttl_s=cache_ttl_s)
+        await self._ensure_subscribed_to_cache_invalidations()
+        return await cache.get_or_call(
+            get_rpc_cache_key(kwargs),
+            functools.partial(self.request, namespace, method_name, timeout_s=timeout_s, **kwargs),
+        )
+
+    async def invalidate_cached_results(
+        self,
+        namespace: RPCNamespace,
+        method_name: RPCMethodName,
+        **kwargs,
+    ) -> None:
+        """
+        Invalidates the cached results of `method_name` called with `kwargs` (all of its results
+        if no `kwargs`) in this client and, via a fanout exchange, in all the other RPC clients
+        (i.e. both the cached handlers and the cached requests)
+        """
+        invalidation = RPCCacheInvalidationMessage(
+            namespaced_method_name=RPCNamespacedMethodName.from_namespace_and_method(namespace, method_name),
+            cache_key=get_rpc_cache_key(kwargs) if kwargs else None,
+        )
+        # NOTE: the local caches are invalidated before returning, the others shortly after
+        self._invalidate_cached_results(invalidation)
+        exchange = await self._get_cache_invalidation_exchange()
+        await exchange.publish(aio_pika.Message(invalidation.body()), routing_key="")
+
+    def _invalidate_cached_results(self, invalidation: RPCCacheInvalidationMessage) -> None:
+        for caches in (self._handler_caches, self._request_caches):
+            if cache := caches.get(invalidation.namespaced_method_name):
+                cache.invalidate(invalidation.cache_key)
+
+    async def _on_cache_invalidation(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        self._invalidate_cached_results(RPCCacheInvalidationMessage.model_validate_json(message.body))
+
+    async def _get_cache_invalidation_exchange(self) -> aio_pika.abc.AbstractExchange:
+        if self._cache_invalidation_exchange is None:
+            if self._channel is None:
+                raise RPCNotInitializedError
+            self._cache_invalidation_exchange = await self._channel.declare_exchange(
+                RPC_CACHE_INVALIDATION_EXCHANGE_NAME, aio_pika.ExchangeType.FANOUT, durable=True
+            )
+        return self._cache_invalidation_exchange
+
+    async def _subscribe_to_cache_invalidations(self) -> None:
+        assert self._channel is not None  # nosec
+        exchange = await self._get_cache_invalidation_exchange()
+        # NOTE: server-named queue, deleted with the channel
+        queue = await self._channel.declare_queue(exclusive=True, auto_delete=True)
+        await queue.bind(exchange)
+        await queue.consume(self._on_cache_invalidation, no_ack=True)
+        self._cache_invalidation_queue = queue
+
+    async def _ensure_subscribed_to_cache_invalidations(self) -> None:
+        if self._cache_invalidation_queue is not None:
+            return
+        async with self._surface_lock:
+            if self._cache_invalidation_queue is None:
+                if self._channel is None:
+                    raise RPCNotInitializedError
+                await self._subscribe_to_cache_invalidations()
+
     async def register_handler(
         self,
         namespace: RPCNamespace,
@@ -212,11 +325,29 @@ class RabbitMQRPCClient(RabbitMQClientBase):
         **handler_kwargs,
     ) -> None:
         for rpc_method_name, handler in router.routes.items():
-            await self.register_handler(
-                namespace,
-                rpc_method_name,
-                functools.partial(handler, *handler_args, **handler_kwargs),
-            )
+            bound_handler: Callable[..., Any] = functools.partial(handler, *handler_args, **handler_kwargs)
+            if (cache_ttl_s := router.cached_routes.get(rpc_method_name)) is not None:
+                bound_handler = self._create_cached_handler(
+                    RPCNamespacedMethodName.from_namespace_and_method(namespace, rpc_method_name),
+                    bound_handler,
+                    cache_ttl_s,
+                )
+            await self.register_handler(namespace, rpc_method_name, bound_handler)
+        if any(rpc_method_name in router.cached_routes for rpc_method_name in router.routes):
+            await self._ensure_subscribed_to_cache_invalidations()
+
+    def _create_cached_handler(
+        self,
+        namespaced_method_name: RPCNamespacedMethodName,
+        handler: Callable[..., Any],
+        cache_ttl_s: float,
+    ) -> Callable[..., Any]:
+        cache = self._handler_caches[namespaced_method_name] = RPCResultCache(ttl_s=cache_ttl_s)
+
+        async def _cached_handler(**kwargs) -> Any:
+            return await cache.get_or_call(get_rpc_cache_key(kwargs), functools.partial(handler, **kwargs))
+
+        return _cached_handler
 
     async def unregister_handler(self, handler: Callable[..., Any]) -> None:
         """Unbind a locally added `handler`"""
@@ -21,6 +21,11 @@ class RemoteMethodNotRegisteredError(BaseRPCError):
     )
 
 
+class RPCSerializationError(BaseRPCError):
+    code = f"{_ERROR_PREFIX}.serialization"  # type: ignore[assignment]
+    msg_template = "Could not (de)serialize the RPC message: {msg}"
+
+
 class RPCServerError(BaseRPCError):
     msg_template = (
         "While running method '{method_name}' raised '{exc_type}' [{error_code}]: '{exc_message}'\n{traceback}"
@@ -0,0 +1,109 @@
+"""Coalescing and caching of the results of idempotent RPC methods
+
+Identical calls (same method and keyword arguments) that arrive while one is already in flight wait
+for its result instead of running again, and successful results are reused for `ttl_s` seconds.
+Errors are shared with the calls that were waiting but never cached.
+
+The results are invalidated explicitly with `RabbitMQRPCClient.invalidate_cached_results`, which
+is broadcast to all the RPC clients via a fanout exchange (i.e. to all the replicas of a service).
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+from common_library.json_serialization import json_dumps
+from pydantic import BaseModel, PositiveFloat, PositiveInt
+
+from ._models import ExchangeName, RPCNamespacedMethodName
+
+RPC_CACHE_INVALIDATION_EXCHANGE_NAME: Final[ExchangeName] = "rpc-cache-invalidation"
+_DEFAULT_MAX_CACHED_RESULTS: Final[PositiveInt] = 1024
+
+
+def get_rpc_cache_key(kwargs: dict[str, Any]) -> str:
+    return json_dumps(kwargs, sort_keys=True)
+
+
+class RPCCacheInvalidationMessage(BaseModel):
+    namespaced_method_name: RPCNamespacedMethodName
+    cache_key: str | None = None  # None invalidates all the results of the method
+
+    def body(self) -> bytes:
+        return self.model_dump_json().encode()
+
+    def routing_key(self) -> str | None:
+        return None
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # NOTE: all the callers waiting for this task might have been cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+@dataclass
+class RPCResultCache:
+    ttl_s: PositiveFloat
+    max_size: PositiveInt = _DEFAULT_MAX_CACHED_RESULTS
+    # NOTE: with a constant ttl, the insertion order is also the expiration order
+    _results: dict[str, tuple[float, Any]] = field(default_factory=dict)
+    _in_flight: dict[str, asyncio.Task] = field(default_factory=dict)
+    _generation: int = 0
+
+    async def get_or_call(self, cache_key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """returns the cached result of `cache_key` or the result of `func()`, which is
+        awaited only once for all the concurrent callers with the same `cache_key`
+
+        NOTE: the same result object is returned to all these callers, it must not be modified
+        """
+        if (cached := self._results.get(cache_key)) is not None:
+            expires_at, result = cached
+            if expires_at > time.monotonic():
+                return result
+            del self._results[cache_key]
+
+        task = self._in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._call(cache_key, func), name=f"rpc_cache_call_{cache_key}")
+            task.add_done_callback(_retrieve_exception)
+            self._in_flight[cache_key] = task
+        # NOTE: a cancelled caller does not cancel the call the other callers are waiting for
+        return await asyncio.shield(task)
+
+    async def _call(self, cache_key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        try:
+            result = await func()
+        finally:
+            if self._in_flight.get(cache_key) is asyncio.current_task():
+                del self._in_flight[cache_key]
+
+        if generation == self._generation:
+            # an invalidation during the call means the result might already be outdated
+            self._results[cache_key] = (time.monotonic() + self.ttl_s, result)
+            self._evict()
+        return result
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._results:
+            oldest_key = next(iter(self._results))
+            expires_at, _ = self._results[oldest_key]
+            if expires_at > now and len(self._results) <= self.max_size:
+                break
+            del self._results[oldest_key]
+
+    def invalidate(self, cache_key: str | None = None) -> None:
+        """drops the cached result of `cache_key` (or all of them if None). The calls in flight
+        complete but their results are neither cached nor shared with the next callers
+        """
+        self._generation += 1
+        if cache_key is None:
+            self._results.clear()
+            self._in_flight.clear()
+        else:
+            self._results.pop(cache_key, None)
+            self._in_flight.pop(cache_key, None)
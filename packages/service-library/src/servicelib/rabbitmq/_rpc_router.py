@@ -39,12 +39,20 @@ def _create_func_msg(func, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str
 @dataclass
 class RPCRouter:
     routes: dict[RPCMethodName, Callable] = field(default_factory=dict)
+    # NOTE: time-to-live of the results of the methods exposed with `cache_ttl_s`
+    cached_routes: dict[RPCMethodName, float] = field(default_factory=dict)
 
     def expose(
         self,
         *,
         reraise_if_error_type: tuple[type[Exception], ...] | None = None,
+        cache_ttl_s: float | None = None,
     ) -> Callable[[DecoratedCallable], DecoratedCallable]:
+        """
+        `cache_ttl_s` is ONLY for read-only methods: identical concurrent calls are coalesced and the
+        results are reused for `cache_ttl_s` seconds or until `RabbitMQRPCClient.invalidate_cached_results`
+        """
+
         def _decorator(func: DecoratedCallable) -> DecoratedCallable:
             @functools.wraps(func)
             async def _wrapper(*args, **kwargs):
@@ -91,6 +99,8 @@ class RPCRouter:
                         ) from None
 
             self.routes[RPCMethodName(func.__name__)] = _wrapper
+            if cache_ttl_s is not None:
+                self.cached_routes[RPCMethodName(func.__name__)] = cache_ttl_s
             return func
 
         return _decorator
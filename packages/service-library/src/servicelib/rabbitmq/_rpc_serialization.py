@@ -0,0 +1,356 @@
+"""Serialization of the RPC calls, results and errors
+
+The content type of an RPC message tells how its body is encoded. The RPC servers decode all the
+content types below and reply with the content type of the call, so that the clients can change
+their serializer independently of the servers they call.
+
+- pickle: any python object, but both sides must have the exact same definition of the classes
+- json (v1): orjson of a tree where pydantic models are dumped in json mode and validated again
+  on the receiving side (tolerant to fields added with defaults or removed). The values that cannot
+  be represented (e.g. secrets, arbitrary classes) are sent with pickle instead
+"""
+
+import contextvars
+import datetime
+import functools
+import importlib
+import math
+import pickle
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, ClassVar, Final
+from uuid import UUID
+
+import aio_pika
+import orjson
+from aio_pika.abc import AbstractIncomingMessage
+from aio_pika.patterns.rpc import RPCMessageType
+from common_library.errors_classes import OsparcErrorMixin
+from prometheus_client import CollectorRegistry, Histogram
+from pydantic import BaseModel
+
+from ..instrumentation import MetricsBase
+from ._errors import RPCSerializationError
+
+_TAG: Final[str] = "__rpc__"
+
+_BUCKETS_SIZE_BYTES: Final[tuple[float, ...]] = tuple(2**exponent for exponent in range(8, 28, 2))
+_BUCKETS_TIME_S: Final[tuple[float, ...]] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1)
+_METRICS_NAMESPACE: Final[str] = "simcore"
+_METRICS_SUBSYSTEM: Final[str] = "rabbitmq_rpc"
+
+
+class _UnsupportedValueError(TypeError): ...
+
+
+class RPCSerializer(ABC):
+    content_type: ClassVar[str]
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes: ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any: ...
+
+
+class PickleRPCSerializer(RPCSerializer):
+    content_type: ClassVar[str] = aio_pika.patterns.RPC.CONTENT_TYPE
+
+    def dumps(self, data: Any) -> bytes:
+        return pickle.dumps(data)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)  # noqa: S301
+
+
+def _get_type_ref(cls: type) -> str:
+    if "<" in cls.__qualname__ or "[" in cls.__qualname__:
+        # locally defined or parametrized classes cannot be imported by the receiver
+        raise _UnsupportedValueError(cls)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+@functools.cache
+def _import_type(type_ref: str, base: type) -> type:
+    module_name, _, qualname = type_ref.partition(":")
+    imported: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        imported = getattr(imported, name)
+    if not (isinstance(imported, type) and issubclass(imported, base)):
+        msg = f"{type_ref} is not a {base}"
+        raise RPCSerializationError(msg=msg)
+    return imported
+
+
+def _get_model_type_ref(cls: type[BaseModel]) -> str | dict[str, Any]:
+    generic_metadata = cls.__pydantic_generic_metadata__
+    if generic_metadata["origin"] is None:
+        return _get_type_ref(cls)
+    # NOTE: a parametrized generic model is rebuilt from its origin and its arguments
+    for arg in generic_metadata["args"]:
+        if not isinstance(arg, type):
+            raise _UnsupportedValueError(arg)
+    return {
+        "origin": _get_model_type_ref(generic_metadata["origin"]),
+        "args": [
+            _get_model_type_ref(arg) if issubclass(arg, BaseModel) else _get_type_ref(arg)
+            for arg in generic_metadata["args"]
+        ],
+    }
+
+
+def _import_model_type(type_ref: str | dict[str, Any]) -> type[BaseModel]:
+    if isinstance(type_ref, str):
+        return _import_type(type_ref, BaseModel)
+    args = tuple(
+        _import_model_type(arg) if isinstance(arg, dict) else _import_type(arg, object) for arg in type_ref["args"]
+    )
+    return _import_model_type(type_ref["origin"])[args]  # type: ignore[index]
+
+
+@functools.cache
+def _can_dump_model_in_json_mode(cls: type[BaseModel]) -> bool:
+    try:
+        json_schema = orjson.dumps(cls.model_json_schema(mode="serialization"))
+    except Exception:  # pylint: disable=broad-exception-caught
+        return False
+    # NOTE: secrets are masked when dumped
+    return b'"format":"password"' not in json_schema
+
+
+def _encode_dict(value: dict) -> dict[str, Any]:
+    if _TAG not in value and all(isinstance(key, str) for key in value):
+        return {key: _encode(item) for key, item in value.items()}
+    return {_TAG: "dict", "items": [[_encode(key), _encode(item)] for key, item in value.items()]}
+
+
+def _encode_model(value: BaseModel) -> dict[str, Any]:
+    if not _can_dump_model_in_json_mode(type(value)):
+        raise _UnsupportedValueError(type(value))
+    return {
+        _TAG: "model",
+        "cls": _get_model_type_ref(type(value)),
+        "data": value.model_dump(mode="json", by_alias=True),
+    }
+
+
+def _encode(value: Any) -> Any:  # noqa: PLR0911 # pylint: disable=too-many-return-statements
+    if isinstance(value, Enum):
+        return {_TAG: "enum", "cls": _get_type_ref(type(value)), "value": _encode(value.value)}
+    if isinstance(value, float) and not math.isfinite(value):
+        # NOTE: json has no representation for nan/inf
+        raise _UnsupportedValueError(value)
+    if value is None or isinstance(value, str | int | float):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return _encode_dict(value)
+    if isinstance(value, BaseModel):
+        return _encode_model(value)
+    if isinstance(value, OsparcErrorMixin):
+        return {_TAG: "error", "cls": _get_type_ref(type(value)), "ctx": _encode(value.error_context())}
+    if (encoder := _ENCODERS_BY_TYPE.get(type(value))) is not None:
+        return encoder(value)
+    if isinstance(value, PurePath):
+        return {_TAG: "path", "cls": _get_type_ref(type(value)), "value": f"{value}"}
+    raise _UnsupportedValueError(type(value))
+
+
+_ENCODERS_BY_TYPE: Final[dict[type, Callable[[Any], Any]]] = {
+    tuple: lambda value: {_TAG: "tuple", "items": [_encode(item) for item in value]},
+    set: lambda value: {_TAG: "set", "items": [_encode(item) for item in value]},
+    frozenset: lambda value: {_TAG: "frozenset", "items": [_encode(item) for item in value]},
+    bytes: lambda value: {_TAG: "bytes", "value": value.hex()},
+    datetime.datetime: lambda value: {_TAG: "datetime", "value": value.isoformat()},
+    datetime.date: lambda value: {_TAG: "date", "value": value.isoformat()},
+    datetime.time: lambda value: {_TAG: "time", "value": value.isoformat()},
+    datetime.timedelta: lambda value: {_TAG: "timedelta", "value": value.total_seconds()},
+    Decimal: lambda value: {_TAG: "decimal", "value": f"{value}"},
+    UUID: lambda value: {_TAG: "uuid", "value": f"{value}"},
+}
+
+
+def _decode_error(encoded: dict[str, Any]) -> OsparcErrorMixin:
+    cls = _import_type(encoded["cls"], OsparcErrorMixin)
+    # NOTE: restored as pickle does (see OsparcErrorMixin.__reduce__)
+    error: OsparcErrorMixin = cls.__new__(cls)
+    error.__dict__.update(_decode(encoded["ctx"]))
+    return error
+
+
+_DECODERS_BY_TAG: Final[dict[str, Callable[[dict[str, Any]], Any]]] = {
+    "enum": lambda encoded: _import_type(encoded["cls"], Enum)(_decode(encoded["value"])),
+    "dict": lambda encoded: {_decode(key): _decode(item) for key, item in encoded["items"]},
+    "model": lambda encoded: _import_model_type(encoded["cls"]).model_validate(encoded["data"]),
+    "error": _decode_error,
+    "path": lambda encoded: _import_type(encoded["cls"], PurePath)(encoded["value"]),
+    "tuple": lambda encoded: tuple(_decode(item) for item in encoded["items"]),
+    "set": lambda encoded: {_decode(item) for item in encoded["items"]},
+    "frozenset": lambda encoded: frozenset(_decode(item) for item in encoded["items"]),
+    "bytes": lambda encoded: bytes.fromhex(encoded["value"]),
+    "datetime": lambda encoded: datetime.datetime.fromisoformat(encoded["value"]),
+    "date": lambda encoded: datetime.date.fromisoformat(encoded["value"]),
+    "time": lambda encoded: datetime.time.fromisoformat(encoded["value"]),
+    "timedelta": lambda encoded: datetime.timedelta(seconds=encoded["value"]),
+    "decimal": lambda encoded: Decimal(encoded["value"]),
+    "uuid": lambda encoded: UUID(encoded["value"]),
+}
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if (tag := value.get(_TAG)) is not None:
+            return _DECODERS_BY_TAG[tag](value)
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+class JsonRPCSerializer(RPCSerializer):
+    content_type: ClassVar[str] = "application/vnd.osparc.rpc.v1+json"
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Raises:
+            _UnsupportedValueError: when data contains values that cannot be represented
+        """
+        try:
+            return orjson.dumps(_encode(data))
+        except orjson.JSONEncodeError as exc:
+            raise _UnsupportedValueError(type(data)) from exc
+
+    def loads(self, data: bytes) -> Any:
+        return _decode(orjson.loads(data))
+
+
+_SERIALIZERS: Final[dict[str, RPCSerializer]] = {
+    serializer.content_type: serializer for serializer in (PickleRPCSerializer(), JsonRPCSerializer())
+}
+_PICKLE_SERIALIZER: Final[RPCSerializer] = _SERIALIZERS[PickleRPCSerializer.content_type]
+
+
+@dataclass(slots=True, kw_only=True)
+class RPCSerializationMetrics(MetricsBase):
+    namespace: str
+
+    payload_size: Histogram = field(init=False)
+    serialization_duration: Histogram = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.payload_size = Histogram(
+            "payload_size_bytes",
+            "size of the RPC messages sent and received",
+            labelnames=("direction", "message_type", "content_type"),
+            namespace=self.namespace,
+            buckets=_BUCKETS_SIZE_BYTES,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+        self.serialization_duration = Histogram(
+            "serialization_duration_seconds",
+            "time to serialize/deserialize the RPC messages",
+            labelnames=("operation", "message_type", "content_type"),
+            namespace=self.namespace,
+            buckets=_BUCKETS_TIME_S,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+
+
+# NOTE: a metric is registered once per registry, the RPC clients of an application share them
+_metrics_by_registry: weakref.WeakKeyDictionary[CollectorRegistry, RPCSerializationMetrics] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_rpc_serialization_metrics(registry: CollectorRegistry) -> RPCSerializationMetrics:
+    if (metrics := _metrics_by_registry.get(registry)) is None:
+        metrics = _metrics_by_registry[registry] = RPCSerializationMetrics(
+            namespace=_METRICS_NAMESPACE, subsystem=_METRICS_SUBSYSTEM, registry=registry
+        )
+    return metrics
+
+
+# NOTE: the serializer of the call being handled, its result is sent back with the same one
+_call_serializer: contextvars.ContextVar[RPCSerializer | None] = contextvars.ContextVar(
+    "rpc_call_serializer", default=None
+)
+
+
+class SerializingRPC(aio_pika.patterns.RPC):
+    def __init__(
+        self,
+        channel: aio_pika.abc.AbstractChannel,
+        *,
+        serializer: RPCSerializer,
+        metrics: RPCSerializationMetrics | None,
+        **kwargs,
+    ) -> None:
+        super().__init__(channel, **kwargs)
+        self.serializer = serializer
+        self.metrics = metrics
+
+    def _dumps(self, payload: Any, message_type: RPCMessageType) -> tuple[bytes, str]:
+        serializer = _call_serializer.get() or self.serializer
+        start = time.perf_counter()
+        try:
+            body = serializer.dumps(payload)
+        except _UnsupportedValueError:
+            serializer = _PICKLE_SERIALIZER
+            body = serializer.dumps(payload)
+        if self.metrics:
+            labels = {"message_type": message_type.value, "content_type": serializer.content_type}
+            self.metrics.serialization_duration.labels(operation="serialize", **labels).observe(
+                time.perf_counter() - start
+            )
+            self.metrics.payload_size.labels(direction="sent", **labels).observe(len(body))
+        return body, serializer.content_type
+
+    async def serialize_message(
+        self,
+        payload: Any,
+        message_type: RPCMessageType,
+        correlation_id: str | None,
+        delivery_mode: aio_pika.DeliveryMode,
+        **kwargs: Any,
+    ) -> aio_pika.Message:
+        body, content_type = self._dumps(payload, message_type)
+        return aio_pika.Message(
+            body,
+            content_type=content_type,
+            correlation_id=correlation_id,
+            delivery_mode=delivery_mode,
+            timestamp=time.time(),
+            type=message_type.value,
+            **kwargs,
+        )
+
+    async def deserialize_message(self, message: AbstractIncomingMessage) -> Any:
+        serializer = _SERIALIZERS.get(message.content_type or _PICKLE_SERIALIZER.content_type)
+        if serializer is None:
+            msg = f"Unsupported RPC message content type '{message.content_type}'"
+            raise RPCSerializationError(msg=msg)
+        start = time.perf_counter()
+        payload = serializer.loads(message.body)
+        if self.metrics:
+            labels = {"message_type": f"{message.type}", "content_type": serializer.content_type}
+            self.metrics.serialization_duration.labels(operation="deserialize", **labels).observe(
+                time.perf_counter() - start
+            )
+            self.metrics.payload_size.labels(direction="received", **labels).observe(len(message.body))
+        return payload
+
+    async def on_call_message(self, method_name: str, message: aio_pika.IncomingMessage) -> None:
+        token = _call_serializer.set(_SERIALIZERS.get(message.content_type or ""))
+        try:
+            await super().on_call_message(method_name, message)
+        finally:
+            _call_serializer.reset(token)
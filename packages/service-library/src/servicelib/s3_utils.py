@@ -27,5 +27,7 @@ class FileLikeBytesIterReader(FileLikeReader):
             except StopAsyncIteration:
                 break  # End of file
 
-        result, self._buffer = self._buffer[:size], self._buffer[size:]
-        return bytes(result)
+        result = bytes(self._buffer[:size])
+        # NOTE: in place, avoids copying the remaining buffer on every read
+        del self._buffer[:size]
+        return result
@@ -406,6 +406,29 @@ async def test_rabbit_client_pub_sub(
     await _assert_message_received(mocked_message_parser, 1, message)
 
 
+@pytest.mark.parametrize("num_messages", [1, 250])
+async def test_rabbit_client_publish_many(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    mocked_message_parser: mock.AsyncMock,
+    random_rabbit_message: Callable[..., PytestRabbitMessage],
+    num_messages: int,
+):
+    consumer = create_rabbitmq_client("consumer")
+    publisher = create_rabbitmq_client("publisher")
+    messages = [random_rabbit_message() for _ in range(num_messages)]
+
+    exchange_name = random_exchange_name()
+    await consumer.subscribe(exchange_name, mocked_message_parser)
+    await publisher.publish_many(exchange_name, messages)
+    # the exchange is declared once, publishing again uses the same one
+    await publisher.publish(exchange_name, messages[-1])
+    await _assert_message_received(mocked_message_parser, num_messages + 1, messages[-1])
+    assert [call.args[0] for call in mocked_message_parser.call_args_list] == [
+        message.message.encode() for message in [*messages, messages[-1]]
+    ]
+
+
 @pytest.mark.parametrize("num_subs", [10])
 async def test_rabbit_client_pub_many_subs(
     create_rabbitmq_client: Callable[[str], RabbitMQClient],
@@ -703,3 +726,31 @@ async def test_unsubscribe_consumer(
     # Unsubscribe the queue
     for _ in range(idempotent_attempts):
         await client.unsubscribe(queue_name)
+
+
+async def test_get_queue_message_count(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    mocked_message_parser: mock.AsyncMock,
+    random_rabbit_message: Callable[..., PytestRabbitMessage],
+):
+    exchange_name = random_exchange_name()
+    consumer = create_rabbitmq_client("consumer")
+    publisher = create_rabbitmq_client("publisher")
+    queue_name, consumer_tag = await consumer.subscribe(exchange_name, mocked_message_parser, exclusive_queue=False)
+    assert await consumer.get_queue_message_count(queue_name) == 0
+
+    # without consumer, the published messages wait in the queue
+    await consumer.unsubscribe_consumer(queue_name, consumer_tag)
+    num_messages = 3
+    for _ in range(num_messages):
+        await publisher.publish(exchange_name, random_rabbit_message())
+    async for attempt in AsyncRetrying(
+        wait=wait_fixed(0.1),
+        stop=stop_after_delay(5),
+        retry=retry_if_exception_type(AssertionError),
+        reraise=True,
+    ):
+        with attempt:
+            assert await consumer.get_queue_message_count(queue_name) == num_messages
+    await _assert_message_received(mocked_message_parser, 0)
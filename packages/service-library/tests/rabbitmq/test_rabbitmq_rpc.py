@@ -11,13 +11,17 @@ from typing import Any, Final
 import aiodocker
 import pytest
 from models_library.rabbitmq_basic_types import RPCMethodName
+from prometheus_client import CollectorRegistry
 from pydantic import NonNegativeInt, ValidationError
 from pytest_mock import MockerFixture
 from servicelib.rabbitmq import (
+    JsonRPCSerializer,
     RabbitMQRPCClient,
     RemoteMethodNotRegisteredError,
     RPCNamespace,
     RPCNotInitializedError,
+    get_rpc_serialization_metrics,
+    rabbitmq_rpc_client_context,
 )
 from settings_library.rabbit import RabbitSettings
 from tenacity.asyncio import AsyncRetrying
@@ -87,6 +91,51 @@ async def test_base_rpc_pattern(
     await rpc_client.unregister_handler(add_me)
 
 
+@pytest.mark.parametrize(
+    "x,y,expected_result",
+    [
+        pytest.param(12, 20, 32, id="json"),
+        pytest.param(b"123b", b"xyz0", b"123bxyz0", id="json_tagged_value"),
+        pytest.param(CustomClass(2, 1), CustomClass(1, 2), CustomClass(3, 3), id="pickle_fallback"),
+    ],
+)
+async def test_rpc_pattern_with_json_serializer(
+    rabbit_service: RabbitSettings,
+    rpc_client: RabbitMQRPCClient,
+    namespace: RPCNamespace,
+    x: Any,
+    y: Any,
+    expected_result: Any,
+):
+    # NOTE: the replier uses the default (pickle) serializer and replies with the serializer of the call
+    await rpc_client.register_handler(namespace, RPCMethodName(add_me.__name__), add_me)
+
+    registry = CollectorRegistry()
+    async with rabbitmq_rpc_client_context(
+        "json-requester",
+        rabbit_service.model_copy(update={"RABBIT_RPC_JSON_SERIALIZER": True}),
+        metrics=get_rpc_serialization_metrics(registry),
+    ) as json_rpc_client:
+        assert isinstance(json_rpc_client.serializer, JsonRPCSerializer)
+        request_result = await json_rpc_client.request(namespace, RPCMethodName(add_me.__name__), x=x, y=y)
+    assert request_result == expected_result
+    assert type(request_result) is type(expected_result)
+
+    sent_calls = registry.get_sample_value(
+        "simcore_rabbitmq_rpc_payload_size_bytes_count",
+        {"direction": "sent", "message_type": "call", "content_type": JsonRPCSerializer.content_type},
+    )
+    received_results = registry.get_sample_value(
+        "simcore_rabbitmq_rpc_payload_size_bytes_count",
+        {"direction": "received", "message_type": "result", "content_type": JsonRPCSerializer.content_type},
+    )
+    if isinstance(x, CustomClass):
+        assert sent_calls is None
+    else:
+        assert sent_calls == 1
+        assert received_results == 1
+
+
 async def test_multiple_requests_sequence_same_replier_and_requester(
     rpc_client: RabbitMQRPCClient, namespace: RPCNamespace
 ):
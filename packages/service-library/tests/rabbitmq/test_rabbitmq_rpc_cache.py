@@ -0,0 +1,162 @@
+# ruff: noqa: SLF001
+# pylint:disable=protected-access
+# pylint:disable=redefined-outer-name
+# pylint:disable=unused-argument
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+from models_library.rabbitmq_basic_types import RPCMethodName
+from servicelib.rabbitmq import RabbitMQRPCClient, RPCNamespace, RPCRouter
+from servicelib.rabbitmq._models import RPCNamespacedMethodName
+from servicelib.rabbitmq._rpc_cache import RPCResultCache
+from tenacity.asyncio import AsyncRetrying
+from tenacity.stop import stop_after_delay
+from tenacity.wait import wait_fixed
+
+pytest_simcore_core_services_selection = [
+    "rabbit",
+]
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, *, delay_s: float = 0.1) -> int:
+        self.calls += 1
+        call_number = self.calls
+        await asyncio.sleep(delay_s)
+        return call_number
+
+
+async def _failing_call() -> int:
+    await asyncio.sleep(0.1)
+    msg = "boom"
+    raise RuntimeError(msg)
+
+
+async def test_rpc_result_cache_coalesces_and_caches():
+    cache = RPCResultCache(ttl_s=60)
+    counter = _Counter()
+
+    results = await asyncio.gather(*(cache.get_or_call("key", counter) for _ in range(10)))
+    assert results == [1] * 10
+    assert await cache.get_or_call("key", counter) == 1
+    assert await cache.get_or_call("other_key", counter) == 2
+    assert counter.calls == 2
+
+
+async def test_rpc_result_cache_expires():
+    cache = RPCResultCache(ttl_s=0.2)
+    counter = _Counter()
+
+    assert await cache.get_or_call("key", counter) == 1
+    await asyncio.sleep(0.3)
+    assert await cache.get_or_call("key", counter) == 2
+
+
+async def test_rpc_result_cache_evicts_oldest_results():
+    cache = RPCResultCache(ttl_s=60, max_size=2)
+    counter = _Counter()
+
+    for key in ("a", "b", "c"):
+        await cache.get_or_call(key, counter)
+    assert list(cache._results) == ["b", "c"]
+
+
+async def test_rpc_result_cache_does_not_cache_errors():
+    cache = RPCResultCache(ttl_s=60)
+
+    results = await asyncio.gather(*(cache.get_or_call("key", _failing_call) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await cache.get_or_call("key", _Counter()) == 1
+
+
+async def test_rpc_result_cache_invalidation_during_call_is_not_cached():
+    cache = RPCResultCache(ttl_s=60)
+    counter = _Counter()
+
+    first_call = asyncio.create_task(cache.get_or_call("key", counter))
+    await asyncio.sleep(0)
+    cache.invalidate("key")
+    # the next call does not join the outdated call
+    assert await cache.get_or_call("key", counter) == 2
+    assert await first_call == 1
+    assert await cache.get_or_call("key", counter) == 2
+
+
+async def test_rpc_result_cache_caller_cancellation_does_not_cancel_the_others():
+    cache = RPCResultCache(ttl_s=60)
+    counter = _Counter()
+
+    first_call = asyncio.create_task(cache.get_or_call("key", counter))
+    second_call = asyncio.create_task(cache.get_or_call("key", counter))
+    await asyncio.sleep(0)
+    first_call.cancel()
+    assert await second_call == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first_call
+
+
+router = RPCRouter()
+_handler_counter = _Counter()
+
+
+@router.expose(cache_ttl_s=60)
+async def get_counter(*, delay_s: float) -> int:
+    return await _handler_counter(delay_s=delay_s)
+
+
+async def test_cached_rpc_handler(
+    rpc_client: RabbitMQRPCClient,
+    rabbitmq_rpc_client: Callable[[str], Awaitable[RabbitMQRPCClient]],
+    namespace: RPCNamespace,
+):
+    server_replicas = [await rabbitmq_rpc_client(f"server_{i}") for i in range(2)]
+    for server in server_replicas:
+        await server.register_router(router, namespace)
+    calls_before = _handler_counter.calls
+
+    async def _get_counter() -> int:
+        return await rpc_client.request(namespace, RPCMethodName("get_counter"), delay_s=0.5)
+
+    # the identical concurrent calls are coalesced on each replica
+    results = await asyncio.gather(*(_get_counter() for _ in range(20)))
+    assert _handler_counter.calls - calls_before <= len(server_replicas)
+    for _ in range(5):
+        assert await _get_counter() in results
+
+    # invalidating from any client reaches all the replicas
+    await rpc_client.invalidate_cached_results(namespace, RPCMethodName("get_counter"))
+    namespaced_method_name = RPCNamespacedMethodName.from_namespace_and_method(namespace, RPCMethodName("get_counter"))
+    async for attempt in AsyncRetrying(wait=wait_fixed(0.1), stop=stop_after_delay(5), reraise=True):
+        with attempt:
+            for server in server_replicas:
+                assert not server._handler_caches[namespaced_method_name]._results
+    assert await _get_counter() not in results
+
+
+async def test_cached_rpc_request(
+    rpc_client: RabbitMQRPCClient,
+    rabbitmq_rpc_client: Callable[[str], Awaitable[RabbitMQRPCClient]],
+    namespace: RPCNamespace,
+):
+    server = await rabbitmq_rpc_client("server")
+    counter = _Counter()
+    await server.register_handler(namespace, RPCMethodName("get_counter"), counter)
+
+    async def _get_counter(client: RabbitMQRPCClient) -> int:
+        return await client.cached_request(namespace, RPCMethodName("get_counter"), cache_ttl_s=60, delay_s=0.5)
+
+    assert await asyncio.gather(*(_get_counter(rpc_client) for _ in range(20))) == [1] * 20
+    assert await _get_counter(rpc_client) == 1
+    assert counter.calls == 1
+
+    # another client invalidates the results
+    other_client = await rabbitmq_rpc_client("other_client")
+    await other_client.invalidate_cached_results(namespace, RPCMethodName("get_counter"), delay_s=0.5)
+    async for attempt in AsyncRetrying(wait=wait_fixed(0.1), stop=stop_after_delay(5), reraise=True):
+        with attempt:
+            assert await _get_counter(rpc_client) == 2
@@ -0,0 +1,110 @@
+# pylint:disable=protected-access
+# pylint:disable=redefined-outer-name
+# pylint:disable=unused-argument
+
+import datetime
+from decimal import Decimal
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from prometheus_client import CollectorRegistry
+from pydantic import BaseModel, SecretStr
+from servicelib.rabbitmq import (
+    JsonRPCSerializer,
+    PickleRPCSerializer,
+    RPCSerializer,
+    RPCServerError,
+    get_rpc_serialization_metrics,
+)
+from servicelib.rabbitmq._rpc_serialization import _UnsupportedValueError
+
+
+class _Color(StrEnum):
+    RED = "red"
+
+
+class _Item(BaseModel):
+    item_id: UUID
+    created: datetime.datetime
+    color: _Color
+
+
+class _Page[ItemT](BaseModel):
+    items: list[ItemT]
+    total: int
+
+
+class _WithSecret(BaseModel):
+    password: SecretStr
+
+
+def _create_item() -> _Item:
+    return _Item(item_id=uuid4(), created=datetime.datetime.now(datetime.UTC), color=_Color.RED)
+
+
+@pytest.mark.parametrize("serializer", [PickleRPCSerializer(), JsonRPCSerializer()], ids=lambda s: s.content_type)
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param({"x": 1, "y": 2.5, "z": "a", "t": True, "n": None}, id="json_values"),
+        pytest.param({"item": _create_item()}, id="model"),
+        pytest.param({"page": _Page[_Item](items=[_create_item()], total=1)}, id="generic_model"),
+        pytest.param(
+            {
+                "tuple": (1, "2"),
+                "set": {1, 2},
+                "frozenset": frozenset({"a"}),
+                "bytes": b"123",
+                "uuid": uuid4(),
+                "date": datetime.date(2024, 1, 1),
+                "timedelta": datetime.timedelta(seconds=3),
+                "decimal": Decimal("1.5"),
+                "path": Path("/tmp/file"),  # noqa: S108
+                "enum": _Color.RED,
+                "non_str_keys": {uuid4(): [1]},
+            },
+            id="tagged_values",
+        ),
+    ],
+)
+def test_serializers_round_trip(serializer: RPCSerializer, data: Any):
+    decoded = serializer.loads(serializer.dumps(data))
+    assert decoded == data
+    assert {key: type(value) for key, value in decoded.items()} == {key: type(value) for key, value in data.items()}
+
+
+def test_json_serializer_round_trips_osparc_errors():
+    serializer = JsonRPCSerializer()
+    error = RPCServerError(
+        method_name="a_method", exc_type="RuntimeError", exc_message="boom", traceback="", error_code="OEC:123"
+    )
+
+    decoded = serializer.loads(serializer.dumps(error))
+    assert type(decoded) is RPCServerError
+    assert decoded.error_context() == error.error_context()
+    assert f"{decoded}" == f"{error}"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(_WithSecret(password=SecretStr("secret")), id="masked_secret"),
+        pytest.param(object(), id="arbitrary_object"),
+        pytest.param(float("nan"), id="nan"),
+        pytest.param(RuntimeError("not an osparc error"), id="exception"),
+    ],
+)
+def test_json_serializer_refuses_values_it_cannot_represent(data: Any):
+    # NOTE: the RPC client sends these with pickle instead
+    with pytest.raises(_UnsupportedValueError):
+        JsonRPCSerializer().dumps(data)
+
+
+def test_rpc_serialization_metrics_are_shared_by_the_clients_of_a_registry():
+    registry = CollectorRegistry()
+    metrics = get_rpc_serialization_metrics(registry)
+    assert get_rpc_serialization_metrics(registry) is metrics
+    assert get_rpc_serialization_metrics(CollectorRegistry()) is not metrics
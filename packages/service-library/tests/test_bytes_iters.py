@@ -8,6 +8,7 @@ from unittest.mock import Mock
 
 import pytest
 from faker import Faker
+from models_library.bytes_iters import BytesIter, DataSize
 from pytest_mock import MockerFixture
 from pytest_simcore.helpers.comparing import (
     assert_same_contents,
@@ -17,6 +18,7 @@ from pytest_simcore.helpers.comparing import (
 from servicelib.archiving_utils import unarchive_dir
 from servicelib.bytes_iters import (
     ArchiveEntries,
+    BytesStreamer,
     DiskStreamReader,
     DiskStreamWriter,
     get_zip_bytes_iter,
@@ -93,6 +95,7 @@ def mocked_progress_bar_cb(mocker: MockerFixture) -> Mock:
     return mocker.Mock(side_effect=_progress_cb)
 
 
+@pytest.mark.parametrize("prefetch_members", [0, 3])
 @pytest.mark.parametrize("use_file_like", [True, False])
 async def test_get_zip_bytes_iter(
     mocked_progress_bar_cb: Mock,
@@ -101,6 +104,7 @@ async def test_get_zip_bytes_iter(
     local_archive_path: Path,
     local_unpacked_archive: Path,
     use_file_like: bool,
+    prefetch_members: int,
 ):
     # 1. generate archive form sources
     archive_files: ArchiveEntries = []
@@ -116,7 +120,9 @@ async def test_get_zip_bytes_iter(
         progress_report_cb=mocked_progress_bar_cb,
         description="root_bar",
     ) as root:
-        bytes_iter = get_zip_bytes_iter(archive_files, progress_bar=root, chunk_size=1024)
+        bytes_iter = get_zip_bytes_iter(
+            archive_files, progress_bar=root, chunk_size=1024, prefetch_members=prefetch_members, prefetch_max_chunks=2
+        )
 
         if use_file_like:
             await writer.write_from_file_like(FileLikeBytesIterReader(bytes_iter))
@@ -131,3 +137,24 @@ async def test_get_zip_bytes_iter(
         get_files_info_from_path(local_files_dir),
         get_files_info_from_path(local_unpacked_archive),
     )
+
+
+async def test_get_zip_bytes_iter_prefetch_raises_source_errors(
+    prepare_content: None,
+    local_files_dir: Path,
+):
+    class _SourceError(RuntimeError): ...
+
+    async def _failing_bytes_iter() -> BytesIter:
+        yield b"some data"
+        raise _SourceError
+
+    archive_files: ArchiveEntries = [
+        (get_relative_to(local_files_dir, file), DiskStreamReader(file).get_bytes_streamer())
+        for file in (x for x in local_files_dir.rglob("*") if x.is_file())
+    ]
+    archive_files.insert(1, ("failing", BytesStreamer(DataSize(100), _failing_bytes_iter)))
+
+    with pytest.raises(_SourceError):
+        async for _ in get_zip_bytes_iter(archive_files, chunk_size=1024, prefetch_members=3):
+            pass
@@ -1,6 +1,7 @@
 from functools import cached_property
-from typing import ClassVar
+from typing import Annotated, ClassVar
 
+from pydantic import Field
 from pydantic.config import JsonDict
 from pydantic.networks import AnyUrl
 from pydantic.types import SecretStr
@@ -24,6 +25,12 @@ class RabbitSettings(BaseCustomSettings):
     RABBIT_USER: str
     RABBIT_PASSWORD: SecretStr
 
+    # rpc
+    RABBIT_RPC_JSON_SERIALIZER: Annotated[
+        bool,
+        Field(description="the RPC calls are sent in json instead of pickle (the servers reply in the call encoding)"),
+    ] = False
+
     @cached_property
     def dsn(self) -> str:
         rabbit_dsn: str = str(
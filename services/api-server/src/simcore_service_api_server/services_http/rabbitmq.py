@@ -1,6 +1,7 @@
 import logging
 
 from fastapi import FastAPI
+from servicelib.fastapi.rabbitmq_lifespan import get_rabbitmq_rpc_client_metrics
 from servicelib.rabbitmq import RabbitMQClient, wait_till_rabbitmq_responsive
 from servicelib.rabbitmq._client_rpc import RabbitMQRPCClient
 from settings_library.rabbit import RabbitSettings
@@ -21,7 +22,9 @@ def setup_rabbitmq(app: FastAPI) -> None:
     async def _on_startup() -> None:
         await wait_till_rabbitmq_responsive(settings.dsn)
 
-        app.state.rabbitmq_rpc_client = await RabbitMQRPCClient.create(client_name="api_server", settings=settings)
+        app.state.rabbitmq_rpc_client = await RabbitMQRPCClient.create(
+            client_name="api_server", settings=settings, metrics=get_rabbitmq_rpc_client_metrics(app)
+        )
         app.state.rabbitmq_client = RabbitMQClient(client_name="api_server", settings=settings)
         app.state.log_distributor = LogDistributor(app.state.rabbitmq_client)
         await app.state.log_distributor.setup()
@@ -75,6 +75,22 @@ class EC2InstancesSettings(BaseCustomSettings):
         ),
     ] = DEFAULT_FACTORY
 
+    EC2_INSTANCES_HOT_BUFFER_PRE_PULL_DEMANDED_IMAGES: Annotated[
+        NonNegativeInt,
+        Field(
+            description="Number of the most demanded docker images (i.e. of the services that waited for a machine "
+            "recently) to pre-pull on the hot buffers in addition to the configured ones (0 disables it)",
+        ),
+    ] = 0
+    EC2_INSTANCES_DEMANDED_IMAGES_HALF_LIFE: Annotated[
+        datetime.timedelta,
+        Field(
+            description="Half-life of the demand of a docker image, the older demand weighs less "
+            "(default to seconds, or see https://pydantic-docs.helpmanual.io/usage/types/#datetime-types"
+            " for string formatting)",
+        ),
+    ] = datetime.timedelta(days=1)
+
     EC2_INSTANCES_KEY_NAME: Annotated[
         str,
         Field(
@@ -277,6 +293,57 @@ class DaskMonitoringSettings(BaseCustomSettings):
     ]
 
 
+class WarmBuffersForecastSettings(BaseCustomSettings):
+    WARM_BUFFERS_FORECAST_MAX_BUFFER_COUNTS: Annotated[
+        dict[str, NonNegativeInt],
+        Field(
+            description="maximal number of warm buffer machines per EC2 instance type sized from the forecasted demand "
+            "(the buffer_count of the instance type in EC2_INSTANCES_ALLOWED_TYPES is the minimum). "
+            "The instance types not listed here keep their configured buffer_count",
+        ),
+    ]
+    WARM_BUFFERS_FORECAST_BUCKET: Annotated[
+        datetime.timedelta,
+        Field(
+            gt=datetime.timedelta(0),
+            description="the machines demand (i.e. started machines) is counted per bucket of this duration",
+        ),
+    ] = datetime.timedelta(hours=1)
+    WARM_BUFFERS_FORECAST_SEASON: Annotated[
+        datetime.timedelta,
+        Field(
+            description="period of the demand pattern (e.g. a week), "
+            "the demand is forecasted from the same buckets in the past seasons",
+        ),
+    ] = datetime.timedelta(days=7)
+    WARM_BUFFERS_FORECAST_SMOOTHING: Annotated[
+        float,
+        Field(
+            gt=0,
+            le=1,
+            description="weight of the last season in the forecast (exponentially weighted moving average)",
+        ),
+    ] = 0.3
+
+    @field_validator("WARM_BUFFERS_FORECAST_MAX_BUFFER_COUNTS")
+    @classmethod
+    def _check_valid_instance_names(cls, value: dict[str, NonNegativeInt]) -> dict[str, NonNegativeInt]:
+        # NOTE: needed because of a flaw in BaseCustomSettings
+        # issubclass raises TypeError if used on Aliases
+        TypeAdapter(list[InstanceTypeType]).validate_python(list(value))
+        return value
+
+    @model_validator(mode="after")
+    def _check_season_is_made_of_buckets(self) -> Self:
+        if self.WARM_BUFFERS_FORECAST_SEASON % self.WARM_BUFFERS_FORECAST_BUCKET:
+            msg = (
+                f"WARM_BUFFERS_FORECAST_SEASON ({self.WARM_BUFFERS_FORECAST_SEASON}) must be a multiple of "
+                f"WARM_BUFFERS_FORECAST_BUCKET ({self.WARM_BUFFERS_FORECAST_BUCKET})"
+            )
+            raise ValueError(msg)
+        return self
+
+
 class ApplicationSettings(BaseApplicationSettings, MixinLoggingSettings):
     # CODE STATICS ---------------------------------------------------------
     API_VERSION: str = API_VERSION
@@ -344,6 +411,14 @@ class ApplicationSettings(BaseApplicationSettings, MixinLoggingSettings):
         Field(json_schema_extra={"auto_default_from_env": True}),
     ]
 
+    AUTOSCALING_WARM_BUFFERS_FORECAST: Annotated[
+        WarmBuffersForecastSettings | None,
+        Field(
+            description="if set, the number of warm buffer machines follows the demand forecasted from its history",
+            json_schema_extra={"auto_default_from_env": True},
+        ),
+    ]
+
     AUTOSCALING_POLL_INTERVAL: Annotated[
         datetime.timedelta,
         Field(
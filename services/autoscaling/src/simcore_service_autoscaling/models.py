@@ -35,9 +35,19 @@ class _TaskAssignmentMixin:
         task_required_node_labels: dict[DockerLabelKey, str],
         task_product_name: ProductName | None = None,
     ) -> None:
-        self.assigned_tasks.append(task)
+        self.assign_tasks([task], task_resources, task_required_node_labels, task_product_name)
+
+    def assign_tasks(
+        self,
+        tasks: list,
+        tasks_total_resources: Resources,
+        task_required_node_labels: dict[DockerLabelKey, str],
+        task_product_name: ProductName | None = None,
+    ) -> None:
+        """same as assign_task for several tasks with the same requirements"""
+        self.assigned_tasks.extend(tasks)
         assert self.available_resources is not None  # nosec
-        object.__setattr__(self, "available_resources", self.available_resources - task_resources)
+        object.__setattr__(self, "available_resources", self.available_resources - tasks_total_resources)
         if task_required_node_labels:
             object.__setattr__(
                 self,
@@ -2,7 +2,6 @@ import asyncio
 import collections
 import dataclasses
 import datetime
-import functools
 import itertools
 import logging
 from typing import Final, cast
@@ -23,9 +22,8 @@ from aws_library.ec2._models import AWSTagKey
 from aws_library.ssm._errors import SSMAccessError
 from common_library.logging.logging_errors import create_troubleshooting_log_kwargs
 from fastapi import FastAPI
-from models_library.docker import DockerLabelKey
+from models_library.docker import DockerGenericTag
 from models_library.generated_models.docker_rest_api import Node
-from models_library.products import ProductName
 from models_library.rabbitmq_messages import ProgressType
 from servicelib.logging_utils import log_catch, log_context
 from servicelib.tracing import traced
@@ -43,13 +41,9 @@ from ...constants import (
 from ...core.errors import (
     Ec2InvalidDnsNameError,
     Ec2TagDeserializationError,
-    TaskBestFittingInstanceNotFoundError,
-    TaskRequirementsAboveRequiredEC2InstanceTypeError,
-    TaskRequiresUnauthorizedEC2InstanceTypeError,
 )
 from ...core.settings import ApplicationSettings, get_application_settings
 from ...models import (
-    AssignedTasksToInstanceType,
     AssociatedInstance,
     Cluster,
     InstanceToLaunch,
@@ -65,14 +59,22 @@ from ...utils.capacity_distribution import cap_needed_instances
 from ...utils.cluster_scaling import (
     associate_ec2_instances_with_nodes,
     ec2_startup_script,
-    find_selected_instance_type_for_task,
     sort_drained_nodes,
 )
+from ...utils.cluster_snapshot import docker_cluster_snapshot
+from ...utils.docker_images_demand import (
+    DEMAND_MEMORY_HALF_LIVES,
+    DockerImagesDemand,
+    record_images_demand,
+    select_most_demanded_images,
+)
 from ...utils.rabbitmq import (
     post_autoscaling_status_message,
     post_tasks_log_message,
     post_tasks_progress_message,
 )
+from ...utils.redis import create_state_key
+from ...utils.task_placement import FirstFitDecreasingPlacement, TaskPlacementPolicy, TaskRequirements
 from ...utils.warm_buffer_machines import (
     get_activated_warm_buffer_ec2_tags,
     get_warm_buffer_ec2_instances,
@@ -80,11 +82,14 @@ from ...utils.warm_buffer_machines import (
 from ..docker import get_docker_client
 from ..ec2 import get_ec2_client
 from ..instrumentation import get_instrumentation, has_instrumentation
+from ..redis import get_redis_client
 from ..ssm import get_ssm_client
 from ._provider_protocol import AutoscalingProvider
 
 _logger = logging.getLogger(__name__)
 
+_TASK_PLACEMENT_POLICY: Final[TaskPlacementPolicy] = FirstFitDecreasingPlacement()
+
 
 def _adjust_instances_resources(
     non_adjusted_instances: list[EC2InstanceData], adjusted_resources_by_type: dict[InstanceTypeType, Resources]
@@ -151,20 +156,15 @@ async def _analyze_current_cluster(
     adjusted_resources_by_type = {t.name: t.resources for t in allowed_instance_types}
 
     # get the EC2 instances we have
-    existing_ec2_instances = _adjust_instances_resources(
-        await get_ec2_client(app).get_instances(
-            key_names=[app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_KEY_NAME],
-            tags=auto_scaling_mode.get_ec2_tags(app),
-            state_names=["pending", "running"],
-        ),
-        adjusted_resources_by_type,
-    )
-
-    terminated_ec2_instances = await get_ec2_client(app).get_instances(
+    ec2_instances = await get_ec2_client(app).get_instances(
         key_names=[app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_KEY_NAME],
         tags=auto_scaling_mode.get_ec2_tags(app),
-        state_names=["terminated"],
+        state_names=["pending", "running", "terminated"],
     )
+    existing_ec2_instances = _adjust_instances_resources(
+        [i for i in ec2_instances if i.state != "terminated"], adjusted_resources_by_type
+    )
+    terminated_ec2_instances = [i for i in ec2_instances if i.state == "terminated"]
 
     warm_buffer_ec2_instances = _adjust_instances_resources(
         await get_warm_buffer_ec2_instances(
@@ -591,85 +591,42 @@ async def _try_start_warm_buffer_instances(
     )
 
 
-def _try_assign_task_to_ec2_instance(
-    task,
-    *,
-    instances: list[AssociatedInstance] | list[NonAssociatedInstance],
-    task_required_ec2_instance: InstanceTypeType | None,
-    task_required_resources: Resources,
-    task_required_docker_node_labels: dict[DockerLabelKey, str],
-    task_product_name: ProductName | None,
-) -> bool:
-    for instance in instances:
-        # Check EC2 instance type
-        if task_required_ec2_instance and (task_required_ec2_instance != instance.ec2_instance.type):
-            continue
-
-        # Combine current node labels + pending labels from assigned tasks to check for compatibility
-        current_labels = instance.osparc_custom_node_labels
-        pending_labels = instance.tasks_required_pending_labels()
-        effective_labels = current_labels | pending_labels
-        if (
-            task_required_docker_node_labels
-            and effective_labels
-            and any(
-                effective_labels.get(label_key) != label_value
-                for label_key, label_value in task_required_docker_node_labels.items()
-            )
-        ):
-            continue
-
-        # Check resources
-        if instance.has_resources_for_task(task_required_resources):
-            instance.assign_task(task, task_required_resources, task_required_docker_node_labels, task_product_name)
-            _logger.debug(
-                "%s",
-                f"assigned task with {task_required_resources=}, {task_required_ec2_instance=}, "
-                f"{task_required_docker_node_labels=} to {instance.ec2_instance.id=}:{instance.ec2_instance.type=}, "
-                f"{instance.available_resources=}, {instance.ec2_instance.resources=}",
-            )
-            return True
-    return False
+async def _get_tasks_requirements(
+    app: FastAPI, tasks: list, auto_scaling_mode: AutoscalingProvider
+) -> list[TaskRequirements]:
+    return [
+        TaskRequirements(
+            task=task,
+            resources=auto_scaling_mode.get_task_required_resources(task),
+            required_instance_type=await auto_scaling_mode.get_task_defined_instance(app, task),
+            required_node_labels=await auto_scaling_mode.get_task_instance_required_docker_tags(app, task),
+            product_name=auto_scaling_mode.get_task_product_name(task),
+            image=auto_scaling_mode.get_task_image(task),
+        )
+        for task in tasks
+    ]
 
 
-def _try_assign_task_to_ec2_instance_type(
-    task,
-    *,
-    instances: list[AssignedTasksToInstanceType],
-    task_required_ec2_instance: InstanceTypeType | None,
-    task_required_resources: Resources,
-    task_required_labels: dict[DockerLabelKey, str],
-    task_product_name: ProductName | None = None,
-) -> bool:
-    """Try to assign task to an existing instance being created.
-
-    Returns True if task was assigned, False otherwise.
-    Task can only be assigned if:
-    - Instance type matches (if specified)
-    - Resources are available
-    - Labels are compatible (no conflicting label values)
-    """
-    for instance in instances:
-        if task_required_ec2_instance and (task_required_ec2_instance != instance.instance_type.name):
-            continue
-        if not instance.has_resources_for_task(task_required_resources):
-            continue
+def _load_pre_pulled_images(instance: EC2InstanceData) -> list[DockerGenericTag]:
+    try:
+        return load_pre_pulled_images_from_tags(instance.tags)
+    except Ec2TagDeserializationError:
+        return []
 
-        # Check label compatibility
-        if not instance.has_compatible_labels(task_required_labels):
-            continue
 
-        # Compatible! Assign task and merge labels
-        instance.assign_task(task, task_required_resources, task_required_labels, task_product_name)
-        _logger.debug(
-            "%s",
-            f"assigned task with {task_required_resources=}, {task_required_ec2_instance=},"
-            f" labels={task_required_labels} to "
-            f"{instance.instance_type=}, "
-            f"{instance.available_resources=}, instance_labels={instance.osparc_custom_node_labels}",
-        )
-        return True
-    return False
+async def _list_instances_docker_images(app: FastAPI, cluster: Cluster) -> dict[str, set[DockerGenericTag]]:
+    """returns the docker images present on the instances of the cluster (pre-pulled or used by a task)"""
+    docker_client = get_docker_client(app)
+    instances_images: dict[str, set[DockerGenericTag]] = {}
+    for node in itertools.chain(
+        cluster.active_nodes, cluster.drained_nodes, cluster.hot_buffer_drained_nodes, cluster.pending_nodes
+    ):
+        instances_images[node.ec2_instance.id] = set(
+            _load_pre_pulled_images(node.ec2_instance)
+        ) | await utils_docker.list_node_docker_images(docker_client, node.node)
+    for instance in itertools.chain(cluster.pending_ec2s, cluster.warm_buffer_ec2s):
+        instances_images[instance.ec2_instance.id] = set(_load_pre_pulled_images(instance.ec2_instance))
+    return instances_images
 
 
 async def _assign_tasks_to_current_cluster(
@@ -689,37 +646,22 @@ async def _assign_tasks_to_current_cluster(
                 be fulfilled by the available machines in the cluster).
             - The same cluster instance passed as input.
     """
-    unassigned_tasks = []
-    assignment_predicates = [
-        functools.partial(_try_assign_task_to_ec2_instance, instances=instances)
-        for instances in (
+    tasks_requirements = await _get_tasks_requirements(app, tasks, auto_scaling_mode)
+    unassigned_tasks = _TASK_PLACEMENT_POLICY.assign_to_instances(
+        tasks_requirements,
+        (
             cluster.active_nodes,
             cluster.drained_nodes + cluster.hot_buffer_drained_nodes,
             cluster.pending_nodes,
             cluster.pending_ec2s,
             cluster.warm_buffer_ec2s,
-        )
-    ]
-
-    for task in tasks:
-        task_required_resources = auto_scaling_mode.get_task_required_resources(task)
-        task_required_ec2_instance = await auto_scaling_mode.get_task_defined_instance(app, task)
-        task_required_labels = await auto_scaling_mode.get_task_instance_required_docker_tags(app, task)
-        task_product_name = auto_scaling_mode.get_task_product_name(task)
-
-        if any(
-            is_assigned(
-                task,
-                task_required_ec2_instance=task_required_ec2_instance,
-                task_required_resources=task_required_resources,
-                task_required_docker_node_labels=task_required_labels,
-                task_product_name=task_product_name,
-            )
-            for is_assigned in assignment_predicates
-        ):
-            _logger.debug("task %s is assigned to one instance available in cluster", task)
-        else:
-            unassigned_tasks.append(task)
+        ),
+        instances_images=(
+            await _list_instances_docker_images(app, cluster)
+            if any(requirements.image for requirements in tasks_requirements)
+            else None
+        ),
+    )
 
     if unassigned_tasks:
         _logger.info(
@@ -740,68 +682,10 @@ async def _find_needed_instances(
 ) -> dict[InstanceToLaunch, int]:
     # 1. check first the pending task needs
     # Track which tasks get assigned to which new instances
-    needed_new_instance_types_for_tasks: list[AssignedTasksToInstanceType] = []
-
     with log_context(_logger, logging.DEBUG, msg="finding needed instances"):
-        for task in unassigned_tasks:
-            task_required_resources = auto_scaling_mode.get_task_required_resources(task)
-            task_required_ec2 = await auto_scaling_mode.get_task_defined_instance(app, task)
-            task_required_labels = await auto_scaling_mode.get_task_instance_required_docker_tags(app, task)
-            task_product_name = auto_scaling_mode.get_task_product_name(task)
-
-            # first check if we can assign the task to one of the newly tobe created instances
-            if _try_assign_task_to_ec2_instance_type(
-                task,
-                instances=needed_new_instance_types_for_tasks,
-                task_required_ec2_instance=task_required_ec2,
-                task_required_resources=task_required_resources,
-                task_required_labels=task_required_labels,
-                task_product_name=task_product_name,
-            ):
-                continue
-
-            # so we need to find what we can create now
-            try:
-                # check if exact instance type is needed first
-                if task_required_ec2:
-                    defined_ec2 = find_selected_instance_type_for_task(
-                        task_required_ec2,
-                        available_ec2_types,
-                        task,
-                        task_required_resources,
-                    )
-                    needed_new_instance_types_for_tasks.append(
-                        AssignedTasksToInstanceType(
-                            instance_type=defined_ec2,
-                            assigned_tasks=[task],
-                            available_resources=defined_ec2.resources - task_required_resources,
-                            osparc_custom_node_labels=task_required_labels,
-                            _assigned_task_product_names={task_product_name} if task_product_name else set(),
-                        )
-                    )
-                else:
-                    # we go for best fitting type
-                    best_ec2_instance = utils_ec2.find_best_fitting_ec2_instance(
-                        available_ec2_types,
-                        task_required_resources,
-                        score_type=utils_ec2.closest_instance_policy,
-                    )
-                    needed_new_instance_types_for_tasks.append(
-                        AssignedTasksToInstanceType(
-                            instance_type=best_ec2_instance,
-                            assigned_tasks=[task],
-                            available_resources=best_ec2_instance.resources - task_required_resources,
-                            osparc_custom_node_labels=task_required_labels,
-                            _assigned_task_product_names={task_product_name} if task_product_name else set(),
-                        )
-                    )
-            except TaskBestFittingInstanceNotFoundError:
-                _logger.exception("Task %s needs more resources: ", f"{task}")
-            except (
-                TaskRequirementsAboveRequiredEC2InstanceTypeError,
-                TaskRequiresUnauthorizedEC2InstanceTypeError,
-            ):
-                _logger.exception("Unexpected error:")
+        needed_new_instance_types_for_tasks = _TASK_PLACEMENT_POLICY.plan_instances(
+            await _get_tasks_requirements(app, unassigned_tasks, auto_scaling_mode), available_ec2_types
+        )
 
     _logger.info(
         "found %d required instances: %s",
@@ -1299,6 +1183,7 @@ async def _autoscale_cluster(
         len(unnasigned_pending_tasks),
         "s" if len(unnasigned_pending_tasks) > 1 else "",
     )
+    await _record_docker_images_demand(app, unnasigned_pending_tasks, auto_scaling_mode)
     # NOTE: this function predicts how the backend will assign tasks
     still_pending_tasks, cluster = await _assign_tasks_to_current_cluster(
         app, unnasigned_pending_tasks, cluster, auto_scaling_mode
@@ -1460,6 +1345,56 @@ async def _sync_hot_buffer_ec2_tags(app: FastAPI, cluster: Cluster) -> None:
             instance.tags.pop(HOT_BUFFER_MACHINE_TAG_KEY, None)
 
 
+def _docker_images_demand_key(app: FastAPI) -> str:
+    # NOTE: the learned demand is kept across the upgrades of the service
+    return create_state_key(app, "docker_images_demand")
+
+
+async def _load_docker_images_demand(app: FastAPI) -> DockerImagesDemand:
+    dumped_demand = await get_redis_client(app).redis.get(_docker_images_demand_key(app))
+    return DockerImagesDemand.model_validate_json(dumped_demand) if dumped_demand else DockerImagesDemand()
+
+
+async def _save_docker_images_demand(
+    app: FastAPI, images_demand: DockerImagesDemand, *, half_life: datetime.timedelta
+) -> None:
+    # NOTE: expires once all the demand would be forgotten
+    await get_redis_client(app).redis.set(
+        _docker_images_demand_key(app),
+        images_demand.model_dump_json(),
+        ex=DEMAND_MEMORY_HALF_LIVES * half_life,
+    )
+
+
+async def _record_docker_images_demand(app: FastAPI, tasks: list, auto_scaling_mode: AutoscalingProvider) -> None:
+    app_settings = get_application_settings(app)
+    assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+    if not app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_HOT_BUFFER_PRE_PULL_DEMANDED_IMAGES:
+        return
+    if not (images := [image for task in tasks if (image := auto_scaling_mode.get_task_image(task))]):
+        return
+    half_life = app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_DEMANDED_IMAGES_HALF_LIFE
+    images_demand = record_images_demand(
+        await _load_docker_images_demand(app), images, now=arrow.utcnow().datetime, half_life=half_life
+    )
+    await _save_docker_images_demand(app, images_demand, half_life=half_life)
+
+
+async def _list_most_demanded_docker_images(app: FastAPI) -> list[DockerGenericTag]:
+    app_settings = get_application_settings(app)
+    assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+    if not (count := app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_HOT_BUFFER_PRE_PULL_DEMANDED_IMAGES):
+        return []
+    half_life = app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_DEMANDED_IMAGES_HALF_LIFE
+    images_demand = await _load_docker_images_demand(app)
+    selected_images_demand = select_most_demanded_images(
+        images_demand, count, now=arrow.utcnow().datetime, half_life=half_life
+    )
+    if selected_images_demand != images_demand:
+        await _save_docker_images_demand(app, selected_images_demand, half_life=half_life)
+    return selected_images_demand.selected_images
+
+
 @traced
 async def _pre_pull_docker_images_on_idle_hot_buffers(app: FastAPI, cluster: Cluster) -> None:
     if not cluster.hot_buffer_drained_nodes:
@@ -1468,6 +1403,17 @@ async def _pre_pull_docker_images_on_idle_hot_buffers(app: FastAPI, cluster: Clu
     ec2_client = get_ec2_client(app)
     app_settings = get_application_settings(app)
     assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+    # NOTE: the hot buffers also pre-pull the images of the services that waited for a machine recently
+    demanded_images = await _list_most_demanded_docker_images(app)
+
+    def _desired_pre_pulled_images(instance_type: InstanceTypeType) -> list[DockerGenericTag]:
+        assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+        ec2_boot_specific = app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ALLOWED_TYPES[instance_type]
+        return sorted(
+            set(utils_docker.compute_full_list_of_pre_pulled_images(ec2_boot_specific, app_settings))
+            | set(demanded_images)
+        )
+
     # check if we have hot buffers that need to pull images
     hot_buffer_nodes_needing_pre_pull = []
     for node in cluster.hot_buffer_drained_nodes:
@@ -1490,10 +1436,7 @@ async def _pre_pull_docker_images_on_idle_hot_buffers(app: FastAPI, cluster: Clu
             )
             pre_pulled_images = []
 
-        ec2_boot_specific = app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ALLOWED_TYPES[
-            updated_node.ec2_instance.type
-        ]
-        desired_pre_pulled_images = utils_docker.compute_full_list_of_pre_pulled_images(ec2_boot_specific, app_settings)
+        desired_pre_pulled_images = _desired_pre_pulled_images(updated_node.ec2_instance.type)
 
         if pre_pulled_images != desired_pre_pulled_images:
             _logger.info(
@@ -1506,8 +1449,7 @@ async def _pre_pull_docker_images_on_idle_hot_buffers(app: FastAPI, cluster: Clu
 
     # now trigger pre-pull on these nodes
     for node in hot_buffer_nodes_needing_pre_pull:
-        ec2_boot_specific = app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ALLOWED_TYPES[node.ec2_instance.type]
-        desired_pre_pulled_images = utils_docker.compute_full_list_of_pre_pulled_images(ec2_boot_specific, app_settings)
+        desired_pre_pulled_images = _desired_pre_pulled_images(node.ec2_instance.type)
         _logger.info(
             "triggering pre-pull of images %s on %s of type %s",
             desired_pre_pulled_images,
@@ -1541,25 +1483,27 @@ async def auto_scale_cluster(*, app: FastAPI, auto_scaling_mode: AutoscalingProv
     If there are such tasks, this method will allocate new machines in AWS to cope with
     the additional load.
     """
-    # current state
-    allowed_instance_types = await _sorted_allowed_instance_types(app, auto_scaling_mode)
-
-    cluster = await _analyze_current_cluster(app, auto_scaling_mode, allowed_instance_types)
-
-    # cleanup
-    cluster = await _cleanup_disconnected_nodes(app, cluster)
-    cluster = await _terminate_broken_ec2s(app, cluster)
-    cluster = await _try_attach_pending_ec2s(app, cluster, auto_scaling_mode)
-    cluster = await _drain_retired_nodes(app, cluster)
-
-    # desired state
-    cluster = await _autoscale_cluster(app, cluster, auto_scaling_mode, allowed_instance_types)
-
-    # keep hot buffer EC2 tag in sync for easy identification
-    await _sync_hot_buffer_ec2_tags(app, cluster)
-
-    # take care of hot buffer pre-pulling
-    await _pre_pull_docker_images_on_idle_hot_buffers(app, cluster)
-    # notify
-    await _notify_machine_creation_progress(app, cluster)
-    await _notify_autoscaling_status(app, cluster, auto_scaling_mode)
+    # NOTE: the swarm nodes/services/tasks are listed once for the whole cycle
+    async with docker_cluster_snapshot(get_docker_client(app)):
+        # current state
+        allowed_instance_types = await _sorted_allowed_instance_types(app, auto_scaling_mode)
+
+        cluster = await _analyze_current_cluster(app, auto_scaling_mode, allowed_instance_types)
+
+        # cleanup
+        cluster = await _cleanup_disconnected_nodes(app, cluster)
+        cluster = await _terminate_broken_ec2s(app, cluster)
+        cluster = await _try_attach_pending_ec2s(app, cluster, auto_scaling_mode)
+        cluster = await _drain_retired_nodes(app, cluster)
+
+        # desired state
+        cluster = await _autoscale_cluster(app, cluster, auto_scaling_mode, allowed_instance_types)
+
+        # keep hot buffer EC2 tag in sync for easy identification
+        await _sync_hot_buffer_ec2_tags(app, cluster)
+
+        # take care of hot buffer pre-pulling
+        await _pre_pull_docker_images_on_idle_hot_buffers(app, cluster)
+        # notify
+        await _notify_machine_creation_progress(app, cluster)
+        await _notify_autoscaling_status(app, cluster, auto_scaling_mode)
@@ -10,7 +10,7 @@ from dask_task_models_library.resource_constraints import (
 )
 from fastapi import FastAPI
 from models_library.clusters import ClusterAuthentication
-from models_library.docker import DockerLabelKey
+from models_library.docker import DockerGenericTag, DockerLabelKey
 from models_library.generated_models.docker_rest_api import Node
 from models_library.products import ProductName
 from models_library.services_metadata_runtime import (
@@ -111,6 +111,12 @@ class ComputationalAutoscalingProvider:
         # NOTE: currently not tagged on computational EC2 instances
         return None
 
+    def get_task_image(self, task) -> DockerGenericTag | None:  # pylint: disable=useless-return
+        assert self  # nosec
+        assert task  # nosec
+        # NOTE: the dask tasks run their image inside the dask-sidecar, the scheduler does not know it
+        return None
+
     async def compute_node_used_resources(self, app: FastAPI, instance: AssociatedInstance) -> Resources:
         assert self  # nosec
         try:
@@ -3,7 +3,7 @@ import dataclasses
 from aws_library.ec2 import EC2InstanceData, EC2Tags, Resources
 from aws_library.ec2._models import EC2InstanceType
 from fastapi import FastAPI
-from models_library.docker import DockerLabelKey
+from models_library.docker import DockerGenericTag, DockerLabelKey
 from models_library.generated_models.docker_rest_api import Node, Task
 from models_library.products import ProductName
 from pydantic import ByteSize
@@ -61,6 +61,10 @@ class DynamicAutoscalingProvider:
         assert self  # nosec
         return utils_docker.get_task_product_name(task)
 
+    def get_task_image(self, task) -> DockerGenericTag | None:
+        assert self  # nosec
+        return utils_docker.get_task_image(task)
+
     async def compute_node_used_resources(self, app: FastAPI, instance: AssociatedInstance) -> Resources:
         assert self  # nosec
         docker_client = get_docker_client(app)
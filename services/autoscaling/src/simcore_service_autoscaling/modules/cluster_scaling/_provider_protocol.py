@@ -3,7 +3,7 @@ from typing import Protocol
 from aws_library.ec2 import EC2InstanceData, EC2Tags, Resources
 from aws_library.ec2._models import EC2InstanceType
 from fastapi import FastAPI
-from models_library.docker import DockerLabelKey
+from models_library.docker import DockerGenericTag, DockerLabelKey
 from models_library.generated_models.docker_rest_api import Node as DockerNode
 from models_library.products import ProductName
 from types_aiobotocore_ec2.literals import InstanceTypeType
@@ -30,6 +30,8 @@ class AutoscalingProvider(Protocol):
 
     def get_task_product_name(self, task) -> ProductName | None: ...
 
+    def get_task_image(self, task) -> DockerGenericTag | None: ...
+
     async def compute_node_used_resources(self, app: FastAPI, instance: AssociatedInstance) -> Resources: ...
 
     async def compute_cluster_used_resources(self, app: FastAPI, instances: list[AssociatedInstance]) -> Resources: ...
@@ -16,7 +16,7 @@ Open features:
 
 import logging
 from collections import defaultdict
-from typing import cast
+from typing import Final, cast
 
 import arrow
 from aws_library.ec2 import (
@@ -50,18 +50,27 @@ from ...utils.buffer_machines import (
     dump_pre_pulled_images_as_tags,
     load_pre_pulled_images_from_tags,
 )
+from ...utils.redis import create_state_key
 from ...utils.warm_buffer_machines import (
     ec2_warm_buffer_startup_script,
     get_deactivated_warm_buffer_ec2_tags,
     get_warm_buffer_ec2_instances,
 )
+from ...utils.warm_buffers_forecast import (
+    WarmBuffersForecast,
+    compute_warm_buffer_counts,
+    record_started_instances,
+)
 from ..ec2 import get_ec2_client
 from ..instrumentation import get_instrumentation, has_instrumentation
+from ..redis import get_redis_client
 from ..ssm import get_ssm_client
 from ._provider_protocol import AutoscalingProvider
 
 _logger = logging.getLogger(__name__)
 
+_WARM_BUFFERS_FORECAST_TTL_SEASONS: Final[int] = 3
+
 
 def _record_instance_ready_metrics(app: FastAPI, *, instance: EC2InstanceData) -> None:
     """Record metrics for instances ready to pull images."""
@@ -261,12 +270,60 @@ async def _terminate_broken_instances(app: FastAPI, buffers_manager: WarmBufferP
     return buffers_manager
 
 
+def _warm_buffers_forecast_key(app: FastAPI) -> str:
+    # NOTE: the learned demand is kept across the upgrades of the service
+    return create_state_key(app, "warm_buffers_forecast")
+
+
+@traced
+async def _update_warm_buffers_forecast(
+    app: FastAPI, *, auto_scaling_mode: AutoscalingProvider
+) -> dict[InstanceTypeType, NonNegativeInt] | None:
+    """records the instances started since the last call and returns the forecasted buffer counts
+    (None if the forecast is disabled)"""
+    app_settings = get_application_settings(app)
+    assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+    if not (forecast_settings := app_settings.AUTOSCALING_WARM_BUFFERS_FORECAST):
+        return None
+
+    redis = get_redis_client(app).redis
+    forecast_key = _warm_buffers_forecast_key(app)
+    forecast = (
+        WarmBuffersForecast.model_validate_json(dumped_forecast)
+        if (dumped_forecast := await redis.get(forecast_key))
+        else WarmBuffersForecast()
+    )
+    now = arrow.utcnow().datetime
+    active_instances = await get_ec2_client(app).get_instances(
+        key_names=[app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_KEY_NAME],
+        tags=auto_scaling_mode.get_ec2_tags(app),
+    )
+    forecast = record_started_instances(forecast_settings, forecast, active_instances=active_instances, now=now)
+    # NOTE: a forecast not updated for several seasons is outdated (e.g. the autoscaling of this cluster was removed)
+    await redis.set(
+        forecast_key,
+        forecast.model_dump_json(),
+        ex=_WARM_BUFFERS_FORECAST_TTL_SEASONS * forecast_settings.WARM_BUFFERS_FORECAST_SEASON,
+    )
+
+    buffer_counts = compute_warm_buffer_counts(app_settings, forecast, now=now)
+    _logger.debug("Forecasted warm buffer counts: %s", buffer_counts)
+    if has_instrumentation(app):
+        get_instrumentation(app).buffer_machines_pools_metrics.update_from_forecast(
+            forecasted_demand=dict(forecast.last_bucket_predicted_demand),
+            observed_demand=dict(forecast.last_bucket_observed_demand),
+            target_instances=dict(buffer_counts),
+        )
+    return buffer_counts
+
+
 @traced
 async def _add_remove_buffer_instances(
     app: FastAPI,
     buffers_manager: WarmBufferPoolManager,
     *,
     auto_scaling_mode: AutoscalingProvider,
+    buffer_counts: dict[InstanceTypeType, NonNegativeInt] | None,
 ) -> WarmBufferPoolManager:
     ec2_client = get_ec2_client(app)
     app_settings = get_application_settings(app)
@@ -281,11 +338,12 @@ async def _add_remove_buffer_instances(
         ec2_boot_config,
     ) in app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ALLOWED_TYPES.items():
         instance_type = cast(InstanceTypeType, ec2_type)
+        buffer_count = (buffer_counts or {}).get(instance_type, ec2_boot_config.buffer_count)
         all_pool_instances = buffers_manager.buffer_pools[instance_type].all_instances()
-        if len(all_pool_instances) < ec2_boot_config.buffer_count:
-            missing_instances[instance_type] += ec2_boot_config.buffer_count - len(all_pool_instances)
+        if len(all_pool_instances) < buffer_count:
+            missing_instances[instance_type] += buffer_count - len(all_pool_instances)
         else:
-            terminateable_instances = set(list(all_pool_instances)[ec2_boot_config.buffer_count :])
+            terminateable_instances = set(list(all_pool_instances)[buffer_count:])
             unneeded_instances = unneeded_instances.union(terminateable_instances)
 
     for ec2_type, num_to_start in missing_instances.items():
@@ -436,8 +494,11 @@ async def monitor_buffer_machines(app: FastAPI, *, auto_scaling_mode: Autoscalin
     # 3. terminate broken instances
     buffers_manager = await _terminate_broken_instances(app, buffers_manager)
 
-    # 3. add/remove buffer instances base on ec2 boot specific data
-    buffers_manager = await _add_remove_buffer_instances(app, buffers_manager, auto_scaling_mode=auto_scaling_mode)
+    # 3. add/remove buffer instances base on ec2 boot specific data (or on the forecasted demand if enabled)
+    buffer_counts = await _update_warm_buffers_forecast(app, auto_scaling_mode=auto_scaling_mode)
+    buffers_manager = await _add_remove_buffer_instances(
+        app, buffers_manager, auto_scaling_mode=auto_scaling_mode, buffer_counts=buffer_counts
+    )
 
     # 4. pull docker images if needed
     await _handle_image_pre_pulling(app, buffers_manager)
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Final
 
 from aws_library.ec2 import EC2ClientMetrics, TrackedGauge
-from prometheus_client import CollectorRegistry, Histogram
+from prometheus_client import CollectorRegistry, Gauge, Histogram
 from servicelib.instrumentation import MetricsBase
 
 from ...models import Cluster, WarmBufferPoolManager
@@ -69,6 +69,10 @@ class WarmBufferPoolsMetrics(MetricsBase):
     instances_ready_to_pull_seconds: Histogram = field(init=False)
     instances_completed_pulling_seconds: Histogram = field(init=False)
 
+    forecasted_demand: Gauge = field(init=False)
+    observed_demand: Gauge = field(init=False)
+    target_instances: Gauge = field(init=False)
+
     def __post_init__(self) -> None:
         buffer_pools_subsystem = f"{self.subsystem}_buffer_machines_pools"
         for field_name, definition in WARM_BUFFER_POOLS_METRICS_DEFINITIONS.items():
@@ -110,6 +114,44 @@ class WarmBufferPoolsMetrics(MetricsBase):
             ),
             registry=self.registry,
         )
+        self.forecasted_demand = Gauge(
+            "forecasted_demand",
+            "Number of EC2 instances forecasted to be started during the last completed forecast bucket",
+            labelnames=EC2_INSTANCE_LABELS,
+            namespace=METRICS_NAMESPACE,
+            subsystem=buffer_pools_subsystem,
+            registry=self.registry,
+        )
+        self.observed_demand = Gauge(
+            "observed_demand",
+            "Number of EC2 instances started during the last completed forecast bucket",
+            labelnames=EC2_INSTANCE_LABELS,
+            namespace=METRICS_NAMESPACE,
+            subsystem=buffer_pools_subsystem,
+            registry=self.registry,
+        )
+        self.target_instances = Gauge(
+            "target_instances",
+            "Number of EC2 buffer instances the pool is sized to",
+            labelnames=EC2_INSTANCE_LABELS,
+            namespace=METRICS_NAMESPACE,
+            subsystem=buffer_pools_subsystem,
+            registry=self.registry,
+        )
+
+    def update_from_forecast(
+        self,
+        *,
+        forecasted_demand: dict[str, float],
+        observed_demand: dict[str, int],
+        target_instances: dict[str, int],
+    ) -> None:
+        for instance_type, value in forecasted_demand.items():
+            self.forecasted_demand.labels(instance_type=instance_type).set(value)
+        for instance_type, value in observed_demand.items():
+            self.observed_demand.labels(instance_type=instance_type).set(value)
+        for instance_type, value in target_instances.items():
+            self.target_instances.labels(instance_type=instance_type).set(value)
 
     def update_from_buffer_pool_manager(self, buffer_pool_manager: WarmBufferPoolManager) -> None:
         flat_pool = buffer_pool_manager.flatten_buffer_pool()
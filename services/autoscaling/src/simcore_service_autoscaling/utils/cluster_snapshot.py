@@ -0,0 +1,175 @@
+"""Snapshot of the docker swarm state used during one autoscaling cycle
+
+The nodes, services and tasks of the swarm are listed once at the beginning of the cycle and indexed
+in memory (tasks by node and by service, nodes and services by label key). While the snapshot is
+active, the helpers in utils_docker read from it instead of querying the swarm manager for each node/task.
+"""
+
+import asyncio
+import collections
+import contextlib
+import itertools
+from collections.abc import AsyncIterator, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from models_library.docker import DockerLabelKey
+from models_library.generated_models.docker_rest_api import Node, Role, Service, Task, TaskState
+from pydantic import TypeAdapter
+
+from ..modules.docker import AutoscalingDocker
+
+
+def _parse_label_filters(label_filters: Iterable[str]) -> list[tuple[str, str | None]]:
+    # same syntax as the docker label filters: "key" (key is defined) or "key=value"
+    return [
+        (key, value) if separator else (key, None)
+        for key, separator, value in (label_filter.partition("=") for label_filter in label_filters)
+    ]
+
+
+def _match_labels(labels: dict[str, str] | None, label_filters: list[tuple[str, str | None]]) -> bool:
+    labels = labels or {}
+    return all(key in labels and (value is None or labels[key] == value) for key, value in label_filters)
+
+
+def _index_by_label_key(items: Iterable[tuple[str, dict[str, str] | None]]) -> dict[str, dict[str, None]]:
+    # NOTE: the ids are kept in dicts (i.e. ordered sets) so that the results keep the order of the swarm
+    index: dict[str, dict[str, None]] = collections.defaultdict(dict)
+    for item_id, labels in items:
+        for key in labels or {}:
+            index[key][item_id] = None
+    return index
+
+
+def _candidate_ids(
+    index: dict[str, dict[str, None]], label_filters: list[tuple[str, str | None]], all_ids: Iterable[str]
+) -> list[str]:
+    if not label_filters:
+        return list(all_ids)
+    ids_with_label_keys = sorted((index.get(key, {}) for key, _ in label_filters), key=len)
+    return [item_id for item_id in ids_with_label_keys[0] if all(item_id in ids for ids in ids_with_label_keys[1:])]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DockerClusterSnapshot:
+    docker_client: AutoscalingDocker
+    nodes: list[Node]
+    services: list[Service]
+    tasks: list[Task]
+    _nodes_by_id: dict[str, Node] = field(init=False)
+    _services_by_id: dict[str, Service] = field(init=False)
+    _tasks_by_node_id: dict[str, list[Task]] = field(init=False)
+    _tasks_by_service_id: dict[str, list[Task]] = field(init=False)
+    _node_ids_by_label_key: dict[str, dict[str, None]] = field(init=False)
+    _service_ids_by_label_key: dict[str, dict[str, None]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        tasks_by_node_id: dict[str, list[Task]] = collections.defaultdict(list)
+        tasks_by_service_id: dict[str, list[Task]] = collections.defaultdict(list)
+        for task in self.tasks:
+            if task.node_id:
+                tasks_by_node_id[task.node_id].append(task)
+            if task.service_id:
+                tasks_by_service_id[task.service_id].append(task)
+        nodes_by_id = {node.id: node for node in self.nodes if node.id}
+        services_by_id = {service.id: service for service in self.services if service.id}
+
+        object.__setattr__(self, "_nodes_by_id", nodes_by_id)
+        object.__setattr__(self, "_services_by_id", services_by_id)
+        object.__setattr__(self, "_tasks_by_node_id", tasks_by_node_id)
+        object.__setattr__(self, "_tasks_by_service_id", tasks_by_service_id)
+        object.__setattr__(
+            self,
+            "_node_ids_by_label_key",
+            _index_by_label_key(
+                (node_id, node.spec.labels if node.spec else None) for node_id, node in nodes_by_id.items()
+            ),
+        )
+        object.__setattr__(
+            self,
+            "_service_ids_by_label_key",
+            _index_by_label_key(
+                (service_id, service.spec.labels if service.spec else None)
+                for service_id, service in services_by_id.items()
+            ),
+        )
+
+    def list_nodes(self, *, labels: Iterable[str] = (), role: Role | None = None) -> list[Node]:
+        """same as docker_client.nodes.list(filters={"node.label": labels, "role": [role]})"""
+        label_filters = _parse_label_filters(labels)
+        return [
+            node
+            for node in (
+                self._nodes_by_id[node_id]
+                for node_id in _candidate_ids(self._node_ids_by_label_key, label_filters, self._nodes_by_id)
+            )
+            if _match_labels(node.spec.labels if node.spec else None, label_filters)
+            and (role is None or (node.spec is not None and node.spec.role == role))
+        ]
+
+    def get_service(self, service_id: str) -> Service | None:
+        return self._services_by_id.get(service_id)
+
+    def list_tasks(
+        self,
+        *,
+        node_id: str | None = None,
+        service_labels: Iterable[DockerLabelKey] = (),
+        desired_state: TaskState | None = None,
+    ) -> list[Task]:
+        """same as docker_client.tasks.list(filters={"node": node_id, "label": service_labels, "desired-state": ...})
+
+        NOTE: as in docker, the label filters apply to the labels of the service of the tasks
+        """
+        tasks: Iterable[Task] = self.tasks
+        if label_filters := _parse_label_filters(service_labels):
+            service_ids = [
+                service_id
+                for service_id in _candidate_ids(self._service_ids_by_label_key, label_filters, self._services_by_id)
+                if _match_labels(self._services_by_id[service_id].spec.labels, label_filters)  # type: ignore[union-attr]
+            ]
+            tasks = itertools.chain.from_iterable(self._tasks_by_service_id.get(i, []) for i in service_ids)
+        if node_id is not None:
+            tasks = (
+                [task for task in tasks if task.node_id == node_id]
+                if label_filters
+                else self._tasks_by_node_id.get(node_id, [])
+            )
+        return [task for task in tasks if desired_state is None or task.desired_state == desired_state]
+
+
+async def create_docker_cluster_snapshot(docker_client: AutoscalingDocker) -> DockerClusterSnapshot:
+    nodes, services, tasks = await asyncio.gather(
+        docker_client.nodes.list(), docker_client.services.list(), docker_client.tasks.list()
+    )
+    return DockerClusterSnapshot(
+        docker_client=docker_client,
+        nodes=TypeAdapter(list[Node]).validate_python(nodes),
+        services=TypeAdapter(list[Service]).validate_python(services),
+        tasks=TypeAdapter(list[Task]).validate_python(tasks),
+    )
+
+
+_current_snapshot: ContextVar[DockerClusterSnapshot | None] = ContextVar(
+    "current_docker_cluster_snapshot", default=None
+)
+
+
+@contextlib.asynccontextmanager
+async def docker_cluster_snapshot(docker_client: AutoscalingDocker) -> AsyncIterator[DockerClusterSnapshot]:
+    """takes a snapshot of the swarm which is used by utils_docker within the context"""
+    snapshot = await create_docker_cluster_snapshot(docker_client)
+    token = _current_snapshot.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _current_snapshot.reset(token)
+
+
+def get_docker_cluster_snapshot(docker_client: AutoscalingDocker) -> DockerClusterSnapshot | None:
+    """returns the current snapshot if it was taken with this docker client"""
+    snapshot = _current_snapshot.get()
+    if snapshot is not None and snapshot.docker_client is docker_client:
+        return snapshot
+    return None
@@ -0,0 +1,73 @@
+"""Recent demand of the docker images of the services waiting for a machine
+
+At every autoscaling cycle, each pending task adds one to the demand of its docker image (a task waiting
+longer weighs more). The demand decays exponentially with time so that the images of the recently started
+services are the most demanded ones. They are worth pre-pulling on the hot buffers.
+The selection of the images to pre-pull is refreshed at most once per half-life, otherwise images with
+close demands would swap places at every cycle and the hot buffers would keep re-pulling them.
+"""
+
+import collections
+import datetime
+from collections.abc import Iterable
+from typing import Final
+
+from models_library.docker import DockerGenericTag
+from pydantic import BaseModel, NonNegativeFloat, NonNegativeInt
+
+# NOTE: an image that was not demanded for DEMAND_MEMORY_HALF_LIVES is forgotten (0.5**7 < 0.01)
+_MIN_DEMAND: Final[float] = 0.01
+DEMAND_MEMORY_HALF_LIVES: Final[int] = 7
+
+
+class DockerImagesDemand(BaseModel):
+    updated_at: datetime.datetime | None = None
+    demand: dict[DockerGenericTag, NonNegativeFloat] = {}
+    selected_at: datetime.datetime | None = None
+    selected_images: list[DockerGenericTag] = []
+
+
+def record_images_demand(
+    images_demand: DockerImagesDemand,
+    images: Iterable[DockerGenericTag],
+    *,
+    now: datetime.datetime,
+    half_life: datetime.timedelta,
+) -> DockerImagesDemand:
+    decay = 1.0
+    if images_demand.updated_at is not None and half_life > datetime.timedelta(0):
+        decay = 0.5 ** (max((now - images_demand.updated_at) / half_life, 0))
+    demand = collections.Counter({image: value * decay for image, value in images_demand.demand.items()})
+    demand.update(images)
+    return images_demand.model_copy(
+        update={
+            "updated_at": now,
+            "demand": {image: value for image, value in demand.items() if value >= _MIN_DEMAND},
+        }
+    )
+
+
+def most_demanded_images(images_demand: DockerImagesDemand, count: NonNegativeInt) -> list[DockerGenericTag]:
+    return sorted(images_demand.demand, key=lambda image: (-images_demand.demand[image], image))[:count]
+
+
+def select_most_demanded_images(
+    images_demand: DockerImagesDemand,
+    count: NonNegativeInt,
+    *,
+    now: datetime.datetime,
+    half_life: datetime.timedelta,
+) -> DockerImagesDemand:
+    """the most demanded images are selected again once per half-life, in between the selection is only
+    completed with the most demanded images if it has less than count images"""
+    if images_demand.selected_at is None or now - images_demand.selected_at >= half_life:
+        return images_demand.model_copy(
+            update={"selected_at": now, "selected_images": most_demanded_images(images_demand, count)}
+        )
+    selected_images = images_demand.selected_images[:count]
+    selected_images += [
+        image
+        for image in most_demanded_images(images_demand, count + len(selected_images))
+        if image not in selected_images
+    ][: count - len(selected_images)]
+    return images_demand.model_copy(update={"selected_images": selected_images})
@@ -4,21 +4,29 @@ from fastapi import FastAPI
 from ..core.settings import ApplicationSettings
 
 
-def create_lock_key_and_value(app: FastAPI) -> tuple[str, str]:
-    app_settings: ApplicationSettings = app.state.settings
-    lock_key_parts = [app.title, app.version]
-    lock_value = ""
+def _get_mode_key_parts_and_value(app_settings: ApplicationSettings) -> tuple[list[str], str]:
     if app_settings.AUTOSCALING_NODES_MONITORING:
-        lock_key_parts += [
+        return [
             "dynamic",
             *app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_NODE_LABELS,
-        ]
-        lock_value = json_dumps({"node_labels": app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_NODE_LABELS})
-    elif app_settings.AUTOSCALING_DASK:
-        lock_key_parts += [
+        ], json_dumps({"node_labels": app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_NODE_LABELS})
+    if app_settings.AUTOSCALING_DASK:
+        return [
             "computational",
             f"{app_settings.AUTOSCALING_DASK.DASK_MONITORING_URL}",
-        ]
-        lock_value = json_dumps({"scheduler_url": f"{app_settings.AUTOSCALING_DASK.DASK_MONITORING_URL}"})
-    lock_key = ":".join(f"{k}" for k in lock_key_parts)
+        ], json_dumps({"scheduler_url": f"{app_settings.AUTOSCALING_DASK.DASK_MONITORING_URL}"})
+    return [], ""
+
+
+def create_lock_key_and_value(app: FastAPI) -> tuple[str, str]:
+    app_settings: ApplicationSettings = app.state.settings
+    mode_key_parts, lock_value = _get_mode_key_parts_and_value(app_settings)
+    lock_key = ":".join(f"{k}" for k in [app.title, app.version, *mode_key_parts])
     return lock_key, lock_value
+
+
+def create_state_key(app: FastAPI, state_name: str) -> str:
+    """key of a state of the autoscaling that outlives the versions of the service (e.g. learned demand)"""
+    app_settings: ApplicationSettings = app.state.settings
+    mode_key_parts, _ = _get_mode_key_parts_and_value(app_settings)
+    return ":".join(f"{k}" for k in [app.title, *mode_key_parts, state_name])
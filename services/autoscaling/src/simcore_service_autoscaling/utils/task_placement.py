@@ -0,0 +1,312 @@
+"""Placement of the pending tasks on the instances of the cluster and on the instances to launch
+
+The tasks with identical requirements are grouped and the groups are placed by decreasing size
+(first-fit-decreasing): the large tasks take the instances first and the small ones fill the gaps.
+How many tasks of a group an instance can take is computed at once on plain resource vectors
+instead of assigning the tasks one by one, so that a burst of thousands of tasks is planned quickly.
+Among instances of the same priority, the ones that already hold the docker image of the tasks are filled
+first (pulling a large image dominates the start time of a service).
+"""
+
+import logging
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from aws_library.ec2 import EC2InstanceType, Resources
+from models_library.docker import DockerGenericTag, DockerLabelKey
+from models_library.products import ProductName
+from pydantic import ByteSize
+from types_aiobotocore_ec2.literals import InstanceTypeType
+
+from ..core.errors import (
+    TaskBestFittingInstanceNotFoundError,
+    TaskRequirementsAboveRequiredEC2InstanceTypeError,
+    TaskRequiresUnauthorizedEC2InstanceTypeError,
+)
+from ..models import AssignedTasksToInstanceType, AssociatedInstance, NonAssociatedInstance
+from . import utils_ec2
+from .cluster_scaling import find_selected_instance_type_for_task
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TaskRequirements:
+    task: object
+    resources: Resources
+    required_instance_type: InstanceTypeType | None
+    required_node_labels: dict[DockerLabelKey, str]
+    product_name: ProductName | None
+    image: DockerGenericTag | None = None
+
+
+@dataclass(slots=True, kw_only=True)
+class _TaskGroup:
+    requirements: TaskRequirements  # of the first task, identical for all of them
+    tasks: list = field(default_factory=list)
+
+    @property
+    def has_only_numeric_resources(self) -> bool:
+        return all(isinstance(value, int | float) for value in self.requirements.resources.generic_resources.values())
+
+
+def _group_tasks(tasks_requirements: Iterable[TaskRequirements]) -> list[_TaskGroup]:
+    groups: dict[tuple, _TaskGroup] = {}
+    for requirements in tasks_requirements:
+        key = (
+            requirements.resources.cpus,
+            requirements.resources.ram,
+            tuple(sorted(requirements.resources.generic_resources.items())),
+            requirements.required_instance_type,
+            tuple(sorted(requirements.required_node_labels.items())),
+            requirements.product_name,
+            requirements.image,
+        )
+        if (group := groups.get(key)) is None:
+            group = groups[key] = _TaskGroup(requirements=requirements)
+        group.tasks.append(requirements.task)
+    return list(groups.values())
+
+
+def _size(resources: Resources, reference: Resources) -> float:
+    # dominant share of the resources compared to the reference (e.g. the largest instance type)
+    shares = [
+        resources.cpus / reference.cpus if reference.cpus else 0,
+        resources.ram / reference.ram if reference.ram else 0,
+    ]
+    shares.extend(
+        value / reference_value
+        for name, value in resources.generic_resources.items()
+        if isinstance(value, int | float)
+        and isinstance(reference_value := reference.generic_resources.get(name), int | float)
+        and reference_value
+    )
+    return max(shares)
+
+
+def _sorted_by_decreasing_size(groups: list[_TaskGroup], capacities: Iterable[Resources]) -> list[_TaskGroup]:
+    reference = Resources.create_as_empty()
+    for capacity in capacities:
+        reference = Resources.model_construct(
+            cpus=max(reference.cpus, capacity.cpus),
+            ram=max(reference.ram, capacity.ram),
+            generic_resources={
+                name: max(value, reference.generic_resources.get(name, 0))
+                for name, value in capacity.generic_resources.items()
+                if isinstance(value, int | float)
+            }
+            | {
+                name: value
+                for name, value in reference.generic_resources.items()
+                if name not in capacity.generic_resources
+            },
+        )
+    # NOTE: sorted is stable, groups of the same size keep the order of arrival
+    return sorted(groups, key=lambda group: _size(group.requirements.resources, reference), reverse=True)
+
+
+def _count_fitting_tasks(available: Resources, group: _TaskGroup, max_count: int) -> int:
+    """number of tasks of the group that fit in the available resources (at most max_count)"""
+    if not available >= group.requirements.resources:
+        return 0
+    if not group.has_only_numeric_resources:
+        # NOTE: the non numeric resources are not kept once a task is assigned (see Resources.__sub__)
+        return 1
+
+    required = group.requirements.resources
+    count = max_count
+    for available_value, required_value in (
+        (available.cpus, required.cpus),
+        (available.ram, required.ram),
+        *(
+            (available_generic_value, value)
+            for name, value in required.generic_resources.items()
+            if isinstance(value, int | float)
+            and isinstance(available_generic_value := available.generic_resources[name], int | float)
+        ),
+    ):
+        if required_value > 0:
+            count = min(count, math.floor(float(available_value) / float(required_value)))
+    count = max(count, 1)
+    # NOTE: guards against the floating point rounding of the division
+    while count > 1 and not available >= _multiply(required, count):
+        count -= 1
+    return count
+
+
+def _multiply(resources: Resources, factor: int) -> Resources:
+    return Resources.model_construct(
+        cpus=resources.cpus * factor,
+        ram=ByteSize(resources.ram * factor),
+        generic_resources={
+            name: value * factor
+            for name, value in resources.generic_resources.items()
+            if isinstance(value, int | float)
+        },
+    )
+
+
+def _assign_group_tasks(
+    instance: AssociatedInstance | NonAssociatedInstance | AssignedTasksToInstanceType, group: _TaskGroup
+) -> None:
+    assert instance.available_resources is not None  # nosec
+    count = _count_fitting_tasks(instance.available_resources, group, len(group.tasks))
+    if count == 0:
+        return
+    assigned_tasks, group.tasks = group.tasks[:count], group.tasks[count:]
+    requirements = group.requirements
+    instance.assign_tasks(
+        assigned_tasks,
+        _multiply(requirements.resources, count),
+        requirements.required_node_labels,
+        requirements.product_name,
+    )
+    _logger.debug(
+        "%s",
+        f"assigned {count} tasks with {requirements.resources=}, {requirements.required_instance_type=}, "
+        f"{requirements.required_node_labels=} to {instance.available_resources=}",
+    )
+
+
+def _has_compatible_labels(
+    instance: AssociatedInstance | NonAssociatedInstance, required_node_labels: dict[DockerLabelKey, str]
+) -> bool:
+    # combine current node labels + pending labels from assigned tasks to check for compatibility
+    effective_labels = instance.osparc_custom_node_labels | instance.tasks_required_pending_labels()
+    return not (
+        required_node_labels
+        and effective_labels
+        and any(effective_labels.get(key) != value for key, value in required_node_labels.items())
+    )
+
+
+def _with_image_first(
+    instances_by_priority: Sequence[Sequence[AssociatedInstance] | Sequence[NonAssociatedInstance]],
+    image: DockerGenericTag | None,
+    instances_images: Mapping[str, set[DockerGenericTag]],
+) -> list[AssociatedInstance | NonAssociatedInstance]:
+    if image is None or not instances_images:
+        return [instance for instances in instances_by_priority for instance in instances]
+    # NOTE: sorted is stable, the instances without the image keep their order
+    return [
+        instance
+        for instances in instances_by_priority
+        for instance in sorted(
+            instances, key=lambda instance: image not in instances_images.get(instance.ec2_instance.id, ())
+        )
+    ]
+
+
+class TaskPlacementPolicy(Protocol):
+    def assign_to_instances(
+        self,
+        tasks_requirements: Sequence[TaskRequirements],
+        instances_by_priority: Sequence[Sequence[AssociatedInstance] | Sequence[NonAssociatedInstance]],
+        *,
+        instances_images: Mapping[str, set[DockerGenericTag]] | None = None,
+    ) -> list:
+        """assigns the tasks to the instances (the first sequences are filled first, and within a sequence
+        the instances holding the image of the tasks, given by EC2 instance ID in instances_images)
+        and returns the tasks that could not be assigned
+        """
+
+    def plan_instances(
+        self,
+        tasks_requirements: Sequence[TaskRequirements],
+        available_ec2_types: list[EC2InstanceType],
+    ) -> list[AssignedTasksToInstanceType]:
+        """returns the instances to launch for the tasks, with their assigned tasks"""
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class FirstFitDecreasingPlacement:
+    # False: keeps the order of arrival of the tasks (i.e. first-fit)
+    decreasing: bool = True
+
+    def _sorted(self, groups: list[_TaskGroup], capacities: Iterable[Resources]) -> list[_TaskGroup]:
+        return _sorted_by_decreasing_size(groups, capacities) if self.decreasing else groups
+
+    def assign_to_instances(
+        self,
+        tasks_requirements: Sequence[TaskRequirements],
+        instances_by_priority: Sequence[Sequence[AssociatedInstance] | Sequence[NonAssociatedInstance]],
+        *,
+        instances_images: Mapping[str, set[DockerGenericTag]] | None = None,
+    ) -> list:
+        unassigned_tasks = []
+        all_instances = [instance for instances in instances_by_priority for instance in instances]
+        for group in self._sorted(
+            _group_tasks(tasks_requirements), (instance.ec2_instance.resources for instance in all_instances)
+        ):
+            requirements = group.requirements
+            for instance in _with_image_first(instances_by_priority, requirements.image, instances_images or {}):
+                if not group.tasks:
+                    break
+                if requirements.required_instance_type and (
+                    requirements.required_instance_type != instance.ec2_instance.type
+                ):
+                    continue
+                if _has_compatible_labels(instance, requirements.required_node_labels):
+                    _assign_group_tasks(instance, group)
+            unassigned_tasks.extend(group.tasks)
+        return unassigned_tasks
+
+    def plan_instances(
+        self,
+        tasks_requirements: Sequence[TaskRequirements],
+        available_ec2_types: list[EC2InstanceType],
+    ) -> list[AssignedTasksToInstanceType]:
+        planned_instances: list[AssignedTasksToInstanceType] = []
+        for group in self._sorted(
+            _group_tasks(tasks_requirements), (instance_type.resources for instance_type in available_ec2_types)
+        ):
+            requirements = group.requirements
+            # first fill the instances already planned
+            for planned_instance in planned_instances:
+                if not group.tasks:
+                    break
+                if requirements.required_instance_type and (
+                    requirements.required_instance_type != planned_instance.instance_type.name
+                ):
+                    continue
+                if planned_instance.has_compatible_labels(requirements.required_node_labels):
+                    _assign_group_tasks(planned_instance, group)
+
+            # then plan new instances for the remaining tasks
+            while group.tasks:
+                try:
+                    if requirements.required_instance_type:
+                        instance_type = find_selected_instance_type_for_task(
+                            requirements.required_instance_type,
+                            available_ec2_types,
+                            group.tasks[0],
+                            requirements.resources,
+                        )
+                    else:
+                        # we go for best fitting type
+                        instance_type = utils_ec2.find_best_fitting_ec2_instance(
+                            available_ec2_types,
+                            requirements.resources,
+                            score_type=utils_ec2.closest_instance_policy,
+                        )
+                except TaskBestFittingInstanceNotFoundError:
+                    _logger.exception("%d tasks need more resources: %s", len(group.tasks), f"{group.tasks[0]}")
+                    break
+                except (
+                    TaskRequirementsAboveRequiredEC2InstanceTypeError,
+                    TaskRequiresUnauthorizedEC2InstanceTypeError,
+                ):
+                    _logger.exception("Unexpected error:")
+                    break
+
+                new_instance = AssignedTasksToInstanceType(
+                    instance_type=instance_type,
+                    available_resources=instance_type.resources,
+                    osparc_custom_node_labels=dict(requirements.required_node_labels),
+                )
+                _assign_group_tasks(new_instance, group)
+                planned_instances.append(new_instance)
+
+        return planned_instances
@@ -23,6 +23,7 @@ from models_library.generated_models.docker_rest_api import (
     Availability,
     Node,
     NodeState,
+    Role,
     Service,
     Task,
     TaskState,
@@ -48,6 +49,7 @@ from ..constants import (
 from ..core.settings import ApplicationSettings
 from ..models import AssociatedInstance
 from ..modules.docker import AutoscalingDocker
+from .cluster_snapshot import get_docker_cluster_snapshot
 
 _logger = logging.getLogger(__name__)
 _NANO_CPU: Final[float] = 10**9
@@ -99,22 +101,24 @@ async def get_monitored_nodes(docker_client: AutoscalingDocker, node_labels: lis
     node_label_filters = [f"{label}=true" for label in node_labels] + [
         f"{label}" for label in _OSPARC_SERVICE_READY_LABEL_KEYS
     ]
-    list_of_nodes = TypeAdapter(list[Node]).validate_python(
-        await docker_client.nodes.list(filters={"node.label": node_label_filters})
-    )
+    if snapshot := get_docker_cluster_snapshot(docker_client):
+        list_of_nodes = snapshot.list_nodes(labels=node_label_filters)
+    else:
+        list_of_nodes = TypeAdapter(list[Node]).validate_python(
+            await docker_client.nodes.list(filters={"node.label": node_label_filters})
+        )
     list_of_nodes.sort(key=_get_node_creation_date)
     return list_of_nodes
 
 
 async def get_worker_nodes(docker_client: AutoscalingDocker) -> list[Node]:
-    list_of_nodes = TypeAdapter(list[Node]).validate_python(
-        await docker_client.nodes.list(
-            filters={
-                "role": ["worker"],
-                "node.label": [f"{label}" for label in _OSPARC_SERVICE_READY_LABEL_KEYS],
-            }
+    node_label_filters = [f"{label}" for label in _OSPARC_SERVICE_READY_LABEL_KEYS]
+    if snapshot := get_docker_cluster_snapshot(docker_client):
+        list_of_nodes = snapshot.list_nodes(labels=node_label_filters, role=Role.worker)
+    else:
+        list_of_nodes = TypeAdapter(list[Node]).validate_python(
+            await docker_client.nodes.list(filters={"role": ["worker"], "node.label": node_label_filters})
         )
-    )
     list_of_nodes.sort(key=_get_node_creation_date)
     return list_of_nodes
 
@@ -159,9 +163,15 @@ def _is_task_waiting_for_resources(task: Task) -> bool:
         )
 
 
-async def _associated_service_has_no_node_placement_constraints(docker_client: AutoscalingDocker, task: Task) -> bool:
+async def _inspect_task_service(docker_client: AutoscalingDocker, task: Task) -> Service:
     assert task.service_id  # nosec
-    service_inspect = TypeAdapter(Service).validate_python(await docker_client.services.inspect(task.service_id))
+    if (snapshot := get_docker_cluster_snapshot(docker_client)) and (service := snapshot.get_service(task.service_id)):
+        return service
+    return TypeAdapter(Service).validate_python(await docker_client.services.inspect(task.service_id))
+
+
+async def _associated_service_has_no_node_placement_constraints(docker_client: AutoscalingDocker, task: Task) -> bool:
+    service_inspect = await _inspect_task_service(docker_client, task)
     assert service_inspect.spec  # nosec
     assert service_inspect.spec.task_template  # nosec
 
@@ -199,14 +209,17 @@ async def pending_service_tasks_with_insufficient_resources(
     - have an error message with "insufficient resources"
     - are not scheduled on any node
     """
-    tasks = TypeAdapter(list[Task]).validate_python(
-        await docker_client.tasks.list(
-            filters={
-                "desired-state": "running",
-                "label": service_labels,
-            }
+    if snapshot := get_docker_cluster_snapshot(docker_client):
+        tasks = snapshot.list_tasks(service_labels=service_labels, desired_state=TaskState.running)
+    else:
+        tasks = TypeAdapter(list[Task]).validate_python(
+            await docker_client.tasks.list(
+                filters={
+                    "desired-state": "running",
+                    "label": service_labels,
+                }
+            )
         )
-    )
 
     sorted_tasks = sorted(tasks, key=_by_created_dt)
     _logger.debug(
@@ -299,8 +312,7 @@ async def get_task_osparc_custom_docker_placement_constraints(
     custom_labels: dict[DockerLabelKey, str] = {}
 
     with contextlib.suppress(ValidationError):
-        assert task.service_id  # nosec
-        service_inspect = TypeAdapter(Service).validate_python(await docker_client.services.inspect(task.service_id))
+        service_inspect = await _inspect_task_service(docker_client, task)
         assert service_inspect.spec  # nosec
         assert service_inspect.spec.task_template  # nosec
 
@@ -331,10 +343,43 @@ def get_task_product_name(task: Task) -> ProductName | None:
     return None
 
 
+def get_task_image(task: Task) -> DockerGenericTag | None:
+    """Returns the docker image of the task (without the digest docker swarm pins it with)"""
+    if not (task.spec and task.spec.container_spec and task.spec.container_spec.image):
+        return None
+    image, _, _digest = task.spec.container_spec.image.partition("@")
+    with contextlib.suppress(ValidationError):
+        return TypeAdapter(DockerGenericTag).validate_python(image)
+    return None
+
+
+async def list_node_docker_images(docker_client: AutoscalingDocker, node: Node) -> set[DockerGenericTag]:
+    """Returns the docker images that are present on the node
+
+    NOTE: the docker API only lists the images of the docker engine it is connected to (i.e. the manager),
+    the images of a node are therefore the ones of the tasks whose container was created on that node
+    (docker swarm keeps a history of the tasks)
+    """
+    assert node.id  # nosec
+    if snapshot := get_docker_cluster_snapshot(docker_client):
+        all_tasks_on_node = snapshot.list_tasks(node_id=node.id)
+    else:
+        all_tasks_on_node = TypeAdapter(list[Task]).validate_python(
+            await docker_client.tasks.list(filters={"node": node.id})
+        )
+    return {
+        image
+        for task in all_tasks_on_node
+        if task.status
+        and task.status.container_status
+        and task.status.container_status.container_id
+        and (image := get_task_image(task))
+    }
+
+
 async def get_task_instance_restriction(docker_client: AutoscalingDocker, task: Task) -> InstanceTypeType | None:
     with contextlib.suppress(ValidationError):
-        assert task.service_id  # nosec
-        service_inspect = TypeAdapter(Service).validate_python(await docker_client.services.inspect(task.service_id))
+        service_inspect = await _inspect_task_service(docker_client, task)
         assert service_inspect.spec  # nosec
         assert service_inspect.spec.task_template  # nosec
 
@@ -372,7 +417,12 @@ async def compute_node_used_resources(
     task_filters: dict[str, str | list[DockerLabelKey]] = {"node": node.id}
     if service_labels is not None:
         task_filters |= {"label": service_labels}
-    all_tasks_on_node = TypeAdapter(list[Task]).validate_python(await docker_client.tasks.list(filters=task_filters))
+    if snapshot := get_docker_cluster_snapshot(docker_client):
+        all_tasks_on_node = snapshot.list_tasks(node_id=node.id, service_labels=service_labels or [])
+    else:
+        all_tasks_on_node = TypeAdapter(list[Task]).validate_python(
+            await docker_client.tasks.list(filters=task_filters)
+        )
     _logger.debug(
         "found following tasks on node %s: %s, using filters %s",
         node.id,
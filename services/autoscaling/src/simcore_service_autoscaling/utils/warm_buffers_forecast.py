@@ -0,0 +1,153 @@
+"""Forecast of the machines demand used to size the warm buffer pools
+
+The demand of an instance type is the number of machines started per bucket of time (i.e. new machines
+launched or warm buffers activated, each one is a user waiting for capacity). The demand is diurnal/weekly,
+therefore each bucket of the season (e.g. mondays 9:00-10:00) keeps an exponentially weighted moving
+average of the demand observed in that bucket in the past seasons. The warm buffer pool of an instance
+type is sized to the demand forecasted for the current and next buckets, within the configured bounds.
+"""
+
+import datetime
+import math
+from collections.abc import Iterable
+from typing import cast
+
+from aws_library.ec2 import EC2InstanceData
+from pydantic import BaseModel, NonNegativeFloat, NonNegativeInt
+from types_aiobotocore_ec2.literals import InstanceTypeType
+
+from ..constants import DEACTIVATED_BUFFER_MACHINE_EC2_TAGS, LEGACY_DEACTIVATED_BUFFER_MACHINE_EC2_TAGS
+from ..core.settings import ApplicationSettings, WarmBuffersForecastSettings
+
+
+class WarmBuffersForecast(BaseModel):
+    observed_until: datetime.datetime | None = None
+    current_bucket: int | None = None
+    current_bucket_demand: dict[InstanceTypeType, NonNegativeInt] = {}
+    seasonal_demand: dict[InstanceTypeType, dict[int, NonNegativeFloat]] = {}
+    last_bucket_predicted_demand: dict[InstanceTypeType, NonNegativeFloat] = {}
+    last_bucket_observed_demand: dict[InstanceTypeType, NonNegativeInt] = {}
+
+
+def _bucket_index(settings: WarmBuffersForecastSettings, when: datetime.datetime) -> int:
+    return int(when.timestamp() // settings.WARM_BUFFERS_FORECAST_BUCKET.total_seconds())
+
+
+def _season_slot(settings: WarmBuffersForecastSettings, bucket_index: int) -> int:
+    return bucket_index % int(settings.WARM_BUFFERS_FORECAST_SEASON / settings.WARM_BUFFERS_FORECAST_BUCKET)
+
+
+def _is_deactivated_warm_buffer(instance: EC2InstanceData) -> bool:
+    return any(
+        all(instance.tags.get(key) == value for key, value in tags.items())
+        for tags in (DEACTIVATED_BUFFER_MACHINE_EC2_TAGS, LEGACY_DEACTIVATED_BUFFER_MACHINE_EC2_TAGS)
+    )
+
+
+def _predicted_demand(
+    settings: WarmBuffersForecastSettings,
+    forecast: WarmBuffersForecast,
+    instance_type: InstanceTypeType,
+    bucket_index: int,
+) -> float:
+    return forecast.seasonal_demand.get(instance_type, {}).get(_season_slot(settings, bucket_index), 0)
+
+
+def _fold_current_bucket(settings: WarmBuffersForecastSettings, forecast: WarmBuffersForecast) -> WarmBuffersForecast:
+    """the demand of the finished bucket updates the moving average of its season slot"""
+    assert forecast.current_bucket is not None  # nosec
+    slot = _season_slot(settings, forecast.current_bucket)
+    seasonal_demand = {instance_type: dict(demand) for instance_type, demand in forecast.seasonal_demand.items()}
+    last_predicted_demand: dict[InstanceTypeType, float] = {}
+    for instance_type in set(seasonal_demand) | set(forecast.current_bucket_demand):
+        observed = forecast.current_bucket_demand.get(instance_type, 0)
+        slots_demand = seasonal_demand.setdefault(instance_type, {})
+        last_predicted_demand[instance_type] = slots_demand.get(slot, 0)
+        slots_demand[slot] = (
+            observed
+            if slot not in slots_demand
+            else settings.WARM_BUFFERS_FORECAST_SMOOTHING * observed
+            + (1 - settings.WARM_BUFFERS_FORECAST_SMOOTHING) * slots_demand[slot]
+        )
+    return forecast.model_copy(
+        update={
+            "current_bucket_demand": {},
+            "seasonal_demand": seasonal_demand,
+            "last_bucket_predicted_demand": last_predicted_demand,
+            "last_bucket_observed_demand": {
+                instance_type: forecast.current_bucket_demand.get(instance_type, 0)
+                for instance_type in last_predicted_demand
+            },
+        }
+    )
+
+
+def record_started_instances(
+    settings: WarmBuffersForecastSettings,
+    forecast: WarmBuffersForecast,
+    *,
+    active_instances: Iterable[EC2InstanceData],
+    now: datetime.datetime,
+) -> WarmBuffersForecast:
+    """counts the instances of the cluster started since the last call as demand
+
+    NOTE: EC2 resets the launch time of an instance when it starts, the deactivated warm buffers are ignored
+    """
+    bucket_index = _bucket_index(settings, now)
+    if forecast.current_bucket is not None and forecast.current_bucket != bucket_index:
+        # NOTE: if buckets were skipped (e.g. the service was down), their demand is unknown and left as is
+        forecast = _fold_current_bucket(settings, forecast)
+
+    current_bucket_demand = dict(forecast.current_bucket_demand)
+    if forecast.observed_until is not None:
+        for instance in active_instances:
+            if instance.launch_time > forecast.observed_until and not _is_deactivated_warm_buffer(instance):
+                current_bucket_demand[instance.type] = current_bucket_demand.get(instance.type, 0) + 1
+
+    return forecast.model_copy(
+        update={
+            "observed_until": now,
+            "current_bucket": bucket_index,
+            "current_bucket_demand": current_bucket_demand,
+        }
+    )
+
+
+def predicted_demand(
+    settings: WarmBuffersForecastSettings,
+    forecast: WarmBuffersForecast,
+    instance_type: InstanceTypeType,
+    *,
+    now: datetime.datetime,
+) -> float:
+    """the demand forecasted for the current bucket"""
+    return _predicted_demand(settings, forecast, instance_type, _bucket_index(settings, now))
+
+
+def compute_warm_buffer_counts(
+    app_settings: ApplicationSettings, forecast: WarmBuffersForecast, *, now: datetime.datetime
+) -> dict[InstanceTypeType, int]:
+    """the warm buffer pools are sized to cover the demand of the current and next buckets
+
+    NOTE: preparing a warm buffer takes minutes, hence the next bucket is anticipated
+    """
+    assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+    assert app_settings.AUTOSCALING_WARM_BUFFERS_FORECAST  # nosec
+    settings = app_settings.AUTOSCALING_WARM_BUFFERS_FORECAST
+    bucket_index = _bucket_index(settings, now)
+    buffer_counts: dict[InstanceTypeType, int] = {}
+    for instance_type_name, boot_specific in app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ALLOWED_TYPES.items():
+        instance_type = cast(InstanceTypeType, instance_type_name)
+        max_buffer_count = settings.WARM_BUFFERS_FORECAST_MAX_BUFFER_COUNTS.get(instance_type_name)
+        if max_buffer_count is None:
+            buffer_counts[instance_type] = boot_specific.buffer_count
+            continue
+        forecasted_demand = max(
+            _predicted_demand(settings, forecast, instance_type, bucket_index),
+            _predicted_demand(settings, forecast, instance_type, bucket_index + 1),
+        )
+        buffer_counts[instance_type] = min(
+            max(math.ceil(forecasted_demand), boot_specific.buffer_count),
+            max(max_buffer_count, boot_specific.buffer_count),
+        )
+    return buffer_counts
@@ -0,0 +1,19 @@
+"""Offline simulation of the autoscaling
+
+Replays a trace of tasks against the real autoscaling cycles with in-memory EC2, SSM, docker swarm
+and dask scheduler, in virtual time. Reports the time to capacity, the machine hours/cost and the
+latency of the autoscaling cycles (e.g. to compare settings or policies before deploying them).
+
+NOTE: the harness patches the time sources, the dask module and the rabbitmq messages of the autoscaling,
+it is therefore only a test tool. Run it from tests/unit with the settings of the autoscaling in the
+environment, e.g. `python -m simulation trace.json`
+"""
+
+from ._models import SimulationReport, SimulationTrace
+from ._simulator import run_simulation
+
+__all__: tuple[str, ...] = (
+    "SimulationReport",
+    "SimulationTrace",
+    "run_simulation",
+)
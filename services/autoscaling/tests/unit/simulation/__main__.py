@@ -0,0 +1,19 @@
+import asyncio
+from pathlib import Path
+
+import typer
+from simcore_service_autoscaling.core.settings import ApplicationSettings
+
+from ._models import SimulationTrace
+from ._simulator import run_simulation
+
+
+def simulate(trace_path: Path):
+    """Replays a trace of tasks against the autoscaling (with simulated EC2, docker and dask) and prints a report"""
+    trace = SimulationTrace.model_validate_json(trace_path.read_text())
+    report = asyncio.run(run_simulation(ApplicationSettings.create_from_envs(), trace))
+    typer.echo(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    typer.run(simulate)
@@ -0,0 +1,52 @@
+import contextlib
+import datetime
+import types
+from collections.abc import Iterator
+from dataclasses import dataclass
+from unittest import mock
+
+import arrow
+from simcore_service_autoscaling.modules.cluster_scaling import _auto_scaling_core
+from simcore_service_autoscaling.utils import cluster_scaling, utils_docker
+
+# NOTE: these modules call datetime.datetime.now() directly (the others use arrow.utcnow())
+_MODULES_USING_DATETIME_NOW = (_auto_scaling_core, cluster_scaling, utils_docker)
+
+
+@dataclass(kw_only=True, slots=True)
+class VirtualClock:
+    start: datetime.datetime
+    elapsed_s: float = 0
+
+    def now(self) -> datetime.datetime:
+        return self.start + datetime.timedelta(seconds=self.elapsed_s)
+
+    def advance(self, seconds: float) -> None:
+        self.elapsed_s += seconds
+
+
+def _create_datetime_module(clock: VirtualClock) -> types.ModuleType:
+    class _VirtualDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz: datetime.tzinfo | None = None) -> datetime.datetime:  # type: ignore[override]
+            return clock.now().astimezone(tz) if tz else clock.now().replace(tzinfo=None)
+
+    virtual_datetime_module = types.ModuleType(datetime.__name__)
+    virtual_datetime_module.__dict__.update(vars(datetime))
+    virtual_datetime_module.datetime = _VirtualDatetime  # type: ignore[attr-defined]
+    return virtual_datetime_module
+
+
+@contextlib.contextmanager
+def patched_time_sources(clock: VirtualClock) -> Iterator[None]:
+    """the autoscaling reads the time from the virtual clock within this context"""
+    virtual_datetime_module = _create_datetime_module(clock)
+
+    def _virtual_utcnow() -> arrow.Arrow:
+        return arrow.Arrow.fromdatetime(clock.now())
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.object(arrow, "utcnow", _virtual_utcnow))
+        for module in _MODULES_USING_DATETIME_NOW:
+            stack.enter_context(mock.patch.object(module, "datetime", virtual_datetime_module))
+        yield
@@ -0,0 +1,272 @@
+"""In-memory replacements of the EC2 and SSM clients (same interface as SimcoreEC2API and SimcoreSSMAPI)
+
+The instances go through the EC2 states with the delays of the simulation timings. The swarm joining
+is driven by the simulator (only the instances whose startup script joins the swarm do so).
+"""
+
+import datetime
+import itertools
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Literal
+
+from aws_library.ec2 import EC2InstanceConfig, EC2InstanceData, EC2InstanceType, EC2Tags, Resources
+from aws_library.ec2._errors import EC2TooManyInstancesError
+from aws_library.ec2._models import AWSTagKey
+from aws_library.ssm import SSMInvalidCommandError
+from aws_library.ssm._client import SSMCommand
+from simcore_service_autoscaling.constants import PREPULL_COMMAND_NAME
+from types_aiobotocore_ec2.literals import InstanceStateNameType, InstanceTypeType
+
+from ._clock import VirtualClock
+from ._models import SimulatedInstanceType, SimulationTimings
+
+_SWARM_JOIN_COMMAND = "docker swarm join"
+
+
+@dataclass(kw_only=True, slots=True)
+class SimulatedEC2Instance:
+    id: str
+    type: InstanceTypeType
+    key_name: str
+    private_ip: str
+    tags: EC2Tags
+    startup_script: str
+    launch_time: datetime.datetime
+    state: InstanceStateNameType = "pending"
+    state_since: datetime.datetime
+    started_from_stopped: bool = False
+
+    @property
+    def host_name(self) -> str:
+        return f"ip-{self.private_ip.replace('.', '-')}"
+
+    @property
+    def joins_swarm(self) -> bool:
+        return _SWARM_JOIN_COMMAND in self.startup_script
+
+    @property
+    def is_billed(self) -> bool:
+        return self.state in ("pending", "running")
+
+
+class FakeEC2:
+    def __init__(
+        self, clock: VirtualClock, instance_types: Iterable[SimulatedInstanceType], timings: SimulationTimings
+    ) -> None:
+        self._clock = clock
+        self._timings = timings
+        self._instance_types = {instance_type.name: instance_type for instance_type in instance_types}
+        self._instance_counter = itertools.count(1)
+        self.instances: dict[str, SimulatedEC2Instance] = {}
+
+    def _resources(self, instance_type_name: InstanceTypeType) -> Resources:
+        instance_type = self._instance_types[instance_type_name]
+        return Resources(cpus=instance_type.cpus, ram=instance_type.ram)
+
+    def _instance_data(self, instance: SimulatedEC2Instance) -> EC2InstanceData:
+        # NOTE: as with the real client, each call returns new objects that the caller may modify
+        return EC2InstanceData(
+            launch_time=instance.launch_time,
+            id=instance.id,
+            aws_private_dns=f"{instance.host_name}.ec2.internal",
+            aws_public_ip=None,
+            type=instance.type,
+            state=instance.state,
+            resources=self._resources(instance.type),
+            tags=dict(instance.tags),
+        )
+
+    def _set_state(self, instance: SimulatedEC2Instance, state: InstanceStateNameType) -> None:
+        instance.state = state
+        instance.state_since = self._clock.now()
+
+    def running_for_s(self, instance: SimulatedEC2Instance) -> float | None:
+        if instance.state != "running":
+            return None
+        return (self._clock.now() - instance.state_since).total_seconds()
+
+    def step(self) -> None:
+        """moves the instances to their next state once the corresponding delay elapsed"""
+        now = self._clock.now()
+        for instance in self.instances.values():
+            elapsed_s = (now - instance.state_since).total_seconds()
+            if instance.state == "pending" and elapsed_s >= self._timings.ec2_pending_s:
+                self._set_state(instance, "running")
+            elif instance.state == "stopping" and elapsed_s >= self._timings.ec2_stopping_s:
+                self._set_state(instance, "stopped")
+
+    async def get_ec2_instance_capabilities(
+        self, instance_type_names: set[InstanceTypeType] | Literal["ALL"]
+    ) -> list[EC2InstanceType]:
+        names = set(self._instance_types) if instance_type_names == "ALL" else instance_type_names
+        return [
+            EC2InstanceType(name=name, resources=self._resources(name))
+            for name in sorted(names)
+            if name in self._instance_types
+        ]
+
+    async def launch_instances(
+        self,
+        instance_config: EC2InstanceConfig,
+        *,
+        min_number_of_instances: int,
+        number_of_instances: int,
+        max_total_number_of_instances: int = 10,
+    ) -> list[EC2InstanceData]:
+        assert min_number_of_instances <= number_of_instances  # nosec
+        current_instances = await self.get_instances(key_names=[instance_config.key_name], tags=instance_config.tags)
+        if len(current_instances) + number_of_instances > max_total_number_of_instances:
+            raise EC2TooManyInstancesError(num_instances=max_total_number_of_instances)
+
+        now = self._clock.now()
+        new_instances = []
+        for _ in range(number_of_instances):
+            instance_number = next(self._instance_counter)
+            ip_bytes = instance_number.to_bytes(3, "big")
+            instance = SimulatedEC2Instance(
+                id=f"i-{instance_number:017x}",
+                type=instance_config.type.name,
+                key_name=instance_config.key_name,
+                private_ip=f"10.{ip_bytes[0]}.{ip_bytes[1]}.{ip_bytes[2]}",
+                tags=dict(instance_config.tags),
+                startup_script=instance_config.startup_script,
+                launch_time=now,
+                state_since=now,
+            )
+            self.instances[instance.id] = instance
+            new_instances.append(self._instance_data(instance))
+        return new_instances
+
+    async def get_instances(
+        self,
+        *,
+        key_names: list[str],
+        tags: EC2Tags,
+        state_names: list[InstanceStateNameType] | None = None,
+    ) -> list[EC2InstanceData]:
+        if state_names is None:
+            state_names = ["pending", "running"]
+        return [
+            self._instance_data(instance)
+            for instance in self.instances.values()
+            if instance.key_name in key_names
+            and instance.state in state_names
+            and all(instance.tags.get(key) == value for key, value in tags.items())
+        ]
+
+    async def start_instances(
+        self, instance_datas: Iterable[EC2InstanceData], *, change_startup_script: str | None = None
+    ) -> list[EC2InstanceData]:
+        started_instances = []
+        for instance_data in instance_datas:
+            instance = self.instances[instance_data.id]
+            if instance.state == "stopped":
+                if change_startup_script is not None:
+                    instance.startup_script = change_startup_script
+                instance.launch_time = self._clock.now()
+                instance.started_from_stopped = True
+                self._set_state(instance, "pending")
+            started_instances.append(self._instance_data(instance))
+        return started_instances
+
+    async def stop_instances(self, instance_datas: Iterable[EC2InstanceData]) -> None:
+        for instance_data in instance_datas:
+            instance = self.instances[instance_data.id]
+            if instance.state in ("pending", "running"):
+                self._set_state(instance, "stopping")
+
+    async def terminate_instances(self, instance_datas: Iterable[EC2InstanceData]) -> None:
+        for instance_data in instance_datas:
+            self._set_state(self.instances[instance_data.id], "terminated")
+
+    async def set_instances_tags(self, instances: Sequence[EC2InstanceData], *, tags: EC2Tags) -> None:
+        for instance_data in instances:
+            self.instances[instance_data.id].tags.update(tags)
+
+    async def remove_instances_tags(
+        self, instances: Sequence[EC2InstanceData], *, tag_keys: Iterable[AWSTagKey]
+    ) -> None:
+        tag_keys = list(tag_keys)
+        for instance_data in instances:
+            for tag_key in tag_keys:
+                self.instances[instance_data.id].tags.pop(tag_key, None)
+
+
+@dataclass(kw_only=True, slots=True)
+class _SimulatedSSMCommand:
+    command_id: str
+    name: str
+    instance_ids: Sequence[str]
+    start_time: datetime.datetime
+    duration_s: float
+    cancelled_instance_ids: set[str] = field(default_factory=set)
+
+
+class FakeSSM:
+    def __init__(self, clock: VirtualClock, ec2: FakeEC2, timings: SimulationTimings) -> None:
+        self._clock = clock
+        self._ec2 = ec2
+        self._timings = timings
+        self._command_counter = itertools.count(1)
+        self._commands: dict[str, _SimulatedSSMCommand] = {}
+
+    def _is_instance_ready(self, instance_id: str) -> bool:
+        running_for_s = self._ec2.running_for_s(self._ec2.instances[instance_id])
+        return running_for_s is not None and running_for_s >= self._timings.ec2_ssm_ready_s
+
+    def _ssm_command(self, command: _SimulatedSSMCommand, instance_id: str) -> SSMCommand:
+        finish_time = command.start_time + datetime.timedelta(seconds=command.duration_s)
+        if instance_id in command.cancelled_instance_ids:
+            return SSMCommand(
+                name=command.name,
+                command_id=command.command_id,
+                instance_ids=[instance_id],
+                status="Cancelled",
+                start_time=command.start_time,
+                finish_time=None,
+            )
+        is_finished = self._clock.now() >= finish_time
+        return SSMCommand(
+            name=command.name,
+            command_id=command.command_id,
+            instance_ids=[instance_id],
+            status="Success" if is_finished else "InProgress",
+            start_time=command.start_time,
+            finish_time=finish_time if is_finished else None,
+        )
+
+    async def send_command(self, instance_ids: Sequence[str], *, command: str, command_name: str) -> SSMCommand:
+        assert command  # nosec
+        simulated_command = _SimulatedSSMCommand(
+            command_id=f"sim-command-{next(self._command_counter)}",
+            name=command_name,
+            instance_ids=list(instance_ids),
+            start_time=self._clock.now(),
+            duration_s=self._timings.images_pull_s if command_name == PREPULL_COMMAND_NAME else 0,
+        )
+        self._commands[simulated_command.command_id] = simulated_command
+        return SSMCommand(
+            name=simulated_command.name,
+            command_id=simulated_command.command_id,
+            instance_ids=simulated_command.instance_ids,
+            status="Pending",
+            start_time=simulated_command.start_time,
+            finish_time=None,
+        )
+
+    async def get_command(self, instance_id: str, *, command_id: str) -> SSMCommand:
+        if (command := self._commands.get(command_id)) is None or instance_id not in command.instance_ids:
+            raise SSMInvalidCommandError(command_id=command_id)
+        return self._ssm_command(command, instance_id)
+
+    async def cancel_command(self, instance_id: str, *, command_id: str) -> None:
+        if (command := self._commands.get(command_id)) is None:
+            raise SSMInvalidCommandError(command_id=command_id)
+        command.cancelled_instance_ids.add(instance_id)
+
+    async def is_instance_connected_to_ssm_server(self, instance_id: str) -> bool:
+        return self._is_instance_ready(instance_id)
+
+    async def wait_for_has_instance_completed_cloud_init(self, instance_id: str) -> bool:
+        return self._is_instance_ready(instance_id)
@@ -0,0 +1,241 @@
+"""In-memory replacement of the dask scheduler (same interface as the functions of modules.dask)
+
+A worker runs on every machine whose docker node is ready for osparc services. As in dask, a task that
+no worker could ever run is unrunnable, otherwise it is processed by a worker (i.e. it runs as soon as
+the worker has enough free resources and threads, it is queued until then).
+"""
+
+import collections
+from dataclasses import dataclass, field
+
+from aws_library.ec2 import EC2InstanceData, EC2InstanceType, Resources
+from dask_task_models_library.resource_constraints import (
+    DASK_WORKER_THREAD_RESOURCE_NAME,
+    DaskTaskResources,
+    create_ec2_resource_constraint_key,
+    estimate_dask_worker_resources_from_ec2_instance,
+)
+from models_library.clusters import ClusterAuthentication
+from pydantic import AnyUrl, ByteSize
+from simcore_service_autoscaling.core.errors import DaskWorkerNotFoundError
+from simcore_service_autoscaling.core.settings import DaskMonitoringSettings
+from simcore_service_autoscaling.models import DaskTask
+from simcore_service_autoscaling.modules import dask
+from simcore_service_autoscaling.modules.cluster_scaling._utils_computational import DASK_TO_RESOURCE_NAME_MAPPING
+from simcore_service_autoscaling.utils.utils_ec2 import node_ip_from_ec2_private_dns
+
+from ._models import SimulatedInstanceType
+
+_DASK_WORKER_PORT = 8786
+
+
+@dataclass(kw_only=True, slots=True)
+class _SimulatedDaskWorker:
+    url: str
+    host: str
+    resources: dict[str, float]
+    nthreads: int
+    status: str = "running"
+    processing: list[str] = field(default_factory=list)
+    running: set[str] = field(default_factory=set)
+
+
+class FakeDaskScheduler:
+    def __init__(self, settings: DaskMonitoringSettings) -> None:
+        self._settings = settings
+        self._workers: dict[str, _SimulatedDaskWorker] = {}
+        self._tasks: dict[str, DaskTaskResources] = {}
+        self._unrunnable: dict[str, None] = {}
+
+    @staticmethod
+    def _task_resources(task_resources: DaskTaskResources) -> DaskTaskResources:
+        return task_resources | {DASK_WORKER_THREAD_RESOURCE_NAME: 1}
+
+    def _worker(self, ec2_instance: EC2InstanceData) -> _SimulatedDaskWorker:
+        host = node_ip_from_ec2_private_dns(ec2_instance)
+        if (worker := self._workers.get(host)) is None:
+            raise DaskWorkerNotFoundError(
+                worker_host=ec2_instance.aws_private_dns, url=self._settings.DASK_MONITORING_URL
+            )
+        return worker
+
+    def _fits(self, task_resources: DaskTaskResources, available_resources: dict[str, float]) -> bool:
+        return all(
+            available_resources.get(name, 0) >= value
+            for name, value in task_resources.items()
+            if name != DASK_WORKER_THREAD_RESOURCE_NAME
+        )
+
+    def _free_resources(self, worker: _SimulatedDaskWorker) -> dict[str, float]:
+        free_resources = collections.Counter(worker.resources)
+        for task_id in worker.running:
+            free_resources.subtract(
+                {name: value for name, value in self._tasks[task_id].items() if name in free_resources}
+            )
+        return dict(free_resources)
+
+    # simulation interface
+
+    def sync_workers(self, ready_hosts: dict[str, SimulatedInstanceType]) -> None:
+        """a worker runs on each of the ready hosts, the tasks of the vanished workers are unrunnable again"""
+        for host in list(self._workers):
+            if host not in ready_hosts:
+                worker = self._workers.pop(host)
+                self._unrunnable |= dict.fromkeys(worker.processing)
+        for host, instance_type in ready_hosts.items():
+            if host in self._workers:
+                continue
+            worker_cpus, worker_ram = estimate_dask_worker_resources_from_ec2_instance(
+                instance_type.cpus, instance_type.ram
+            )
+            adjusted_instance_type = EC2InstanceType(
+                name=instance_type.name, resources=Resources(cpus=worker_cpus, ram=ByteSize(worker_ram))
+            )
+            dask.add_instance_type_generic_resource(self._settings, adjusted_instance_type)
+            self._workers[host] = _SimulatedDaskWorker(
+                url=f"tcp://{host}:{_DASK_WORKER_PORT}",
+                host=host,
+                resources={
+                    "CPU": worker_cpus,
+                    "RAM": worker_ram,
+                    create_ec2_resource_constraint_key(instance_type.name): 1,
+                },
+                nthreads=int(adjusted_instance_type.resources.generic_resources[DASK_WORKER_THREAD_RESOURCE_NAME]),
+            )
+
+    def submit(self, task_id: str, task_resources: DaskTaskResources) -> None:
+        self._tasks[task_id] = self._task_resources(task_resources)
+        self._unrunnable[task_id] = None
+
+    def complete(self, task_id: str) -> None:
+        del self._tasks[task_id]
+        for worker in self._workers.values():
+            if task_id in worker.running:
+                worker.running.remove(task_id)
+                worker.processing.remove(task_id)
+
+    def running_task_ids(self) -> set[str]:
+        return set().union(*(worker.running for worker in self._workers.values()))
+
+    def busy_hosts(self) -> set[str]:
+        return {worker.host for worker in self._workers.values() if worker.running}
+
+    def schedule(self) -> None:
+        """assigns the unrunnable tasks to workers and starts the processing tasks that fit"""
+        running_workers = [worker for worker in self._workers.values() if worker.status == "running"]
+        for task_id in list(self._unrunnable):
+            task_resources = self._tasks[task_id]
+            fitting_workers = [worker for worker in running_workers if self._fits(task_resources, worker.resources)]
+            if not fitting_workers:
+                continue
+            worker = min(fitting_workers, key=lambda worker: len(worker.processing))
+            worker.processing.append(task_id)
+            del self._unrunnable[task_id]
+
+        for worker in self._workers.values():
+            free_resources = self._free_resources(worker)
+            for task_id in worker.processing:
+                if len(worker.running) >= worker.nthreads:
+                    break
+                if task_id in worker.running or not self._fits(self._tasks[task_id], free_resources):
+                    continue
+                worker.running.add(task_id)
+                for name in free_resources:
+                    free_resources[name] -= self._tasks[task_id].get(name, 0)
+
+    # modules.dask interface
+
+    async def list_unrunnable_tasks(
+        self, scheduler_url: AnyUrl, authentication: ClusterAuthentication
+    ) -> list[DaskTask]:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        return [DaskTask(task_id=task_id, required_resources=self._tasks[task_id]) for task_id in self._unrunnable]
+
+    async def list_processing_tasks_per_worker(
+        self, scheduler_url: AnyUrl, authentication: ClusterAuthentication
+    ) -> dict[str, list[DaskTask]]:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        return {
+            worker.url: [
+                DaskTask(task_id=task_id, required_resources=self._tasks[task_id]) for task_id in worker.processing
+            ]
+            for worker in self._workers.values()
+            if worker.processing
+        }
+
+    async def get_worker_still_has_results_in_memory(
+        self, scheduler_url: AnyUrl, authentication: ClusterAuthentication, ec2_instance: EC2InstanceData
+    ) -> int:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        self._worker(ec2_instance)
+        return 0
+
+    async def get_worker_used_resources(
+        self, scheduler_url: AnyUrl, authentication: ClusterAuthentication, ec2_instance: EC2InstanceData
+    ) -> Resources:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        worker = self._worker(ec2_instance)
+        if not worker.processing:
+            return Resources.create_as_empty()
+        total_resources_used: collections.Counter = collections.Counter()
+        for task_id in worker.processing:
+            total_resources_used.update(self._tasks[task_id])
+        return Resources.from_flat_dict(dict(total_resources_used), mapping=DASK_TO_RESOURCE_NAME_MAPPING)
+
+    async def compute_cluster_total_resources(
+        self, scheduler_url: AnyUrl, authentication: ClusterAuthentication, instances: list[EC2InstanceData]
+    ) -> Resources:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        hosts = {node_ip_from_ec2_private_dns(instance) for instance in instances}
+        cluster_resources = Resources.create_as_empty()
+        for worker in self._workers.values():
+            if worker.host in hosts:
+                cluster_resources += Resources.from_flat_dict(
+                    worker.resources | {DASK_WORKER_THREAD_RESOURCE_NAME: worker.nthreads},
+                    mapping=DASK_TO_RESOURCE_NAME_MAPPING,
+                )
+        return cluster_resources
+
+    async def is_worker_connected(
+        self, scheduler_url: AnyUrl, authentication: ClusterAuthentication, worker_ec2_instance: EC2InstanceData
+    ) -> bool:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        worker = self._workers.get(node_ip_from_ec2_private_dns(worker_ec2_instance))
+        return worker is not None and worker.status == "running"
+
+    async def is_worker_retired(
+        self, scheduler_url: AnyUrl, authentication: ClusterAuthentication, worker_ec2_instance: EC2InstanceData
+    ) -> bool:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        worker = self._workers.get(node_ip_from_ec2_private_dns(worker_ec2_instance))
+        return worker is not None and worker.status != "running"
+
+    async def try_retire_nodes(self, scheduler_url: AnyUrl, authentication: ClusterAuthentication) -> None:
+        assert scheduler_url  # nosec
+        assert authentication  # nosec
+        for worker in self._workers.values():
+            if not worker.processing:
+                worker.status = "closing_gracefully"
+
+    def patched_functions(self) -> dict[str, object]:
+        """the functions of modules.dask that are replaced during the simulation"""
+        return {
+            name: getattr(self, name)
+            for name in (
+                "list_unrunnable_tasks",
+                "list_processing_tasks_per_worker",
+                "get_worker_still_has_results_in_memory",
+                "get_worker_used_resources",
+                "compute_cluster_total_resources",
+                "is_worker_connected",
+                "is_worker_retired",
+                "try_retire_nodes",
+            )
+        }
@@ -0,0 +1,372 @@
+"""In-memory replacement of the docker swarm manager (same interface as the used parts of AutoscalingDocker)
+
+The nodes, services and tasks are returned as the docker REST API returns them (i.e. dicts). The simulated
+scheduler places the pending tasks on the ready and active nodes that satisfy the node labels placement
+constraints and have enough unreserved resources, otherwise the tasks stay pending with the same error
+messages as docker.
+"""
+
+import collections
+import itertools
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import ByteSize
+
+from ._clock import VirtualClock
+
+_NANO_CPUS = 1e9
+_NODE_LABEL_CONSTRAINT_PREFIX = "node.labels."
+_SIMULATED_SERVICE_IMAGE = "simcore/services/dynamic/simulated-service:1.0.0"
+
+
+def _as_list(value: str | Iterable[str]) -> list[str]:
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _parse_label_filters(label_filters: Iterable[str]) -> list[tuple[str, str | None]]:
+    return [
+        (key, value) if separator else (key, None)
+        for key, separator, value in (label_filter.partition("=") for label_filter in label_filters)
+    ]
+
+
+def _match_labels(labels: dict[str, str], label_filters: list[tuple[str, str | None]]) -> bool:
+    return all(key in labels and (value is None or labels[key] == value) for key, value in label_filters)
+
+
+def _parse_node_labels_constraints(constraints: Iterable[str]) -> list[tuple[str, str, bool]]:
+    # NOTE: only the node labels constraints are simulated ("node.labels.KEY==VALUE" or "node.labels.KEY!=VALUE")
+    parsed_constraints = []
+    for constraint in constraints:
+        for operator, is_equal in (("==", True), ("!=", False)):
+            key, separator, value = constraint.partition(operator)
+            if separator and key.strip().startswith(_NODE_LABEL_CONSTRAINT_PREFIX):
+                parsed_constraints.append(
+                    (key.strip().removeprefix(_NODE_LABEL_CONSTRAINT_PREFIX), value.strip(), is_equal)
+                )
+                break
+    return parsed_constraints
+
+
+@dataclass(kw_only=True, slots=True)
+class _SimulatedNode:
+    id: str
+    hostname: str
+    ip: str
+    nano_cpus: int
+    memory_bytes: int
+    labels: dict[str, str] = field(default_factory=dict)
+    availability: str
+    state: str = "ready"
+    version: int = 1
+    created_at: str
+    updated_at: str
+
+    @property
+    def is_schedulable(self) -> bool:
+        return self.state == "ready" and self.availability == "active"
+
+
+@dataclass(kw_only=True, slots=True)
+class _SimulatedService:
+    id: str
+    name: str
+    labels: dict[str, str]
+    constraints: list[str]
+    nano_cpus: int
+    memory_bytes: int
+    created_at: str
+
+
+@dataclass(kw_only=True, slots=True)
+class _SimulatedTask:
+    id: str
+    service: _SimulatedService
+    node_id: str | None = None
+    state: str = "pending"
+    err: str | None = None
+    updated_at: str
+
+
+class _FakeNodes:
+    def __init__(self, swarm: "FakeDockerSwarm") -> None:
+        self._swarm = swarm
+
+    async def list(self, *, filters: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        filters = filters or {}
+        label_filters = _parse_label_filters(_as_list(filters.get("node.label", [])))
+        roles = _as_list(filters.get("role", ["worker"]))
+        names = _as_list(filters.get("name", []))
+        return [
+            self._swarm.node_as_dict(node)
+            for node in self._swarm.swarm_nodes.values()
+            if "worker" in roles
+            and _match_labels(node.labels, label_filters)
+            and (not names or any(node.hostname.startswith(name) for name in names))
+        ]
+
+    async def inspect(self, *, node_id: str) -> dict[str, Any]:
+        return self._swarm.node_as_dict(self._swarm.swarm_nodes[node_id])
+
+    async def update(self, *, node_id: str, version: int, spec: dict[str, Any]) -> None:
+        node = self._swarm.swarm_nodes[node_id]
+        if version != node.version:
+            msg = f"update out of sequence for {node_id=}: {version=} != {node.version}"
+            raise ValueError(msg)
+        node.labels = dict(spec.get("Labels") or {})
+        node.availability = spec.get("Availability", node.availability)
+        node.version += 1
+        node.updated_at = self._swarm.timestamp()
+        self._swarm.unschedule_node_tasks_if_needed(node)
+
+    async def remove(self, *, node_id: str, force: bool = False) -> None:
+        node = self._swarm.swarm_nodes[node_id]
+        if node.state != "down" and not force:
+            msg = f"node {node_id} is not down and can't be removed"
+            raise ValueError(msg)
+        self._swarm.remove_node(node)
+
+
+class _FakeServices:
+    def __init__(self, swarm: "FakeDockerSwarm") -> None:
+        self._swarm = swarm
+
+    async def list(self, *, filters: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        label_filters = _parse_label_filters(_as_list((filters or {}).get("label", [])))
+        return [
+            self._swarm.service_as_dict(service)
+            for service in self._swarm.swarm_services.values()
+            if _match_labels(service.labels, label_filters)
+        ]
+
+    async def inspect(self, service_id: str) -> dict[str, Any]:
+        return self._swarm.service_as_dict(self._swarm.swarm_services[service_id])
+
+
+class _FakeTasks:
+    def __init__(self, swarm: "FakeDockerSwarm") -> None:
+        self._swarm = swarm
+
+    async def list(self, *, filters: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        filters = filters or {}
+        # NOTE: as in docker, the label filters apply to the labels of the service of the tasks
+        label_filters = _parse_label_filters(_as_list(filters.get("label", [])))
+        node_ids = _as_list(filters.get("node", []))
+        service_ids = _as_list(filters.get("service", []))
+        desired_states = _as_list(filters.get("desired-state", []))
+        return [
+            self._swarm.task_as_dict(task)
+            for task in self._swarm.swarm_tasks.values()
+            if _match_labels(task.service.labels, label_filters)
+            and (not node_ids or task.node_id in node_ids)
+            and (not service_ids or task.service.id in service_ids)
+            and (not desired_states or "running" in desired_states)
+        ]
+
+
+class FakeDockerSwarm:
+    def __init__(self, clock: VirtualClock) -> None:
+        self._clock = clock
+        self._id_counter = itertools.count(1)
+        self.swarm_nodes: dict[str, _SimulatedNode] = {}
+        self.swarm_services: dict[str, _SimulatedService] = {}
+        self.swarm_tasks: dict[str, _SimulatedTask] = {}
+        # NOTE: same API as the aiodocker client
+        self.nodes = _FakeNodes(self)
+        self.services = _FakeServices(self)
+        self.tasks = _FakeTasks(self)
+
+    def _new_id(self) -> str:
+        return f"{next(self._id_counter):025x}"
+
+    def timestamp(self) -> str:
+        return self._clock.now().isoformat()
+
+    def node_as_dict(self, node: _SimulatedNode) -> dict[str, Any]:
+        return {
+            "ID": node.id,
+            "Version": {"Index": node.version},
+            "CreatedAt": node.created_at,
+            "UpdatedAt": node.updated_at,
+            "Spec": {"Labels": dict(node.labels), "Role": "worker", "Availability": node.availability},
+            "Description": {
+                "Hostname": node.hostname,
+                "Resources": {"NanoCPUs": node.nano_cpus, "MemoryBytes": node.memory_bytes},
+            },
+            "Status": {"State": node.state, "Addr": node.ip},
+        }
+
+    @staticmethod
+    def _task_template(service: _SimulatedService) -> dict[str, Any]:
+        return {
+            "ContainerSpec": {"Image": _SIMULATED_SERVICE_IMAGE, "Labels": {}},
+            "Resources": {"Reservations": {"NanoCPUs": service.nano_cpus, "MemoryBytes": service.memory_bytes}},
+            "Placement": {"Constraints": list(service.constraints)},
+        }
+
+    def service_as_dict(self, service: _SimulatedService) -> dict[str, Any]:
+        return {
+            "ID": service.id,
+            "Version": {"Index": 1},
+            "CreatedAt": service.created_at,
+            "UpdatedAt": service.created_at,
+            "Spec": {
+                "Name": service.name,
+                "Labels": dict(service.labels),
+                "TaskTemplate": self._task_template(service),
+                "Mode": {"Replicated": {"Replicas": 1}},
+            },
+        }
+
+    def task_as_dict(self, task: _SimulatedTask) -> dict[str, Any]:
+        status: dict[str, Any] = {
+            "Timestamp": task.updated_at,
+            "State": task.state,
+            "Message": "started" if task.state == "running" else "pending task scheduling",
+        }
+        if task.err:
+            status["Err"] = task.err
+        return {
+            "ID": task.id,
+            "Version": {"Index": 1},
+            "CreatedAt": task.service.created_at,
+            "UpdatedAt": task.updated_at,
+            "ServiceID": task.service.id,
+            "Slot": 1,
+            "Spec": self._task_template(task.service),
+            "Status": status,
+            "DesiredState": "running",
+        } | ({"NodeID": task.node_id} if task.node_id else {})
+
+    # simulation interface
+
+    def join_node(self, *, hostname: str, ip: str, cpus: float, ram: ByteSize, available: bool) -> str:
+        """a machine joins the swarm (or re-joins with its previous node)"""
+        for node in self.swarm_nodes.values():
+            if node.hostname == hostname:
+                node.state = "ready"
+                node.updated_at = self.timestamp()
+                return node.id
+        node = _SimulatedNode(
+            id=self._new_id(),
+            hostname=hostname,
+            ip=ip,
+            nano_cpus=int(cpus * _NANO_CPUS),
+            memory_bytes=int(ram),
+            availability="active" if available else "drain",
+            created_at=self.timestamp(),
+            updated_at=self.timestamp(),
+        )
+        self.swarm_nodes[node.id] = node
+        return node.id
+
+    def disconnect_node(self, hostname: str) -> None:
+        for node in self.swarm_nodes.values():
+            if node.hostname == hostname and node.state != "down":
+                node.state = "down"
+                node.updated_at = self.timestamp()
+                self.unschedule_node_tasks_if_needed(node)
+
+    def remove_node(self, node: _SimulatedNode) -> None:
+        node.state = "down"
+        self.unschedule_node_tasks_if_needed(node)
+        del self.swarm_nodes[node.id]
+
+    def unschedule_node_tasks_if_needed(self, node: _SimulatedNode) -> None:
+        # NOTE: tasks keep running on a drained node in the simulation, only a node going down reschedules them
+        if node.state == "ready":
+            return
+        for task in self.swarm_tasks.values():
+            if task.node_id == node.id:
+                task.node_id = None
+                task.state = "pending"
+                task.updated_at = self.timestamp()
+
+    def create_service(self, *, labels: dict[str, str], cpus: float, ram: ByteSize, constraints: list[str]) -> str:
+        service = _SimulatedService(
+            id=self._new_id(),
+            name=f"simulated-service-{len(self.swarm_services)}",
+            labels=dict(labels),
+            constraints=list(constraints),
+            nano_cpus=int(cpus * _NANO_CPUS),
+            memory_bytes=int(ram),
+            created_at=self.timestamp(),
+        )
+        self.swarm_services[service.id] = service
+        task = _SimulatedTask(id=self._new_id(), service=service, updated_at=self.timestamp())
+        self.swarm_tasks[task.id] = task
+        return service.id
+
+    def remove_service(self, service_id: str) -> None:
+        del self.swarm_services[service_id]
+        self.swarm_tasks = {
+            task_id: task for task_id, task in self.swarm_tasks.items() if task.service.id != service_id
+        }
+
+    def running_service_ids(self) -> set[str]:
+        return {task.service.id for task in self.swarm_tasks.values() if task.state == "running"}
+
+    def busy_node_ips(self) -> set[str]:
+        return {
+            self.swarm_nodes[task.node_id].ip
+            for task in self.swarm_tasks.values()
+            if task.state == "running" and task.node_id in self.swarm_nodes
+        }
+
+    def schedule(self) -> None:
+        """places the pending tasks in their creation order"""
+        free_resources = {
+            node.id: [node.nano_cpus, node.memory_bytes] for node in self.swarm_nodes.values() if node.is_schedulable
+        }
+        num_tasks_per_node = collections.Counter(
+            task.node_id for task in self.swarm_tasks.values() if task.state == "running"
+        )
+        for task in self.swarm_tasks.values():
+            if task.state == "running" and task.node_id in free_resources:
+                free_resources[task.node_id][0] -= task.service.nano_cpus
+                free_resources[task.node_id][1] -= task.service.memory_bytes
+
+        # NOTE: once a kind of task could not be placed, the identical ones will not be either
+        unschedulable_errors: dict[tuple, str] = {}
+        for task in self.swarm_tasks.values():
+            if task.state != "pending":
+                continue
+            service = task.service
+            task_kind = (tuple(service.constraints), service.nano_cpus, service.memory_bytes)
+            if task_kind in unschedulable_errors:
+                task.err = unschedulable_errors[task_kind]
+                continue
+            node_labels_constraints = _parse_node_labels_constraints(service.constraints)
+            candidate_node_ids = [
+                node_id
+                for node_id in free_resources
+                if all(
+                    (self.swarm_nodes[node_id].labels.get(key) == value) is is_equal
+                    for key, value, is_equal in node_labels_constraints
+                )
+            ]
+            fitting_node_ids = [
+                node_id
+                for node_id in candidate_node_ids
+                if free_resources[node_id][0] >= service.nano_cpus
+                and free_resources[node_id][1] >= service.memory_bytes
+            ]
+            if not fitting_node_ids:
+                task.err = (
+                    f"no suitable node (insufficient resources on {len(candidate_node_ids)} nodes)"
+                    if candidate_node_ids
+                    else f"no suitable node (scheduling constraints not satisfied on {len(self.swarm_nodes)} nodes)"
+                )
+                unschedulable_errors[task_kind] = task.err
+                continue
+            # NOTE: as docker, spreads the tasks on the nodes with the least tasks
+            node_id = min(fitting_node_ids, key=lambda node_id: num_tasks_per_node[node_id])
+            free_resources[node_id][0] -= service.nano_cpus
+            free_resources[node_id][1] -= service.memory_bytes
+            num_tasks_per_node[node_id] += 1
+            task.node_id = node_id
+            task.state = "running"
+            task.err = None
+            task.updated_at = self.timestamp()
@@ -0,0 +1,86 @@
+from typing import Annotated
+
+from pydantic import BaseModel, ByteSize, Field, NonNegativeFloat, NonNegativeInt, PositiveFloat
+from types_aiobotocore_ec2.literals import InstanceTypeType
+
+
+class SimulatedInstanceType(BaseModel):
+    name: InstanceTypeType
+    cpus: PositiveFloat
+    ram: ByteSize
+    hourly_price: Annotated[NonNegativeFloat, Field(description="on-demand price per hour (e.g. in USD)")] = 0
+
+
+class SimulatedTask(BaseModel):
+    arrival_s: Annotated[NonNegativeFloat, Field(description="time of submission since the start of the trace")]
+    duration_s: Annotated[PositiveFloat, Field(description="running time once the task started")]
+    cpus: NonNegativeFloat
+    ram: ByteSize
+    required_instance_type: InstanceTypeType | None = None
+
+
+class SimulationTimings(BaseModel):
+    ec2_pending_s: Annotated[NonNegativeFloat, Field(description="time from launch/start to the running state")] = 5
+    ec2_stopping_s: Annotated[NonNegativeFloat, Field(description="time from stop to the stopped state")] = 30
+    ec2_ssm_ready_s: Annotated[
+        NonNegativeFloat,
+        Field(description="time from the running state until the instance is connected to SSM and cloud-init is done"),
+    ] = 60
+    cold_start_join_s: Annotated[
+        NonNegativeFloat,
+        Field(description="time from the running state until a newly launched instance joins the swarm"),
+    ] = 180
+    warm_start_join_s: Annotated[
+        NonNegativeFloat,
+        Field(description="time from the running state until a started warm buffer instance joins the swarm"),
+    ] = 45
+    images_pull_s: Annotated[NonNegativeFloat, Field(description="duration of the SSM images pulling commands")] = 120
+
+
+class SimulationTrace(BaseModel):
+    instance_types: Annotated[
+        list[SimulatedInstanceType],
+        Field(description="the EC2 instance types known to the fake EC2 (must contain the allowed types)"),
+    ]
+    tasks: list[SimulatedTask]
+    timings: SimulationTimings = SimulationTimings()
+    placement_constraints: Annotated[
+        list[str],
+        Field(description="additional docker placement constraints of the simulated services (e.g. custom ones)"),
+    ] = []
+    cooldown_s: Annotated[
+        NonNegativeFloat,
+        Field(description="simulated time after the last task completed (i.e. to scale the cluster down)"),
+    ] = 1800
+    timeout_s: Annotated[
+        PositiveFloat,
+        Field(description="the simulation stops at the latest this long after the last task arrival"),
+    ] = 24 * 3600
+
+
+class TickLatency(BaseModel):
+    count: NonNegativeInt
+    mean_s: NonNegativeFloat
+    p95_s: NonNegativeFloat
+    max_s: NonNegativeFloat
+    cpu_mean_s: NonNegativeFloat
+    cpu_max_s: NonNegativeFloat
+
+
+class SimulationReport(BaseModel):
+    simulated_s: NonNegativeFloat
+    num_tasks: NonNegativeInt
+    num_started_tasks: NonNegativeInt
+    num_completed_tasks: NonNegativeInt
+    time_to_capacity_mean_s: NonNegativeFloat
+    time_to_capacity_p95_s: NonNegativeFloat
+    time_to_capacity_max_s: NonNegativeFloat
+    num_launched_instances: NonNegativeInt
+    max_running_instances: NonNegativeInt
+    machine_hours: NonNegativeFloat
+    idle_machine_hours: Annotated[
+        NonNegativeFloat, Field(description="billed machine hours while no task was running on the machine")
+    ]
+    cost: NonNegativeFloat
+    autoscaling_tick_latency: TickLatency
+    warm_buffers_tick_latency: TickLatency | None
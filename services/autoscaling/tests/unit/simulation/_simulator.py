@@ -0,0 +1,428 @@
+import contextlib
+import datetime
+import math
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Protocol
+from unittest import mock
+
+from dask_task_models_library.resource_constraints import create_ec2_resource_constraint_key
+from fastapi import FastAPI
+from models_library.generated_models.docker_rest_api import Node
+from models_library.services_metadata_runtime import DOCKER_TASK_EC2_INSTANCE_TYPE_PLACEMENT_CONSTRAINT_KEY
+from pydantic import TypeAdapter
+from servicelib.tracing import TracingConfig
+from simcore_service_autoscaling._meta import APP_NAME
+from simcore_service_autoscaling.core.errors import ConfigurationError
+from simcore_service_autoscaling.core.settings import ApplicationSettings
+from simcore_service_autoscaling.modules import dask
+from simcore_service_autoscaling.modules.cluster_scaling import _auto_scaling_core
+from simcore_service_autoscaling.modules.cluster_scaling._auto_scaling_core import auto_scale_cluster
+from simcore_service_autoscaling.modules.cluster_scaling._provider_computational import ComputationalAutoscalingProvider
+from simcore_service_autoscaling.modules.cluster_scaling._provider_dynamic import DynamicAutoscalingProvider
+from simcore_service_autoscaling.modules.cluster_scaling._provider_protocol import AutoscalingProvider
+from simcore_service_autoscaling.modules.cluster_scaling._warm_buffer_machines_pool_core import monitor_buffer_machines
+from simcore_service_autoscaling.utils import utils_docker
+
+from ._clock import VirtualClock, patched_time_sources
+from ._fake_aws import FakeEC2, FakeSSM
+from ._fake_dask import FakeDaskScheduler
+from ._fake_docker import FakeDockerSwarm
+from ._models import SimulatedInstanceType, SimulatedTask, SimulationReport, SimulationTrace, TickLatency
+
+_SIMULATION_START = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+_SWARM_MANAGER_ADDRESS = "10.0.0.1:2377"
+
+
+class _SimulatedWorkload(Protocol):
+    def submit(self, task_id: str, task: SimulatedTask) -> None: ...
+
+    def complete(self, task_id: str) -> None: ...
+
+    def running_task_ids(self) -> set[str]: ...
+
+    def busy_host_ips(self) -> set[str]: ...
+
+    def schedule(self) -> None: ...
+
+
+class _DockerServicesWorkload:
+    """each task is a docker service (dynamic autoscaling)"""
+
+    def __init__(self, settings: ApplicationSettings, swarm: FakeDockerSwarm, constraints: list[str]) -> None:
+        assert settings.AUTOSCALING_NODES_MONITORING  # nosec
+        self._swarm = swarm
+        nodes_monitoring = settings.AUTOSCALING_NODES_MONITORING
+        self._service_labels = dict.fromkeys(nodes_monitoring.NODES_MONITORING_SERVICE_LABELS, "true")
+        self._constraints = [
+            f"node.labels.{label}==true" for label in nodes_monitoring.NODES_MONITORING_NODE_LABELS
+        ] + constraints
+        self._service_ids: dict[str, str] = {}
+
+    def submit(self, task_id: str, task: SimulatedTask) -> None:
+        constraints = list(self._constraints)
+        if task.required_instance_type:
+            constraints.append(
+                f"node.labels.{DOCKER_TASK_EC2_INSTANCE_TYPE_PLACEMENT_CONSTRAINT_KEY}=={task.required_instance_type}"
+            )
+        self._service_ids[task_id] = self._swarm.create_service(
+            labels=self._service_labels, cpus=task.cpus, ram=task.ram, constraints=constraints
+        )
+
+    def complete(self, task_id: str) -> None:
+        self._swarm.remove_service(self._service_ids.pop(task_id))
+
+    def running_task_ids(self) -> set[str]:
+        running_service_ids = self._swarm.running_service_ids()
+        return {task_id for task_id, service_id in self._service_ids.items() if service_id in running_service_ids}
+
+    def busy_host_ips(self) -> set[str]:
+        return self._swarm.busy_node_ips()
+
+    def schedule(self) -> None:
+        self._swarm.schedule()
+
+
+class _DaskTasksWorkload:
+    """each task is a dask task (computational autoscaling)"""
+
+    def __init__(
+        self,
+        scheduler: FakeDaskScheduler,
+        swarm: FakeDockerSwarm,
+        ec2: FakeEC2,
+        instance_types: dict[str, SimulatedInstanceType],
+    ) -> None:
+        self._scheduler = scheduler
+        self._swarm = swarm
+        self._ec2 = ec2
+        self._instance_types = instance_types
+
+    def submit(self, task_id: str, task: SimulatedTask) -> None:
+        task_resources = {"CPU": task.cpus, "RAM": task.ram}
+        if task.required_instance_type:
+            task_resources[create_ec2_resource_constraint_key(task.required_instance_type)] = 1
+        self._scheduler.submit(task_id, task_resources)
+
+    def complete(self, task_id: str) -> None:
+        self._scheduler.complete(task_id)
+
+    def running_task_ids(self) -> set[str]:
+        return self._scheduler.running_task_ids()
+
+    def busy_host_ips(self) -> set[str]:
+        return self._scheduler.busy_hosts()
+
+    def schedule(self) -> None:
+        # NOTE: the dask-sidecar of a machine connects once its docker node is ready for osparc services
+        instances_by_host_name = {
+            instance.host_name: instance for instance in self._ec2.instances.values() if instance.state == "running"
+        }
+        ready_hosts = {}
+        for swarm_node in self._swarm.swarm_nodes.values():
+            instance = instances_by_host_name.get(swarm_node.hostname)
+            if instance and utils_docker.is_node_osparc_ready(
+                TypeAdapter(Node).validate_python(self._swarm.node_as_dict(swarm_node))
+            ):
+                ready_hosts[instance.private_ip] = self._instance_types[instance.type]
+        self._scheduler.sync_workers(ready_hosts)
+        self._scheduler.schedule()
+
+
+class _TickTimer:
+    def __init__(self) -> None:
+        self.wall_durations: list[float] = []
+        self.cpu_durations: list[float] = []
+
+    @contextlib.contextmanager
+    def measure(self) -> Iterator[None]:
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.wall_durations.append(time.perf_counter() - wall_start)
+            self.cpu_durations.append(time.process_time() - cpu_start)
+
+    def latency(self) -> TickLatency:
+        if not self.wall_durations:
+            return TickLatency(count=0, mean_s=0, p95_s=0, max_s=0, cpu_mean_s=0, cpu_max_s=0)
+        return TickLatency(
+            count=len(self.wall_durations),
+            mean_s=sum(self.wall_durations) / len(self.wall_durations),
+            p95_s=_percentile(self.wall_durations, 95),
+            max_s=max(self.wall_durations),
+            cpu_mean_s=sum(self.cpu_durations) / len(self.cpu_durations),
+            cpu_max_s=max(self.cpu_durations),
+        )
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0
+    sorted_values = sorted(values)
+    return sorted_values[max(0, math.ceil(len(sorted_values) * percent / 100) - 1)]
+
+
+def _check_settings(settings: ApplicationSettings, trace: SimulationTrace) -> None:
+    if settings.AUTOSCALING_EC2_INSTANCES is None or (
+        settings.AUTOSCALING_NODES_MONITORING is None and settings.AUTOSCALING_DASK is None
+    ):
+        raise ConfigurationError(
+            msg="the simulation needs AUTOSCALING_EC2_INSTANCES and "
+            "one of AUTOSCALING_NODES_MONITORING or AUTOSCALING_DASK"
+        )
+    known_instance_types = {instance_type.name for instance_type in trace.instance_types}
+    if missing_types := set(settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ALLOWED_TYPES) - known_instance_types:
+        raise ConfigurationError(
+            msg=f"the trace does not define the allowed EC2 instance types {sorted(missing_types)}"
+        )
+
+
+def _has_warm_buffers(settings: ApplicationSettings) -> bool:
+    # NOTE: same conditions as the warm buffer machines pool background task
+    return bool(
+        settings.AUTOSCALING_SSM_ACCESS
+        and settings.AUTOSCALING_EC2_INSTANCES
+        and settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ATTACHED_IAM_PROFILE
+        and settings.AUTOSCALING_NODES_MONITORING
+    )
+
+
+async def _simulated_swarm_join_command(*, join_as_drained: bool, idempotent: bool) -> str:
+    assert idempotent is not None  # nosec
+    return (
+        f"docker swarm join --availability={'drain' if join_as_drained else 'active'} "
+        f"--token SWMTKN-simulated {_SWARM_MANAGER_ADDRESS}"
+    )
+
+
+async def _no_message(*_args, **_kwargs) -> None:
+    return None
+
+
+@contextlib.contextmanager
+def _patched_autoscaling(clock: VirtualClock, dask_scheduler: FakeDaskScheduler | None) -> Iterator[None]:
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patched_time_sources(clock))
+        stack.enter_context(
+            mock.patch.object(utils_docker, "get_docker_swarm_join_bash_command", _simulated_swarm_join_command)
+        )
+        # NOTE: the messages to the users (via rabbitmq) are not simulated
+        for message_function in (
+            "post_tasks_log_message",
+            "post_tasks_progress_message",
+            "post_autoscaling_status_message",
+        ):
+            stack.enter_context(mock.patch.object(_auto_scaling_core, message_function, _no_message))
+        if dask_scheduler:
+            for function_name, function in dask_scheduler.patched_functions().items():
+                stack.enter_context(mock.patch.object(dask, function_name, function))
+        yield
+
+
+def _sync_swarm_membership(
+    ec2: FakeEC2,
+    swarm: FakeDockerSwarm,
+    trace: SimulationTrace,
+    instance_types: dict[str, SimulatedInstanceType],
+    joined_host_names: set[str],
+) -> None:
+    for instance in ec2.instances.values():
+        if instance.state != "running":
+            if instance.host_name in joined_host_names:
+                swarm.disconnect_node(instance.host_name)
+                joined_host_names.remove(instance.host_name)
+            continue
+        if instance.host_name in joined_host_names or not instance.joins_swarm:
+            continue
+        join_delay_s = (
+            trace.timings.warm_start_join_s if instance.started_from_stopped else trace.timings.cold_start_join_s
+        )
+        if (ec2.running_for_s(instance) or 0) >= join_delay_s:
+            instance_type = instance_types[instance.type]
+            swarm.join_node(
+                hostname=instance.host_name,
+                ip=instance.private_ip,
+                cpus=instance_type.cpus,
+                ram=instance_type.ram,
+                available="--availability=active" in instance.startup_script,
+            )
+            joined_host_names.add(instance.host_name)
+
+
+@dataclass(kw_only=True)
+class _SimulationRun:
+    """state of the simulated cluster and of the tasks of the trace, advanced tick by tick"""
+
+    trace: SimulationTrace
+    clock: VirtualClock
+    ec2: FakeEC2
+    swarm: FakeDockerSwarm
+    workload: _SimulatedWorkload
+    instance_types: dict[str, SimulatedInstanceType]
+    poll_interval_s: float
+
+    tasks: list[SimulatedTask] = field(init=False)
+    task_ids: list[str] = field(init=False)
+    tasks_by_id: dict[str, SimulatedTask] = field(init=False)
+    joined_host_names: set[str] = field(default_factory=set)
+    started_at_s: dict[str, float] = field(default_factory=dict)
+    first_started_at_s: dict[str, float] = field(default_factory=dict)
+    completed_task_ids: set[str] = field(default_factory=set)
+    all_completed_at_s: float | None = None
+    next_task_index: int = 0
+    billed_s: float = 0
+    idle_s: float = 0
+    cost: float = 0
+    max_running_instances: int = 0
+
+    def __post_init__(self) -> None:
+        self.tasks = sorted(self.trace.tasks, key=lambda task: task.arrival_s)
+        self.task_ids = [f"simulated-task-{index}" for index in range(len(self.tasks))]
+        self.tasks_by_id = dict(zip(self.task_ids, self.tasks, strict=True))
+
+    @property
+    def end_s(self) -> float:
+        return (self.tasks[-1].arrival_s if self.tasks else 0) + self.trace.timeout_s
+
+    def _submit_arrived_tasks(self, now_s: float) -> None:
+        while self.next_task_index < len(self.tasks) and self.tasks[self.next_task_index].arrival_s <= now_s:
+            self.workload.submit(self.task_ids[self.next_task_index], self.tasks[self.next_task_index])
+            self.next_task_index += 1
+
+    def _complete_finished_tasks(self, now_s: float) -> None:
+        for task_id in [
+            task_id
+            for task_id, start_s in self.started_at_s.items()
+            if now_s - start_s >= self.tasks_by_id[task_id].duration_s
+        ]:
+            self.workload.complete(task_id)
+            del self.started_at_s[task_id]
+            self.completed_task_ids.add(task_id)
+
+    def _record_running_tasks(self, now_s: float) -> None:
+        running_task_ids = self.workload.running_task_ids()
+        # NOTE: a task that is not running anymore (e.g. its machine went away) restarts from scratch
+        self.started_at_s = {task_id: self.started_at_s.get(task_id, now_s) for task_id in running_task_ids}
+        for task_id in running_task_ids:
+            self.first_started_at_s.setdefault(task_id, now_s)
+
+    def _record_billed_instances(self) -> None:
+        billed_instances = [instance for instance in self.ec2.instances.values() if instance.is_billed]
+        self.max_running_instances = max(self.max_running_instances, len(billed_instances))
+        busy_host_ips = self.workload.busy_host_ips()
+        for instance in billed_instances:
+            self.billed_s += self.poll_interval_s
+            self.cost += self.poll_interval_s * self.instance_types[instance.type].hourly_price / 3600
+            if instance.private_ip not in busy_host_ips:
+                self.idle_s += self.poll_interval_s
+
+    def before_autoscaling(self) -> None:
+        """the machines boot/join and the tasks arrive/complete/get scheduled since the last tick"""
+        now_s = self.clock.elapsed_s
+        self.ec2.step()
+        _sync_swarm_membership(self.ec2, self.swarm, self.trace, self.instance_types, self.joined_host_names)
+        self._submit_arrived_tasks(now_s)
+        self._complete_finished_tasks(now_s)
+        self.workload.schedule()
+
+    def after_autoscaling(self) -> None:
+        self.workload.schedule()
+        self._record_running_tasks(self.clock.elapsed_s)
+        self._record_billed_instances()
+
+    def is_done(self) -> bool:
+        """all the tasks completed and the cluster had the time to scale down"""
+        if len(self.completed_task_ids) < len(self.tasks):
+            return False
+        if self.all_completed_at_s is None:
+            self.all_completed_at_s = self.clock.elapsed_s
+        return self.clock.elapsed_s - self.all_completed_at_s >= self.trace.cooldown_s
+
+    def report(self, autoscaling_latency: TickLatency, warm_buffers_latency: TickLatency | None) -> SimulationReport:
+        times_to_capacity = [
+            self.first_started_at_s[task_id] - task.arrival_s
+            for task_id, task in zip(self.task_ids, self.tasks, strict=True)
+            if task_id in self.first_started_at_s
+        ]
+        return SimulationReport(
+            simulated_s=self.clock.elapsed_s,
+            num_tasks=len(self.tasks),
+            num_started_tasks=len(self.first_started_at_s),
+            num_completed_tasks=len(self.completed_task_ids),
+            time_to_capacity_mean_s=sum(times_to_capacity) / len(times_to_capacity) if times_to_capacity else 0,
+            time_to_capacity_p95_s=_percentile(times_to_capacity, 95),
+            time_to_capacity_max_s=max(times_to_capacity, default=0),
+            num_launched_instances=len(self.ec2.instances),
+            max_running_instances=self.max_running_instances,
+            machine_hours=self.billed_s / 3600,
+            idle_machine_hours=self.idle_s / 3600,
+            cost=self.cost,
+            autoscaling_tick_latency=autoscaling_latency,
+            warm_buffers_tick_latency=warm_buffers_latency,
+        )
+
+
+def _create_app(settings: ApplicationSettings, ec2: FakeEC2, ssm: FakeSSM, swarm: FakeDockerSwarm) -> FastAPI:
+    app = FastAPI()
+    app.state.settings = settings
+    app.state.ec2_client = ec2
+    app.state.ssm_client = ssm
+    app.state.docker_client = swarm
+    app.state.tracing_config = TracingConfig.create(service_name=APP_NAME, tracing_settings=None)
+    return app
+
+
+async def run_simulation(settings: ApplicationSettings, trace: SimulationTrace) -> SimulationReport:
+    """replays the trace against the autoscaling with simulated EC2, SSM, docker swarm (and dask) in virtual time
+
+    The autoscaling (and warm buffers) cycles run every AUTOSCALING_POLL_INTERVAL of virtual time, their real
+    duration is measured.
+    """
+    _check_settings(settings, trace)
+    clock = VirtualClock(start=_SIMULATION_START)
+    instance_types = {instance_type.name: instance_type for instance_type in trace.instance_types}
+    ec2 = FakeEC2(clock, trace.instance_types, trace.timings)
+    swarm = FakeDockerSwarm(clock)
+    app = _create_app(settings, ec2, FakeSSM(clock, ec2, trace.timings), swarm)
+
+    auto_scaling_mode: AutoscalingProvider
+    dask_scheduler: FakeDaskScheduler | None = None
+    workload: _SimulatedWorkload
+    if settings.AUTOSCALING_NODES_MONITORING is not None:
+        auto_scaling_mode = DynamicAutoscalingProvider()
+        workload = _DockerServicesWorkload(settings, swarm, trace.placement_constraints)
+    else:
+        assert settings.AUTOSCALING_DASK  # nosec
+        auto_scaling_mode = ComputationalAutoscalingProvider()
+        dask_scheduler = FakeDaskScheduler(settings.AUTOSCALING_DASK)
+        workload = _DaskTasksWorkload(dask_scheduler, swarm, ec2, instance_types)
+    has_warm_buffers = _has_warm_buffers(settings)
+
+    simulation_run = _SimulationRun(
+        trace=trace,
+        clock=clock,
+        ec2=ec2,
+        swarm=swarm,
+        workload=workload,
+        instance_types=instance_types,
+        poll_interval_s=settings.AUTOSCALING_POLL_INTERVAL.total_seconds(),
+    )
+    autoscaling_timer, warm_buffers_timer = _TickTimer(), _TickTimer()
+    with _patched_autoscaling(clock, dask_scheduler):
+        while clock.elapsed_s < simulation_run.end_s:
+            simulation_run.before_autoscaling()
+            with autoscaling_timer.measure():
+                await auto_scale_cluster(app=app, auto_scaling_mode=auto_scaling_mode)
+            if has_warm_buffers:
+                with warm_buffers_timer.measure():
+                    await monitor_buffer_machines(app, auto_scaling_mode=auto_scaling_mode)
+            simulation_run.after_autoscaling()
+            if simulation_run.is_done():
+                break
+            clock.advance(simulation_run.poll_interval_s)
+
+    return simulation_run.report(
+        autoscaling_timer.latency(), warm_buffers_timer.latency() if has_warm_buffers else None
+    )
@@ -0,0 +1,90 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import pytest
+from pydantic import ByteSize, TypeAdapter
+from pytest_simcore.helpers.typing_env import EnvVarsDict
+from simcore_service_autoscaling.core.errors import ConfigurationError
+from simcore_service_autoscaling.core.settings import ApplicationSettings
+from simulation import SimulationTrace, run_simulation
+from types_aiobotocore_ec2.literals import InstanceTypeType
+
+_GiB = 1024**3
+
+
+@pytest.fixture
+def simulation_trace(aws_allowed_ec2_instance_type_names: list[InstanceTypeType]) -> SimulationTrace:
+    return TypeAdapter(SimulationTrace).validate_python(
+        {
+            "instance_types": [
+                {"name": name, "cpus": 32, "ram": 128 * _GiB, "hourly_price": 1.0}
+                for name in aws_allowed_ec2_instance_type_names
+            ],
+            "tasks": [
+                {"arrival_s": 30 * index, "duration_s": 600, "cpus": 1, "ram": ByteSize(2 * _GiB)} for index in range(5)
+            ],
+            "cooldown_s": 120,
+        }
+    )
+
+
+@pytest.mark.parametrize("mode", ["enabled_dynamic_mode", "enabled_computational_mode"])
+async def test_run_simulation(
+    app_environment: EnvVarsDict,
+    mode: str,
+    request: pytest.FixtureRequest,
+    simulation_trace: SimulationTrace,
+):
+    request.getfixturevalue(mode)
+    report = await run_simulation(ApplicationSettings.create_from_envs(), simulation_trace)
+
+    assert report.num_tasks == len(simulation_trace.tasks)
+    assert report.num_started_tasks == report.num_tasks
+    assert report.num_completed_tasks == report.num_tasks
+    # a machine had to be started for the tasks
+    assert report.num_launched_instances > 0
+    assert report.time_to_capacity_mean_s > 0
+    assert report.time_to_capacity_max_s >= report.time_to_capacity_p95_s >= simulation_trace.timings.ec2_pending_s
+    assert report.machine_hours > 0
+    assert report.idle_machine_hours < report.machine_hours
+    assert report.cost == pytest.approx(report.machine_hours)
+    assert report.autoscaling_tick_latency.count > 0
+    assert report.simulated_s >= max(task.arrival_s + task.duration_s for task in simulation_trace.tasks)
+
+
+async def test_run_simulation_needs_the_allowed_instance_types(
+    app_environment: EnvVarsDict, enabled_dynamic_mode: EnvVarsDict, simulation_trace: SimulationTrace
+):
+    with pytest.raises(ConfigurationError):
+        await run_simulation(
+            ApplicationSettings.create_from_envs(),
+            simulation_trace.model_copy(update={"instance_types": simulation_trace.instance_types[1:]}),
+        )
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("mode", ["enabled_dynamic_mode", "enabled_computational_mode"])
+async def test_run_simulation_of_a_burst_of_10k_tasks(
+    app_environment: EnvVarsDict,
+    mode: str,
+    request: pytest.FixtureRequest,
+    simulation_trace: SimulationTrace,
+):
+    request.getfixturevalue(mode)
+    burst_trace = SimulationTrace.model_validate(
+        simulation_trace.model_dump()
+        | {
+            "tasks": [
+                {"arrival_s": 0, "duration_s": 60, "cpus": 0.1, "ram": ByteSize(256 * 1024**2)} for _ in range(10000)
+            ],
+            "cooldown_s": 60,
+        }
+    )
+    report = await run_simulation(ApplicationSettings.create_from_envs(), burst_trace)
+
+    assert report.num_started_tasks == report.num_tasks == 10000
+    assert report.num_completed_tasks == report.num_tasks
+    # NOTE: benchmark of the autoscaling cycles with 10k pending tasks, the duration of the ticks depends on the
+    # machine running the test and is therefore reported instead of asserted
+    print(f"{mode}: autoscaling tick latency {report.autoscaling_tick_latency.model_dump_json()}")
@@ -0,0 +1,80 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from faker import Faker
+from models_library.docker import DockerLabelKey
+from models_library.generated_models.docker_rest_api import Node, Service
+from pytest_mock import MockerFixture
+from simcore_service_autoscaling.modules.docker import AutoscalingDocker
+from simcore_service_autoscaling.utils.cluster_snapshot import (
+    docker_cluster_snapshot,
+    get_docker_cluster_snapshot,
+)
+from simcore_service_autoscaling.utils.utils_docker import (
+    compute_cluster_used_resources,
+    compute_node_used_resources,
+    get_monitored_nodes,
+    get_task_osparc_custom_docker_placement_constraints,
+    get_worker_nodes,
+    pending_service_tasks_with_insufficient_resources,
+)
+
+
+async def test_docker_cluster_snapshot_is_scoped(autoscaling_docker: AutoscalingDocker, host_node: Node):
+    assert get_docker_cluster_snapshot(autoscaling_docker) is None
+    async with docker_cluster_snapshot(autoscaling_docker) as snapshot:
+        assert get_docker_cluster_snapshot(autoscaling_docker) is snapshot
+        assert [node.id for node in snapshot.nodes] == [host_node.id]
+        # another client does not use it
+        async with AutoscalingDocker() as other_docker_client:
+            assert get_docker_cluster_snapshot(other_docker_client) is None
+    assert get_docker_cluster_snapshot(autoscaling_docker) is None
+
+
+async def test_docker_cluster_snapshot_gives_the_same_results_as_docker(
+    autoscaling_docker: AutoscalingDocker,
+    host_node: Node,
+    create_service: Callable[[dict[str, Any], dict[DockerLabelKey, str], str], Awaitable[Service]],
+    task_template: dict[str, Any],
+    create_task_reservations: Callable[[int, int], dict[str, Any]],
+    mocker: MockerFixture,
+    faker: Faker,
+):
+    service_labels: dict[DockerLabelKey, str] = faker.pydict(allowed_types=(str,))
+    await asyncio.gather(
+        create_service(task_template | create_task_reservations(1, 0), service_labels, "running"),
+        create_service(task_template | create_task_reservations(1, 0), {}, "running"),
+        create_service(task_template | create_task_reservations(1000, 0), service_labels, "pending"),
+    )
+
+    async def _query_all() -> tuple:
+        pending_tasks = await pending_service_tasks_with_insufficient_resources(
+            autoscaling_docker, service_labels=list(service_labels)
+        )
+        return (
+            await get_monitored_nodes(autoscaling_docker, node_labels=[]),
+            await get_worker_nodes(autoscaling_docker),
+            await compute_node_used_resources(autoscaling_docker, host_node),
+            await compute_node_used_resources(autoscaling_docker, host_node, service_labels=list(service_labels)),
+            await compute_cluster_used_resources(autoscaling_docker, [host_node]),
+            [task.id for task in pending_tasks],
+            [
+                await get_task_osparc_custom_docker_placement_constraints(autoscaling_docker, task)
+                for task in pending_tasks
+            ],
+        )
+
+    expected_results = await _query_all()
+    assert expected_results[5], "there should be one pending task"
+
+    async with docker_cluster_snapshot(autoscaling_docker):
+        spied_tasks_list = mocker.spy(autoscaling_docker.tasks, "list")
+        spied_services_inspect = mocker.spy(autoscaling_docker.services, "inspect")
+        assert await _query_all() == expected_results
+        spied_tasks_list.assert_not_called()
+        spied_services_inspect.assert_not_called()
@@ -66,11 +66,13 @@ from simcore_service_autoscaling.utils.utils_docker import (
     get_node_last_readiness_update,
     get_node_termination_started_since,
     get_node_total_resources,
+    get_task_image,
     get_task_instance_restriction,
     get_task_osparc_custom_docker_placement_constraints,
     get_worker_nodes,
     is_node_osparc_ready,
     is_node_ready_and_available,
+    list_node_docker_images,
     pending_service_tasks_with_insufficient_resources,
     remove_nodes,
     set_node_availability,
@@ -615,6 +617,29 @@ async def test_get_task_instance_restriction(
     assert instance_type_or_none == expected_instance_type
 
 
+async def test_get_task_image_and_list_node_docker_images(
+    autoscaling_docker: AutoscalingDocker,
+    host_node: Node,
+    create_service: Callable[[dict[str, Any], dict[DockerLabelKey, str], str], Awaitable[Service]],
+    task_template: dict[str, Any],
+    create_task_reservations: Callable[[int, int], dict[str, Any]],
+):
+    assert await list_node_docker_images(autoscaling_docker, host_node) == set()
+
+    # a pending service did not bring its image on the node
+    pending_service = await create_service(task_template | create_task_reservations(1000, 0), {}, "pending")
+    assert pending_service.spec
+    pending_tasks = TypeAdapter(list[Task]).validate_python(
+        await autoscaling_docker.tasks.list(filters={"service": pending_service.spec.name})
+    )
+    # NOTE: docker swarm pins the image with its digest
+    assert get_task_image(pending_tasks[0]) == task_template["ContainerSpec"]["Image"]
+    assert await list_node_docker_images(autoscaling_docker, host_node) == set()
+
+    await create_service(task_template, {}, "running")
+    assert await list_node_docker_images(autoscaling_docker, host_node) == {task_template["ContainerSpec"]["Image"]}
+
+
 async def test_compute_tasks_needed_resources(
     autoscaling_docker: AutoscalingDocker,
     host_node: Node,
@@ -0,0 +1,69 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+import datetime
+
+import pytest
+from simcore_service_autoscaling.utils.docker_images_demand import (
+    DockerImagesDemand,
+    most_demanded_images,
+    record_images_demand,
+    select_most_demanded_images,
+)
+
+_T0 = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+_HALF_LIFE = datetime.timedelta(hours=1)
+
+
+def test_record_images_demand():
+    images_demand = record_images_demand(
+        DockerImagesDemand(), ["sleeper:1.0", "sleeper:1.0", "jupyter:2.0"], now=_T0, half_life=_HALF_LIFE
+    )
+    assert images_demand.demand == {"sleeper:1.0": 2, "jupyter:2.0": 1}
+    assert most_demanded_images(images_demand, 1) == ["sleeper:1.0"]
+
+    # the old demand decays
+    images_demand = record_images_demand(images_demand, ["jupyter:2.0"], now=_T0 + 2 * _HALF_LIFE, half_life=_HALF_LIFE)
+    assert images_demand.demand == {"sleeper:1.0": pytest.approx(0.5), "jupyter:2.0": pytest.approx(1.25)}
+    assert most_demanded_images(images_demand, 1) == ["jupyter:2.0"]
+    assert most_demanded_images(images_demand, 5) == ["jupyter:2.0", "sleeper:1.0"]
+    assert most_demanded_images(images_demand, 0) == []
+
+    # and is eventually forgotten
+    images_demand = record_images_demand(
+        images_demand, ["jupyter:2.0"], now=_T0 + 10 * _HALF_LIFE, half_life=_HALF_LIFE
+    )
+    assert set(images_demand.demand) == {"jupyter:2.0"}
+
+    # the demand survives a round trip through redis
+    assert DockerImagesDemand.model_validate_json(images_demand.model_dump_json()) == images_demand
+
+
+def test_select_most_demanded_images():
+    images_demand = record_images_demand(
+        DockerImagesDemand(), ["sleeper:1.0", "sleeper:1.0", "jupyter:2.0"], now=_T0, half_life=_HALF_LIFE
+    )
+    images_demand = select_most_demanded_images(images_demand, 1, now=_T0, half_life=_HALF_LIFE)
+    assert images_demand.selected_images == ["sleeper:1.0"]
+
+    # within the half-life, another image becoming the most demanded does not replace the selected one
+    images_demand = record_images_demand(
+        images_demand, ["jupyter:2.0"] * 3, now=_T0 + _HALF_LIFE / 2, half_life=_HALF_LIFE
+    )
+    assert most_demanded_images(images_demand, 1) == ["jupyter:2.0"]
+    images_demand = select_most_demanded_images(images_demand, 1, now=_T0 + _HALF_LIFE / 2, half_life=_HALF_LIFE)
+    assert images_demand.selected_images == ["sleeper:1.0"]
+    assert images_demand.selected_at == _T0
+
+    # but the free slots are filled
+    images_demand = select_most_demanded_images(images_demand, 2, now=_T0 + _HALF_LIFE / 2, half_life=_HALF_LIFE)
+    assert images_demand.selected_images == ["sleeper:1.0", "jupyter:2.0"]
+
+    # the selection is refreshed once the half-life elapsed
+    images_demand = select_most_demanded_images(images_demand, 1, now=_T0 + _HALF_LIFE, half_life=_HALF_LIFE)
+    assert images_demand.selected_images == ["jupyter:2.0"]
+    assert images_demand.selected_at == _T0 + _HALF_LIFE
+
+    # the selection survives a round trip through redis
+    assert DockerImagesDemand.model_validate_json(images_demand.model_dump_json()) == images_demand
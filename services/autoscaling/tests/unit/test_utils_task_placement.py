@@ -0,0 +1,155 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+from collections.abc import Callable
+
+from aws_library.ec2 import EC2InstanceData, EC2InstanceType, Resources
+from models_library.docker import DockerGenericTag, DockerLabelKey
+from pydantic import ByteSize, TypeAdapter
+from pytest_mock import MockerFixture
+from simcore_service_autoscaling.models import AssignedTasksToInstanceType, NonAssociatedInstance
+from simcore_service_autoscaling.utils.task_placement import (
+    FirstFitDecreasingPlacement,
+    TaskRequirements,
+)
+
+_GiB = 1024**3
+_LABEL_KEY = TypeAdapter(DockerLabelKey).validate_python("io.simcore.test-label")
+
+
+def _instance_type(name: str, cpus: float, ram_gib: int) -> EC2InstanceType:
+    return EC2InstanceType(
+        name=name,  # type: ignore
+        resources=Resources(cpus=cpus, ram=ByteSize(ram_gib * _GiB)),
+    )
+
+
+def _task_requirements(
+    task: str,
+    cpus: float,
+    ram_gib: int,
+    *,
+    required_instance_type: str | None = None,
+    required_node_labels: dict[DockerLabelKey, str] | None = None,
+    image: DockerGenericTag | None = None,
+) -> TaskRequirements:
+    return TaskRequirements(
+        task=task,
+        resources=Resources(cpus=cpus, ram=ByteSize(ram_gib * _GiB)),
+        required_instance_type=required_instance_type,  # type: ignore
+        required_node_labels=required_node_labels or {},
+        product_name=None,
+        image=image,
+    )
+
+
+def _assigned_tasks(planned_instances) -> list:
+    return [task for instance in planned_instances for task in instance.assigned_tasks]
+
+
+def test_first_fit_decreasing_needs_less_instances_than_first_fit():
+    available_ec2_types = [_instance_type("r5n.2xlarge", 8, 64)]
+    # the small tasks arrive first and leave gaps the large tasks cannot use
+    tasks_requirements = [_task_requirements(f"small_{i}", 2, 4) for i in range(4)] + [
+        _task_requirements(f"large_{i}", 6, 4) for i in range(4)
+    ]
+
+    first_fit_instances = FirstFitDecreasingPlacement(decreasing=False).plan_instances(
+        tasks_requirements, available_ec2_types
+    )
+    assert len(first_fit_instances) == 5
+
+    planned_instances = FirstFitDecreasingPlacement().plan_instances(tasks_requirements, available_ec2_types)
+    assert len(planned_instances) == 4
+    assert sorted(_assigned_tasks(planned_instances)) == sorted(r.task for r in tasks_requirements)
+    for instance in planned_instances:
+        assert instance.available_resources == Resources(cpus=0, ram=ByteSize(56 * _GiB))
+
+
+def test_plan_instances_respects_required_instance_type_and_labels():
+    available_ec2_types = [_instance_type("t2.xlarge", 4, 16), _instance_type("r5n.4xlarge", 16, 128)]
+    tasks_requirements = [
+        *(_task_requirements(f"blue_{i}", 1, 1, required_node_labels={_LABEL_KEY: "blue"}) for i in range(3)),
+        *(_task_requirements(f"red_{i}", 1, 1, required_node_labels={_LABEL_KEY: "red"}) for i in range(3)),
+        *(_task_requirements(f"big_{i}", 1, 1, required_instance_type="r5n.4xlarge") for i in range(3)),
+    ]
+
+    planned_instances = FirstFitDecreasingPlacement().plan_instances(tasks_requirements, available_ec2_types)
+
+    assert sorted(_assigned_tasks(planned_instances)) == sorted(r.task for r in tasks_requirements)
+    for instance in planned_instances:
+        tasks_kinds = {task.split("_")[0] for task in instance.assigned_tasks}
+        assert len(tasks_kinds) == 1
+        if tasks_kinds == {"big"}:
+            assert instance.instance_type.name == "r5n.4xlarge"
+        else:
+            assert instance.osparc_custom_node_labels == {_LABEL_KEY: tasks_kinds.pop()}
+
+
+def test_plan_instances_skips_tasks_that_fit_no_instance_type():
+    available_ec2_types = [_instance_type("t2.xlarge", 4, 16)]
+    tasks_requirements = [_task_requirements("too_big", 8, 1), _task_requirements("small", 1, 1)]
+
+    planned_instances = FirstFitDecreasingPlacement().plan_instances(tasks_requirements, available_ec2_types)
+
+    assert _assigned_tasks(planned_instances) == ["small"]
+
+
+def test_plan_instances_of_a_large_burst_of_tasks():
+    available_ec2_types = [_instance_type("t2.xlarge", 4, 16), _instance_type("r5n.4xlarge", 16, 128)]
+    tasks_requirements = [_task_requirements(f"task_{i}", 1 + i % 4, 1 + i % 8) for i in range(5000)]
+
+    planned_instances = FirstFitDecreasingPlacement().plan_instances(tasks_requirements, available_ec2_types)
+
+    assert len(_assigned_tasks(planned_instances)) == len(tasks_requirements)
+    assert all(
+        instance.available_resources.cpus >= 0 and instance.available_resources.ram >= 0
+        for instance in planned_instances
+    )
+
+
+def test_plan_instances_assigns_identical_tasks_at_once(mocker: MockerFixture):
+    available_ec2_types = [_instance_type("t2.xlarge", 4, 16)]
+    tasks_requirements = [_task_requirements(f"task_{i}", 0.5, 1) for i in range(10000)]
+    assign_tasks_spy = mocker.spy(AssignedTasksToInstanceType, "assign_tasks")
+
+    planned_instances = FirstFitDecreasingPlacement().plan_instances(tasks_requirements, available_ec2_types)
+
+    # 8 tasks fill the CPUs of an instance, they are assigned in one call instead of one by one
+    assert len(planned_instances) == len(tasks_requirements) // 8
+    assert all(len(instance.assigned_tasks) == 8 for instance in planned_instances)
+    assert assign_tasks_spy.call_count == len(planned_instances)
+
+
+def test_assign_to_instances_prefers_the_instances_holding_the_image(
+    fake_ec2_instance_data: Callable[..., EC2InstanceData],
+):
+    image = TypeAdapter(DockerGenericTag).validate_python("itisfoundation/sleeper:2.1.1")
+
+    def _instance() -> NonAssociatedInstance:
+        return NonAssociatedInstance(
+            ec2_instance=fake_ec2_instance_data(resources=Resources(cpus=4, ram=ByteSize(16 * _GiB)))
+        )
+
+    first_instance, instance_with_image, lower_priority_instance_with_image = _instance(), _instance(), _instance()
+    instances_images = {
+        instance_with_image.ec2_instance.id: {image},
+        lower_priority_instance_with_image.ec2_instance.id: {image},
+    }
+
+    unassigned_tasks = FirstFitDecreasingPlacement().assign_to_instances(
+        [
+            _task_requirements("with_image", 4, 16, image=image),
+            _task_requirements("without_image", 4, 16),
+            _task_requirements("with_image_again", 4, 16, image=image),
+        ],
+        ([first_instance, instance_with_image], [lower_priority_instance_with_image]),
+        instances_images=instances_images,
+    )
+
+    assert unassigned_tasks == []
+    assert instance_with_image.assigned_tasks == ["with_image"]
+    # the priorities are kept, the instances holding the image are only preferred within the same priority
+    assert first_instance.assigned_tasks == ["with_image_again"]
+    assert lower_priority_instance_with_image.assigned_tasks == ["without_image"]
@@ -0,0 +1,162 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+import datetime
+from collections.abc import Callable
+
+import pytest
+from aws_library.ec2 import EC2InstanceBootSpecific, EC2InstanceData
+from common_library.json_serialization import json_dumps
+from pytest_simcore.helpers.monkeypatch_envs import EnvVarsDict, setenvs_from_dict
+from simcore_service_autoscaling.constants import DEACTIVATED_BUFFER_MACHINE_EC2_TAGS
+from simcore_service_autoscaling.core.settings import ApplicationSettings, WarmBuffersForecastSettings
+from simcore_service_autoscaling.utils.warm_buffers_forecast import (
+    WarmBuffersForecast,
+    compute_warm_buffer_counts,
+    predicted_demand,
+    record_started_instances,
+)
+from types_aiobotocore_ec2.literals import InstanceTypeType
+
+_T0 = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+
+
+@pytest.fixture
+def forecast_settings() -> WarmBuffersForecastSettings:
+    return WarmBuffersForecastSettings(
+        WARM_BUFFERS_FORECAST_MAX_BUFFER_COUNTS={"t2.xlarge": 10},
+        WARM_BUFFERS_FORECAST_BUCKET=datetime.timedelta(hours=1),
+        WARM_BUFFERS_FORECAST_SEASON=datetime.timedelta(hours=2),
+        WARM_BUFFERS_FORECAST_SMOOTHING=0.5,
+    )
+
+
+def test_forecast_settings_season_must_be_made_of_buckets():
+    with pytest.raises(ValueError, match="must be a multiple"):
+        WarmBuffersForecastSettings(
+            WARM_BUFFERS_FORECAST_MAX_BUFFER_COUNTS={},
+            WARM_BUFFERS_FORECAST_BUCKET=datetime.timedelta(hours=5),
+        )
+    with pytest.raises(ValueError, match="greater than 0"):
+        WarmBuffersForecastSettings(
+            WARM_BUFFERS_FORECAST_MAX_BUFFER_COUNTS={},
+            WARM_BUFFERS_FORECAST_BUCKET=datetime.timedelta(0),
+        )
+
+
+def test_record_started_instances(
+    forecast_settings: WarmBuffersForecastSettings,
+    fake_ec2_instance_data: Callable[..., EC2InstanceData],
+):
+    started_instances = [
+        fake_ec2_instance_data(type="t2.xlarge", tags={}, launch_time=_T0 + datetime.timedelta(minutes=10))
+        for _ in range(2)
+    ]
+    not_counted_instances = [
+        # already running before the forecast started
+        fake_ec2_instance_data(type="t2.xlarge", tags={}, launch_time=_T0 - datetime.timedelta(minutes=10)),
+        # warm buffers being prepared are not demand
+        fake_ec2_instance_data(
+            type="t2.xlarge",
+            tags=DEACTIVATED_BUFFER_MACHINE_EC2_TAGS,
+            launch_time=_T0 + datetime.timedelta(minutes=10),
+        ),
+    ]
+
+    # the first call only starts observing
+    forecast = record_started_instances(
+        forecast_settings, WarmBuffersForecast(), active_instances=not_counted_instances, now=_T0
+    )
+    assert forecast.current_bucket_demand == {}
+
+    forecast = record_started_instances(
+        forecast_settings,
+        forecast,
+        active_instances=[*started_instances, *not_counted_instances],
+        now=_T0 + datetime.timedelta(minutes=30),
+    )
+    assert forecast.current_bucket_demand == {"t2.xlarge": 2}
+    assert forecast.seasonal_demand == {}
+
+    # the next bucket starts, the demand of the first one is folded into its season slot
+    forecast = record_started_instances(
+        forecast_settings,
+        forecast,
+        active_instances=[
+            *started_instances,
+            fake_ec2_instance_data(type="t2.xlarge", tags={}, launch_time=_T0 + datetime.timedelta(minutes=61)),
+        ],
+        now=_T0 + datetime.timedelta(minutes=65),
+    )
+    assert forecast.current_bucket_demand == {"t2.xlarge": 1}
+    assert forecast.last_bucket_predicted_demand == {"t2.xlarge": 0}
+    assert forecast.last_bucket_observed_demand == {"t2.xlarge": 2}
+    assert predicted_demand(forecast_settings, forecast, "t2.xlarge", now=_T0) == 2
+    assert predicted_demand(forecast_settings, forecast, "t2.xlarge", now=_T0 + datetime.timedelta(hours=2)) == 2
+
+    # a season later, nothing was started in the first bucket: the moving average decreases
+    forecast = record_started_instances(
+        forecast_settings, forecast, active_instances=[], now=_T0 + datetime.timedelta(hours=2, minutes=1)
+    )
+    forecast = record_started_instances(
+        forecast_settings, forecast, active_instances=[], now=_T0 + datetime.timedelta(hours=3, minutes=1)
+    )
+    assert forecast.last_bucket_predicted_demand == {"t2.xlarge": 2}
+    assert forecast.last_bucket_observed_demand == {"t2.xlarge": 0}
+    assert predicted_demand(forecast_settings, forecast, "t2.xlarge", now=_T0) == pytest.approx(1)
+    assert predicted_demand(forecast_settings, forecast, "t2.xlarge", now=_T0 + datetime.timedelta(hours=1)) == 1
+
+    # the forecast survives a round trip through redis
+    assert WarmBuffersForecast.model_validate_json(forecast.model_dump_json()) == forecast
+
+
+@pytest.fixture
+def app_with_warm_buffers_forecast(
+    app_environment: EnvVarsDict,
+    monkeypatch: pytest.MonkeyPatch,
+    aws_allowed_ec2_instance_type_names: list[InstanceTypeType],
+) -> EnvVarsDict:
+    return app_environment | setenvs_from_dict(
+        monkeypatch,
+        {
+            "EC2_INSTANCES_ALLOWED_TYPES": json_dumps(
+                {
+                    instance_type: EC2InstanceBootSpecific.model_json_schema()["examples"][0] | {"buffer_count": 1}
+                    for instance_type in aws_allowed_ec2_instance_type_names
+                }
+            ),
+            "AUTOSCALING_WARM_BUFFERS_FORECAST": "{}",
+            "WARM_BUFFERS_FORECAST_MAX_BUFFER_COUNTS": json_dumps({"t2.xlarge": 3, "t2.2xlarge": 0}),
+            "WARM_BUFFERS_FORECAST_BUCKET": "01:00:00",
+            "WARM_BUFFERS_FORECAST_SEASON": "02:00:00",
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "seasonal_demand, expected_t2_xlarge_buffer_count",
+    [
+        pytest.param({}, 1, id="no demand keeps the configured buffer count"),
+        pytest.param({0: 0.2}, 1, id="low demand keeps the configured buffer count"),
+        pytest.param({0: 1.2}, 2, id="the demand is rounded up"),
+        pytest.param({1: 2}, 2, id="the next bucket is anticipated"),
+        pytest.param({0: 25, 1: 2}, 3, id="the demand is capped"),
+    ],
+)
+def test_compute_warm_buffer_counts(
+    app_with_warm_buffers_forecast: EnvVarsDict,
+    aws_allowed_ec2_instance_type_names: list[InstanceTypeType],
+    seasonal_demand: dict[int, float],
+    expected_t2_xlarge_buffer_count: int,
+):
+    app_settings = ApplicationSettings.create_from_envs()
+    forecast = WarmBuffersForecast(
+        seasonal_demand={"t2.xlarge": seasonal_demand, "t2.2xlarge": {0: 25}, "r5n.4xlarge": {0: 25}}
+    )
+    buffer_counts = compute_warm_buffer_counts(app_settings, forecast, now=_T0)
+    assert buffer_counts == dict.fromkeys(aws_allowed_ec2_instance_type_names, 1) | {
+        # the configured buffer count is the minimum even if the maximum is lower
+        "t2.2xlarge": 1,
+        "t2.xlarge": expected_t2_xlarge_buffer_count,
+    }
@@ -1,8 +1,9 @@
 import functools
 import logging
-from typing import cast
+from typing import Final, cast
 
 from fastapi import FastAPI
+from models_library.api_schemas_catalog import CATALOG_RPC_NAMESPACE
 from models_library.api_schemas_catalog.services import (
     MyServicesRpcBatchGet,
     PageRpcLatestServiceGet,
@@ -14,6 +15,7 @@ from models_library.api_schemas_catalog.services import (
 )
 from models_library.api_schemas_catalog.services_ports import ServicePortGet
 from models_library.products import ProductName
+from models_library.rabbitmq_basic_types import RPCMethodName
 from models_library.rest_pagination import PageOffsetInt
 from models_library.rpc_pagination import DEFAULT_NUMBER_OF_ITEMS_PER_PAGE, PageLimitInt
 from models_library.services_types import ServiceKey, ServiceVersion
@@ -27,6 +29,7 @@ from servicelib.rabbitmq.rpc_interfaces.catalog.errors import (
     CatalogItemNotFoundRpcError,
 )
 
+from ...clients.rabbitmq import get_rabbitmq_rpc_client
 from ...errors import BatchNotFoundError
 from ...models.services_db import ServiceDBFilters
 from ...repository.groups import GroupsRepository
@@ -36,6 +39,9 @@ from .._dependencies.director import get_director_client
 
 _logger = logging.getLogger(__name__)
 
+# NOTE: many users open the same study at once, updates of the services invalidate these results
+_GET_SERVICE_CACHE_TTL_S: Final[float] = 5
+
 router = RPCRouter()
 
 
@@ -108,7 +114,8 @@ async def list_services_paginated(
         CatalogItemNotFoundRpcError,
         CatalogForbiddenRpcError,
         ValidationError,
-    )
+    ),
+    cache_ttl_s=_GET_SERVICE_CACHE_TTL_S,
 )
 @_profile_rpc_call
 @validate_call(config={"arbitrary_types_allowed": True})
@@ -167,6 +174,9 @@ async def update_service(
         service_version=service_version,
         update=update,
     )
+    await get_rabbitmq_rpc_client(app).invalidate_cached_results(
+        CATALOG_RPC_NAMESPACE, RPCMethodName(get_service.__name__)
+    )
 
     assert service.key == service_key  # nosec
     assert service.version == service_version  # nosec
@@ -3,6 +3,7 @@ from typing import Final
 
 LEGACY_SERVICE_LOG_FILE_NAME: Final[str] = "log.dat"
 PARSE_LOG_INTERVAL_S: Final[float] = 0.5
+INPUTS_CACHE_FOLDER_NAME: Final[str] = ".inputs-cache"
 
 DOCKER_LOG_REGEXP_WITH_TIMESTAMP: re.Pattern[str] = re.compile(
     r"^(?P<timestamp>(?:(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}:\d{2}(?:\.\d+)?))(Z|[\+-]\d{2}:\d{2})?)"
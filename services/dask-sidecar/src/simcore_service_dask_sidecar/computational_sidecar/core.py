@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import os
+import shutil
 import socket
 from collections.abc import Coroutine
 from dataclasses import dataclass
@@ -27,6 +28,7 @@ from pydantic import ByteSize, TypeAdapter, ValidationError
 from pydantic.networks import AnyUrl
 from servicelib.logging_utils import LogLevelInt, LogMessageStr, log_catch
 from servicelib.progress_bar import ProgressBarData
+from servicelib.utils import limited_gather
 from settings_library.s3 import S3Settings
 from yarl import URL
 
@@ -34,10 +36,12 @@ from ..settings import ApplicationSettings
 from ..utils.dask import TaskPublisher
 from ..utils.encryption import ResolvedJobEncryptionContext
 from ..utils.files import (
+    InputsCache,
     check_need_unzipping,
     pull_file_from_remote,
     push_file_to_remote,
 )
+from .constants import INPUTS_CACHE_FOLDER_NAME
 from .docker_utils import (
     create_container_config,
     get_computational_shared_data_mount_point,
@@ -55,6 +59,34 @@ CONTAINER_WAIT_TIME_SECS = 2
 _TASK_PROCESSING_PROGRESS_WEIGHT: Final[float] = 0.99
 
 
+def _get_inputs_cache(settings: ApplicationSettings) -> InputsCache | None:
+    if settings.DASK_SIDECAR_INPUTS_CACHE_MAX_SIZE == 0:
+        return None
+    # NOTE: on the same volume as the tasks folders, so that the files can be cloned
+    return InputsCache(
+        cache_dir=settings.SIDECAR_COMP_SERVICES_SHARED_FOLDER / INPUTS_CACHE_FOLDER_NAME,
+        max_size=settings.DASK_SIDECAR_INPUTS_CACHE_MAX_SIZE,
+    )
+
+
+def _move_downloaded_input(download_folder: Path, inputs_folder: Path) -> set[Path]:
+    """moves (atomically, file by file) the content of download_folder into inputs_folder,
+    returns the paths that were already present and are overridden
+    """
+    overridden_paths: set[Path] = set()
+    for folder, sub_folder_names, file_names in os.walk(download_folder):
+        relative_folder = Path(folder).relative_to(download_folder)
+        for sub_folder_name in sub_folder_names:
+            (inputs_folder / relative_folder / sub_folder_name).mkdir(exist_ok=True)
+        for file_name in file_names:
+            destination = inputs_folder / relative_folder / file_name
+            if destination.exists():
+                overridden_paths.add(relative_folder / file_name)
+            (Path(folder) / file_name).replace(destination)
+    shutil.rmtree(download_folder)
+    return overridden_paths
+
+
 @dataclass(kw_only=True, frozen=True, slots=True)
 class ComputationalSidecar:
     task_parameters: ContainerTaskParameters
@@ -69,10 +101,11 @@ class ComputationalSidecar:
         self,
         input_key: str,
         input_params: FileUrl,
-        task_volumes: TaskSharedVolumes,
+        download_folder: Path,
+        inputs_cache: InputsCache | None,
     ) -> Coroutine:
         file_name = input_params.file_mapping or Path(URL(f"{input_params.url}").path.strip("/")).name
-        destination_path = task_volumes.inputs_folder / file_name
+        destination_path = download_folder / file_name
 
         need_unzipping = check_need_unzipping(input_params.url, input_params.file_mime_type, destination_path)
         if input_params.file_mapping and need_unzipping:
@@ -83,8 +116,9 @@ class ComputationalSidecar:
                 file_to_key_map=input_params.file_mapping,
             )
 
-        if destination_path.parent != task_volumes.inputs_folder:
-            # NOTE: only 'task_volumes.inputs_folder' part of 'destination_path' is guaranteed,
+        download_folder.mkdir(parents=True)
+        if destination_path.parent != download_folder:
+            # NOTE: only 'download_folder' part of 'destination_path' is guaranteed,
             # if extra subfolders via file-mapping,
             # then we make them first
             destination_path.parent.mkdir(parents=True)
@@ -96,31 +130,55 @@ class ComputationalSidecar:
             log_publishing_cb=self._publish_sidecar_log,
             s3_settings=self.s3_settings,
             encryption=(self.encryption.transfer_settings_for_input(input_key) if self.encryption else None),
+            inputs_cache=inputs_cache,
         )
 
     async def _write_input_data(
         self,
         task_volumes: TaskSharedVolumes,
         integration_version: version.Version,
+        *,
+        inputs_cache: InputsCache | None,
+        max_concurrent_downloads: int,
     ) -> None:
         input_data_file = (
             task_volumes.inputs_folder
             / f"{'inputs' if integration_version > LEGACY_INTEGRATION_VERSION else 'input'}.json"
         )
         local_input_data_file = {}
-        download_tasks: list[tuple[str, Coroutine]] = []
+        download_tasks: list[tuple[Path, Coroutine]] = []
 
         for input_key, input_params in self.task_parameters.input_data.items():
             if isinstance(input_params, FileUrl):
+                download_folder = task_volumes.inputs_staging_folder / input_key
                 download_tasks.append(
-                    (input_key, self._create_file_download_task(input_key, input_params, task_volumes))
+                    (
+                        download_folder,
+                        self._create_file_download_task(input_key, input_params, download_folder, inputs_cache),
+                    )
                 )
             else:
                 local_input_data_file[input_key] = input_params
 
-        # NOTE: concurrent download cannot be done as download is done in a flat folder and might override files with same name
-        for _, task in download_tasks:
-            await task
+        # NOTE: each input is downloaded (and uncompressed) concurrently in its own folder, then moved into
+        # the inputs folder following the order of the inputs. As with sequential downloads, an input
+        # overrides the files of the previous inputs that have the same name.
+        # NOTE: all the downloads are awaited before raising, none is left writing in the staging folders
+        results = await limited_gather(
+            *(task for _, task in download_tasks), reraise=False, log=_logger, limit=max_concurrent_downloads
+        )
+        if errors := [result for result in results if isinstance(result, BaseException)]:
+            raise errors[0]
+        colliding_paths: set[Path] = set()
+        for download_folder, _ in download_tasks:
+            colliding_paths |= await asyncio.to_thread(
+                _move_downloaded_input, download_folder, task_volumes.inputs_folder
+            )
+        if colliding_paths:
+            await self._publish_sidecar_log(
+                f"Some inputs override each other, the last one is kept: {sorted(f'{p}' for p in colliding_paths)}",
+                log_level=logging.WARNING,
+            )
 
         input_data_file.write_text(json_dumps(local_input_data_file))
 
@@ -232,7 +290,12 @@ class ComputationalSidecar:
                 envs=self.task_parameters.envs,
                 labels=self.task_parameters.labels,
             )
-            await self._write_input_data(task_volumes, image_labels.get_integration_version())
+            await self._write_input_data(
+                task_volumes,
+                image_labels.get_integration_version(),
+                inputs_cache=_get_inputs_cache(settings),
+                max_concurrent_downloads=settings.DASK_SIDECAR_MAX_CONCURRENT_INPUT_DOWNLOADS,
+            )
             await progress_bar.update()  # NOTE:  (1 step weighting 5%)
             # PROCESSING (1 step weighted 90%)
             async with (
@@ -31,6 +31,11 @@ class TaskSharedVolumes:
     def inputs_folder(self) -> Path:
         return self.base_path / "inputs"
 
+    @property
+    def inputs_staging_folder(self) -> Path:
+        """where the inputs are downloaded before being moved to inputs_folder (not visible to the service)"""
+        return self.base_path / "inputs-staging"
+
     @property
     def outputs_folder(self) -> Path:
         return self.base_path / "outputs"
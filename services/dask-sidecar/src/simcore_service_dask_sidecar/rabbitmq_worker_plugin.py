@@ -1,4 +1,5 @@
 import asyncio
+import itertools
 import logging
 import threading
 from asyncio import AbstractEventLoop
@@ -17,6 +18,7 @@ from .errors import ConfigurationError
 _logger = logging.getLogger(__name__)
 
 _RABBITMQ_CONFIGURATION_ERROR: Final[str] = "RabbitMQ client is not available. Please check the configuration."
+_MAX_MESSAGES_PER_BATCH: Final[int] = 100
 
 
 class RabbitMQPlugin(distributed.WorkerPlugin):
@@ -40,11 +42,21 @@ class RabbitMQPlugin(distributed.WorkerPlugin):
         with log_context(_logger, logging.INFO, "RabbitMQ message processor"):
             while True:
                 with log_catch(_logger, reraise=False):
-                    exchange_name, message_data = await self._message_queue.get()
+                    # NOTE: the messages queued while the previous batch was published are sent together
+                    messages = [await self._message_queue.get()]
+                    while len(messages) < _MAX_MESSAGES_PER_BATCH and not self._message_queue.empty():
+                        messages.append(self._message_queue.get_nowait())
                     try:
-                        await self._client.publish(exchange_name, message_data)
+                        # consecutive messages to the same exchange are grouped to keep the order
+                        for exchange_name, exchange_messages in itertools.groupby(messages, key=lambda m: m[0]):
+                            # NOTE: a failing exchange shall not prevent publishing to the others
+                            with log_catch(_logger, reraise=False):
+                                await self._client.publish_many(
+                                    exchange_name, [message_data for _, message_data in exchange_messages]
+                                )
                     finally:
-                        self._message_queue.task_done()
+                        for _ in messages:
+                            self._message_queue.task_done()
 
     def setup(self, worker: distributed.Worker) -> Awaitable[None]:
         """Called when the plugin is attached to a worker"""
@@ -5,7 +5,7 @@ from typing import Annotated, Any, cast
 
 from common_library.logging.logging_utils_filtering import LoggerName, MessageSubstring
 from models_library.basic_types import LogLevel
-from pydantic import AliasChoices, Field, field_validator
+from pydantic import AliasChoices, ByteSize, Field, PositiveInt, TypeAdapter, field_validator
 from servicelib.logging_utils import LogLevelInt
 from settings_library.application import BaseApplicationSettings
 from settings_library.kms import KMSSettings
@@ -80,6 +80,19 @@ class ApplicationSettings(BaseApplicationSettings, MixinLoggingSettings):
         ),
     ] = datetime.timedelta(hours=1)
 
+    DASK_SIDECAR_MAX_CONCURRENT_INPUT_DOWNLOADS: Annotated[
+        PositiveInt,
+        Field(description="Maximum number of input files of a task downloaded at the same time"),
+    ] = 4
+
+    DASK_SIDECAR_INPUTS_CACHE_MAX_SIZE: Annotated[
+        ByteSize,
+        Field(
+            description="Maximum size of the input files kept on the worker to be reused by the next tasks "
+            "(stored in SIDECAR_COMP_SERVICES_SHARED_FOLDER, 0 disables the cache)",
+        ),
+    ] = TypeAdapter(ByteSize).validate_python("10GiB")
+
     @cached_property
     def log_level(self) -> LogLevelInt:
         return cast(LogLevelInt, self.DASK_SIDECAR_LOGLEVEL)
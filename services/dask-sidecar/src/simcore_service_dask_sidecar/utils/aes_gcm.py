@@ -142,11 +142,24 @@ Protocol invariants (enforced on decryption)
 10. No bytes may follow the final chunk.
 11. Any authentication-tag failure, truncation or violation of the above aborts
     decryption (no data beyond the failing chunk is emitted as valid output).
+
+
+Random access (implementation note, not part of the protocol)
+-------------------------------------------------------------
+:func:`encrypt_stream` writes every non-final chunk with exactly ``chunk_size`` bytes of
+data. The offset of every chunk record of such a stream follows from the header and the
+stream size alone, so its chunks can be fetched and decrypted independently (e.g.
+concurrently, from ranged reads), see :func:`parse_stream_layout` and
+:func:`decrypt_chunk_records`. A conforming stream with shorter non-final chunks is
+rejected with ``AesGcmStreamLayoutError`` and must be decrypted with
+:func:`decrypt_stream`.
 """
 
+import io
 import os
 import struct
 from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated, BinaryIO, Final
 
@@ -177,6 +190,9 @@ _CHUNK_PREFIX_STRUCT: Final[struct.Struct] = struct.Struct(">BI")
 _U16_STRUCT: Final[struct.Struct] = struct.Struct(">H")
 _U64_STRUCT: Final[struct.Struct] = struct.Struct(">Q")
 
+HEADER_SIZE_BYTES: Final[int] = _HEADER_STRUCT.size
+CHUNK_RECORD_OVERHEAD_BYTES: Final[int] = _CHUNK_PREFIX_STRUCT.size + TAG_SIZE_BYTES
+
 
 class AesGcmStreamError(ValueError):
     """Base error for the streaming AES-GCM protocol."""
@@ -190,6 +206,10 @@ class AesGcmStreamAuthError(AesGcmStreamError):
     """Raised when authentication fails (tampering, wrong key/context or truncation)."""
 
 
+class AesGcmStreamLayoutError(AesGcmStreamFormatError):
+    """Raised when the chunk records of a stream cannot be located without reading it sequentially."""
+
+
 def generate_key() -> bytes:
     """Return a fresh random 32-byte root key suitable for AES-256-GCM derivation."""
     return os.urandom(AES_256_GCM_KEY_SIZE_BYTES)
@@ -449,6 +469,103 @@ def decrypt_stream(
         raise AesGcmStreamFormatError(msg)
 
 
+@dataclass(frozen=True, kw_only=True)
+class StreamLayout:
+    """Location of the chunk records of a stream whose non-final chunks are all full-size."""
+
+    chunk_size: int
+    base_nonce_seed: bytes
+    num_chunks: int
+    data_size: int
+
+    def record_offset(self, chunk_index: int) -> int:
+        """Offset in the stream of the record of chunk ``chunk_index``."""
+        return HEADER_SIZE_BYTES + chunk_index * (self.chunk_size + CHUNK_RECORD_OVERHEAD_BYTES)
+
+    def data_offset(self, chunk_index: int) -> int:
+        """Offset in the data of the first byte of chunk ``chunk_index``."""
+        return chunk_index * self.chunk_size
+
+
+def parse_stream_layout(
+    header: Annotated[bytes, Field(description="The first HEADER_SIZE_BYTES bytes of the stream")],
+    *,
+    stream_size: int,
+) -> StreamLayout:
+    """Locate the chunk records of a stream of ``stream_size`` bytes written by :func:`encrypt_stream`.
+
+    Raises:
+        AesGcmStreamFormatError: If the header is malformed or unsupported.
+        AesGcmStreamLayoutError: If the stream size does not match full-size non-final chunks.
+    """
+    chunk_size, base_nonce_seed = _parse_header(io.BytesIO(header))
+    records_size = stream_size - HEADER_SIZE_BYTES
+    record_size = chunk_size + CHUNK_RECORD_OVERHEAD_BYTES
+    num_chunks = max(1, -(-records_size // record_size))
+    final_record_size = records_size - (num_chunks - 1) * record_size
+    if final_record_size < CHUNK_RECORD_OVERHEAD_BYTES:
+        msg = f"Unexpected stream layout: {stream_size} bytes do not match chunks of {chunk_size} bytes"
+        raise AesGcmStreamLayoutError(msg)
+    return StreamLayout(
+        chunk_size=chunk_size,
+        base_nonce_seed=base_nonce_seed,
+        num_chunks=num_chunks,
+        data_size=records_size - num_chunks * CHUNK_RECORD_OVERHEAD_BYTES,
+    )
+
+
+def decrypt_chunk_records(
+    records: Annotated[bytes, Field(description="Consecutive chunk records, as located by ``layout``")],
+    *,
+    root_key: bytes,
+    file_id: str,
+    layout: StreamLayout,
+    first_chunk_index: int,
+) -> bytes:
+    """Decrypt consecutive chunk records of a stream, starting at chunk ``first_chunk_index``.
+
+    Every record must be where ``layout`` expects it, with the final marker set only on the
+    last chunk of the stream; the data of the chunks is returned concatenated.
+
+    Raises:
+        AesGcmStreamError: If ``root_key`` length is invalid.
+        AesGcmStreamLayoutError: If the records do not match ``layout`` (the stream must then be
+            decrypted sequentially with :func:`decrypt_stream`).
+        AesGcmStreamAuthError: If authentication fails.
+    """
+    _validate_key(root_key)
+    aesgcm = AESGCM(_derive_file_key(root_key, file_id=file_id))
+
+    data = bytearray()
+    offset = 0
+    chunk_index = first_chunk_index
+    while offset < len(records):
+        is_final = chunk_index == layout.num_chunks - 1
+        expected_data_len = layout.data_size - layout.data_offset(chunk_index) if is_final else layout.chunk_size
+        prefix = records[offset : offset + _CHUNK_PREFIX_STRUCT.size]
+        if chunk_index >= layout.num_chunks or len(prefix) < _CHUNK_PREFIX_STRUCT.size:
+            msg = f"Unexpected stream layout: no chunk record expected at chunk {chunk_index}"
+            raise AesGcmStreamLayoutError(msg)
+        chunk_flags, ct_len = _CHUNK_PREFIX_STRUCT.unpack(prefix)
+        if chunk_flags != (_FINAL_CHUNK_FLAG if is_final else 0) or ct_len != expected_data_len + TAG_SIZE_BYTES:
+            msg = f"Unexpected stream layout: chunk {chunk_index} is not where expected"
+            raise AesGcmStreamLayoutError(msg)
+        offset += _CHUNK_PREFIX_STRUCT.size
+        ct_and_tag = records[offset : offset + ct_len]
+        if len(ct_and_tag) < ct_len:
+            msg = f"Unexpected stream layout: chunk {chunk_index} is incomplete"
+            raise AesGcmStreamLayoutError(msg)
+        data += _decrypt_chunk(
+            aesgcm,
+            nonce=_chunk_nonce(layout.base_nonce_seed, chunk_index),
+            ct_and_tag=ct_and_tag,
+            aad=_build_chunk_aad(chunk_index=chunk_index, is_final=is_final, file_id=file_id),
+        )
+        offset += ct_len
+        chunk_index += 1
+    return bytes(data)
+
+
 def encrypt_file(
     src: Annotated[Path, Field(description="Path to unencrypted (data) input file")],
     dst: Annotated[Path, Field(description="Path to encrypted output file")],
@@ -1,3 +1,4 @@
+from ._cache import InputsCache
 from ._copy import CHUNK_SIZE
 from ._download import check_need_unzipping, pull_file_from_remote
 from ._progress import LogPublishingCB
@@ -16,6 +17,7 @@ __all__: tuple[str, ...] = (
     "MIMETYPE_APPLICATION_ZIP",
     "S3_FILE_SYSTEM_SCHEMES",
     "ClientKWArgsDict",
+    "InputsCache",
     "LogPublishingCB",
     "S3FsSettingsDict",
     "_s3fs_settings_from_s3_settings",
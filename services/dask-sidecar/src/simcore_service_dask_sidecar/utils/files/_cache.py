@@ -0,0 +1,141 @@
+"""On-disk cache of the input files downloaded on this worker
+
+Tasks running on the same worker often consume the same remote files (e.g. a parameter sweep
+fanning out many tasks over the same model). The downloaded files are kept in a bounded
+content-addressed folder (keyed by remote location, entity tag and size) and handed over to
+the next tasks instead of being downloaded again.
+
+The cache lives on the same volume as the tasks folders: entries are handed over as reflinks
+when the filesystem supports it (no data is copied), otherwise as local copies. Hard links are not
+used, a service modifying its inputs in place would otherwise modify the cache.
+
+All the operations rely on atomic filesystem operations, so the cache can be shared by several
+worker threads and processes.
+"""
+
+import contextlib
+import errno
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+from uuid import uuid4
+
+import fsspec  # type: ignore[import-untyped]
+from prometheus_client import Counter
+from pydantic import ByteSize
+from pydantic.networks import AnyUrl
+from yarl import URL
+
+from ._copy import CHUNK_SIZE
+
+_logger = logging.getLogger(__name__)
+
+_FICLONE: Final[int] = 0x40049409  # from linux/fs.h
+_DOWNLOADS_FOLDER_NAME: Final[str] = ".downloads"
+_ENTITY_TAG_INFO_KEYS: Final[tuple[str, ...]] = ("ETag", "etag")
+
+_CACHE_REQUESTS = Counter(
+    "dask_sidecar_inputs_cache_requests",
+    "Number of input files looked up in the worker inputs cache",
+    labelnames=("result",),
+)
+_CACHE_BYTES_SERVED = Counter(
+    "dask_sidecar_inputs_cache_served_bytes",
+    "Bytes of input files served from the worker inputs cache instead of being downloaded",
+)
+_CACHE_EVICTIONS = Counter(
+    "dask_sidecar_inputs_cache_evictions",
+    "Number of entries evicted from the worker inputs cache",
+)
+
+
+def _clone_or_copy_file(src: Path, dst: Path) -> None:
+    with src.open("rb") as src_fp, dst.open("wb") as dst_fp:
+        try:
+            fcntl.ioctl(dst_fp.fileno(), _FICLONE, src_fp.fileno())
+            return
+        except OSError as exc:
+            if exc.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+                raise
+        shutil.copyfileobj(src_fp, dst_fp, length=CHUNK_SIZE)
+
+
+def compute_cache_key(src_url: AnyUrl, storage_kwargs: dict[str, Any]) -> str | None:
+    """returns the cache key of the remote file, None if its content cannot be identified
+
+    NOTE: blocking call (requests the remote file metadata)
+    """
+    file_system, path = fsspec.core.url_to_fs(f"{src_url}", **storage_kwargs)
+    info = file_system.info(path)
+    entity_tag = next((info[key] for key in _ENTITY_TAG_INFO_KEYS if info.get(key)), None)
+    if entity_tag is None:
+        return None
+    # NOTE: the query is ignored, presigned links to the same object differ by their signature
+    url = URL(f"{src_url}")
+    location = f"{url.host}:{url.port}{url.path}"
+    return hashlib.sha256(f"{location}|{entity_tag}|{info.get('size')}".encode()).hexdigest()
+
+
+@dataclass(frozen=True, kw_only=True)
+class InputsCache:
+    cache_dir: Path
+    max_size: ByteSize
+
+    def __post_init__(self) -> None:
+        (self.cache_dir / _DOWNLOADS_FOLDER_NAME).mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def create_download_path(self) -> Path:
+        """path where a file can be downloaded before being added to the cache"""
+        return self.cache_dir / _DOWNLOADS_FOLDER_NAME / f"{uuid4()}"
+
+    def get(self, key: str) -> Path | None:
+        entry_path = self._entry_path(key)
+        try:
+            # NOTE: the modification time orders the entries for eviction (least recently used first)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            _CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        _CACHE_REQUESTS.labels(result="hit").inc()
+        return entry_path
+
+    def add(self, key: str, downloaded_path: Path, *, dst_path: Path) -> None:
+        """moves a file downloaded to `create_download_path()` into the cache, once copied to dst_path
+
+        NOTE: copying it first ensures it cannot be evicted in the meantime
+        """
+        _clone_or_copy_file(downloaded_path, dst_path)
+        downloaded_path.replace(self._entry_path(key))
+
+    def copy_to(self, entry_path: Path, dst_path: Path) -> None:
+        """raises FileNotFoundError if the entry was evicted in the meantime"""
+        _clone_or_copy_file(entry_path, dst_path)
+        _CACHE_BYTES_SERVED.inc(dst_path.stat().st_size)
+
+    def evict(self) -> None:
+        """removes the least recently used entries until the cache fits in max_size"""
+        entries: list[tuple[float, int, Path]] = []
+        for entry_path in self.cache_dir.iterdir():
+            if entry_path.name == _DOWNLOADS_FOLDER_NAME:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                entry_stat = entry_path.stat()
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                entry_path.unlink()
+                _CACHE_EVICTIONS.inc()
+                _logger.debug("evicted %s from the inputs cache", entry_path.name)
+            total_size -= size
@@ -11,6 +11,7 @@ from pydantic.networks import AnyUrl
 
 from ..aes_gcm import decrypt_stream, encrypt_stream
 from ..encryption import TransferEncryptionSettings
+from ._parallel import download_in_parts, upload_in_parts
 from ._progress import LogPublishingCB, _format_progress_message, _ThreadSafeProgressLogger
 
 CHUNK_SIZE = 4 * 1024 * 1024
@@ -96,6 +97,36 @@ async def _copy_file(
 ):
     src_storage_kwargs = src_storage_cfg or {}
     dst_storage_kwargs = dst_storage_cfg or {}
+    if encryption is not None and encryption_mode is None:
+        msg = "encryption_mode must be provided when encryption settings are configured"
+        raise ValueError(msg)
+
+    # NOTE: large files are transferred in concurrent parts when possible
+    if (
+        isinstance(src_url, AnyUrl)
+        and isinstance(dst_url, Path)
+        and await download_in_parts(
+            src_url,
+            dst_url,
+            storage_kwargs=src_storage_kwargs,
+            encryption=encryption,
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=text_prefix,
+        )
+    ) or (
+        isinstance(src_url, Path)
+        and isinstance(dst_url, AnyUrl)
+        and encryption is None
+        and await upload_in_parts(
+            src_url,
+            dst_url,
+            storage_kwargs=dst_storage_kwargs,
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=text_prefix,
+        )
+    ):
+        return
+
     with (
         fsspec.open(f"{src_url}", mode="rb", expand=False, **src_storage_kwargs) as src_fp,
         fsspec.open(f"{dst_url}", mode="wb", expand=False, **dst_storage_kwargs) as dst_fp,
@@ -112,9 +143,7 @@ async def _copy_file(
                 text_prefix=text_prefix,
             )
         else:
-            if encryption_mode is None:
-                msg = "encryption_mode must be provided when encryption settings are configured"
-                raise ValueError(msg)
+            assert encryption_mode is not None  # nosec
             await _run_crypto_copy(
                 src_fp,
                 dst_fp,
@@ -6,7 +6,6 @@ from pathlib import Path
 from typing import Any, Final, cast
 
 import aiofiles.tempfile
-import repro_zipfile
 from pydantic.networks import AnyUrl
 from settings_library.s3 import S3Settings
 from yarl import URL
@@ -14,9 +13,11 @@ from yarl import URL
 from ...errors import FileTransferEncryptionError
 from ..aes_gcm import AesGcmStreamError
 from ..encryption import TransferEncryptionSettings
+from ._cache import InputsCache, compute_cache_key
 from ._copy import _copy_file
 from ._progress import LogPublishingCB
 from ._s3 import S3_FILE_SYSTEM_SCHEMES, S3FsSettingsDict, _s3fs_settings_from_s3_settings
+from ._unzip import extract_zip
 
 _logger = logging.getLogger(__name__)
 
@@ -40,6 +41,34 @@ def check_need_unzipping(
     return (src_mime_type == _ZIP_MIME_TYPE) and (dst_mime_type != _ZIP_MIME_TYPE)
 
 
+async def _get_inputs_cache_key(src_url: AnyUrl, storage_kwargs: dict[str, Any]) -> str | None:
+    try:
+        return await asyncio.to_thread(compute_cache_key, src_url, storage_kwargs)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # NOTE: the cache is an optimization, the download reports the actual issue if any
+        _logger.warning("could not identify the content of %s, it will not be cached", src_url, exc_info=True)
+        return None
+
+
+async def _pull_file_from_inputs_cache(inputs_cache: InputsCache, cache_key: str, dst_path: Path) -> bool:
+    entry_path = inputs_cache.get(cache_key)
+    if entry_path is None:
+        return False
+    try:
+        await asyncio.to_thread(inputs_cache.copy_to, entry_path, dst_path)
+    except FileNotFoundError:
+        # evicted in the meantime
+        return False
+    return True
+
+
+async def _add_file_to_inputs_cache(
+    inputs_cache: InputsCache, cache_key: str, downloaded_path: Path, dst_path: Path
+) -> None:
+    await asyncio.to_thread(inputs_cache.add, cache_key, downloaded_path, dst_path=dst_path)
+    await asyncio.to_thread(inputs_cache.evict)
+
+
 async def pull_file_from_remote(
     src_url: AnyUrl,
     target_mime_type: str | None,
@@ -48,6 +77,7 @@ async def pull_file_from_remote(
     log_publishing_cb: LogPublishingCB,
     s3_settings: S3Settings | None,
     encryption: TransferEncryptionSettings | None,
+    inputs_cache: InputsCache | None = None,
 ) -> None:
     assert src_url.path  # nosec
     src_location_str = f"{src_url.path.strip('/')} on {src_url.host}:{src_url.port}"
@@ -64,6 +94,12 @@ async def pull_file_from_remote(
         storage_kwargs = _s3fs_settings_from_s3_settings(s3_settings)
 
     need_unzipping = check_need_unzipping(src_url, target_mime_type, dst_path)
+    # NOTE: decrypted inputs are never cached, they must not outlive the task
+    cache_key = (
+        await _get_inputs_cache_key(src_url, cast(dict[str, Any], storage_kwargs))
+        if inputs_cache is not None and encryption is None
+        else None
+    )
     async with AsyncExitStack() as exit_stack:
         if need_unzipping:
             # we need to extract the file, so we create a temporary directory
@@ -75,37 +111,57 @@ async def pull_file_from_remote(
             # no extraction needed, so we can use the provided dst_path directly
             download_dst_path = dst_path
 
-        try:
-            await _copy_file(
-                src_url,
-                download_dst_path,
-                src_storage_cfg=cast(dict[str, Any], storage_kwargs),
-                dst_storage_cfg=None,
-                log_publishing_cb=log_publishing_cb,
-                text_prefix=f"Downloading '{src_location_str}':",
-                encryption=encryption,
-                encryption_mode="decrypt" if encryption else None,
+        if (
+            inputs_cache is not None
+            and cache_key is not None
+            and await _pull_file_from_inputs_cache(inputs_cache, cache_key, download_dst_path)
+        ):
+            await log_publishing_cb(
+                f"Using '{src_location_str}' from the worker cache as local file '{download_dst_path}'.",
+                logging.INFO,
+            )
+        else:
+            transfer_dst_path = (
+                inputs_cache.create_download_path()
+                if inputs_cache is not None and cache_key is not None
+                else download_dst_path
+            )
+            if transfer_dst_path != download_dst_path:
+                # NOTE: removes what remains of the download if it fails
+                exit_stack.callback(transfer_dst_path.unlink, missing_ok=True)
+            try:
+                await _copy_file(
+                    src_url,
+                    transfer_dst_path,
+                    src_storage_cfg=cast(dict[str, Any], storage_kwargs),
+                    dst_storage_cfg=None,
+                    log_publishing_cb=log_publishing_cb,
+                    text_prefix=f"Downloading '{src_location_str}':",
+                    encryption=encryption,
+                    encryption_mode="decrypt" if encryption else None,
+                )
+            except AesGcmStreamError as exc:
+                # translate the low-level crypto failure into a sidecar error so callers do not
+                # depend on the crypto primitives. file_id is the one used for key derivation.
+                assert encryption is not None  # nosec
+                raise FileTransferEncryptionError(
+                    operation="decrypt",
+                    file_role="input",
+                    file_id=encryption.file_id,
+                    error_message=f"{exc}",
+                ) from exc
+
+            if inputs_cache is not None and cache_key is not None:
+                await _add_file_to_inputs_cache(inputs_cache, cache_key, transfer_dst_path, download_dst_path)
+
+            await log_publishing_cb(
+                f"Download of '{src_location_str}' into local file '{download_dst_path}' complete.",
+                logging.INFO,
             )
-        except AesGcmStreamError as exc:
-            # translate the low-level crypto failure into a sidecar error so callers do not
-            # depend on the crypto primitives. file_id is the one used for key derivation.
-            assert encryption is not None  # nosec
-            raise FileTransferEncryptionError(
-                operation="decrypt",
-                file_role="input",
-                file_id=encryption.file_id,
-                error_message=f"{exc}",
-            ) from exc
-
-        await log_publishing_cb(
-            f"Download of '{src_location_str}' into local file '{download_dst_path}' complete.",
-            logging.INFO,
-        )
 
         if need_unzipping:
             await log_publishing_cb(f"Uncompressing '{download_dst_path.name}'...", logging.INFO)
             _logger.debug("%s is a zip file and will be now uncompressed", download_dst_path)
-            with repro_zipfile.ReproducibleZipFile(download_dst_path, "r") as zip_obj:
-                await asyncio.to_thread(zip_obj.extractall, dst_path.parents[0])
+            await extract_zip(download_dst_path, dst_path.parents[0])
             # finally remove the zip archive
             await log_publishing_cb(f"Uncompressing '{download_dst_path.name}' complete.", logging.INFO)
@@ -0,0 +1,260 @@
+"""Parallel transfers of large files between S3 (or HTTP links) and the local disk
+
+A streaming copy keeps a single request in flight. Large files are instead split in parts
+transferred concurrently:
+- downloads issue ranged reads, each part is written in place (os.pwrite) into the preallocated
+  destination file. Encrypted files are split on chunk record boundaries and each part is decrypted
+  in a worker thread as soon as it is received (the chunks are independently nonce'd).
+- uploads to S3 use a concurrent multipart upload.
+
+Whatever cannot be split (small files, other file systems, servers ignoring ranges, encrypted
+files with a layout not written by encrypt_stream) is left to the streaming copy.
+"""
+
+import asyncio
+import contextlib
+import errno
+import functools
+import logging
+import os
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+import fsspec  # type: ignore[import-untyped]
+from fsspec.asyn import AsyncFileSystem  # type: ignore[import-untyped]
+from pydantic.networks import AnyUrl
+from servicelib.utils import limited_gather
+
+from ..aes_gcm import (
+    HEADER_SIZE_BYTES,
+    AesGcmStreamLayoutError,
+    StreamLayout,
+    decrypt_chunk_records,
+    parse_stream_layout,
+)
+from ..encryption import TransferEncryptionSettings
+from ._progress import LogPublishingCB, _file_progress_cb, _ThreadSafeProgressLogger
+from ._s3 import HTTP_FILE_SYSTEM_SCHEMES, S3_FILE_SYSTEM_SCHEMES
+
+_logger = logging.getLogger(__name__)
+
+_MIN_PARALLEL_TRANSFER_SIZE: Final[int] = 64 * 1024 * 1024
+_PART_SIZE: Final[int] = 16 * 1024 * 1024
+_MAX_CONCURRENT_PARTS: Final[int] = 8
+_RANGED_READ_SCHEMES: Final[tuple[str, ...]] = (*S3_FILE_SYSTEM_SCHEMES, *HTTP_FILE_SYSTEM_SCHEMES)
+
+
+class _RangedReadNotSupportedError(RuntimeError): ...
+
+
+@dataclass(frozen=True, kw_only=True)
+class _Part:
+    src_start: int
+    src_end: int
+    dst_offset: int
+    first_chunk_index: int = 0
+
+
+type _PartDecoder = Callable[[_Part, bytes], bytes]
+
+
+@contextlib.asynccontextmanager
+async def _async_file_system(url: AnyUrl, storage_kwargs: dict[str, Any]) -> AsyncIterator[tuple[AsyncFileSystem, str]]:
+    file_system, path = fsspec.core.url_to_fs(f"{url}", asynchronous=True, skip_instance_cache=True, **storage_kwargs)
+    session = await file_system.set_session()
+    try:
+        yield file_system, path
+    finally:
+        await session.close()
+
+
+async def _read_range(file_system: AsyncFileSystem, path: str, start: int, end: int) -> bytes:
+    data: bytes = await file_system._cat_file(path, start=start, end=end)  # noqa: SLF001
+    if len(data) != end - start:
+        # e.g. a HTTP server ignoring the Range header
+        raise _RangedReadNotSupportedError
+    return data
+
+
+def _preallocate(fd: int, size: int) -> None:
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as exc:
+        if exc.errno not in (errno.EOPNOTSUPP, errno.EINVAL):
+            raise
+        os.ftruncate(fd, size)
+
+
+def _write_part(fd: int, part: _Part, data: bytes, decode: _PartDecoder | None) -> int:
+    if decode is not None:
+        data = decode(part, data)
+    view = memoryview(data)
+    offset = part.dst_offset
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+    return len(data)
+
+
+def _plain_parts(size: int) -> list[_Part]:
+    return [
+        _Part(src_start=start, src_end=min(start + _PART_SIZE, size), dst_offset=start)
+        for start in range(0, size, _PART_SIZE)
+    ]
+
+
+def _encrypted_parts(layout: StreamLayout, stream_size: int) -> list[_Part]:
+    # NOTE: a part holds whole chunk records, so it can be decrypted on its own
+    chunks_per_part = max(1, _PART_SIZE // layout.chunk_size)
+    return [
+        _Part(
+            src_start=layout.record_offset(chunk_index),
+            src_end=min(layout.record_offset(chunk_index + chunks_per_part), stream_size),
+            dst_offset=layout.data_offset(chunk_index),
+            first_chunk_index=chunk_index,
+        )
+        for chunk_index in range(0, layout.num_chunks, chunks_per_part)
+    ]
+
+
+def _decrypt_part(part: _Part, data: bytes, *, encryption: TransferEncryptionSettings, layout: StreamLayout) -> bytes:
+    return decrypt_chunk_records(
+        data,
+        root_key=encryption.root_key.get_secret_value(),
+        file_id=encryption.file_id,
+        layout=layout,
+        first_chunk_index=part.first_chunk_index,
+    )
+
+
+async def _download_parts(
+    file_system: AsyncFileSystem,
+    path: str,
+    dst_path: Path,
+    *,
+    parts: list[_Part],
+    dst_size: int,
+    decode: _PartDecoder | None,
+    progress_logger: _ThreadSafeProgressLogger,
+) -> None:
+    bytes_written = 0
+
+    async def _download_part(part: _Part) -> None:
+        nonlocal bytes_written
+        data = await _read_range(file_system, path, part.src_start, part.src_end)
+        bytes_written += await asyncio.to_thread(_write_part, fd, part, data, decode)
+        progress_logger(bytes_written)
+
+    async def _download_other_parts() -> None:
+        # NOTE: all the parts are awaited before raising, none is left writing in fd
+        results = await limited_gather(
+            *(_download_part(part) for part in parts[1:]), reraise=False, log=_logger, limit=_MAX_CONCURRENT_PARTS
+        )
+        if errors := [result for result in results if isinstance(result, BaseException)]:
+            raise errors[0]
+
+    fd = await asyncio.to_thread(os.open, dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if dst_size > 0:
+            await asyncio.to_thread(_preallocate, fd, dst_size)
+        # NOTE: the first part checks that ranged reads are supported before requesting the others
+        await _download_part(parts[0])
+        await _download_other_parts()
+    except BaseException:
+        # NOTE: the parts are not written in order, nothing that was written can be trusted
+        await asyncio.to_thread(os.ftruncate, fd, 0)
+        raise
+    finally:
+        await asyncio.to_thread(os.close, fd)
+
+
+async def download_in_parts(
+    src_url: AnyUrl,
+    dst_path: Path,
+    *,
+    storage_kwargs: dict[str, Any],
+    encryption: TransferEncryptionSettings | None,
+    log_publishing_cb: LogPublishingCB,
+    text_prefix: str,
+) -> bool:
+    """downloads (and decrypts) src_url with concurrent ranged reads,
+    returns False if nothing was transferred and it must be streamed instead
+    """
+    if src_url.scheme not in _RANGED_READ_SCHEMES:
+        return False
+    async with _async_file_system(src_url, storage_kwargs) as (file_system, path):
+        src_size = (await file_system._info(path)).get("size")  # noqa: SLF001
+        if src_size is None or src_size < _MIN_PARALLEL_TRANSFER_SIZE:
+            return False
+        try:
+            dst_size = src_size
+            decode: _PartDecoder | None = None
+            parts = _plain_parts(src_size)
+            if encryption is not None:
+                header = await _read_range(file_system, path, 0, HEADER_SIZE_BYTES)
+                layout = parse_stream_layout(header, stream_size=src_size)
+                if layout.chunk_size > _PART_SIZE:
+                    return False
+                dst_size = layout.data_size
+                decode = functools.partial(_decrypt_part, encryption=encryption, layout=layout)
+                parts = _encrypted_parts(layout, src_size)
+
+            progress_logger = _ThreadSafeProgressLogger(
+                file_size=dst_size,
+                log_publishing_cb=log_publishing_cb,
+                text_prefix=text_prefix,
+                main_loop=asyncio.get_running_loop(),
+            )
+            await _download_parts(
+                file_system,
+                path,
+                dst_path,
+                parts=parts,
+                dst_size=dst_size,
+                decode=decode,
+                progress_logger=progress_logger,
+            )
+        except (_RangedReadNotSupportedError, AesGcmStreamLayoutError):
+            _logger.debug("%s cannot be downloaded in parts, it is streamed instead", src_url, exc_info=True)
+            return False
+    await progress_logger.emit_final()
+    return True
+
+
+async def upload_in_parts(
+    src_path: Path,
+    dst_url: AnyUrl,
+    *,
+    storage_kwargs: dict[str, Any],
+    log_publishing_cb: LogPublishingCB,
+    text_prefix: str,
+) -> bool:
+    """uploads src_path to S3 with a concurrent multipart upload,
+    returns False if nothing was transferred and it must be streamed instead
+    """
+    if dst_url.scheme not in S3_FILE_SYSTEM_SCHEMES:
+        return False
+    src_size = (await asyncio.to_thread(src_path.stat)).st_size
+    if src_size < _MIN_PARALLEL_TRANSFER_SIZE:
+        return False
+    async with _async_file_system(dst_url, storage_kwargs) as (file_system, path):
+        await file_system._put_file(  # noqa: SLF001
+            f"{src_path}",
+            path,
+            callback=fsspec.Callback(
+                hooks={
+                    "progress": functools.partial(
+                        _file_progress_cb,
+                        log_publishing_cb=log_publishing_cb,
+                        text_prefix=text_prefix,
+                        main_loop=asyncio.get_running_loop(),
+                    )
+                }
+            ),
+            chunksize=_PART_SIZE,
+            max_concurrency=_MAX_CONCURRENT_PARTS,
+        )
+    return True
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Final
+from zipfile import ZipInfo
+
+import repro_zipfile
+
+_MAX_EXTRACTION_THREADS: Final[int] = 4
+
+
+def _extract_members(
+    zip_path: Path,
+    members: deque[ZipInfo],
+    dst_folder: Path,
+    failed: threading.Event,
+) -> None:
+    # NOTE: each thread reads the archive through its own file handle
+    with repro_zipfile.ReproducibleZipFile(zip_path, "r") as zip_obj:
+        while not failed.is_set():
+            try:
+                member = members.popleft()
+            except IndexError:
+                return
+            try:
+                # NOTE: the member path is sanitized as in extractall (no absolute paths, no '..')
+                zip_obj.extract(member, dst_folder)
+            except BaseException:
+                failed.set()
+                raise
+
+
+async def extract_zip(zip_path: Path, dst_folder: Path, *, max_threads: int = _MAX_EXTRACTION_THREADS) -> None:
+    """extracts the archive into dst_folder, its members are inflated concurrently (zlib releases the GIL)"""
+    with repro_zipfile.ReproducibleZipFile(zip_path, "r") as zip_obj:
+        # NOTE: the largest members first, so that they do not end up being inflated last by a single thread
+        members = deque(sorted(zip_obj.infolist(), key=lambda member: member.file_size, reverse=True))
+
+    failed = threading.Event()
+    extractions = asyncio.gather(
+        *(
+            asyncio.to_thread(_extract_members, zip_path, members, dst_folder, failed)
+            for _ in range(min(max_threads, len(members)))
+        ),
+        return_exceptions=True,
+    )
+    try:
+        # NOTE: waits for all the threads, they stop after their current member once one failed
+        results = await asyncio.shield(extractions)
+    except asyncio.CancelledError:
+        failed.set()
+        # NOTE: the threads cannot be cancelled, the caller may only clean up dst_folder once they stopped
+        await asyncio.wait([extractions])
+        raise
+    if errors := [result for result in results if isinstance(result, BaseException)]:
+        raise errors[0]
@@ -0,0 +1,23 @@
+# pylint: disable=protected-access
+
+from pathlib import Path
+
+from simcore_service_dask_sidecar.computational_sidecar.core import _move_downloaded_input
+
+
+def test_move_downloaded_input_keeps_the_last_input(tmp_path: Path):
+    inputs_folder = tmp_path / "inputs"
+    inputs_folder.mkdir()
+    download_folders = [tmp_path / "staging" / f"input_{n}" for n in range(2)]
+    for n, download_folder in enumerate(download_folders):
+        (download_folder / "sub").mkdir(parents=True)
+        (download_folder / "sub" / "same_name.txt").write_text(f"input_{n}")
+        (download_folder / f"only_in_input_{n}.txt").write_text(f"input_{n}")
+
+    overridden_paths = [_move_downloaded_input(folder, inputs_folder) for folder in download_folders]
+
+    assert overridden_paths == [set(), {Path("sub/same_name.txt")}]
+    assert (inputs_folder / "sub" / "same_name.txt").read_text() == "input_1"
+    assert (inputs_folder / "only_in_input_0.txt").read_text() == "input_0"
+    assert (inputs_folder / "only_in_input_1.txt").read_text() == "input_1"
+    assert not any(folder.exists() for folder in download_folders)
@@ -2,13 +2,16 @@
 # pylint: disable=unused-argument
 # pylint: disable=unused-variable
 # pylint: disable=no-member
+# pylint: disable=protected-access
 
 import asyncio
 from unittest import mock
 
 import distributed
 import pytest
+from common_library.async_tools import cancel_wait_task
 from pytest_mock import MockerFixture
+from simcore_service_dask_sidecar.rabbitmq_worker_plugin import RabbitMQPlugin
 
 # Selection of core and tool services started in this swarm fixture (integration)
 pytest_simcore_core_services_selection = [
@@ -35,3 +38,25 @@ async def test_dask_worker_closes_if_plugin_fails_on_start(
     local_cluster: distributed.LocalCluster,
 ):
     await asyncio.sleep(10)
+
+
+async def test_rabbitmq_plugin_publishes_other_exchanges_when_one_fails(mocker: MockerFixture):
+    client = mocker.AsyncMock()
+    client.publish_many.side_effect = [None, RuntimeError("Pytest: exchange failure"), None]
+    message_queue = asyncio.Queue()
+    for exchange_name in ("logs", "logs", "progress", "logs"):
+        message_queue.put_nowait((exchange_name, mocker.MagicMock()))
+    plugin = RabbitMQPlugin(settings=mocker.MagicMock())
+    plugin._client = client  # noqa: SLF001
+    plugin._message_queue = message_queue  # noqa: SLF001
+
+    message_processor = asyncio.create_task(plugin._process_messages())  # noqa: SLF001
+    await asyncio.wait_for(message_queue.join(), timeout=5)
+    await cancel_wait_task(message_processor)
+
+    # the messages of the exchanges after the failing one are published
+    assert [(call.args[0], len(call.args[1])) for call in client.publish_many.call_args_list] == [
+        ("logs", 2),
+        ("progress", 1),
+        ("logs", 1),
+    ]
@@ -26,15 +26,18 @@ from simcore_service_dask_sidecar.utils.aes_gcm import (
     AesGcmStreamAuthError,
     AesGcmStreamError,
     AesGcmStreamFormatError,
+    AesGcmStreamLayoutError,
     _build_chunk_aad,
     _chunk_nonce,
     _derive_file_key,
     _length_prefixed,
+    decrypt_chunk_records,
     decrypt_file,
     decrypt_stream,
     encrypt_file,
     encrypt_stream,
     generate_key,
+    parse_stream_layout,
 )
 
 _HEADER_SIZE: Final[int] = _HEADER_STRUCT.size
@@ -449,3 +452,51 @@ def test_path_wrappers_reject_wrong_context(root_key: bytes, context: dict[str,
 
     with pytest.raises(AesGcmStreamAuthError, match="authentication failed"):
         decrypt_file(encrypted, decrypted, root_key=root_key, **{**context, "file_id": "other-file"})
+
+
+@pytest.mark.parametrize("data_size", [0, 1, 99, 100, 101, 250, 1000])
+def test_decrypt_chunk_records_in_any_order(root_key: bytes, context: dict[str, str], data_size: int):
+    chunk_size = 100
+    chunks_per_part = 2
+    plaintext = os.urandom(data_size)
+    encrypted = _encrypt_to_bytes(plaintext, root_key, context, chunk_size=chunk_size)
+
+    layout = parse_stream_layout(encrypted[:_HEADER_SIZE], stream_size=len(encrypted))
+    assert layout.data_size == data_size
+
+    decrypted = bytearray(data_size)
+    for chunk_index in reversed(range(0, layout.num_chunks, chunks_per_part)):
+        records = encrypted[layout.record_offset(chunk_index) : layout.record_offset(chunk_index + chunks_per_part)]
+        data = decrypt_chunk_records(
+            records, root_key=root_key, layout=layout, first_chunk_index=chunk_index, **context
+        )  # pyright: ignore[reportArgumentType]
+        offset = layout.data_offset(chunk_index)
+        decrypted[offset : offset + len(data)] = data
+    assert decrypted == plaintext
+
+
+def test_decrypt_chunk_records_rejects_short_non_final_chunks(root_key: bytes, context: dict[str, str]):
+    class _ShortReads(io.BytesIO):
+        def read(self, size: int | None = -1, /) -> bytes:
+            return super().read(min(size, 60) if size is not None and size > 0 else size)
+
+    # a conforming stream that was not written with full-size chunks
+    dst = io.BytesIO()
+    encrypt_stream(_ShortReads(os.urandom(250)), dst, root_key=root_key, chunk_size=100, **context)  # pyright: ignore[reportArgumentType]
+    encrypted = dst.getvalue()
+    assert len(_decrypt_to_bytes(encrypted, root_key, context)) == 250
+
+    layout = parse_stream_layout(encrypted[:_HEADER_SIZE], stream_size=len(encrypted))
+    with pytest.raises(AesGcmStreamLayoutError):
+        decrypt_chunk_records(
+            encrypted[_HEADER_SIZE:], root_key=root_key, layout=layout, first_chunk_index=0, **context
+        )  # pyright: ignore[reportArgumentType]
+
+
+def test_decrypt_chunk_records_rejects_tampered_ciphertext(root_key: bytes, context: dict[str, str]):
+    encrypted = bytearray(_encrypt_to_bytes(os.urandom(250), root_key, context, chunk_size=100))
+    layout = parse_stream_layout(bytes(encrypted[:_HEADER_SIZE]), stream_size=len(encrypted))
+    encrypted[layout.record_offset(1) + _CHUNK_PREFIX_SIZE] ^= 0x01
+    records = bytes(encrypted[layout.record_offset(1) : layout.record_offset(2)])
+    with pytest.raises(AesGcmStreamAuthError):
+        decrypt_chunk_records(records, root_key=root_key, layout=layout, first_chunk_index=1, **context)  # pyright: ignore[reportArgumentType]
@@ -6,6 +6,9 @@ import asyncio
 import contextlib
 import hashlib
 import mimetypes
+import os
+import threading
+import time
 import zipfile
 from collections.abc import AsyncIterable, Callable, Iterator
 from dataclasses import dataclass
@@ -16,7 +19,7 @@ from unittest import mock
 import fsspec
 import pytest
 from faker import Faker
-from pydantic import AnyUrl, SecretBytes, TypeAdapter
+from pydantic import AnyUrl, ByteSize, SecretBytes, TypeAdapter
 from pytest_localftpserver.servers import ProcessFTPServer
 from pytest_mock.plugin import MockerFixture
 from settings_library.s3 import S3Settings
@@ -27,10 +30,16 @@ from simcore_service_dask_sidecar.errors import (
 from simcore_service_dask_sidecar.utils.aes_gcm import FORMAT_MAGIC, generate_key
 from simcore_service_dask_sidecar.utils.encryption import TransferEncryptionSettings
 from simcore_service_dask_sidecar.utils.files import (
+    InputsCache,
     _s3fs_settings_from_s3_settings,
     pull_file_from_remote,
     push_file_to_remote,
 )
+from simcore_service_dask_sidecar.utils.files import _copy as _copy_module
+from simcore_service_dask_sidecar.utils.files import _download as _download_module
+from simcore_service_dask_sidecar.utils.files import _parallel as _parallel_module
+from simcore_service_dask_sidecar.utils.files import _unzip as _unzip_module
+from simcore_service_dask_sidecar.utils.files._unzip import extract_zip
 from types_aiobotocore_s3 import S3Client
 
 
@@ -311,6 +320,75 @@ async def test_pull_file_from_remote(
     mocked_log_publishing_cb.assert_called()
 
 
+async def test_pull_file_from_remote_with_inputs_cache(
+    s3_settings: S3Settings,
+    s3_remote_file_url: AnyUrl,
+    tmp_path: Path,
+    faker: Faker,
+    mocker: MockerFixture,
+    mocked_log_publishing_cb: mock.AsyncMock,
+):
+    storage_kwargs = cast(dict, _s3fs_settings_from_s3_settings(s3_settings))
+    TEXT_IN_FILE = faker.text()
+    with cast(fsspec.core.OpenFile, fsspec.open(f"{s3_remote_file_url}", mode="wt", **storage_kwargs)) as fp:
+        fp.write(TEXT_IN_FILE)
+
+    spy_copy_file = mocker.spy(_download_module, "_copy_file")
+    inputs_cache = InputsCache(cache_dir=tmp_path / "cache", max_size=ByteSize(1024**2))
+    for task_number in range(3):
+        dst_path = tmp_path / f"task{task_number}" / faker.file_name()
+        dst_path.parent.mkdir()
+        await pull_file_from_remote(
+            src_url=s3_remote_file_url,
+            target_mime_type=None,
+            dst_path=dst_path,
+            log_publishing_cb=mocked_log_publishing_cb,
+            s3_settings=s3_settings,
+            encryption=None,
+            inputs_cache=inputs_cache,
+        )
+        assert dst_path.read_text() == TEXT_IN_FILE
+    # only the first task downloaded the file
+    assert spy_copy_file.call_count == 1
+
+    # a modified remote file is downloaded again
+    TEXT_IN_FILE = faker.text()
+    with cast(fsspec.core.OpenFile, fsspec.open(f"{s3_remote_file_url}", mode="wt", **storage_kwargs)) as fp:
+        fp.write(TEXT_IN_FILE)
+    dst_path = tmp_path / "modified" / faker.file_name()
+    dst_path.parent.mkdir()
+    await pull_file_from_remote(
+        src_url=s3_remote_file_url,
+        target_mime_type=None,
+        dst_path=dst_path,
+        log_publishing_cb=mocked_log_publishing_cb,
+        s3_settings=s3_settings,
+        encryption=None,
+        inputs_cache=inputs_cache,
+    )
+    assert dst_path.read_text() == TEXT_IN_FILE
+    assert spy_copy_file.call_count == 2
+
+
+def test_inputs_cache_evicts_least_recently_used_entries(tmp_path: Path):
+    inputs_cache = InputsCache(cache_dir=tmp_path / "cache", max_size=ByteSize(25))
+    for age, key in enumerate(("c", "b", "a"), start=1):
+        downloaded_path = inputs_cache.create_download_path()
+        downloaded_path.write_bytes(b"x" * 10)
+        inputs_cache.add(key, downloaded_path, dst_path=tmp_path / key)
+        assert (tmp_path / key).read_bytes() == b"x" * 10
+        # NOTE: ensures distinct modification times ("a" being the oldest)
+        mtime = time.time() - 10 * age
+        os.utime(inputs_cache.cache_dir / key, (mtime, mtime))
+    assert inputs_cache.get("a")  # now the most recently used
+
+    inputs_cache.evict()
+
+    assert inputs_cache.get("b") is None
+    assert inputs_cache.get("a")
+    assert inputs_cache.get("c")
+
+
 async def test_push_file_to_remote_logs_progress_when_elapsed_time_is_zero(
     mocker: MockerFixture,
     tmp_path: Path,
@@ -507,6 +585,49 @@ async def test_push_then_pull_file_with_encryption_roundtrip(
     mocked_log_publishing_cb.assert_called()
 
 
+@pytest.mark.parametrize("with_encryption", [False, True])
+async def test_push_then_pull_large_file_in_parts(
+    s3_settings: S3Settings,
+    s3_remote_file_url: AnyUrl,
+    tmp_path: Path,
+    faker: Faker,
+    mocker: MockerFixture,
+    mocked_log_publishing_cb: mock.AsyncMock,
+    encryption_settings: TransferEncryptionSettings,
+    with_encryption: bool,
+):
+    mocker.patch.object(_parallel_module, "_MIN_PARALLEL_TRANSFER_SIZE", 1)
+    # NOTE: S3 multipart uploads require parts of at least 5MiB
+    mocker.patch.object(_parallel_module, "_PART_SIZE", 5 * 1024**2)
+    encryption = encryption_settings if with_encryption else None
+    spy_plain_copy = mocker.spy(_copy_module, "_run_plain_copy")
+    spy_read_range = mocker.spy(_parallel_module, "_read_range")
+
+    src_path = tmp_path / faker.file_name()
+    src_path.write_bytes(os.urandom(12 * 1024**2 + 17))
+    await push_file_to_remote(
+        src_path,
+        s3_remote_file_url,
+        log_publishing_cb=mocked_log_publishing_cb,
+        s3_settings=s3_settings,
+        encryption=encryption,
+    )
+
+    dst_path = tmp_path / faker.file_name()
+    await pull_file_from_remote(
+        src_url=s3_remote_file_url,
+        target_mime_type=None,
+        dst_path=dst_path,
+        log_publishing_cb=mocked_log_publishing_cb,
+        s3_settings=s3_settings,
+        encryption=encryption,
+    )
+    assert dst_path.read_bytes() == src_path.read_bytes()
+    # neither the plain upload nor the download were streamed
+    assert spy_plain_copy.call_count == 0
+    assert spy_read_range.call_count > 1
+
+
 async def test_pull_file_from_remote_s3_presigned_link(
     s3_settings: S3Settings,
     s3_remote_file_url: AnyUrl,
@@ -693,6 +814,63 @@ async def test_pull_compressed_zip_file_from_remote(
     mocked_log_publishing_cb.assert_called()
 
 
+async def test_extract_zip(tmp_path: Path, faker: Faker):
+    zip_file_path = tmp_path / "archive.zip"
+    expected_contents: dict[Path, bytes] = {}
+    with zipfile.ZipFile(zip_file_path, compression=zipfile.ZIP_DEFLATED, mode="w") as zfp:
+        zfp.mkdir("empty_folder")
+        for file_number in range(20):
+            relative_path = Path(f"folder_{file_number % 3}") / f"{file_number}_{faker.file_name()}"
+            content = os.urandom(file_number * 1024)
+            zfp.writestr(f"{relative_path}", content)
+            expected_contents[relative_path] = content
+        # members cannot be written outside of the destination folder
+        zfp.writestr("../outside.txt", b"outside")
+        zfp.writestr("/absolute.txt", b"absolute")
+        expected_contents |= {Path("outside.txt"): b"outside", Path("absolute.txt"): b"absolute"}
+
+    dst_folder = tmp_path / "extracted"
+    dst_folder.mkdir()
+    await extract_zip(zip_file_path, dst_folder, max_threads=4)
+
+    assert (dst_folder / "empty_folder").is_dir()
+    assert not (tmp_path / "outside.txt").exists()
+    extracted_contents = {
+        path.relative_to(dst_folder): path.read_bytes() for path in dst_folder.rglob("*") if path.is_file()
+    }
+    assert extracted_contents == expected_contents
+
+
+async def test_extract_zip_cancelled_waits_for_the_threads(tmp_path: Path, mocker: MockerFixture):
+    zip_file_path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(zip_file_path, mode="w") as zfp:
+        for file_number in range(20):
+            zfp.writestr(f"{file_number}.txt", b"content")
+
+    extraction_started = threading.Event()
+    running_extractions = 0
+    lock = threading.Lock()
+
+    def _slow_extract(*args: Any, **kwargs: Any) -> None:
+        nonlocal running_extractions
+        with lock:
+            running_extractions += 1
+        extraction_started.set()
+        time.sleep(0.5)
+        with lock:
+            running_extractions -= 1
+
+    mocker.patch.object(_unzip_module.repro_zipfile.ReproducibleZipFile, "extract", side_effect=_slow_extract)
+
+    extraction = asyncio.create_task(extract_zip(zip_file_path, tmp_path / "extracted", max_threads=4))
+    assert await asyncio.to_thread(extraction_started.wait, 5)
+    extraction.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await extraction
+    # no thread is still writing into the destination folder
+    assert running_extractions == 0
+
+
 async def test_pull_compressed_zip_file_with_spaces_in_name_from_remote(
     remote_parameters: StorageParameters,
     upload_file_to_remote: Callable[[Path, AnyUrl], None],
@@ -5,6 +5,10 @@ MODULE_NAME_SCHEDULER: Final[str] = "computational-distributed-scheduler"
 MODULE_NAME_WORKER: Final[str] = "computational-distributed-worker"
 MODULE_NAME_RELEASER: Final[str] = "computational-distributed-releaser"
 SCHEDULER_INTERVAL: Final[datetime.timedelta] = datetime.timedelta(seconds=5)
+# NOTE: the pipelines are woken up by the events of their tasks, the manager periodically re-schedules
+# the ones that were not processed for that many scheduler intervals (e.g. because of a lost event) as a safety net
+SCHEDULER_SAFETY_NET_FACTOR: Final[int] = 6
+SCHEDULER_WAKE_UP_DEBOUNCE: Final[datetime.timedelta] = datetime.timedelta(milliseconds=200)
 MAX_CONCURRENT_PIPELINE_SCHEDULING: Final[int] = 10
 TASK_RESULT_RELEASE_CONCURRENCY: Final[int] = 5
 # NOTE: on-demand clusters may take up to COMPUTATIONAL_BACKEND_MAX_WAITING_FOR_CLUSTER_TIMEOUT
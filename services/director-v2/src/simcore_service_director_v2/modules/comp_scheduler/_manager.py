@@ -10,7 +10,7 @@ from models_library.projects import ProjectID
 from models_library.users import UserID
 from servicelib.background_task import create_periodic_task
 from servicelib.exception_utils import suppress_exceptions
-from servicelib.logging_utils import log_context
+from servicelib.logging_utils import log_catch, log_context
 from servicelib.redis import CouldNotAcquireLockError, exclusive
 from servicelib.tracing import traced
 from servicelib.utils import limited_gather
@@ -28,14 +28,24 @@ from ..db.repositories.comp_runs_snapshot_tasks import (
     CompRunsSnapshotTasksRepository,
 )
 from ..db.repositories.comp_tasks import CompTasksRepository
+from ..instrumentation._models import CompSchedulerMetrics
 from ..rabbitmq import get_rabbitmq_client
 from ._constants import (
     MAX_CONCURRENT_PIPELINE_SCHEDULING,
     MODULE_NAME_SCHEDULER,
     SCHEDULER_INTERVAL,
+    SCHEDULER_SAFETY_NET_FACTOR,
 )
+from ._models import SchedulePipelineRabbitMessage
 from ._publisher import request_pipeline_scheduling
-from ._utils import SCHEDULED_STATES, get_redis_client_from_app, get_redis_lock_key
+from ._utils import (
+    POLLED_STATES,
+    SCHEDULED_STATES,
+    get_cluster_type_label,
+    get_redis_client_from_app,
+    get_redis_lock_key,
+    get_scheduler_metrics,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -151,16 +161,27 @@ async def _get_pipeline_tasks_at_db(
     db_engine: AsyncEngine, project_id: ProjectID, pipeline_dag: nx.DiGraph
 ) -> list[CompTaskAtDB]:
     comp_tasks_repo = CompTasksRepository.instance(db_engine)
-    return [
-        t
-        for t in await comp_tasks_repo.list_computational_tasks(project_id)
-        if (f"{t.node_id}" in list(pipeline_dag.nodes()))
-    ]
+    return [t for t in await comp_tasks_repo.list_computational_tasks(project_id) if f"{t.node_id}" in pipeline_dag]
 
 
 _LOST_TASKS_FACTOR: Final[int] = 10
 
 
+async def _update_scheduling_metrics(app: FastAPI, metrics: CompSchedulerMetrics) -> None:
+    # NOTE: only the replica holding the manager lock updates these, they describe the whole deployment
+    metrics.scheduling_queue_depth.set(
+        await get_rabbitmq_client(app).get_queue_message_count(SchedulePipelineRabbitMessage.get_channel_name())
+    )
+    tasks_per_state = await CompRunsSnapshotTasksRepository.instance(get_db_engine(app)).count_tasks_per_state(
+        filter_by_run_state=SCHEDULED_STATES
+    )
+    metrics.tasks.clear()
+    for (use_on_demand_clusters, state), num_tasks in tasks_per_state.items():
+        metrics.tasks.labels(
+            state=state.value, cluster_type=get_cluster_type_label(use_on_demand_clusters=use_on_demand_clusters)
+        ).set(num_tasks)
+
+
 @traced
 @exclusive(
     get_redis_client_from_app,
@@ -172,8 +193,18 @@ async def schedule_all_pipelines(app: FastAPI) -> None:
         runs_to_schedule = await CompRunsRepository.instance(db_engine).list_(
             filter_by_state=SCHEDULED_STATES,
             never_scheduled=True,
-            processed_since=SCHEDULER_INTERVAL,
+            processed_since=SCHEDULER_INTERVAL * SCHEDULER_SAFETY_NET_FACTOR,
         )
+        # NOTE: the other runs are woken up by the events of their tasks
+        scheduled_run_ids = {run.run_id for run in runs_to_schedule}
+        runs_to_schedule += [
+            run
+            for run in await CompRunsRepository.instance(db_engine).list_(
+                filter_by_state=POLLED_STATES,
+                processed_since=SCHEDULER_INTERVAL,
+            )
+            if run.run_id not in scheduled_run_ids
+        ]
         possibly_lost_scheduled_pipelines = await CompRunsRepository.instance(db_engine).list_(
             filter_by_state=SCHEDULED_STATES,
             scheduled_since=SCHEDULER_INTERVAL * _LOST_TASKS_FACTOR,
@@ -203,6 +234,10 @@ async def schedule_all_pipelines(app: FastAPI) -> None:
         if runs_to_schedule:
             _logger.debug("distributed %d pipelines", len(runs_to_schedule))
 
+        if metrics := get_scheduler_metrics(app):
+            with log_catch(_logger, reraise=False):
+                await _update_scheduling_metrics(app, metrics)
+
 
 async def setup_manager(app: FastAPI) -> None:
     app.state.scheduler_manager = create_periodic_task(
@@ -1,10 +1,13 @@
+import datetime
 from dataclasses import dataclass
 from typing import Literal
 
+import arrow
 from dask_task_models_library.models import DaskJobID
 from models_library.projects import ProjectID
 from models_library.rabbitmq_messages import RabbitMessageBase
 from models_library.users import UserID
+from pydantic import Field
 
 from ...models.comp_runs import Iteration, RunID, RunMetadataDict
 from ...models.comp_tasks import CompTaskAtDB
@@ -15,6 +18,10 @@ class SchedulePipelineRabbitMessage(RabbitMessageBase):
     user_id: UserID
     project_id: ProjectID
     iteration: Iteration
+    created_at: datetime.datetime = Field(
+        default_factory=lambda: arrow.utcnow().datetime,
+        description="message creation datetime",
+    )
 
     def routing_key(self) -> str | None:  # pylint: disable=no-self-use # abstract
         return None
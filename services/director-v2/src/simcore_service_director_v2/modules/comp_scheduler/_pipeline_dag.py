@@ -0,0 +1,137 @@
+"""Compact representation of the DAG of a computational run, updated incrementally
+
+The DAG of a run does not change once the run is created. It is indexed once (integer-indexed
+adjacency lists), then each scheduling step only applies the task states that changed since the
+previous step:
+- the count of unfinished (not SUCCESS) predecessors of each node gives the nodes ready to start,
+- the nodes downstream of a FAILED node are collected once, when that node fails.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+
+from models_library.projects_nodes_io import NodeIDStr
+from models_library.projects_state import RunningState
+
+
+class PipelineDag:
+    def __init__(self, dag_adjacency_list: Mapping[NodeIDStr, Iterable[NodeIDStr]]) -> None:
+        node_ids = list(
+            dict.fromkeys(
+                [
+                    *dag_adjacency_list,
+                    *(successor for successors in dag_adjacency_list.values() for successor in successors),
+                ]
+            )
+        )
+        self._node_ids: tuple[NodeIDStr, ...] = tuple(node_ids)
+        self._index: dict[NodeIDStr, int] = {node_id: index for index, node_id in enumerate(node_ids)}
+        self._successors: list[tuple[int, ...]] = [()] * len(node_ids)
+        self._predecessors: list[list[int]] = [[] for _ in node_ids]
+        in_degree = [0] * len(node_ids)
+        for node_id, successors in dag_adjacency_list.items():
+            # NOTE: duplicated edges are ignored, as in a nx.DiGraph
+            successor_indices = tuple(dict.fromkeys(self._index[successor] for successor in successors))
+            self._successors[self._index[node_id]] = successor_indices
+            for successor_index in successor_indices:
+                in_degree[successor_index] += 1
+                self._predecessors[successor_index].append(self._index[node_id])
+        self._reverse_topological_order = self._compute_reverse_topological_order(in_degree)
+
+        # NOTE: the states are unknown until the first update, i.e. no node is finished
+        self._states: list[RunningState | None] = [None] * len(node_ids)
+        self._unfinished_predecessors = in_degree
+        self._ready: set[int] = {index for index, degree in enumerate(in_degree) if degree == 0}
+        self._downstream_of_failed: set[int] = set()
+
+    def _compute_reverse_topological_order(self, in_degree: list[int]) -> tuple[NodeIDStr, ...]:
+        remaining_predecessors = list(in_degree)
+        to_visit = deque(index for index, degree in enumerate(in_degree) if degree == 0)
+        order: list[int] = []
+        while to_visit:
+            index = to_visit.popleft()
+            order.append(index)
+            for successor_index in self._successors[index]:
+                remaining_predecessors[successor_index] -= 1
+                if remaining_predecessors[successor_index] == 0:
+                    to_visit.append(successor_index)
+        # NOTE: nodes in a cycle (invalid pipeline) have no topological order, they come first
+        ordered = set(order)
+        order += [index for index in range(len(self._node_ids)) if index not in ordered]
+        return tuple(self._node_ids[index] for index in reversed(order))
+
+    def __len__(self) -> int:
+        return len(self._node_ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._index
+
+    def __iter__(self) -> Iterator[NodeIDStr]:
+        return iter(self._node_ids)
+
+    @property
+    def reverse_topological_order(self) -> tuple[NodeIDStr, ...]:
+        """the node ids ordered from the last to the first"""
+        return self._reverse_topological_order
+
+    def update(self, states: Mapping[NodeIDStr, RunningState]) -> None:
+        """applies the states of the nodes, only the nodes whose state changed are processed"""
+        recompute_downstream_of_failed = False
+        for node_id, state in states.items():
+            if (index := self._index.get(node_id)) is None or self._states[index] is state:
+                continue
+            previous_state, self._states[index] = self._states[index], state
+
+            if state is RunningState.SUCCESS:
+                self._set_succeeded(index)
+            elif previous_state is RunningState.SUCCESS:
+                self._unset_succeeded(index)
+
+            if state is RunningState.FAILED:
+                self._add_downstream_of_failed(index)
+            elif previous_state is RunningState.FAILED:
+                recompute_downstream_of_failed = True
+
+        if recompute_downstream_of_failed:
+            self._downstream_of_failed.clear()
+            for index, state in enumerate(self._states):
+                if state is RunningState.FAILED:
+                    self._add_downstream_of_failed(index)
+
+    def _set_succeeded(self, index: int) -> None:
+        self._ready.discard(index)
+        for successor_index in self._successors[index]:
+            self._unfinished_predecessors[successor_index] -= 1
+            if (
+                self._unfinished_predecessors[successor_index] == 0
+                and self._states[successor_index] is not RunningState.SUCCESS
+            ):
+                self._ready.add(successor_index)
+
+    def _unset_succeeded(self, index: int) -> None:
+        for successor_index in self._successors[index]:
+            self._unfinished_predecessors[successor_index] += 1
+            self._ready.discard(successor_index)
+        if self._unfinished_predecessors[index] == 0:
+            self._ready.add(index)
+
+    def _add_downstream_of_failed(self, failed_index: int) -> None:
+        to_visit = deque(self._successors[failed_index])
+        while to_visit:
+            index = to_visit.popleft()
+            if index in self._downstream_of_failed:
+                continue
+            self._downstream_of_failed.add(index)
+            to_visit.extend(self._successors[index])
+
+    def ready_node_ids(self) -> list[NodeIDStr]:
+        """the nodes that are not SUCCESS and whose predecessors are all SUCCESS"""
+        return [self._node_ids[index] for index in self._ready]
+
+    def predecessor_node_ids(self, node_id: NodeIDStr) -> list[NodeIDStr]:
+        """the nodes with an edge to node_id"""
+        return [self._node_ids[index] for index in self._predecessors[self._index[node_id]]]
+
+    def downstream_of_failed_node_ids(self) -> set[NodeIDStr]:
+        """the nodes that can be reached from a FAILED node"""
+        return {self._node_ids[index] for index in self._downstream_of_failed}
@@ -13,15 +13,16 @@ The sidecar will then change the state to STARTED, then to SUCCESS or FAILED.
 """
 
 import asyncio
+import contextlib
 import datetime
+import functools
 import logging
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from typing import Final
 
 import arrow
-import networkx as nx
 from common_library.logging.logging_errors import create_troubleshooting_log_kwargs
 from common_library.user_messages import user_message
 from models_library.projects import ProjectID
@@ -30,7 +31,6 @@ from models_library.projects_state import RunningState
 from models_library.services import ServiceType
 from models_library.services_types import ServiceRunID
 from models_library.users import UserID
-from networkx.classes.reportviews import InDegreeView
 from servicelib.common_headers import UNDEFINED_DEFAULT_SIMCORE_USER_AGENT_VALUE
 from servicelib.logging_utils import log_catch, log_context
 from servicelib.rabbitmq import RabbitMQClient, RabbitMQRPCClient
@@ -60,10 +60,12 @@ from ...utils.rabbitmq import (
     publish_service_started_metrics,
 )
 from ..db.repositories.comp_runs import CompRunsRepository
-from ..db.repositories.comp_tasks import CompTasksRepository
+from ..db.repositories.comp_tasks import CompTasksRepository, CompTasksUpdates
+from ..instrumentation import track_duration
+from ..instrumentation._models import CompSchedulerMetrics
 from ..osparc_variables._errors import OsparcVariableResolveTimeoutError
 from ._models import TaskStateTracker
-from ._publisher import request_pipeline_scheduling
+from ._pipeline_dag import PipelineDag
 from ._utils import (
     COMPLETED_STATES,
     PROCESSING_STATES,
@@ -71,41 +73,34 @@ from ._utils import (
     TASK_TO_START_STATES,
     WAITING_FOR_START_STATES,
     create_service_resources_from_task,
+    get_cluster_type_label,
 )
+from ._wake_ups import PipelineWakeUps
 
 _logger = logging.getLogger(__name__)
 
 
 _MAX_WAITING_TIME_FOR_UNKNOWN_TASKS: Final[datetime.timedelta] = datetime.timedelta(seconds=30)
 _PUBLICATION_CONCURRENCY_LIMIT: Final[int] = 10
+_MAX_CACHED_PIPELINE_DAGS: Final[int] = 256
 
 
 def _auto_schedule_callback(
     loop: asyncio.AbstractEventLoop,
-    db_engine: AsyncEngine,
-    rabbit_mq_client: RabbitMQClient,
+    wake_ups: PipelineWakeUps,
     *,
     user_id: UserID,
     project_id: ProjectID,
     iteration: Iteration,
 ) -> Callable[[], None]:
     """this function is called via Dask-backend from a separate thread.
-    Therefore the need to use run_coroutine_threadsafe to request a new
-    pipeline scheduling"""
+    Therefore the need to hand the wake-up over to the event loop"""
 
     def _cb() -> None:
-        async def _async_cb() -> None:
-            await request_pipeline_scheduling(
-                rabbit_mq_client,
-                db_engine,
-                user_id=user_id,
-                project_id=project_id,
-                iteration=iteration,
-            )
-
-        future = asyncio.run_coroutine_threadsafe(_async_cb(), loop)
         with log_catch(_logger, reraise=False):
-            future.result(timeout=10)
+            loop.call_soon_threadsafe(
+                functools.partial(wake_ups.request, user_id=user_id, project_id=project_id, iteration=iteration)
+            )
 
     return _cb
 
@@ -164,20 +159,46 @@ class BaseCompScheduler(ABC):
     settings: ComputationalBackendSettings
     service_runtime_heartbeat_interval: datetime.timedelta
     redis_client: RedisClientSDK
+    metrics: CompSchedulerMetrics | None = field(default=None, kw_only=True)
+    wake_ups: PipelineWakeUps = field(init=False)
+    # NOTE: the DAG of a run never changes, it is kept between the scheduling steps of the run
+    # (least recently scheduled runs are dropped first)
+    _pipeline_dags: dict[RunID, PipelineDag] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.wake_ups = PipelineWakeUps(self.rabbitmq_client, self.db_engine)
+
+    @contextlib.contextmanager
+    def _track_apply_phase(self, phase: str) -> Iterator[None]:
+        if self.metrics is None:
+            yield
+            return
+        with track_duration() as duration:
+            yield
+        self.metrics.apply_phase_duration.labels(phase=phase).observe(duration.to_float())
+
+    def _get_pipeline_dag(self, comp_run: CompRunsAtDB) -> PipelineDag:
+        pipeline_dag = self._pipeline_dags.pop(comp_run.run_id, None)
+        if pipeline_dag is None:
+            pipeline_dag = PipelineDag(comp_run.dag_adjacency_list)
+            if len(self._pipeline_dags) >= _MAX_CACHED_PIPELINE_DAGS:
+                self._pipeline_dags.pop(next(iter(self._pipeline_dags)))
+        self._pipeline_dags[comp_run.run_id] = pipeline_dag
+        return pipeline_dag
 
     async def _get_pipeline_tasks(
-        self, project_id: ProjectID, pipeline_dag: nx.DiGraph
+        self, project_id: ProjectID, pipeline_dag: PipelineDag
     ) -> dict[NodeIDStr, CompTaskAtDB]:
         comp_tasks_repo = CompTasksRepository.instance(self.db_engine)
         pipeline_comp_tasks: dict[NodeIDStr, CompTaskAtDB] = {
             f"{t.node_id}": t
             for t in await comp_tasks_repo.list_computational_tasks(project_id)
-            if (f"{t.node_id}" in list(pipeline_dag.nodes()))
+            if f"{t.node_id}" in pipeline_dag
         }
-        if len(pipeline_comp_tasks) != len(pipeline_dag.nodes()):
+        if len(pipeline_comp_tasks) != len(pipeline_dag):
             msg = (
                 f"The tasks defined for {project_id} do not contain all"
-                f" the tasks defined in the pipeline [{list(pipeline_dag.nodes)}]! Please check."
+                f" the tasks defined in the pipeline [{list(pipeline_dag)}]! Please check."
             )
             raise InvalidPipelineError(pipeline_id=project_id, msg=msg)
         return pipeline_comp_tasks
@@ -253,22 +274,22 @@ class BaseCompScheduler(ABC):
     async def _set_states_following_failed_to_aborted(
         self,
         project_id: ProjectID,
-        dag: nx.DiGraph,
+        dag: PipelineDag,
         tasks: dict[NodeIDStr, CompTaskAtDB],
         run_id: RunID,
     ) -> dict[NodeIDStr, CompTaskAtDB]:
-        # Perform a reverse topological sort to ensure tasks are ordered from last to first
-        sorted_node_ids = list(reversed(list(nx.topological_sort(dag))))
-        tasks = {node_id: tasks[node_id] for node_id in sorted_node_ids if node_id in tasks}
         # we need the tasks ordered from the last task to the first
-        node_ids_to_set_as_aborted: set[NodeIDStr] = set()
-        for task in tasks.values():
-            if task.state == RunningState.FAILED:
-                node_ids_to_set_as_aborted.update(nx.bfs_tree(dag, f"{task.node_id}"))
-                node_ids_to_set_as_aborted.remove(f"{task.node_id}")
+        tasks = {node_id: tasks[node_id] for node_id in dag.reverse_topological_order if node_id in tasks}
+        dag.update({node_id: task.state for node_id, task in tasks.items()})
+        node_ids_to_set_as_aborted = {
+            node_id
+            for node_id in dag.downstream_of_failed_node_ids()
+            if tasks[node_id].state is not RunningState.ABORTED
+        }
         for node_id in node_ids_to_set_as_aborted:
             tasks[f"{node_id}"].state = RunningState.ABORTED
         if node_ids_to_set_as_aborted:
+            dag.update(dict.fromkeys(node_ids_to_set_as_aborted, RunningState.ABORTED))
             # update the current states back in DB
             comp_tasks_repo = CompTasksRepository.instance(self.db_engine)
             await comp_tasks_repo.update_project_tasks_state(
@@ -316,9 +337,9 @@ class BaseCompScheduler(ABC):
                 log=_logger,
                 limit=_PUBLICATION_CONCURRENCY_LIMIT,
             )
-            comp_tasks_repo = CompTasksRepository.instance(self.db_engine)
-            for task in running_tasks:
-                await comp_tasks_repo.update_project_task_last_heartbeat(project_id, task.node_id, run_id, utc_now)
+            async with CompTasksRepository.instance(self.db_engine).batch_updates(project_id, run_id) as tasks_updates:
+                for task in running_tasks:
+                    tasks_updates.update_task(task.node_id, last_heartbeat=utc_now)
 
     async def _get_changed_tasks_from_backend(
         self,
@@ -352,7 +373,7 @@ class BaseCompScheduler(ABC):
         project_id: ProjectID,
         iteration: Iteration,
         run_metadata: RunMetadataDict,
-        run_id: RunID,
+        tasks_updates: CompTasksUpdates,
     ) -> None:
         utc_now = arrow.utcnow().datetime
 
@@ -413,11 +434,8 @@ class BaseCompScheduler(ABC):
         )
 
         # update DB
-        comp_tasks_repo = CompTasksRepository(self.db_engine)
         for task in tasks:
-            await comp_tasks_repo.update_project_tasks_state(
-                project_id,
-                run_id,
+            tasks_updates.update_tasks_state(
                 [task.node_id],
                 task.state,
                 optional_started=utc_now,
@@ -430,22 +448,16 @@ class BaseCompScheduler(ABC):
             started_time=utc_now,
         )
 
-    async def _process_waiting_tasks(self, tasks: list[TaskStateTracker], run_id: RunID) -> None:
-        comp_tasks_repo = CompTasksRepository.instance(self.db_engine)
+    async def _process_waiting_tasks(self, tasks: list[TaskStateTracker], tasks_updates: CompTasksUpdates) -> None:
         for task in tasks:
-            await comp_tasks_repo.update_project_tasks_state(
-                task.current.project_id,
-                run_id,
-                [task.current.node_id],
-                task.current.state,
-            )
+            tasks_updates.update_tasks_state([task.current.node_id], task.current.state)
 
     async def _update_states_from_comp_backend(
         self,
         user_id: UserID,
         project_id: ProjectID,
         iteration: Iteration,
-        pipeline_dag: nx.DiGraph,
+        pipeline_dag: PipelineDag,
         comp_run: CompRunsAtDB,
     ) -> None:
         tasks = await self._get_pipeline_tasks(project_id, pipeline_dag)
@@ -467,36 +479,42 @@ class BaseCompScheduler(ABC):
         sorted_tasks = await _triage_changed_tasks(tasks_with_changed_states)
         _logger.debug("found the following %s tasks with changed states", sorted_tasks)
         # now process the tasks
-        if sorted_tasks.started:
-            # NOTE: the dask-scheduler cannot differentiate between tasks that are effectively computing and
-            # tasks that are only queued and accepted by a dask-worker. We use dask plugins to report on tasks states
-            # states are published to log_event, and we directly publish into RabbitMQ the sidecar and services logs.
-            # tasks_started should therefore be mostly empty but for cases where
-            # - dask log_event/subscribe_topic mechanism failed,
-            #       the tasks goes from PENDING -> SUCCESS/FAILED/ABORTED without STARTED
-            # - the task finished so fast that the STARTED state was skipped between 2 runs of the dv-2 comp scheduler
-            await self._process_started_tasks(
-                sorted_tasks.started,
-                user_id=user_id,
-                project_id=project_id,
-                iteration=iteration,
-                run_metadata=comp_run.metadata,
-                run_id=comp_run.run_id,
-            )
+        # NOTE: the changes of the tasks are collected and written to the DB in one go when leaving the context
+        async with CompTasksRepository.instance(self.db_engine).batch_updates(
+            project_id, comp_run.run_id
+        ) as tasks_updates:
+            if sorted_tasks.started:
+                # NOTE: the dask-scheduler cannot differentiate between tasks that are effectively computing and
+                # tasks that are only queued and accepted by a dask-worker. We use dask plugins to report on tasks
+                # states, states are published to log_event, and we directly publish into RabbitMQ the sidecar and
+                # services logs. tasks_started should therefore be mostly empty but for cases where
+                # - dask log_event/subscribe_topic mechanism failed,
+                #       the tasks goes from PENDING -> SUCCESS/FAILED/ABORTED without STARTED
+                # - the task finished so fast that the STARTED state was skipped between 2 runs of the dv-2
+                #       comp scheduler
+                await self._process_started_tasks(
+                    sorted_tasks.started,
+                    user_id=user_id,
+                    project_id=project_id,
+                    iteration=iteration,
+                    run_metadata=comp_run.metadata,
+                    tasks_updates=tasks_updates,
+                )
 
-        if sorted_tasks.completed or sorted_tasks.potentially_lost:
-            await self._process_completed_tasks(
-                user_id,
-                sorted_tasks.completed + sorted_tasks.potentially_lost,
-                iteration,
-                comp_run=comp_run,
-            )
+            if sorted_tasks.completed or sorted_tasks.potentially_lost:
+                await self._process_completed_tasks(
+                    user_id,
+                    sorted_tasks.completed + sorted_tasks.potentially_lost,
+                    iteration,
+                    comp_run=comp_run,
+                    tasks_updates=tasks_updates,
+                )
 
-        if sorted_tasks.waiting:
-            await self._process_waiting_tasks(sorted_tasks.waiting, comp_run.run_id)
+            if sorted_tasks.waiting:
+                await self._process_waiting_tasks(sorted_tasks.waiting, tasks_updates)
 
-        if executing_tasks:
-            await self._process_executing_tasks(user_id, executing_tasks, comp_run)
+            if executing_tasks:
+                await self._process_executing_tasks(user_id, executing_tasks, comp_run, tasks_updates)
 
     @abstractmethod
     async def _start_tasks(
@@ -507,8 +525,11 @@ class BaseCompScheduler(ABC):
         scheduled_tasks: dict[NodeID, CompTaskAtDB],
         comp_run: CompRunsAtDB,
         wake_up_callback: Callable[[], None],
-    ) -> None:
-        """start tasks in the 3rd party backend"""
+    ) -> dict[NodeID, BaseException]:
+        """start tasks in the 3rd party backend, returns the tasks that could not be started with the reason why
+
+        Raises an error when none of the tasks could be started for the same reason (e.g. backend not connected)
+        """
 
     @abstractmethod
     async def _get_tasks_status(
@@ -527,6 +548,7 @@ class BaseCompScheduler(ABC):
         tasks: list[TaskStateTracker],
         iteration: Iteration,
         comp_run: CompRunsAtDB,
+        tasks_updates: CompTasksUpdates,
     ) -> None:
         """process tasks from the 3rd party backend"""
 
@@ -536,6 +558,7 @@ class BaseCompScheduler(ABC):
         user_id: UserID,
         tasks: list[CompTaskAtDB],
         comp_run: CompRunsAtDB,
+        tasks_updates: CompTasksUpdates,
     ) -> None:
         """process executing tasks from the 3rd party backend"""
 
@@ -556,55 +579,64 @@ class BaseCompScheduler(ABC):
             level=logging.INFO,
             msg=f"scheduling pipeline {user_id=}:{project_id=}:{iteration=}",
         ):
-            dag: nx.DiGraph = nx.DiGraph()
+            dag = PipelineDag({})
 
             try:
                 comp_run = await CompRunsRepository.instance(self.db_engine).get(user_id, project_id, iteration)
-                dag = comp_run.get_graph()
+                dag = self._get_pipeline_dag(comp_run)
 
                 # 1. Update our list of tasks with data from backend (state, results)
-                await self._update_states_from_comp_backend(user_id, project_id, iteration, dag, comp_run)
-                # 1.1. get the updated tasks NOTE: we need to get them again as some states might have changed
-                comp_tasks = await self._get_pipeline_tasks(project_id, dag)
+                with self._track_apply_phase("update_from_backend"):
+                    await self._update_states_from_comp_backend(user_id, project_id, iteration, dag, comp_run)
+                    # 1.1. get the updated tasks NOTE: we need to get them again as some states might have changed
+                    comp_tasks = await self._get_pipeline_tasks(project_id, dag)
                 # 2. timeout if waiting for cluster has been there for more than X minutes
-                comp_tasks = await self._timeout_if_waiting_for_cluster_too_long(
-                    user_id, project_id, comp_run, comp_tasks
-                )
+                with self._track_apply_phase("timeout_check"):
+                    comp_tasks = await self._timeout_if_waiting_for_cluster_too_long(
+                        user_id, project_id, comp_run, comp_tasks
+                    )
                 # 3. Any task following a FAILED task shall be ABORTED
-                comp_tasks = await self._set_states_following_failed_to_aborted(
-                    project_id, dag, comp_tasks, comp_run.run_id
-                )
+                with self._track_apply_phase("abort_propagation"):
+                    comp_tasks = await self._set_states_following_failed_to_aborted(
+                        project_id, dag, comp_tasks, comp_run.run_id
+                    )
                 # 4. do we want to stop the pipeline now?
                 if comp_run.cancelled:
-                    comp_tasks = await self._schedule_tasks_to_stop(user_id, project_id, comp_tasks, comp_run)
+                    with self._track_apply_phase("stop"):
+                        comp_tasks = await self._schedule_tasks_to_stop(user_id, project_id, comp_tasks, comp_run)
                 else:
                     # let's get the tasks to schedule then
-                    comp_tasks = await self._schedule_tasks_to_start(
-                        user_id=user_id,
-                        project_id=project_id,
-                        comp_tasks=comp_tasks,
-                        dag=dag,
-                        comp_run=comp_run,
-                        wake_up_callback=_auto_schedule_callback(
-                            asyncio.get_running_loop(),
-                            self.db_engine,
-                            self.rabbitmq_client,
+                    with self._track_apply_phase("start"):
+                        comp_tasks = await self._schedule_tasks_to_start(
                             user_id=user_id,
                             project_id=project_id,
-                            iteration=iteration,
-                        ),
-                    )
+                            comp_tasks=comp_tasks,
+                            dag=dag,
+                            comp_run=comp_run,
+                            wake_up_callback=_auto_schedule_callback(
+                                asyncio.get_running_loop(),
+                                self.wake_ups,
+                                user_id=user_id,
+                                project_id=project_id,
+                                iteration=iteration,
+                            ),
+                        )
 
                 # 5. send a heartbeat
-                await self._send_running_tasks_heartbeat(user_id, project_id, comp_run.run_id, iteration, comp_tasks)
+                with self._track_apply_phase("heartbeat"):
+                    await self._send_running_tasks_heartbeat(
+                        user_id, project_id, comp_run.run_id, iteration, comp_tasks
+                    )
 
                 # 6. Update the run result
-                pipeline_result = await self._update_run_result_from_tasks(
-                    user_id, project_id, iteration, comp_tasks, comp_run.result
-                )
+                with self._track_apply_phase("result_processing"):
+                    pipeline_result = await self._update_run_result_from_tasks(
+                        user_id, project_id, iteration, comp_tasks, comp_run.result
+                    )
 
                 # 7. Are we done scheduling that pipeline?
-                if not dag.nodes() or pipeline_result in COMPLETED_STATES:
+                if not dag or pipeline_result in COMPLETED_STATES:
+                    self._pipeline_dags.pop(comp_run.run_id, None)
                     await self._safe_release_resources(comp_run.user_id, comp_run.project_uuid, comp_run.run_id)
                     # there is nothing left, the run is completed, we're done here
                     _logger.info(
@@ -746,15 +778,13 @@ class BaseCompScheduler(ABC):
         user_id: UserID,
         project_id: ProjectID,
         comp_tasks: dict[NodeIDStr, CompTaskAtDB],
-        dag: nx.DiGraph,
+        dag: PipelineDag,
         comp_run: CompRunsAtDB,
         wake_up_callback: Callable[[], None],
     ) -> dict[NodeIDStr, CompTaskAtDB]:
-        # filter out the successfully completed tasks
-        dag.remove_nodes_from({node_id for node_id, t in comp_tasks.items() if t.state == RunningState.SUCCESS})
-        dag_in_degree = dag.in_degree()
-        assert isinstance(dag_in_degree, InDegreeView)  # nosec
-        next_task_node_ids = [node_id for node_id, degree in dag_in_degree if degree == 0]
+        # the next tasks are the ones whose predecessors all completed successfully
+        dag.update({node_id: task.state for node_id, task in comp_tasks.items()})
+        next_task_node_ids = dag.ready_node_ids()
 
         # get the tasks to start
         tasks_ready_to_start: dict[NodeID, CompTaskAtDB] = {
@@ -769,27 +799,98 @@ class BaseCompScheduler(ABC):
             # nothing to do
             return comp_tasks
 
-        log_error_context = {
-            "user_id": f"{user_id}",
-            "project_id": f"{project_id}",
-            "tasks_ready_to_start": f"{list(tasks_ready_to_start.keys())}",
-            "comp_run_use_on_demand_clusters": f"{comp_run.use_on_demand_clusters}",
-            "comp_run_run_id": f"{comp_run.run_id}",
-        }
         try:
-            await self._start_tasks(
+            tasks_start_errors = await self._start_tasks(
                 user_id=user_id,
                 project_id=project_id,
                 scheduled_tasks=tasks_ready_to_start,
                 comp_run=comp_run,
                 wake_up_callback=wake_up_callback,
             )
-        except ComputationalBackendOnDemandNotReadyError as exc:
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            tasks_start_errors = dict.fromkeys(tasks_ready_to_start, exc)
+
+        # NOTE: the tasks that failed for the same reason are handled together
+        tasks_per_error: dict[int, tuple[BaseException, dict[NodeID, CompTaskAtDB]]] = {}
+        for node_id, error in tasks_start_errors.items():
+            tasks_per_error.setdefault(id(error), (error, {}))[1][node_id] = tasks_ready_to_start[node_id]
+        unexpected_errors: list[Exception] = []
+        for error, tasks_not_started in tasks_per_error.values():
+            try:
+                await self._handle_tasks_start_error(
+                    error,
+                    user_id=user_id,
+                    project_id=project_id,
+                    comp_tasks=comp_tasks,
+                    tasks_not_started=tasks_not_started,
+                    comp_run=comp_run,
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                unexpected_errors.append(exc)
+        if self.metrics is not None:
+            self._observe_tasks_ready_to_submitted(
+                self.metrics,
+                [node_id for node_id in tasks_ready_to_start if node_id not in tasks_start_errors],
+                comp_tasks=comp_tasks,
+                dag=dag,
+                comp_run=comp_run,
+            )
+        if unexpected_errors:
+            raise unexpected_errors[0]
+
+        return comp_tasks
+
+    @staticmethod
+    def _observe_tasks_ready_to_submitted(
+        metrics: CompSchedulerMetrics,
+        submitted_node_ids: list[NodeID],
+        *,
+        comp_tasks: dict[NodeIDStr, CompTaskAtDB],
+        dag: PipelineDag,
+        comp_run: CompRunsAtDB,
+    ) -> None:
+        # NOTE: a task becomes ready when the last of its predecessors completed, or when the run is created
+        submitted_at = arrow.utcnow().datetime
+        histogram = metrics.task_ready_to_submitted_duration.labels(
+            cluster_type=get_cluster_type_label(use_on_demand_clusters=comp_run.use_on_demand_clusters)
+        )
+        for node_id in submitted_node_ids:
+            ready_at = max(
+                (
+                    end
+                    for predecessor_id in dag.predecessor_node_ids(NodeIDStr(f"{node_id}"))
+                    if (end := comp_tasks[predecessor_id].end) is not None
+                ),
+                default=comp_run.created,
+            )
+            histogram.observe(max((submitted_at - ready_at).total_seconds(), 0))
+
+    async def _handle_tasks_start_error(
+        self,
+        error: BaseException,
+        *,
+        user_id: UserID,
+        project_id: ProjectID,
+        comp_tasks: dict[NodeIDStr, CompTaskAtDB],
+        tasks_not_started: dict[NodeID, CompTaskAtDB],
+        comp_run: CompRunsAtDB,
+    ) -> None:
+        log_error_context = {
+            "user_id": f"{user_id}",
+            "project_id": f"{project_id}",
+            "tasks_not_started": f"{list(tasks_not_started.keys())}",
+            "comp_run_use_on_demand_clusters": f"{comp_run.use_on_demand_clusters}",
+            "comp_run_run_id": f"{comp_run.run_id}",
+        }
+        if not isinstance(error, Exception):
+            raise error
+
+        if isinstance(error, ComputationalBackendOnDemandNotReadyError):
             _logger.info(
                 **create_troubleshooting_log_kwargs(
                     "The on demand computational backend is not ready yet. "
                     "Tasks are set to WAITING_FOR_CLUSTER state until the cluster is ready!",
-                    error=exc,
+                    error=error,
                     error_context=log_error_context,
                     tip="This can happen when the cluster is still being created. "
                     "Please wait a bit and the tasks should be scheduled automatically once the cluster is ready.",
@@ -799,29 +900,26 @@ class BaseCompScheduler(ABC):
                 self.rabbitmq_client,
                 user_id,
                 project_id,
-                log=f"{exc}",
+                log=f"{error}",
                 log_level=logging.INFO,
             )
-            await CompTasksRepository.instance(self.db_engine).update_project_tasks_state(
-                project_id,
-                comp_run.run_id,
-                list(tasks_ready_to_start.keys()),
-                RunningState.WAITING_FOR_CLUSTER,
+            await self._set_tasks_not_started_state(
+                project_id, comp_run, comp_tasks, tasks_not_started, RunningState.WAITING_FOR_CLUSTER
             )
-            for task in tasks_ready_to_start:
-                comp_tasks[f"{task}"].state = RunningState.WAITING_FOR_CLUSTER
-        except (
-            ComputationalBackendNotConnectedError,
-            ComputationalSchedulerChangedError,
-            ClustersKeeperNotAvailableError,
-        ) as exc:
-            _logger.exception(
+        elif isinstance(
+            error,
+            ComputationalBackendNotConnectedError
+            | ComputationalSchedulerChangedError
+            | ClustersKeeperNotAvailableError,
+        ):
+            _logger.error(
                 **create_troubleshooting_log_kwargs(
                     "Computational backend is not connected. Tasks are set back "
                     "to WAITING_FOR_CLUSTER state until scheduler comes back!",
-                    error=exc,
+                    error=error,
                     error_context=log_error_context,
-                )
+                ),
+                exc_info=error,
             )
             await publish_project_log(
                 self.rabbitmq_client,
@@ -834,21 +932,15 @@ class BaseCompScheduler(ABC):
                 ),
                 log_level=logging.ERROR,
             )
-            await CompTasksRepository.instance(self.db_engine).update_project_tasks_state(
-                project_id,
-                comp_run.run_id,
-                list(tasks_ready_to_start.keys()),
-                RunningState.WAITING_FOR_CLUSTER,
+            await self._set_tasks_not_started_state(
+                project_id, comp_run, comp_tasks, tasks_not_started, RunningState.WAITING_FOR_CLUSTER
             )
-            for task in tasks_ready_to_start:
-                comp_tasks[f"{task}"].state = RunningState.WAITING_FOR_CLUSTER
-
-        except OsparcVariableResolveTimeoutError as exc:
+        elif isinstance(error, OsparcVariableResolveTimeoutError):
             _logger.warning(
                 **create_troubleshooting_log_kwargs(
                     "Variable resolution timed out during task scheduling. "
                     "Tasks are set back to WAITING_FOR_CLUSTER state and will be retried!",
-                    error=exc,
+                    error=error,
                     error_context=log_error_context,
                     tip="This is likely a transient issue. The variable resolution will be retried "
                     "on the next scheduling cycle.",
@@ -864,37 +956,51 @@ class BaseCompScheduler(ABC):
                 ),
                 log_level=logging.WARNING,
             )
-            await CompTasksRepository.instance(self.db_engine).update_project_tasks_state(
-                project_id,
-                comp_run.run_id,
-                list(tasks_ready_to_start.keys()),
-                RunningState.WAITING_FOR_CLUSTER,
+            await self._set_tasks_not_started_state(
+                project_id, comp_run, comp_tasks, tasks_not_started, RunningState.WAITING_FOR_CLUSTER
             )
-            for task in tasks_ready_to_start:
-                comp_tasks[f"{task}"].state = RunningState.WAITING_FOR_CLUSTER
-
-        except Exception as exc:
-            _logger.exception(
+        else:
+            _logger.error(
                 **create_troubleshooting_log_kwargs(
-                    "Unexpected error happened when scheduling tasks, all tasks to start are set to FAILED "
+                    "Unexpected error happened when scheduling tasks, the tasks not started are set to FAILED "
                     "and the rest of the pipeline will be ABORTED",
-                    error=exc,
+                    error=error,
                     error_context=log_error_context,
-                )
+                ),
+                exc_info=error,
             )
-            await CompTasksRepository.instance(self.db_engine).update_project_tasks_state(
+            await self._set_tasks_not_started_state(
                 project_id,
-                comp_run.run_id,
-                list(tasks_ready_to_start.keys()),
+                comp_run,
+                comp_tasks,
+                tasks_not_started,
                 RunningState.FAILED,
                 optional_progress=1.0,
                 optional_stopped=arrow.utcnow().datetime,
             )
-            for task in tasks_ready_to_start:
-                comp_tasks[f"{task}"].state = RunningState.FAILED
-            raise
+            raise error
 
-        return comp_tasks
+    async def _set_tasks_not_started_state(
+        self,
+        project_id: ProjectID,
+        comp_run: CompRunsAtDB,
+        comp_tasks: dict[NodeIDStr, CompTaskAtDB],
+        tasks_not_started: dict[NodeID, CompTaskAtDB],
+        state: RunningState,
+        *,
+        optional_progress: float | None = None,
+        optional_stopped: datetime.datetime | None = None,
+    ) -> None:
+        await CompTasksRepository.instance(self.db_engine).update_project_tasks_state(
+            project_id,
+            comp_run.run_id,
+            list(tasks_not_started.keys()),
+            state,
+            optional_progress=optional_progress,
+            optional_stopped=optional_stopped,
+        )
+        for task in tasks_not_started:
+            comp_tasks[f"{task}"].state = state
 
     async def _timeout_if_waiting_for_cluster_too_long(
         self,
@@ -16,6 +16,7 @@ from dask_task_models_library.container_tasks.events import (
     TaskProgressEvent,
 )
 from dask_task_models_library.container_tasks.io import TaskOutputData
+from dask_task_models_library.container_tasks.utils import parse_dask_job_id
 from dask_task_models_library.models import DaskJobID
 from models_library.clusters import BaseCluster
 from models_library.errors import ErrorDict
@@ -39,6 +40,7 @@ from ...core.errors import (
     ComputationalBackendOnDemandNotReadyError,
     ComputationalBackendTaskNotFoundError,
     ComputationalBackendTaskResultsNotReadyError,
+    ComputationalRunNotFoundError,
     PortsValidationError,
 )
 from ...models.comp_runs import CompRunsAtDB, Iteration, RunID, RunMetadataDict
@@ -54,16 +56,17 @@ from ...utils.rabbitmq import (
     publish_service_stopped_metrics,
 )
 from ..clusters_keeper import get_or_create_on_demand_cluster
-from ..dask_client import DaskClient
+from ..dask_client import ComputationTaskToSend, DaskClient, PublishedComputationTask
 from ..dask_clients_pool import DaskClientsPool
 from ..db.repositories.comp_runs import (
     CompRunsRepository,
 )
-from ..db.repositories.comp_tasks import CompTasksRepository
+from ..db.repositories.comp_tasks import CompTasksRepository, CompTasksUpdates
 from ._models import TaskStateTracker
 from ._publisher import request_task_result_release
 from ._scheduler_base import BaseCompScheduler
 from ._utils import (
+    SCHEDULED_STATES,
     WAITING_FOR_START_STATES,
 )
 
@@ -139,9 +142,11 @@ class DaskScheduler(BaseCompScheduler):
     dask_clients_pool: DaskClientsPool
 
     def __post_init__(self) -> None:
+        super().__post_init__()
         self.dask_clients_pool.register_handlers(
             TaskHandlers(
                 self._task_progress_change_handler,
+                self._task_states_changed_handler,
             )
         )
 
@@ -153,7 +158,7 @@ class DaskScheduler(BaseCompScheduler):
         scheduled_tasks: dict[NodeID, CompTaskAtDB],
         comp_run: CompRunsAtDB,
         wake_up_callback: Callable[[], None],
-    ) -> None:
+    ) -> dict[NodeID, BaseException]:
         # now transfer the pipeline to the dask scheduler
         async with _cluster_dask_client(
             user_id,
@@ -172,32 +177,40 @@ class DaskScheduler(BaseCompScheduler):
                 RunningState.PENDING,
                 clear_errors=False,
             )
-            # each task is started independently
-
-            for node_id, task in scheduled_tasks.items():
-                published_tasks = await client.send_computation_tasks(
-                    user_id=user_id,
-                    project_id=project_id,
-                    tasks={node_id: task.image},
-                    hardware_info=task.hardware_info,
-                    callback=wake_up_callback,
-                    metadata=comp_run.metadata,
-                    resource_tracking_run_id=ServiceRunID.get_resource_tracking_run_id_for_computational(
-                        user_id, project_id, node_id, comp_run.iteration
-                    ),
-                )
+            # all the tasks are sent at once, each task that cannot be sent is reported with its error
+            sent_tasks = await client.send_computation_tasks_in_bulk(
+                user_id=user_id,
+                project_id=project_id,
+                tasks=[
+                    ComputationTaskToSend(
+                        node_id=node_id,
+                        node_image=task.image,
+                        hardware_info=task.hardware_info,
+                        resource_tracking_run_id=ServiceRunID.get_resource_tracking_run_id_for_computational(
+                            user_id, project_id, node_id, comp_run.iteration
+                        ),
+                    )
+                    for node_id, task in scheduled_tasks.items()
+                ],
+                callback=wake_up_callback,
+                metadata=comp_run.metadata,
+            )
 
-                # update the database so we do have the correct job_ids there
-                await limited_gather(
-                    *(
-                        comp_tasks_repo.update_project_task_job_id(
-                            project_id, task.node_id, comp_run.run_id, task.job_id
-                        )
-                        for task in published_tasks
-                    ),
-                    log=_logger,
-                    limit=1,
-                )
+            # update the database so we do have the correct job_ids there
+            await limited_gather(
+                *(
+                    comp_tasks_repo.update_project_task_job_id(project_id, task.node_id, comp_run.run_id, task.job_id)
+                    for task in sent_tasks
+                    if isinstance(task, PublishedComputationTask)
+                ),
+                log=_logger,
+                limit=1,
+            )
+            return {
+                node_id: error
+                for node_id, error in zip(scheduled_tasks, sent_tasks, strict=True)
+                if isinstance(error, BaseException)
+            }
 
     async def _get_tasks_status(
         self,
@@ -234,6 +247,7 @@ class DaskScheduler(BaseCompScheduler):
         user_id: UserID,
         tasks: list[CompTaskAtDB],
         comp_run: CompRunsAtDB,
+        tasks_updates: CompTasksUpdates,
     ) -> None:
         task_progress_events = []
         try:
@@ -265,14 +279,8 @@ class DaskScheduler(BaseCompScheduler):
                 )
             )
 
-        comp_tasks_repo = CompTasksRepository(self.db_engine)
         for task in task_progress_events:
-            await comp_tasks_repo.update_project_task_progress(
-                task.task_owner.project_id,
-                task.task_owner.node_id,
-                comp_run.run_id,
-                task.progress,
-            )
+            tasks_updates.update_task(task.task_owner.node_id, progress=task.progress)
         await limited_gather(
             *(
                 publish_service_progress(
@@ -370,6 +378,7 @@ class DaskScheduler(BaseCompScheduler):
         tasks: list[TaskStateTracker],
         iteration: Iteration,
         comp_run: CompRunsAtDB,
+        tasks_updates: CompTasksUpdates,
     ) -> None:
         async with _cluster_dask_client(
             user_id,
@@ -393,6 +402,7 @@ class DaskScheduler(BaseCompScheduler):
                         result,
                         iteration,
                         comp_run,
+                        tasks_updates,
                     )
                     for task, result in zip(tasks, tasks_results, strict=True)
                 ),
@@ -403,6 +413,8 @@ class DaskScheduler(BaseCompScheduler):
                     if task_can_be_cleaned and job_id:
                         releasable_job_ids.append(job_id)
 
+        # NOTE: the final states must be in the DB before the results are released from the cluster
+        await tasks_updates.flush()
         if releasable_job_ids:
             # NOTE: releasing is delegated to a dedicated consumer so a slow/hanging
             # dask-scheduler cannot leak this pipeline-scheduling slot (see _releaser.py).
@@ -654,6 +666,7 @@ class DaskScheduler(BaseCompScheduler):
         result: BaseException | TaskOutputData,
         iteration: Iteration,
         comp_run: CompRunsAtDB,
+        tasks_updates: CompTasksUpdates,
     ) -> tuple[bool, str | None]:
         """Returns True and the job ID if the task was successfully processed
         and can be released from the Dask cluster."""
@@ -746,9 +759,7 @@ class DaskScheduler(BaseCompScheduler):
                     task_final_state=task_final_state,
                 )
 
-            await CompTasksRepository(self.db_engine).update_project_tasks_state(
-                task.current.project_id,
-                comp_run.run_id,
+            tasks_updates.update_tasks_state(
                 [task.current.node_id],
                 task_final_state if task_completed else task.previous.state,
                 errors=task_errors,
@@ -758,6 +769,28 @@ class DaskScheduler(BaseCompScheduler):
 
             return task_completed, task.current.job_id
 
+    async def _task_states_changed_handler(self, event: tuple[UnixTimestamp, Any]) -> None:
+        with log_catch(_logger, reraise=False):
+            changed_pipelines: set[tuple[UserID, ProjectID]] = set()
+            for job_id in event[1]:
+                # NOTE: the cluster might run tasks that were not submitted by this service
+                with contextlib.suppress(AssertionError, IndexError, ValueError):
+                    _, _, user_id, project_id, _ = parse_dask_job_id(job_id)
+                    changed_pipelines.add((user_id, project_id))
+            _logger.debug("received task states changes for pipelines %s", changed_pipelines)
+
+            async def _wake_up(user_id: UserID, project_id: ProjectID) -> None:
+                with contextlib.suppress(ComputationalRunNotFoundError):
+                    run = await CompRunsRepository.instance(self.db_engine).get(user_id, project_id)
+                    if run.result in SCHEDULED_STATES:
+                        self.wake_ups.request(user_id=user_id, project_id=project_id, iteration=run.iteration)
+
+            await limited_gather(
+                *(_wake_up(user_id, project_id) for user_id, project_id in changed_pipelines),
+                log=_logger,
+                limit=_PUBLICATION_CONCURRENCY_LIMIT,
+            )
+
     async def _task_progress_change_handler(self, event: tuple[UnixTimestamp, Any]) -> None:
         with log_catch(_logger, reraise=False):
             task_progress_event = TaskProgressEvent.model_validate_json(event[1])
@@ -768,21 +801,20 @@ class DaskScheduler(BaseCompScheduler):
             comp_tasks_repo = CompTasksRepository(self.db_engine)
             task = await comp_tasks_repo.get_task(project_id, node_id)
             run = await CompRunsRepository(self.db_engine).get(user_id, project_id)
-            if task.state in WAITING_FOR_START_STATES:
-                task.state = RunningState.STARTED
-                task.progress = task_progress_event.progress
-                await self._process_started_tasks(
-                    [task],
-                    user_id=user_id,
-                    project_id=project_id,
-                    iteration=run.iteration,
-                    run_metadata=run.metadata,
-                    run_id=run.run_id,
-                )
-            else:
-                await comp_tasks_repo.update_project_task_progress(
-                    project_id, node_id, run.run_id, task_progress_event.progress
-                )
+            async with comp_tasks_repo.batch_updates(project_id, run.run_id) as tasks_updates:
+                if task.state in WAITING_FOR_START_STATES:
+                    task.state = RunningState.STARTED
+                    task.progress = task_progress_event.progress
+                    await self._process_started_tasks(
+                        [task],
+                        user_id=user_id,
+                        project_id=project_id,
+                        iteration=run.iteration,
+                        run_metadata=run.metadata,
+                        tasks_updates=tasks_updates,
+                    )
+                else:
+                    tasks_updates.update_task(node_id, progress=task_progress_event.progress)
             await publish_service_progress(
                 self.rabbitmq_client,
                 user_id=user_id,
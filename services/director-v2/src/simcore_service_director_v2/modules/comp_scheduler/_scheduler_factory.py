@@ -11,6 +11,7 @@ from ..rabbitmq import get_rabbitmq_client, get_rabbitmq_rpc_client
 from ..redis import get_redis_client_manager
 from ._scheduler_base import BaseCompScheduler
 from ._scheduler_dask import DaskScheduler
+from ._utils import get_scheduler_metrics
 
 _logger = logging.getLogger(__name__)
 
@@ -26,4 +27,5 @@ def create_scheduler(app: FastAPI) -> BaseCompScheduler:
             redis_client=get_redis_client_manager(app).client(RedisDatabase.LOCKS),
             db_engine=get_db_engine(app),
             service_runtime_heartbeat_interval=app_settings.SERVICE_TRACKING_HEARTBEAT,
+            metrics=get_scheduler_metrics(app),
         )
@@ -11,7 +11,10 @@ from models_library.services_resources import (
 from servicelib.redis import RedisClientSDK
 from settings_library.redis import RedisDatabase
 
+from ...core.settings import get_application_settings
 from ...models.comp_tasks import CompTaskAtDB
+from ..instrumentation import get_instrumentation
+from ..instrumentation._models import CompSchedulerMetrics
 from ..redis import get_redis_client_manager
 
 SCHEDULED_STATES: set[RunningState] = {
@@ -22,6 +25,13 @@ SCHEDULED_STATES: set[RunningState] = {
     RunningState.WAITING_FOR_CLUSTER,
 }
 
+# NOTE: runs in these states wait on something that does not wake them up (e.g. an on-demand cluster
+# being created, a free slot to submit to the cluster), the manager schedules them at SCHEDULER_INTERVAL
+POLLED_STATES: set[RunningState] = {
+    RunningState.PUBLISHED,
+    RunningState.WAITING_FOR_CLUSTER,
+}
+
 TASK_TO_START_STATES: set[RunningState] = {
     RunningState.PUBLISHED,
     RunningState.WAITING_FOR_CLUSTER,
@@ -65,6 +75,16 @@ def create_service_resources_from_task(task: CompTaskAtDB) -> ServiceResourcesDi
     )
 
 
+def get_cluster_type_label(*, use_on_demand_clusters: bool) -> str:
+    return "on_demand" if use_on_demand_clusters else "default"
+
+
+def get_scheduler_metrics(app: FastAPI) -> CompSchedulerMetrics | None:
+    if not get_application_settings(app).DIRECTOR_V2_PROMETHEUS_INSTRUMENTATION_ENABLED:
+        return None
+    return get_instrumentation(app).comp_scheduler_metrics
+
+
 def _get_app_from_args(*args, **kwargs) -> FastAPI:
     assert kwargs is not None  # nosec
     if args:
@@ -0,0 +1,74 @@
+"""Event-driven scheduling of the pipelines
+
+Events concerning a pipeline (a dask task completed or changed state) request that pipeline to be
+scheduled right away instead of waiting for the periodic sweep of the manager. The requests received
+for the same pipeline within a short time window are coalesced into a single scheduling request.
+"""
+
+import asyncio
+import datetime
+import logging
+from dataclasses import dataclass, field
+
+from common_library.async_tools import cancel_wait_task
+from models_library.projects import ProjectID
+from models_library.users import UserID
+from servicelib.rabbitmq import RabbitMQClient
+from servicelib.utils import limited_gather
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ...models.comp_runs import Iteration
+from ._constants import MAX_CONCURRENT_PIPELINE_SCHEDULING, SCHEDULER_WAKE_UP_DEBOUNCE
+from ._publisher import request_pipeline_scheduling
+
+_logger = logging.getLogger(__name__)
+
+type _PipelineKey = tuple[UserID, ProjectID, Iteration]
+
+
+@dataclass
+class PipelineWakeUps:
+    rabbitmq_client: RabbitMQClient
+    db_engine: AsyncEngine
+    debounce: datetime.timedelta = SCHEDULER_WAKE_UP_DEBOUNCE
+    _pending: set[_PipelineKey] = field(default_factory=set, init=False)
+    _flush_task: asyncio.Task | None = field(default=None, init=False)
+    _running_tasks: set[asyncio.Task] = field(default_factory=set, init=False)
+
+    def request(self, *, user_id: UserID, project_id: ProjectID, iteration: Iteration) -> None:
+        """requests the pipeline to be scheduled within `debounce`
+
+        NOTE: must be called from the event loop, use `loop.call_soon_threadsafe` from another thread
+        """
+        self._pending.add((user_id, project_id, iteration))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush(), name=f"{__name__}.flush")
+            self._running_tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._running_tasks.discard)
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.debounce.total_seconds())
+        # NOTE: the requests received from now on are flushed by the next task
+        pipelines, self._pending = self._pending, set()
+        self._flush_task = None
+        await limited_gather(
+            *(
+                request_pipeline_scheduling(
+                    self.rabbitmq_client,
+                    self.db_engine,
+                    user_id=user_id,
+                    project_id=project_id,
+                    iteration=iteration,
+                )
+                for user_id, project_id, iteration in pipelines
+            ),
+            reraise=False,
+            log=_logger,
+            limit=MAX_CONCURRENT_PIPELINE_SCHEDULING,
+        )
+
+    async def shutdown(self) -> None:
+        # NOTE: the pending requests are dropped, the manager periodic sweep catches up on them
+        await asyncio.gather(*(cancel_wait_task(task) for task in list(self._running_tasks)))
+        self._pending.clear()
+        self._flush_task = None
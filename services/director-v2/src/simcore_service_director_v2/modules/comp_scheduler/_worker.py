@@ -1,9 +1,9 @@
 import asyncio
-import contextlib
 import functools
 import logging
 from typing import cast
 
+import arrow
 from fastapi import FastAPI
 from models_library.projects import ProjectID
 from models_library.users import UserID
@@ -14,11 +14,11 @@ from servicelib.tracing import traced
 from ...core.settings import get_application_settings
 from ...models.comp_runs import Iteration
 from ..rabbitmq import get_rabbitmq_client
-from ._constants import MODULE_NAME_WORKER
+from ._constants import MODULE_NAME_WORKER, SCHEDULER_INTERVAL, SCHEDULER_SAFETY_NET_FACTOR
 from ._models import SchedulePipelineRabbitMessage
 from ._scheduler_base import BaseCompScheduler
 from ._scheduler_factory import create_scheduler
-from ._utils import get_redis_client_from_app, get_redis_lock_key
+from ._utils import get_redis_client_from_app, get_redis_lock_key, get_scheduler_metrics
 
 _logger = logging.getLogger(__name__)
 
@@ -31,10 +31,14 @@ def _unique_key_builder(_app, user_id: UserID, project_id: ProjectID, iteration:
     return f"{user_id}:{project_id}:{iteration}"
 
 
-@exclusive(
-    get_redis_client_from_app,
-    lock_key=get_redis_lock_key(MODULE_NAME_WORKER, unique_lock_key_builder=_unique_key_builder),
-)
+_pipeline_lock_key = get_redis_lock_key(MODULE_NAME_WORKER, unique_lock_key_builder=_unique_key_builder)
+
+
+def _deferred_scheduling_key(lock_key: str) -> str:
+    return f"{lock_key}:deferred"
+
+
+@exclusive(get_redis_client_from_app, lock_key=_pipeline_lock_key)
 async def _exclusively_schedule_pipeline(
     app: FastAPI, *, user_id: UserID, project_id: ProjectID, iteration: Iteration
 ) -> None:
@@ -45,17 +49,62 @@ async def _exclusively_schedule_pipeline(
     )
 
 
+async def _defer_pipeline_scheduling(app: FastAPI, pipeline: SchedulePipelineRabbitMessage) -> None:
+    """the pipeline is being scheduled right now, possibly with a state older than the event that requested
+    this scheduling: the lock holder is asked to request a new scheduling once it is done"""
+    lock_key = _pipeline_lock_key(
+        app, user_id=pipeline.user_id, project_id=pipeline.project_id, iteration=pipeline.iteration
+    )
+    redis_client = get_redis_client_from_app(app)
+    # NOTE: past the safety net interval, the manager re-schedules the pipeline anyway
+    await redis_client.redis.set(
+        _deferred_scheduling_key(lock_key),
+        1,
+        ex=int((SCHEDULER_INTERVAL * SCHEDULER_SAFETY_NET_FACTOR).total_seconds()),
+    )
+    if await redis_client.lock_value(lock_key) is None:
+        # NOTE: the lock holder finished in the meantime and might have missed the request
+        _get_scheduler_worker(app).wake_ups.request(
+            user_id=pipeline.user_id, project_id=pipeline.project_id, iteration=pipeline.iteration
+        )
+
+
+async def _request_deferred_pipeline_scheduling(app: FastAPI, pipeline: SchedulePipelineRabbitMessage) -> None:
+    lock_key = _pipeline_lock_key(
+        app, user_id=pipeline.user_id, project_id=pipeline.project_id, iteration=pipeline.iteration
+    )
+    if await get_redis_client_from_app(app).redis.getdel(_deferred_scheduling_key(lock_key)) is not None:
+        _get_scheduler_worker(app).wake_ups.request(
+            user_id=pipeline.user_id, project_id=pipeline.project_id, iteration=pipeline.iteration
+        )
+
+
 @traced
 async def _handle_apply_distributed_schedule(app: FastAPI, data: bytes) -> bool:
     with log_context(_logger, logging.DEBUG, msg="handling scheduling"):
         to_schedule_pipeline = SchedulePipelineRabbitMessage.model_validate_json(data)
-        with contextlib.suppress(CouldNotAcquireLockError):
+        metrics = get_scheduler_metrics(app)
+        if metrics is not None:
+            # NOTE: redelivered messages keep their creation time, their lag includes the retries
+            metrics.scheduling_request_lag.observe(
+                (arrow.utcnow().datetime - to_schedule_pipeline.created_at).total_seconds()
+            )
+            metrics.scheduling_requests_in_progress.inc()
+        try:
             await _exclusively_schedule_pipeline(
                 app,
                 user_id=to_schedule_pipeline.user_id,
                 project_id=to_schedule_pipeline.project_id,
                 iteration=to_schedule_pipeline.iteration,
             )
+        except CouldNotAcquireLockError:
+            # NOTE: contention is expected, the message is not redelivered (that is the error path)
+            await _defer_pipeline_scheduling(app, to_schedule_pipeline)
+        else:
+            await _request_deferred_pipeline_scheduling(app, to_schedule_pipeline)
+        finally:
+            if metrics is not None:
+                metrics.scheduling_requests_in_progress.dec()
         return True
 
 
@@ -83,3 +132,4 @@ async def shutdown_worker(app: FastAPI) -> None:
         *(rabbitmq_client.unsubscribe_consumer(*consumer) for consumer in app.state.scheduler_worker_consumers),
         return_exceptions=False,
     )
+    await app.state.scheduler_worker.wake_ups.shutdown()
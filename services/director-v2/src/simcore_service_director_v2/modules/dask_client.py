@@ -13,16 +13,14 @@ import logging
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from http.client import HTTPException
-from typing import Final, cast
+from typing import Any, Final, cast
 
 import distributed
 import distributed.client
 from aiohttp import ClientResponseError
 from common_library.json_serialization import json_dumps
-from common_library.logging.logging_errors import create_troubleshooting_log_kwargs
 from dask_task_models_library.container_tasks.docker import DockerBasicAuth
 from dask_task_models_library.container_tasks.encryption import JobEncryptionContext
-from dask_task_models_library.container_tasks.errors import TaskCancelledError
 from dask_task_models_library.container_tasks.events import TaskProgressEvent
 from dask_task_models_library.container_tasks.io import (
     TaskCancelEventName,
@@ -40,11 +38,12 @@ from dask_task_models_library.container_tasks.protocol import (
 )
 from dask_task_models_library.container_tasks.utils import generate_dask_job_id
 from dask_task_models_library.models import (
-    TASK_LIFE_CYCLE_EVENT,
-    TASK_RUNNING_PROGRESS_EVENT,
+    GET_TASK_STATES_SCHEDULER_HANDLER,
+    TASK_STATES_CHANGED_EVENT,
     DaskJobID,
     DaskResources,
     TaskLifeCycleState,
+    TaskStateDict,
 )
 from dask_task_models_library.resource_constraints import (
     create_ec2_resource_constraint_key,
@@ -85,7 +84,6 @@ from ..utils import dask as dask_utils
 from ..utils.dask_client_utils import (
     DaskSubSystem,
     TaskHandlers,
-    UnixTimestamp,
     connect_to_dask_scheduler,
 )
 from .db import get_db_engine
@@ -94,10 +92,10 @@ _logger = logging.getLogger(__name__)
 
 
 _DASK_DEFAULT_TIMEOUT_S: Final[int] = 10
+_MAX_CONCURRENT_TASKS_PREPARATIONS: Final[int] = 10
 
 
 _UserCallbackInSepThread = Callable[[], None]
-_MAX_CONCURRENT_CLIENT_CONNECTIONS: Final[int] = 1
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -106,6 +104,38 @@ class PublishedComputationTask:
     job_id: DaskJobID
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ComputationTaskToSend:
+    node_id: NodeID
+    node_image: Image
+    hardware_info: HardwareInfo
+    resource_tracking_run_id: ServiceRunID
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class _PreparedComputationTask:
+    node_id: NodeID
+    node_image: Image
+    job_id: DaskJobID
+    dask_resources: DaskResources
+    input_data: TaskInputData
+    output_data_keys: TaskOutputDataSchema
+    log_file_url: AnyUrl
+    task_envs: ContainerEnvsDict
+    task_labels: ContainerLabelsDict
+    task_owner: TaskOwner
+    encryption: JobEncryptionContext | None
+
+
+def _vendor_substituted_envs_or_raise(
+    vendor_substituted_envs: dict[str, Any] | BaseException | None,
+) -> dict[str, Any] | None:
+    # NOTE: the vendor secrets are resolved once per service, their error is raised for each of its tasks
+    if isinstance(vendor_substituted_envs, BaseException):
+        raise vendor_substituted_envs
+    return vendor_substituted_envs
+
+
 @dataclass
 class DaskClient:
     app: FastAPI
@@ -172,27 +202,19 @@ class DaskClient:
         _event_consumer_map = [
             (TaskProgressEvent.topic_name(), task_handlers.task_progress_handler),
         ]
+        if task_handlers.task_states_changed_handler is not None:
+            _event_consumer_map.append((TASK_STATES_CHANGED_EVENT, task_handlers.task_states_changed_handler))
         for topic_name, handler in _event_consumer_map:
             self.backend.client.subscribe_topic(topic_name, handler)
 
-    async def _publish_in_dask(  # noqa: PLR0913 # pylint: disable=too-many-arguments
+    def _submit_in_dask(
         self,
         *,
         remote_fct: ContainerRemoteFct | None = None,
-        node_image: Image,
-        input_data: TaskInputData,
-        output_data_keys: TaskOutputDataSchema,
-        log_file_url: AnyUrl,
-        task_envs: ContainerEnvsDict,
-        task_labels: ContainerLabelsDict,
-        task_owner: TaskOwner,
+        task: _PreparedComputationTask,
         s3_settings: S3Settings | None,
-        encryption: JobEncryptionContext | None,
-        dask_resources: DaskResources,
-        node_id: NodeID,
-        job_id: DaskJobID,
         callback: _UserCallbackInSepThread,
-    ) -> PublishedComputationTask:
+    ) -> distributed.Future:
         def _comp_sidecar_fct(
             *,
             task_parameters: ContainerTaskParameters,
@@ -225,47 +247,271 @@ class DaskClient:
             task_future = self.backend.client.submit(
                 remote_fct,
                 task_parameters=ContainerTaskParameters(
-                    image=node_image.name,
-                    tag=node_image.tag,
-                    input_data=input_data,
-                    output_data_keys=output_data_keys,
-                    command=node_image.command,
-                    envs=task_envs,
-                    labels=task_labels,
-                    boot_mode=node_image.boot_mode,
-                    task_owner=task_owner,
+                    image=task.node_image.name,
+                    tag=task.node_image.tag,
+                    input_data=task.input_data,
+                    output_data_keys=task.output_data_keys,
+                    command=task.node_image.command,
+                    envs=task.task_envs,
+                    labels=task.task_labels,
+                    boot_mode=task.node_image.boot_mode,
+                    task_owner=task.task_owner,
                 ),
                 docker_auth=DockerBasicAuth(
                     server_address=settings.DIRECTOR_V2_DOCKER_REGISTRY.resolved_registry_url,
                     username=settings.DIRECTOR_V2_DOCKER_REGISTRY.REGISTRY_USER,
                     password=settings.DIRECTOR_V2_DOCKER_REGISTRY.REGISTRY_PW,
                 ),
-                log_file_url=log_file_url,
+                log_file_url=task.log_file_url,
                 s3_settings=s3_settings,
-                encryption=encryption,
-                key=job_id,
-                resources=dask_resources,
+                encryption=task.encryption,
+                key=task.job_id,
+                resources=task.dask_resources,
                 retries=0,
                 pure=False,
             )
             # NOTE: the callback is running in a secondary thread, and takes a future as arg
             task_future.add_done_callback(lambda _: callback())
-
-            await dask_utils.wrap_client_async_routine(self.backend.client.publish_dataset(task_future, name=job_id))
-
-            _logger.info(
-                "Dask task %s started [%s] with encryption [%s]",
-                f"{job_id=}",
-                f"{node_image.command=}",
-                f"{'enabled' if encryption else 'disabled'}",
-            )
-            return PublishedComputationTask(node_id=node_id, job_id=DaskJobID(job_id))
+            return task_future
         except Exception:
             # Dask raises a base Exception here in case of connection error, this will raise a more precise one
             dask_utils.check_scheduler_status(self.backend.client)
             # if the connection is good, then the problem is different, so we re-raise
             raise
 
+    def _compute_dask_resources(
+        self,
+        *,
+        project_id: ProjectID,
+        task: ComputationTaskToSend,
+        scheduler_info: dict[str, Any] | None,
+    ) -> DaskResources:
+        """
+        Raises:
+          - MissingComputationalResourcesError (only for internal cluster)
+          - InsufficientComputationalResourcesError (only for internal cluster)
+        """
+        assert task.node_image.node_requirements  # nosec
+        dask_resources = dask_utils.from_node_reqs_to_dask_resources(task.node_image.node_requirements)
+        if task.hardware_info.aws_ec2_instances:
+            dask_resources[create_ec2_resource_constraint_key(task.hardware_info.aws_ec2_instances[0])] = 1
+
+        # NOTE: in case it is an on-demand cluster
+        # we do not check a priori if the task
+        # is runnable because we CAN'T. A cluster might auto-scale, the worker(s)
+        # might also auto-scale we do not know that a priori.
+        # So, we'll just send the tasks over and see what happens after a while.
+        if scheduler_info is not None:
+            dask_utils.check_if_cluster_is_able_to_run_pipeline(
+                project_id=project_id,
+                node_id=task.node_id,
+                scheduler_info=scheduler_info,
+                task_resources=dask_resources,
+                node_image=task.node_image,
+            )
+        return dask_resources
+
+    async def _prepare_computation_task(
+        self,
+        *,
+        user_id: UserID,
+        project_id: ProjectID,
+        task: ComputationTaskToSend,
+        metadata: RunMetadataDict,
+        scheduler_info: dict[str, Any] | None,
+        vendor_substituted_envs: dict[str, Any] | BaseException | None,
+    ) -> _PreparedComputationTask:
+        dask_resources = self._compute_dask_resources(project_id=project_id, task=task, scheduler_info=scheduler_info)
+        node_id = task.node_id
+        try:
+            # This instance is created only once so it can be reused in calls below
+            node_ports = await dask_utils.create_node_ports(
+                db_engine=get_db_engine(self.app),
+                user_id=user_id,
+                project_id=project_id,
+                node_id=node_id,
+            )
+            # NOTE: for download there is no need to go with S3 links
+            input_data = await dask_utils.compute_input_data(
+                project_id=project_id,
+                node_id=node_id,
+                node_ports=node_ports,
+                file_link_type=FileLinkType.PRESIGNED,
+            )
+            output_data_keys = await dask_utils.compute_output_data_schema(
+                user_id=user_id,
+                project_id=project_id,
+                node_id=node_id,
+                node_ports=node_ports,
+                file_link_type=self.tasks_file_link_type,
+            )
+            log_file_url = await dask_utils.compute_service_log_file_upload_link(
+                user_id,
+                project_id,
+                node_id,
+                file_link_type=self.tasks_file_link_type,
+            )
+            task_labels = dask_utils.compute_task_labels(
+                user_id=user_id,
+                project_id=project_id,
+                node_id=node_id,
+                run_metadata=metadata,
+                node_requirements=task.node_image.node_requirements,
+            )
+            task_envs = await dask_utils.compute_task_envs(
+                self.app,
+                user_id=user_id,
+                project_id=project_id,
+                node_id=node_id,
+                node_image=task.node_image,
+                metadata=metadata,
+                resource_tracking_run_id=task.resource_tracking_run_id,
+                wallet_id=metadata.get("wallet_id"),
+                vendor_substituted_envs=_vendor_substituted_envs_or_raise(vendor_substituted_envs),
+            )
+            task_owner = dask_utils.compute_task_owner(
+                user_id, project_id, node_id, metadata.get("project_metadata", {})
+            )
+            encryption_metadata = dask_utils.get_job_encryption_context_metadata(metadata)
+            encryption = (
+                JobEncryptionContext.from_metadata(encryption_metadata, node_id) if encryption_metadata else None
+            )
+        except (NodeportsError, ValidationError, ClientResponseError) as exc:
+            raise TaskSchedulingError(project_id=project_id, node_id=node_id, msg=f"{exc}") from exc
+
+        return _PreparedComputationTask(
+            node_id=node_id,
+            node_image=task.node_image,
+            job_id=DaskJobID(
+                generate_dask_job_id(
+                    service_key=task.node_image.name,
+                    service_version=task.node_image.tag,
+                    user_id=user_id,
+                    project_id=project_id,
+                    node_id=node_id,
+                )
+            ),
+            dask_resources=dask_resources,
+            input_data=input_data,
+            output_data_keys=output_data_keys,
+            log_file_url=log_file_url,
+            task_envs=task_envs,
+            task_labels=task_labels,
+            task_owner=task_owner,
+            encryption=encryption,
+        )
+
+    async def send_computation_tasks_in_bulk(
+        self,
+        *,
+        user_id: UserID,
+        project_id: ProjectID,
+        tasks: list[ComputationTaskToSend],
+        callback: _UserCallbackInSepThread,
+        remote_fct: ContainerRemoteFct | None = None,
+        metadata: RunMetadataDict,
+    ) -> list[PublishedComputationTask | BaseException]:
+        """sends all the tasks to be remotely executed at once. if remote_fct is None then the default
+        function that runs container will be started.
+
+        The tasks are prepared concurrently, the vendor secrets are resolved once per service
+        and the tasks are published in the dask-scheduler in a single call.
+
+        Returns:
+          for each task (same order), either the published task or the error that prevented sending it:
+          - MissingComputationalResourcesError (only for internal cluster)
+          - InsufficientComputationalResourcesError (only for internal cluster)
+          - TaskSchedulingError when any other error happens
+
+        Raises:
+          - ComputationalBackendNoS3AccessError when storage is not accessible
+          - ComputationalSchedulerChangedError when expected scheduler changed
+          - ComputationalBackendNotConnectedError when scheduler is not connected/running
+        """
+        if not tasks:
+            return []
+        dask_utils.check_scheduler_is_still_the_same(self.backend.scheduler_id, self.backend.client)
+        dask_utils.check_communication_with_scheduler_is_open(self.backend.client)
+        dask_utils.check_scheduler_status(self.backend.client)
+        scheduler_info = (
+            None if self.cluster_type == ClusterTypeInModel.ON_DEMAND else self.backend.client.scheduler_info()
+        )
+
+        s3_settings = None
+        if self.tasks_file_link_type == FileLinkType.S3:
+            try:
+                s3_settings = await StorageClient.instance(self.app).get_s3_access(user_id)
+            except HTTPException as err:
+                raise ComputationalBackendNoS3AccessError from err
+
+        # NOTE: the vendor secrets only depend on the service, many tasks usually run the same one
+        services_images = {(t.node_image.name, t.node_image.tag): t.node_image for t in tasks if t.node_image.envs}
+        services_vendor_substituted_envs = dict(
+            zip(
+                services_images,
+                await limited_gather(
+                    *(
+                        dask_utils.substitute_vendor_secrets_in_task_envs(
+                            self.app, node_image=node_image, metadata=metadata
+                        )
+                        for node_image in services_images.values()
+                    ),
+                    reraise=False,
+                    log=_logger,
+                    limit=_MAX_CONCURRENT_TASKS_PREPARATIONS,
+                ),
+                strict=True,
+            )
+        )
+        prepared_tasks = await limited_gather(
+            *(
+                self._prepare_computation_task(
+                    user_id=user_id,
+                    project_id=project_id,
+                    task=task,
+                    metadata=metadata,
+                    scheduler_info=scheduler_info,
+                    vendor_substituted_envs=services_vendor_substituted_envs.get(
+                        (task.node_image.name, task.node_image.tag)
+                    ),
+                )
+                for task in tasks
+            ),
+            reraise=False,
+            log=_logger,
+            limit=_MAX_CONCURRENT_TASKS_PREPARATIONS,
+        )
+
+        results: list[PublishedComputationTask | BaseException] = []
+        submitted_futures: dict[str, distributed.Future] = {}
+        for prepared_task in prepared_tasks:
+            if isinstance(prepared_task, BaseException):
+                results.append(prepared_task)
+                continue
+            submitted_futures[prepared_task.job_id] = self._submit_in_dask(
+                remote_fct=remote_fct,
+                task=prepared_task,
+                s3_settings=s3_settings,
+                callback=callback,
+            )
+            results.append(PublishedComputationTask(node_id=prepared_task.node_id, job_id=prepared_task.job_id))
+            _logger.info(
+                "Dask task %s started [%s] with encryption [%s]",
+                f"{prepared_task.job_id=}",
+                f"{prepared_task.node_image.command=}",
+                f"{'enabled' if prepared_task.encryption else 'disabled'}",
+            )
+
+        if submitted_futures:
+            try:
+                await dask_utils.wrap_client_async_routine(self.backend.client.publish_dataset(**submitted_futures))
+            except Exception:
+                # Dask raises a base Exception here in case of connection error, this will raise a more precise one
+                dask_utils.check_scheduler_status(self.backend.client)
+                # if the connection is good, then the problem is different, so we re-raise
+                raise
+        return results
+
     async def send_computation_tasks(
         self,
         *,
@@ -289,218 +535,69 @@ class DaskClient:
           - InsufficientComputationalResourcesError (only for internal cluster)
           - TaskSchedulingError when any other error happens
         """
-
         list_of_node_id_to_job_id: list[PublishedComputationTask] = []
-
-        for node_id, node_image in tasks.items():
-            job_id = generate_dask_job_id(
-                service_key=node_image.name,
-                service_version=node_image.tag,
-                user_id=user_id,
-                project_id=project_id,
-                node_id=node_id,
-            )
-            assert node_image.node_requirements  # nosec
-            dask_resources = dask_utils.from_node_reqs_to_dask_resources(node_image.node_requirements)
-            if hardware_info.aws_ec2_instances:
-                dask_resources[create_ec2_resource_constraint_key(hardware_info.aws_ec2_instances[0])] = 1
-
-            dask_utils.check_scheduler_is_still_the_same(self.backend.scheduler_id, self.backend.client)
-            dask_utils.check_communication_with_scheduler_is_open(self.backend.client)
-            dask_utils.check_scheduler_status(self.backend.client)
-            # NOTE: in case it is an on-demand cluster
-            # we do not check a priori if the task
-            # is runnable because we CAN'T. A cluster might auto-scale, the worker(s)
-            # might also auto-scale we do not know that a priori.
-            # So, we'll just send the tasks over and see what happens after a while.
-            if self.cluster_type != ClusterTypeInModel.ON_DEMAND:
-                dask_utils.check_if_cluster_is_able_to_run_pipeline(
-                    project_id=project_id,
-                    node_id=node_id,
-                    scheduler_info=self.backend.client.scheduler_info(),
-                    task_resources=dask_resources,
-                    node_image=node_image,
-                )
-
-            s3_settings = None
-            if self.tasks_file_link_type == FileLinkType.S3:
-                try:
-                    s3_settings = await StorageClient.instance(self.app).get_s3_access(user_id)
-                except HTTPException as err:
-                    raise ComputationalBackendNoS3AccessError from err
-
-            try:
-                # This instance is created only once so it can be reused in calls below
-                node_ports = await dask_utils.create_node_ports(
-                    db_engine=get_db_engine(self.app),
-                    user_id=user_id,
-                    project_id=project_id,
-                    node_id=node_id,
-                )
-                # NOTE: for download there is no need to go with S3 links
-                input_data = await dask_utils.compute_input_data(
-                    project_id=project_id,
-                    node_id=node_id,
-                    node_ports=node_ports,
-                    file_link_type=FileLinkType.PRESIGNED,
-                )
-                output_data_keys = await dask_utils.compute_output_data_schema(
-                    user_id=user_id,
-                    project_id=project_id,
-                    node_id=node_id,
-                    node_ports=node_ports,
-                    file_link_type=self.tasks_file_link_type,
-                )
-                log_file_url = await dask_utils.compute_service_log_file_upload_link(
-                    user_id,
-                    project_id,
-                    node_id,
-                    file_link_type=self.tasks_file_link_type,
-                )
-                task_labels = dask_utils.compute_task_labels(
-                    user_id=user_id,
-                    project_id=project_id,
-                    node_id=node_id,
-                    run_metadata=metadata,
-                    node_requirements=node_image.node_requirements,
-                )
-                task_envs = await dask_utils.compute_task_envs(
-                    self.app,
-                    user_id=user_id,
-                    project_id=project_id,
+        for published_task in await self.send_computation_tasks_in_bulk(
+            user_id=user_id,
+            project_id=project_id,
+            tasks=[
+                ComputationTaskToSend(
                     node_id=node_id,
                     node_image=node_image,
-                    metadata=metadata,
+                    hardware_info=hardware_info,
                     resource_tracking_run_id=resource_tracking_run_id,
-                    wallet_id=metadata.get("wallet_id"),
-                )
-                task_owner = dask_utils.compute_task_owner(
-                    user_id, project_id, node_id, metadata.get("project_metadata", {})
-                )
-                encryption_metadata = dask_utils.get_job_encryption_context_metadata(metadata)
-                encryption = (
-                    JobEncryptionContext.from_metadata(encryption_metadata, node_id) if encryption_metadata else None
                 )
-                list_of_node_id_to_job_id.append(
-                    await self._publish_in_dask(
-                        remote_fct=remote_fct,
-                        node_image=node_image,
-                        input_data=input_data,
-                        output_data_keys=output_data_keys,
-                        log_file_url=log_file_url,
-                        task_envs=task_envs,
-                        task_labels=task_labels,
-                        task_owner=task_owner,
-                        s3_settings=s3_settings,
-                        encryption=encryption,
-                        dask_resources=dask_resources,
-                        node_id=node_id,
-                        job_id=job_id,
-                        callback=callback,
-                    )
-                )
-            except (NodeportsError, ValidationError, ClientResponseError) as exc:
-                raise TaskSchedulingError(project_id=project_id, node_id=node_id, msg=f"{exc}") from exc
-
+                for node_id, node_image in tasks.items()
+            ],
+            callback=callback,
+            remote_fct=remote_fct,
+            metadata=metadata,
+        ):
+            if isinstance(published_task, BaseException):
+                raise published_task
+            list_of_node_id_to_job_id.append(published_task)
         return list_of_node_id_to_job_id
 
-    async def get_tasks_progress(self, job_ids: list[str]) -> list[TaskProgressEvent | None]:
+    async def _get_task_states(self, job_ids: Iterable[str]) -> dict[str, TaskStateDict]:
         dask_utils.check_scheduler_is_still_the_same(self.backend.scheduler_id, self.backend.client)
         dask_utils.check_communication_with_scheduler_is_open(self.backend.client)
         dask_utils.check_scheduler_status(self.backend.client)
+        # NOTE: one call for all the tasks, served by the TaskLifecycleSchedulerPlugin
+        task_states: dict[str, TaskStateDict] = await getattr(
+            self.backend.client.scheduler, GET_TASK_STATES_SCHEDULER_HANDLER
+        )(keys=list(job_ids))
+        return task_states
 
-        async def _get_task_progress(job_id: str) -> TaskProgressEvent | None:
-            dask_events: tuple[tuple[UnixTimestamp, str], ...] = await self.backend.client.get_events(
-                TASK_RUNNING_PROGRESS_EVENT.format(key=job_id)
-            )
-            if not dask_events:
-                return None
-            # we are interested in the last event
-            return TaskProgressEvent.model_validate_json(dask_events[-1][1])
+    async def get_tasks_progress(self, job_ids: list[str]) -> list[TaskProgressEvent | None]:
+        task_states = await self._get_task_states(job_ids)
+        return [
+            TaskProgressEvent.model_validate_json(progress)
+            if (task_state := task_states.get(job_id)) and (progress := task_state["progress"])
+            else None
+            for job_id in job_ids
+        ]
 
-        return await limited_gather(
-            *(_get_task_progress(job_id) for job_id in job_ids),
-            log=_logger,
-            limit=_MAX_CONCURRENT_CLIENT_CONNECTIONS,
-        )
+    def _get_task_state(self, job_id: str, task_state: TaskStateDict | None) -> RunningState:
+        if task_state is None or task_state["life_cycle"] is None:
+            return RunningState.UNKNOWN
+        parsed_event = TaskLifeCycleState.model_validate(task_state["life_cycle"])
 
-    async def get_tasks_status(self, job_ids: Iterable[str]) -> list[RunningState]:
-        dask_utils.check_scheduler_is_still_the_same(self.backend.scheduler_id, self.backend.client)
-        dask_utils.check_communication_with_scheduler_is_open(self.backend.client)
-        dask_utils.check_scheduler_status(self.backend.client)
+        if parsed_event.state == RunningState.FAILED:
+            exception_text = task_state["exception_text"]
+            if exception_text is None:
+                # NOTE: the worker reported the failure, the dask-scheduler did not record the error yet
+                return RunningState.STARTED
+            if task_state["cancelled"]:
+                _logger.info("Task %s was aborted by user", job_id)
+                return RunningState.ABORTED
+            _logger.info("Task %s completed with an error: %s", job_id, exception_text)
+            return RunningState.FAILED
 
-        async def _get_task_state(job_id: str) -> RunningState:
-            dask_events: tuple[tuple[UnixTimestamp, str], ...] = await self.backend.client.get_events(
-                TASK_LIFE_CYCLE_EVENT.format(key=job_id)
-            )
-            if not dask_events:
-                return RunningState.UNKNOWN
-            # we are interested in the last event
-            parsed_event = TaskLifeCycleState.model_validate(dask_events[-1][1])
-
-            if parsed_event.state == RunningState.FAILED:
-                log_error_context = {
-                    "job_id": job_id,
-                    "dask-scheduler": self.backend.scheduler_id,
-                }
-                try:
-                    # find out if this was a cancellation
-                    task_future: distributed.Future = await dask_utils.wrap_client_async_routine(
-                        self.backend.client.get_dataset(name=job_id)
-                    )
-                    exception = await task_future.exception(timeout=_DASK_DEFAULT_TIMEOUT_S)
-                    assert isinstance(exception, Exception)  # nosec
-
-                    if isinstance(exception, TaskCancelledError):
-                        _logger.info(
-                            **create_troubleshooting_log_kwargs(
-                                f"Task {job_id} was aborted by user",
-                                error=exception,
-                                error_context=log_error_context,
-                            )
-                        )
-                        return RunningState.ABORTED
-                    assert exception  # nosec
-                    _logger.info(
-                        **create_troubleshooting_log_kwargs(
-                            f"Task {job_id} completed with an error",
-                            error=exception,
-                            error_context=log_error_context,
-                        )
-                    )
-                    return RunningState.FAILED
-                except TimeoutError as exc:
-                    _logger.exception(
-                        **create_troubleshooting_log_kwargs(
-                            f"Task {job_id} exception could not be retrieved due to timeout",
-                            error=exc,
-                            error_context=log_error_context,
-                            tip="The dask-scheduler is probably under load, this should resolve itself later.",
-                        ),
-                    )
-                    return RunningState.UNKNOWN
-                except KeyError as exc:
-                    # the task does not exist
-                    _logger.warning(
-                        **create_troubleshooting_log_kwargs(
-                            f"Task {job_id} not found. State is UNKNOWN.",
-                            error=exc,
-                            error_context=log_error_context,
-                            tip=(
-                                "If the task is supposed to exist, the dask-scheduler has probably restarted. "
-                                "Check its status."
-                            ),
-                        ),
-                    )
-                    return RunningState.UNKNOWN
-
-            return parsed_event.state
+        return parsed_event.state
 
-        return await limited_gather(
-            *(_get_task_state(job_id) for job_id in job_ids),
-            log=_logger,
-            limit=_MAX_CONCURRENT_CLIENT_CONNECTIONS,
-        )
+    async def get_tasks_status(self, job_ids: Iterable[str]) -> list[RunningState]:
+        job_ids = list(job_ids)
+        task_states = await self._get_task_states(job_ids)
+        return [self._get_task_state(job_id, task_states.get(job_id)) for job_id in job_ids]
 
     async def abort_computation_task(self, job_id: str) -> None:
         # Dask future may be cancelled, but only a future that was not already taken by
@@ -5,6 +5,7 @@ import sqlalchemy as sa
 from models_library.basic_types import IDStr
 from models_library.computations import CollectionRunID
 from models_library.products import ProductName
+from models_library.projects_state import RunningState
 from models_library.rest_ordering import OrderBy, OrderDirection
 from simcore_postgres_database.utils_comp_run_snapshot_tasks import (
     COMP_RUN_SNAPSHOT_TASKS_DB_COLS,
@@ -14,6 +15,7 @@ from simcore_postgres_database.utils_repos import (
 )
 
 from ....models.comp_run_snapshot_tasks import CompRunSnapshotTaskDBGet
+from ....utils.db import DB_TO_RUNNING_STATE, RUNNING_STATE_TO_DB
 from ..tables import comp_run_snapshot_tasks, comp_runs
 from ._base import BaseRepository
 
@@ -36,6 +38,29 @@ class CompRunsSnapshotTasksRepository(BaseRepository):
                 logger.exception("Failed to batch create comp run snapshot tasks")
                 raise
 
+    async def count_tasks_per_state(
+        self, *, filter_by_run_state: set[RunningState]
+    ) -> dict[tuple[bool, RunningState], int]:
+        """counts the tasks of the runs with result in filter_by_run_state
+
+        Returns:
+            the number of tasks per (use_on_demand_clusters, task state)
+        """
+        async with self.db_engine.connect() as conn:
+            result = await conn.execute(
+                sa.select(
+                    comp_runs.c.use_on_demand_clusters,
+                    comp_run_snapshot_tasks.c.state,
+                    sa.func.count().label("num_tasks"),
+                )
+                .select_from(
+                    comp_run_snapshot_tasks.join(comp_runs, comp_run_snapshot_tasks.c.run_id == comp_runs.c.run_id)
+                )
+                .where(comp_runs.c.result.in_([RUNNING_STATE_TO_DB[s] for s in filter_by_run_state]))
+                .group_by(comp_runs.c.use_on_demand_clusters, comp_run_snapshot_tasks.c.state)
+            )
+            return {(row.use_on_demand_clusters, DB_TO_RUNNING_STATE[row.state]): row.num_tasks for row in result}
+
     async def list_computation_collection_run_tasks(
         self,
         *,
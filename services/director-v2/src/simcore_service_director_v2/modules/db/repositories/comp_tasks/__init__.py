@@ -1,3 +1,6 @@
-from ._core import CompTasksRepository
+from ._core import CompTasksRepository, CompTasksUpdates
 
-__all__: tuple[str, ...] = ("CompTasksRepository",)
+__all__: tuple[str, ...] = (
+    "CompTasksRepository",
+    "CompTasksUpdates",
+)
@@ -1,4 +1,7 @@
 import logging
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, cast
 
@@ -31,6 +34,44 @@ from . import _utils
 _logger = logging.getLogger(__name__)
 
 
+def _get_state_update_values(
+    state: RunningState,
+    errors: list[ErrorDict] | None,
+    *,
+    clear_errors: bool,
+    optional_progress: float | None,
+    optional_started: datetime | None,
+    optional_stopped: datetime | None,
+) -> dict[str, Any]:
+    update_values: dict[str, Any] = {"state": RUNNING_STATE_TO_DB[state]}
+    if clear_errors or errors is not None:
+        update_values["errors"] = errors
+    if optional_progress is not None:
+        update_values["progress"] = optional_progress
+    if optional_started is not None:
+        update_values["start"] = optional_started
+    if optional_stopped is not None:
+        update_values["end"] = optional_stopped
+    return update_values
+
+
+def _update_from_values(
+    table: sa.Table, tasks_values: dict[NodeID, dict[str, Any]], columns: tuple[str, ...]
+) -> sa.Update:
+    """UPDATE table SET column = updates.column FROM (VALUES ...) AS updates WHERE node_id = updates.node_id"""
+    updates = sa.values(
+        sa.column("node_id", table.c.node_id.type),
+        *(sa.column(column, table.c[column].type) for column in columns),
+        name="updates",
+    ).data([(f"{node_id}", *(values[column] for column in columns)) for node_id, values in tasks_values.items()])
+    # NOTE: the JSON columns are not cast by the driver, hence the explicit cast
+    return (
+        sa.update(table)
+        .where(table.c.node_id == updates.c.node_id)
+        .values({column: sa.cast(updates.c[column], table.c[column].type) for column in columns})
+    )
+
+
 class CompTasksRepository(BaseRepository):
     async def get_task(self, project_id: ProjectID, node_id: NodeID) -> CompTaskAtDB:
         async with self.db_engine.connect() as conn:
@@ -281,15 +322,14 @@ class CompTasksRepository(BaseRepository):
         """
         if not tasks:
             return
-        update_values: dict[str, Any] = {"state": RUNNING_STATE_TO_DB[state]}
-        if clear_errors or errors is not None:
-            update_values["errors"] = errors
-        if optional_progress is not None:
-            update_values["progress"] = optional_progress
-        if optional_started is not None:
-            update_values["start"] = optional_started
-        if optional_stopped is not None:
-            update_values["end"] = optional_stopped
+        update_values = _get_state_update_values(
+            state,
+            errors,
+            clear_errors=clear_errors,
+            optional_progress=optional_progress,
+            optional_started=optional_started,
+            optional_stopped=optional_stopped,
+        )
 
         # NOTE: all the tasks share the same update_values, so this is done as a single
         # bulk update per table instead of one transaction per task (see ADR on comp_tasks batching)
@@ -316,23 +356,49 @@ class CompTasksRepository(BaseRepository):
                     .values(**update_values)
                 )
 
-    async def update_project_task_progress(
-        self,
-        project_id: ProjectID,
-        node_id: NodeID,
-        run_id: RunID,
-        progress: float,
+    async def batch_update_tasks(
+        self, project_id: ProjectID, run_id: RunID, tasks_values: dict[NodeID, dict[str, Any]]
     ) -> None:
-        await self._update_task(project_id, node_id, run_id, progress=progress)
+        """updates each task with its own values, in a single transaction
 
-    async def update_project_task_last_heartbeat(
-        self,
-        project_id: ProjectID,
-        node_id: NodeID,
-        run_id: RunID,
-        heartbeat_time: datetime,
-    ) -> None:
-        await self._update_task(project_id, node_id, run_id, last_heartbeat=heartbeat_time)
+        NOTE: the tasks updating the same columns are updated with a single statement per table
+        """
+        tasks_values_by_columns: dict[tuple[str, ...], dict[NodeID, dict[str, Any]]] = {}
+        for node_id, values in tasks_values.items():
+            if values:
+                tasks_values_by_columns.setdefault(tuple(sorted(values)), {})[node_id] = values
+        if not tasks_values_by_columns:
+            return
+
+        with log_context(
+            _logger,
+            logging.DEBUG,
+            msg=f"batch update tasks {project_id=}:{list(tasks_values)=}",
+        ):
+            async with self.db_engine.begin() as conn:
+                for columns, same_columns_tasks_values in tasks_values_by_columns.items():
+                    update_stmt = _update_from_values(comp_tasks, same_columns_tasks_values, columns)
+                    await conn.execute(update_stmt.where(comp_tasks.c.project_id == f"{project_id}"))
+                    # Sync with comp_run_snapshot_tasks table
+                    update_stmt = _update_from_values(comp_run_snapshot_tasks, same_columns_tasks_values, columns)
+                    await conn.execute(
+                        update_stmt.where(
+                            (comp_run_snapshot_tasks.c.run_id == run_id)
+                            & (comp_run_snapshot_tasks.c.project_id == f"{project_id}")
+                        )
+                    )
+
+    @asynccontextmanager
+    async def batch_updates(self, project_id: ProjectID, run_id: RunID) -> AsyncIterator["CompTasksUpdates"]:
+        """collects the changes of the tasks of a run and writes them all at once when leaving the context
+
+        NOTE: the changes collected before an error are still written
+        """
+        tasks_updates = CompTasksUpdates(self, project_id, run_id)
+        try:
+            yield tasks_updates
+        finally:
+            await tasks_updates.flush()
 
     async def delete_tasks_from_project(self, project_id: ProjectID) -> None:
         async with self.db_engine.begin() as conn:
@@ -352,3 +418,44 @@ class CompTasksRepository(BaseRepository):
                 assert set(selection) == {f"{_.node_id}" for _ in rows}  # nosec
                 return {NodeID(_.node_id): _.outputs or {} for _ in rows}
             return {}
+
+
+@dataclass
+class CompTasksUpdates:
+    """Changes of the tasks of a run, written with CompTasksRepository.batch_update_tasks on flush"""
+
+    repository: CompTasksRepository
+    project_id: ProjectID
+    run_id: RunID
+    _tasks_values: dict[NodeID, dict[str, Any]] = field(default_factory=dict, init=False)
+
+    def update_task(self, node_id: NodeID, **values: Any) -> None:
+        """the values override the ones previously set for that task"""
+        self._tasks_values.setdefault(node_id, {}).update(values)
+
+    def update_tasks_state(
+        self,
+        tasks: Iterable[NodeID],
+        state: RunningState,
+        errors: list[ErrorDict] | None = None,
+        *,
+        clear_errors: bool = True,
+        optional_progress: float | None = None,
+        optional_started: datetime | None = None,
+        optional_stopped: datetime | None = None,
+    ) -> None:
+        """same as CompTasksRepository.update_project_tasks_state"""
+        update_values = _get_state_update_values(
+            state,
+            errors,
+            clear_errors=clear_errors,
+            optional_progress=optional_progress,
+            optional_started=optional_started,
+            optional_stopped=optional_stopped,
+        )
+        for node_id in tasks:
+            self.update_task(node_id, **update_values)
+
+    async def flush(self) -> None:
+        tasks_values, self._tasks_values = self._tasks_values, {}
+        await self.repository.batch_update_tasks(self.project_id, self.run_id, tasks_values)
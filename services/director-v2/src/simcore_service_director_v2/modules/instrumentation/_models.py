@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Final
 
-from prometheus_client import CollectorRegistry, Histogram
+from prometheus_client import CollectorRegistry, Gauge, Histogram
 from pydantic import ByteSize, TypeAdapter
 from servicelib.db_asyncpg_pool_metrics import DbPoolMetrics
 from servicelib.instrumentation import MetricsBase, get_metrics_namespace
@@ -30,6 +30,21 @@ _BUCKETS_TIME_S: Final[tuple[float, ...]] = (
     20 * _MINUTE,
 )
 
+_BUCKETS_SCHEDULING_TIME_S: Final[tuple[float, ...]] = (
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    1 * _MINUTE,
+    2 * _MINUTE,
+)
+
 
 _RATE_BPS_BUCKETS: Final[tuple[float, ...]] = tuple(
     TypeAdapter(ByteSize).validate_python(f"{m}MiB")
@@ -135,11 +150,74 @@ class DynamiSidecarMetrics(MetricsBase):
         )
 
 
+@dataclass(slots=True, kw_only=True)
+class CompSchedulerMetrics(MetricsBase):
+    apply_phase_duration: Histogram = field(init=False)
+    scheduling_queue_depth: Gauge = field(init=False)
+    scheduling_request_lag: Histogram = field(init=False)
+    scheduling_requests_in_progress: Gauge = field(init=False)
+    task_ready_to_submitted_duration: Histogram = field(init=False)
+    tasks: Gauge = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.apply_phase_duration = Histogram(
+            "apply_phase_duration_seconds",
+            "time spent in each phase of the scheduling step of a pipeline",
+            labelnames=("phase",),
+            namespace=_METRICS_NAMESPACE,
+            buckets=_BUCKETS_SCHEDULING_TIME_S,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+        self.scheduling_queue_depth = Gauge(
+            "scheduling_queue_depth",
+            "number of scheduling requests waiting in the scheduling queue",
+            namespace=_METRICS_NAMESPACE,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+        self.scheduling_request_lag = Histogram(
+            "scheduling_request_lag_seconds",
+            "time between the request to schedule a pipeline and its handling by a worker "
+            "(time spent in the scheduling queue)",
+            namespace=_METRICS_NAMESPACE,
+            buckets=_BUCKETS_SCHEDULING_TIME_S,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+        self.scheduling_requests_in_progress = Gauge(
+            "scheduling_requests_in_progress",
+            "number of scheduling requests currently handled by the workers of this replica",
+            namespace=_METRICS_NAMESPACE,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+        self.task_ready_to_submitted_duration = Histogram(
+            "task_ready_to_submitted_duration_seconds",
+            "time between a task becoming ready (all its predecessors completed) and its submission "
+            "to the computational backend",
+            labelnames=("cluster_type",),
+            namespace=_METRICS_NAMESPACE,
+            buckets=_BUCKETS_TIME_S,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+        self.tasks = Gauge(
+            "tasks",
+            "number of tasks of the scheduled pipelines per state and cluster type",
+            labelnames=("state", "cluster_type"),
+            namespace=_METRICS_NAMESPACE,
+            subsystem=self.subsystem,
+            registry=self.registry,
+        )
+
+
 @dataclass(slots=True, kw_only=True)
 class DirectorV2Instrumentation:
     registry: CollectorRegistry
     dynamic_sidecar_metrics: DynamiSidecarMetrics = field(init=False)
     db_pool_metrics: DbPoolMetrics = field(init=False)
+    comp_scheduler_metrics: CompSchedulerMetrics = field(init=False)
 
     def __post_init__(self) -> None:
         self.dynamic_sidecar_metrics = DynamiSidecarMetrics(  # pylint: disable=unexpected-keyword-arg
@@ -150,3 +228,6 @@ class DirectorV2Instrumentation:
             namespace=_METRICS_NAMESPACE,
             registry=self.registry,
         )
+        self.comp_scheduler_metrics = CompSchedulerMetrics(  # pylint: disable=unexpected-keyword-arg
+            subsystem="computational_pipelines", registry=self.registry
+        )
@@ -7,6 +7,7 @@ from models_library.rabbitmq_messages import (
     CreditsLimit,
     WalletCreditsLimitReachedMessage,
 )
+from servicelib.fastapi.rabbitmq_lifespan import get_rabbitmq_rpc_client_metrics
 from servicelib.rabbitmq import (
     RabbitMQClient,
     RabbitMQRPCClient,
@@ -55,7 +56,7 @@ def setup(app: FastAPI) -> None:
         await wait_till_rabbitmq_responsive(settings.dsn)
         app.state.rabbitmq_client = RabbitMQClient(client_name="director-v2", settings=settings)
         app.state.rabbitmq_rpc_client = await RabbitMQRPCClient.create(
-            client_name="director-v2-rpc-client", settings=settings
+            client_name="director-v2-rpc-client", settings=settings, metrics=get_rabbitmq_rpc_client_metrics(app)
         )
 
         await app.state.rabbitmq_client.subscribe(
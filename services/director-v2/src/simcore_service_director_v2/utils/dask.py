@@ -298,6 +298,19 @@ def compute_task_labels(
     )
 
 
+async def substitute_vendor_secrets_in_task_envs(
+    app: FastAPI, *, node_image: Image, metadata: RunMetadataDict
+) -> dict[str, Any]:
+    """the vendor secrets only depend on the service (key, version), the result can be shared by its tasks"""
+    return await substitute_vendor_secrets_in_specs(
+        app,
+        cast(dict[str, Any], node_image.envs),
+        service_key=TypeAdapter(ServiceKey).validate_python(node_image.name),
+        service_version=TypeAdapter(ServiceVersion).validate_python(node_image.tag),
+        product_name=metadata.get("product_name", UNDEFINED_DOCKER_LABEL),
+    )
+
+
 async def compute_task_envs(
     app: FastAPI,
     *,
@@ -308,18 +321,20 @@ async def compute_task_envs(
     metadata: RunMetadataDict,
     resource_tracking_run_id: ServiceRunID,
     wallet_id: WalletID | None,
+    vendor_substituted_envs: dict[str, Any] | None = None,
 ) -> ContainerEnvsDict:
+    """
+    Keyword Arguments:
+        vendor_substituted_envs -- the result of substitute_vendor_secrets_in_task_envs if already computed
+    """
     product_name = metadata.get("product_name", UNDEFINED_DOCKER_LABEL)
     product_api_base_url = metadata.get("product_api_base_url", UNDEFINED_API_BASE_URL)
     task_envs = node_image.envs
     if task_envs:
-        vendor_substituted_envs = await substitute_vendor_secrets_in_specs(
-            app,
-            cast(dict[str, Any], node_image.envs),
-            service_key=TypeAdapter(ServiceKey).validate_python(node_image.name),
-            service_version=TypeAdapter(ServiceVersion).validate_python(node_image.tag),
-            product_name=product_name,
-        )
+        if vendor_substituted_envs is None:
+            vendor_substituted_envs = await substitute_vendor_secrets_in_task_envs(
+                app, node_image=node_image, metadata=metadata
+            )
         resolved_envs = await resolve_and_substitute_session_variables_in_specs(
             app,
             vendor_substituted_envs,
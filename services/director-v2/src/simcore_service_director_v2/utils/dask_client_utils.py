@@ -18,6 +18,8 @@ UnixTimestamp: TypeAlias = float
 @dataclass
 class TaskHandlers:
     task_progress_handler: Callable[[tuple[UnixTimestamp, Any]], Awaitable[None]]
+    # called with the keys of the tasks whose state changed (see TASK_STATES_CHANGED_EVENT)
+    task_states_changed_handler: Callable[[tuple[UnixTimestamp, Any]], Awaitable[None]] | None = None
 
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,71 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+
+import random
+
+import networkx as nx
+import pytest
+from models_library.projects_nodes_io import NodeIDStr
+from models_library.projects_state import RunningState
+from simcore_service_director_v2.modules.comp_scheduler._pipeline_dag import PipelineDag
+
+
+def _create_random_dag_adjacency_list(num_nodes: int) -> dict[NodeIDStr, list[NodeIDStr]]:
+    node_ids = [NodeIDStr(f"node_{n}") for n in range(num_nodes)]
+    return {
+        node_id: [successor for successor in node_ids[index + 1 :] if random.random() < 0.2]  # noqa: S311
+        for index, node_id in enumerate(node_ids)
+    }
+
+
+def _expected_ready_node_ids(dag: nx.DiGraph, states: dict[NodeIDStr, RunningState]) -> set[NodeIDStr]:
+    # NOTE: this is how the scheduler used to select the next tasks
+    dag = dag.copy()
+    dag.remove_nodes_from({node_id for node_id, state in states.items() if state is RunningState.SUCCESS})
+    return {node_id for node_id, degree in dag.in_degree() if degree == 0}
+
+
+def _expected_downstream_of_failed_node_ids(dag: nx.DiGraph, states: dict[NodeIDStr, RunningState]) -> set[NodeIDStr]:
+    return {
+        descendant
+        for node_id, state in states.items()
+        if state is RunningState.FAILED
+        for descendant in nx.descendants(dag, node_id)
+    }
+
+
+def test_pipeline_dag_reverse_topological_order():
+    dag_adjacency_list = _create_random_dag_adjacency_list(50)
+    pipeline_dag = PipelineDag(dag_adjacency_list)
+
+    assert len(pipeline_dag) == 50
+    position = {node_id: index for index, node_id in enumerate(pipeline_dag.reverse_topological_order)}
+    for node_id, successors in dag_adjacency_list.items():
+        assert all(position[node_id] > position[successor] for successor in successors)
+
+
+def test_pipeline_dag_predecessors():
+    dag_adjacency_list = _create_random_dag_adjacency_list(50)
+    dag = nx.convert.from_dict_of_lists(dag_adjacency_list, create_using=nx.DiGraph)
+    pipeline_dag = PipelineDag(dag_adjacency_list)
+
+    for node_id in pipeline_dag:
+        assert set(pipeline_dag.predecessor_node_ids(node_id)) == set(dag.predecessors(node_id))
+
+
+@pytest.mark.parametrize("num_nodes", [0, 1, 20, 200])
+def test_pipeline_dag_incremental_updates(num_nodes: int):
+    dag_adjacency_list = _create_random_dag_adjacency_list(num_nodes)
+    dag = nx.convert.from_dict_of_lists(dag_adjacency_list, create_using=nx.DiGraph)
+    pipeline_dag = PipelineDag(dag_adjacency_list)
+
+    states = dict.fromkeys(dag_adjacency_list, RunningState.PUBLISHED)
+    for _ in range(20):
+        pipeline_dag.update(states)
+        assert set(pipeline_dag.ready_node_ids()) == _expected_ready_node_ids(dag, states)
+        assert pipeline_dag.downstream_of_failed_node_ids() == _expected_downstream_of_failed_node_ids(dag, states)
+        # some tasks change state before the next scheduling step (including back from SUCCESS/FAILED)
+        for node_id in random.sample(list(states), k=min(len(states), 5)):
+            states[node_id] = random.choice(list(RunningState))  # noqa: S311
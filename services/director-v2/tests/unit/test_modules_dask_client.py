@@ -75,7 +75,12 @@ from simcore_service_director_v2.models.comp_runs import (
     RunMetadataDict,
 )
 from simcore_service_director_v2.models.comp_tasks import Image
-from simcore_service_director_v2.modules.dask_client import DaskClient, TaskHandlers
+from simcore_service_director_v2.modules.dask_client import (
+    ComputationTaskToSend,
+    DaskClient,
+    PublishedComputationTask,
+    TaskHandlers,
+)
 from tenacity.asyncio import AsyncRetrying
 from tenacity.retry import retry_if_exception_type
 from tenacity.stop import stop_after_delay
@@ -948,6 +953,67 @@ async def test_send_computation_task_with_hardware_info_raises(
     mocked_user_completed_cb.assert_not_called()
 
 
+@pytest.mark.parametrize("dask_client", ["create_dask_client_from_scheduler"], indirect=True)
+async def test_send_computation_tasks_in_bulk_reports_errors_per_task(
+    dask_client: DaskClient,
+    user_id: UserID,
+    project_id: ProjectID,
+    node_id: NodeID,
+    cpu_image: ImageParams,
+    _mocked_node_ports: None,
+    mocked_user_completed_cb: mock.AsyncMock,
+    mocked_storage_service_api: respx.MockRouter,
+    comp_run_metadata: RunMetadataDict,
+    empty_hardware_info: HardwareInfo,
+    resource_tracking_run_id: ServiceRunID,
+    faker: Faker,
+):
+    # NOTE: this must be inlined so that the test works,
+    # the dask-worker must be able to import the function
+    def fake_remote_fct(
+        task_parameters: ContainerTaskParameters,
+        docker_auth: DockerBasicAuth,
+        log_file_url: LogFileUploadURL,
+        s3_settings: S3Settings | None,
+        encryption: JobEncryptionContext | None,
+    ) -> TaskOutputData:
+        return TaskOutputData.model_validate({"some_output_key": 123})
+
+    # the second task needs a huge amount of CPU, it cannot run on the cluster
+    too_big_image = cpu_image.image.model_copy(deep=True)
+    assert too_big_image.node_requirements
+    too_big_image.node_requirements.cpu = 10000000000000000
+    tasks = [
+        ComputationTaskToSend(
+            node_id=node_id,
+            node_image=cpu_image.image,
+            hardware_info=empty_hardware_info,
+            resource_tracking_run_id=resource_tracking_run_id,
+        ),
+        ComputationTaskToSend(
+            node_id=faker.uuid4(cast_to=None),
+            node_image=too_big_image,
+            hardware_info=empty_hardware_info,
+            resource_tracking_run_id=resource_tracking_run_id,
+        ),
+    ]
+
+    published_task, error = await dask_client.send_computation_tasks_in_bulk(
+        user_id=user_id,
+        project_id=project_id,
+        tasks=tasks,
+        callback=mocked_user_completed_cb,
+        remote_fct=fake_remote_fct,
+        metadata=comp_run_metadata,
+    )
+    assert isinstance(error, InsufficientComputationalResourcesError)
+    # the other task was sent anyway
+    assert isinstance(published_task, PublishedComputationTask)
+    assert published_task.node_id == node_id
+    await _assert_wait_for_cb_call(mocked_user_completed_cb)
+    await _assert_wait_for_task_status(published_task.job_id, dask_client, expected_status=RunningState.SUCCESS)
+
+
 @pytest.mark.parametrize("dask_client", ["create_dask_client_from_scheduler"], indirect=True)
 async def test_too_many_resources_send_computation_task(
     dask_client: DaskClient,
@@ -1145,7 +1211,7 @@ async def test_get_tasks_status(
 
 @pytest.fixture
 async def fake_task_handlers(mocker: MockerFixture) -> TaskHandlers:
-    return TaskHandlers(task_progress_handler=mocker.MagicMock())
+    return TaskHandlers(task_progress_handler=mocker.MagicMock(), task_states_changed_handler=mocker.MagicMock())
 
 
 async def test_dask_sub_handlers(
@@ -1208,4 +1274,10 @@ async def test_dask_sub_handlers(
             print(f"waiting for call in mocked fct {fake_task_handlers}, Attempt={attempt.retry_state.attempt_number}")
             # we should have received data in our TaskHandlers
             fake_task_handlers.task_progress_handler.assert_called_with((mock.ANY, "my name is progress"))
+            # the scheduler notified the changes of the task state
+            assert isinstance(fake_task_handlers.task_states_changed_handler, mock.MagicMock)
+            assert any(
+                published_computation_task[0].job_id in call.args[0][1]
+                for call in fake_task_handlers.task_states_changed_handler.call_args_list
+            )
     await _assert_wait_for_cb_call(mocked_user_completed_cb)
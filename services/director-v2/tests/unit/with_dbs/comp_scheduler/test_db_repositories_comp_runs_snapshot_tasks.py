@@ -7,9 +7,10 @@
 from collections.abc import Awaitable, Callable
 from typing import Any
 
-from _helpers import PublishedProject
+from _helpers import PublishedProject, RunningProject
 from models_library.computations import CollectionRunID
 from models_library.products import ProductName
+from models_library.projects_state import RunningState
 from simcore_service_director_v2.models.comp_run_snapshot_tasks import (
     CompRunSnapshotTaskDBGet,
 )
@@ -230,3 +231,16 @@ async def test_list_computation_collection_run_tasks_multiple_comp_runs_same_col
     assert actual_task_ids == expected_task_ids
     # Ensure tasks from run3 are not included
     assert not any(t.snapshot_task_id in {tt.snapshot_task_id for tt in tasks_run3} for t in tasks)
+
+
+async def test_count_tasks_per_state(
+    sqlalchemy_async_engine: AsyncEngine,
+    running_project: RunningProject,
+):
+    repo = CompRunsSnapshotTasksRepository(db_engine=sqlalchemy_async_engine)
+    use_on_demand_clusters = running_project.runs.use_on_demand_clusters
+
+    assert await repo.count_tasks_per_state(filter_by_run_state={RunningState.STARTED}) == {
+        (use_on_demand_clusters, RunningState.STARTED): len(running_project.runs_snapshot_tasks)
+    }
+    assert await repo.count_tasks_per_state(filter_by_run_state={RunningState.SUCCESS}) == {}
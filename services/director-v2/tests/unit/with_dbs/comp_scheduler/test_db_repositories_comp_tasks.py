@@ -0,0 +1,88 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+# pylint: disable=too-many-arguments
+
+
+import arrow
+import sqlalchemy as sa
+from _helpers import RunningProject
+from models_library.errors import ErrorDict
+from models_library.projects_state import RunningState
+from simcore_postgres_database.models.comp_pipeline import StateType
+from simcore_postgres_database.models.comp_run_snapshot_tasks import (
+    comp_run_snapshot_tasks,
+)
+from simcore_postgres_database.models.comp_tasks import NodeClass, comp_tasks
+from simcore_service_director_v2.modules.db.repositories.comp_tasks import (
+    CompTasksRepository,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+pytest_simcore_core_services_selection = [
+    "postgres",
+]
+pytest_simcore_ops_services_selection = [
+    "adminer",
+]
+
+
+async def test_batch_updates(
+    sqlalchemy_async_engine: AsyncEngine,
+    running_project: RunningProject,
+):
+    repo = CompTasksRepository(db_engine=sqlalchemy_async_engine)
+    project_id = running_project.project.uuid
+    run_id = running_project.runs.run_id
+    # NOTE: only the computational tasks are in the run snapshot
+    computational_tasks = [t for t in running_project.tasks if t.node_class is NodeClass.COMPUTATIONAL]
+    assert len(computational_tasks) > 2
+    succeeded_task, failed_task, *progressing_tasks = computational_tasks
+    stopped_time = arrow.utcnow().datetime
+    errors = [ErrorDict(loc=(f"{failed_task.node_id}",), msg="the task failed", type="runtime")]
+
+    async with repo.batch_updates(project_id, run_id) as tasks_updates:
+        tasks_updates.update_tasks_state(
+            [succeeded_task.node_id], RunningState.SUCCESS, optional_progress=1, optional_stopped=stopped_time
+        )
+        tasks_updates.update_tasks_state(
+            [failed_task.node_id], RunningState.FAILED, errors, optional_progress=1, optional_stopped=stopped_time
+        )
+        for task in progressing_tasks:
+            tasks_updates.update_task(task.node_id, progress=0.1)
+            # the last change of a task wins
+            tasks_updates.update_task(task.node_id, progress=0.5, last_heartbeat=stopped_time)
+
+    for table, run_filter in (
+        (comp_tasks, sa.true()),
+        (comp_run_snapshot_tasks, comp_run_snapshot_tasks.c.run_id == run_id),
+    ):
+        async with sqlalchemy_async_engine.connect() as conn:
+            result = await conn.execute(
+                sa.select(
+                    table.c.node_id,
+                    table.c.state,
+                    table.c.progress,
+                    table.c.end,
+                    table.c.errors,
+                    table.c.last_heartbeat,
+                ).where((table.c.project_id == f"{project_id}") & run_filter)
+            )
+            rows = {row.node_id: row for row in result}
+
+        succeeded_row = rows[f"{succeeded_task.node_id}"]
+        assert succeeded_row.state == StateType.SUCCESS
+        assert succeeded_row.progress == 1
+        assert succeeded_row.end == stopped_time
+        assert succeeded_row.errors is None
+
+        failed_row = rows[f"{failed_task.node_id}"]
+        assert failed_row.state == StateType.FAILED
+        assert failed_row.end == stopped_time
+        assert [error["msg"] for error in failed_row.errors] == [error["msg"] for error in errors]
+
+        for task in progressing_tasks:
+            progressing_row = rows[f"{task.node_id}"]
+            assert progressing_row.state == StateType.RUNNING
+            assert progressing_row.progress == 0.5
+            assert progressing_row.last_heartbeat == stopped_time
@@ -32,6 +32,7 @@ from simcore_service_director_v2.models.comp_runs import RunMetadataDict
 from simcore_service_director_v2.modules.comp_scheduler._manager import (
     _LOST_TASKS_FACTOR,
     SCHEDULER_INTERVAL,
+    SCHEDULER_SAFETY_NET_FACTOR,
     run_new_pipeline,
     schedule_all_pipelines,
     stop_pipeline,
@@ -363,6 +364,64 @@ async def test_schedule_all_pipelines_logs_error_if_it_find_old_pipelines(
     assert comp_run.modified > start_modified_time
 
 
+async def test_schedule_all_pipelines_only_polls_started_pipelines_as_safety_net(
+    with_disabled_auto_scheduling: mock.Mock,
+    with_disabled_scheduler_worker: mock.Mock,
+    initialized_app: FastAPI,
+    published_project: PublishedProject,
+    sqlalchemy_async_engine: AsyncEngine,
+    run_metadata: RunMetadataDict,
+    scheduler_rabbit_client_parser: mock.AsyncMock,
+    fake_collection_run_id: CollectionRunID,
+):
+    await assert_comp_runs_empty(sqlalchemy_async_engine)
+    assert published_project.project.prj_owner
+    await run_new_pipeline(
+        initialized_app,
+        user_id=published_project.project.prj_owner,
+        project_id=published_project.project.uuid,
+        run_metadata=run_metadata,
+        use_on_demand_clusters=False,
+        collection_run_id=fake_collection_run_id,
+    )
+    expected_message = SchedulePipelineRabbitMessage(
+        user_id=published_project.project.prj_owner,
+        project_id=published_project.project.uuid,
+        iteration=1,
+    )
+    await _assert_scheduler_client_called_once_with(scheduler_rabbit_client_parser, expected_message)
+    scheduler_rabbit_client_parser.reset_mock()
+    comp_run = (await assert_comp_runs(sqlalchemy_async_engine, expected_total=1))[0]
+    await CompRunsRepository(sqlalchemy_async_engine).set_run_result(
+        user_id=comp_run.user_id,
+        project_id=comp_run.project_uuid,
+        iteration=comp_run.iteration,
+        result_state=RunningState.STARTED,
+    )
+
+    # a started pipeline is woken up by its tasks events, so it is not scheduled at every interval
+    await CompRunsRepository(sqlalchemy_async_engine).update(
+        comp_run.user_id,
+        comp_run.project_uuid,
+        comp_run.iteration,
+        scheduled=comp_run.scheduled - 1.5 * SCHEDULER_INTERVAL,
+        processed=comp_run.scheduled - 1.1 * SCHEDULER_INTERVAL,
+    )
+    await schedule_all_pipelines(initialized_app)
+    await _assert_scheduler_client_not_called(scheduler_rabbit_client_parser)
+
+    # but it is scheduled once it was not processed for a while
+    await CompRunsRepository(sqlalchemy_async_engine).update(
+        comp_run.user_id,
+        comp_run.project_uuid,
+        comp_run.iteration,
+        scheduled=comp_run.scheduled - 1.5 * SCHEDULER_INTERVAL * SCHEDULER_SAFETY_NET_FACTOR,
+        processed=comp_run.scheduled - 1.1 * SCHEDULER_INTERVAL * SCHEDULER_SAFETY_NET_FACTOR,
+    )
+    await schedule_all_pipelines(initialized_app)
+    await _assert_scheduler_client_called_once_with(scheduler_rabbit_client_parser, expected_message)
+
+
 async def test_empty_pipeline_is_not_scheduled(
     with_disabled_auto_scheduling: mock.Mock,
     with_disabled_scheduler_worker: mock.Mock,
@@ -31,6 +31,7 @@ from dask_task_models_library.container_tasks.errors import ServiceRuntimeError,
 from dask_task_models_library.container_tasks.events import TaskProgressEvent
 from dask_task_models_library.container_tasks.io import TaskOutputData
 from dask_task_models_library.container_tasks.protocol import TaskOwner
+from dask_task_models_library.container_tasks.utils import generate_dask_job_id
 from faker import Faker
 from fastapi.applications import FastAPI
 from models_library.computations import CollectionRunID
@@ -69,7 +70,7 @@ from simcore_service_director_v2.core.errors import (
 )
 from simcore_service_director_v2.models.comp_pipelines import CompPipelineAtDB
 from simcore_service_director_v2.models.comp_runs import CompRunsAtDB, RunMetadataDict
-from simcore_service_director_v2.models.comp_tasks import CompTaskAtDB, Image
+from simcore_service_director_v2.models.comp_tasks import CompTaskAtDB
 from simcore_service_director_v2.modules.comp_scheduler._manager import run_new_pipeline, stop_pipeline
 from simcore_service_director_v2.modules.comp_scheduler._models import ReleaseTaskResultRabbitMessage
 from simcore_service_director_v2.modules.comp_scheduler._scheduler_base import BaseCompScheduler
@@ -80,7 +81,11 @@ from simcore_service_director_v2.modules.comp_scheduler._scheduler_dask import (
 )
 from simcore_service_director_v2.modules.comp_scheduler._utils import COMPLETED_STATES
 from simcore_service_director_v2.modules.comp_scheduler._worker import _get_scheduler_worker
-from simcore_service_director_v2.modules.dask_client import DaskJobID, PublishedComputationTask
+from simcore_service_director_v2.modules.dask_client import (
+    ComputationTaskToSend,
+    DaskJobID,
+    PublishedComputationTask,
+)
 from simcore_service_director_v2.modules.osparc_variables._errors import (
     OsparcVariableResolveError,
     OsparcVariableResolveTimeoutError,
@@ -113,6 +118,9 @@ def _assert_dask_client_correctly_initialized(mocked_dask_client: mock.MagicMock
             cast(  # noqa: SLF001
                 DaskScheduler, scheduler
             )._task_progress_change_handler,
+            cast(  # noqa: SLF001
+                DaskScheduler, scheduler
+            )._task_states_changed_handler,
         )
     )
 
@@ -260,29 +268,23 @@ async def _assert_publish_in_dask_backend(
     )
     # tasks were send to the backend
     assert published_project.project.prj_owner is not None
-    assert isinstance(mocked_dask_client.send_computation_tasks, mock.Mock)
+    assert isinstance(mocked_dask_client.send_computation_tasks_in_bulk, mock.Mock)
     assert isinstance(mocked_dask_client.get_tasks_status, mock.Mock)
     assert isinstance(mocked_dask_client.get_task_result, mock.Mock)
-    mocked_dask_client.send_computation_tasks.assert_has_calls(
-        calls=[
-            mock.call(
-                user_id=published_project.project.prj_owner,
-                project_id=published_project.project.uuid,
-                tasks={f"{p.node_id}": p.image},
-                callback=mock.ANY,
-                metadata=mock.ANY,
-                hardware_info=mock.ANY,
-                resource_tracking_run_id=mock.ANY,
-            )
-            for p in expected_pending_tasks
-        ],
-        any_order=True,
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_called_once_with(
+        user_id=published_project.project.prj_owner,
+        project_id=published_project.project.uuid,
+        tasks=mock.ANY,
+        callback=mock.ANY,
+        metadata=mock.ANY,
     )
+    sent_tasks = mocked_dask_client.send_computation_tasks_in_bulk.call_args.kwargs["tasks"]
+    assert {(t.node_id, t.node_image) for t in sent_tasks} == {(p.node_id, p.image) for p in expected_pending_tasks}
     task_to_callback_mapping = {
-        task.node_id: mocked_dask_client.send_computation_tasks.call_args_list[i].kwargs["callback"]
-        for i, task in enumerate(expected_pending_tasks)
+        task.node_id: mocked_dask_client.send_computation_tasks_in_bulk.call_args.kwargs["callback"]
+        for task in expected_pending_tasks
     }
-    mocked_dask_client.send_computation_tasks.reset_mock()
+    mocked_dask_client.send_computation_tasks_in_bulk.reset_mock()
     mocked_dask_client.get_tasks_status.assert_not_called()
     mocked_dask_client.get_task_result.assert_not_called()
     # there is a second run of the scheduler to move comp_runs to pending, the rest does not change
@@ -319,7 +321,7 @@ async def _assert_publish_in_dask_backend(
         expected_progress=None,
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     mocked_dask_client.get_tasks_status.assert_has_calls(
         calls=[mock.call([p.job_id for p in updated_pending_tasks])], any_order=True
     )
@@ -429,19 +431,21 @@ def _with_mock_send_computation_tasks(tasks: list[CompTaskAtDB], mocked_dask_cli
         for task in tasks
     }
 
-    async def _send_computation_tasks(*args, tasks: dict[NodeID, Image], **kwargs) -> list[PublishedComputationTask]:
-        for node_id in tasks:
-            assert NodeID(f"{node_id}") in node_id_to_job_id_map
+    async def _send_computation_tasks(
+        *args, tasks: list[ComputationTaskToSend], **kwargs
+    ) -> list[PublishedComputationTask | BaseException]:
+        for task in tasks:
+            assert NodeID(f"{task.node_id}") in node_id_to_job_id_map
         return [
             PublishedComputationTask(
-                node_id=NodeID(f"{node_id}"),
-                job_id=DaskJobID(node_id_to_job_id_map[NodeID(f"{node_id}")]),
+                node_id=NodeID(f"{task.node_id}"),
+                job_id=DaskJobID(node_id_to_job_id_map[NodeID(f"{task.node_id}")]),
             )
-            for node_id in tasks
+            for task in tasks
         ]  # type: ignore
 
-    mocked_dask_client.send_computation_tasks.side_effect = _send_computation_tasks
-    return mocked_dask_client.send_computation_tasks
+    mocked_dask_client.send_computation_tasks_in_bulk.side_effect = _send_computation_tasks
+    return mocked_dask_client.send_computation_tasks_in_bulk
 
 
 async def _trigger_progress_event(
@@ -568,7 +572,7 @@ async def test_proper_pipeline_is_scheduled(  # noqa: PLR0915
         expected_progress=None,  # since we bypass the API entrypoint this is correct
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     mocked_dask_client.get_tasks_status.assert_called_once_with(
         [p.job_id for p in (exp_started_task, *expected_pending_tasks)],
     )
@@ -628,7 +632,7 @@ async def test_proper_pipeline_is_scheduled(  # noqa: PLR0915
         expected_progress=None,
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     mocked_dask_client.get_tasks_status.assert_called_once_with(
         [p.job_id for p in (exp_started_task, *expected_pending_tasks)],
     )
@@ -727,18 +731,21 @@ async def test_proper_pipeline_is_scheduled(  # noqa: PLR0915
         expected_progress=None,  # since we bypass the API entrypoint this is correct
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_called_once_with(
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_called_once_with(
         user_id=published_project.project.prj_owner,
         project_id=published_project.project.uuid,
-        tasks={
-            f"{next_pending_task.node_id}": next_pending_task.image,
-        },
+        tasks=[
+            ComputationTaskToSend(
+                node_id=next_pending_task.node_id,
+                node_image=next_pending_task.image,
+                hardware_info=mock.ANY,
+                resource_tracking_run_id=mock.ANY,
+            )
+        ],
         callback=mock.ANY,
         metadata=mock.ANY,
-        hardware_info=mock.ANY,
-        resource_tracking_run_id=mock.ANY,
     )
-    mocked_dask_client.send_computation_tasks.reset_mock()
+    mocked_dask_client.send_computation_tasks_in_bulk.reset_mock()
     mocked_dask_client.get_tasks_status.assert_has_calls(
         calls=[mock.call([p.job_id for p in completed_tasks + expected_pending_tasks[:1]])],
         any_order=True,
@@ -794,7 +801,7 @@ async def test_proper_pipeline_is_scheduled(  # noqa: PLR0915
         expected_progress=0,
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     expected_pending_tasks.reverse()
     mocked_dask_client.get_tasks_status.assert_called_once_with([p.job_id for p in expected_pending_tasks])
     mocked_dask_client.get_tasks_status.reset_mock()
@@ -853,7 +860,7 @@ async def test_proper_pipeline_is_scheduled(  # noqa: PLR0915
         expected_progress=1,
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     mocked_dask_client.get_tasks_status.assert_called_once_with([p.job_id for p in expected_pending_tasks])
     mocked_dask_client.get_tasks_status.reset_mock()
     mocked_dask_client.get_task_result.assert_called_once_with(exp_started_task.job_id)
@@ -916,7 +923,7 @@ async def test_proper_pipeline_is_scheduled(  # noqa: PLR0915
         expected_progress=1,
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     mocked_dask_client.get_tasks_status.assert_called_once_with([p.job_id for p in expected_pending_tasks])
     mocked_dask_client.get_task_result.assert_called_once_with(exp_started_task.job_id)
     messages = await _assert_message_received(
@@ -1025,7 +1032,7 @@ async def with_started_project(  # noqa: PLR0915
         ]
 
     assert isinstance(mocked_dask_client.get_tasks_status, mock.Mock)
-    assert isinstance(mocked_dask_client.send_computation_tasks, mock.Mock)
+    assert isinstance(mocked_dask_client.send_computation_tasks_in_bulk, mock.Mock)
     assert isinstance(mocked_dask_client.get_task_result, mock.Mock)
     mocked_dask_client.get_tasks_status.side_effect = _return_1st_task_running
     await scheduler_api.apply(
@@ -1071,7 +1078,7 @@ async def with_started_project(  # noqa: PLR0915
         expected_progress=None,  # since we bypass the API entrypoint this is correct
         run_id=_comp_runs_db[0].run_id,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     assert mocked_dask_client.get_tasks_status.call_count == 1
     assert set(mocked_dask_client.get_tasks_status.call_args[0][0]) == {
         p.job_id for p in (exp_started_task, *expected_pending_tasks)
@@ -1146,7 +1153,7 @@ async def with_started_project(  # noqa: PLR0915
     )
     tasks_in_db += tasks
     run_snapshot_tasks_in_db += run_snapshot_tasks
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     assert mocked_dask_client.get_tasks_status.call_count == 1
     assert set(mocked_dask_client.get_tasks_status.call_args[0][0]) == {
         p.job_id for p in (exp_started_task, *expected_pending_tasks)
@@ -1184,7 +1191,7 @@ async def with_started_project(  # noqa: PLR0915
 @pytest.fixture
 def mocked_worker_publisher(mocker: MockerFixture) -> mock.Mock:
     return mocker.patch(
-        "simcore_service_director_v2.modules.comp_scheduler._scheduler_base.request_pipeline_scheduling",
+        "simcore_service_director_v2.modules.comp_scheduler._wake_ups.request_pipeline_scheduling",
         autospec=True,
     )
 
@@ -1200,15 +1207,58 @@ async def test_completed_task_triggers_new_scheduling_task(
     """
     completed_node_id = with_started_project.tasks[0].node_id
     callback = with_started_project.task_to_callback_mapping[completed_node_id]
-    await asyncio.to_thread(callback)
+    # NOTE: the wake-ups of the same pipeline are coalesced
+    await asyncio.gather(*(asyncio.to_thread(callback) for _ in range(5)))
 
-    mocked_worker_publisher.assert_called_once_with(
-        mock.ANY,
-        mock.ANY,
-        user_id=with_started_project.runs.user_id,
-        project_id=with_started_project.runs.project_uuid,
-        iteration=with_started_project.runs.iteration,
-    )
+    async for attempt in AsyncRetrying(
+        stop=stop_after_delay(5),
+        wait=wait_fixed(0.1),
+        retry=retry_if_exception_type(AssertionError),
+        reraise=True,
+    ):
+        with attempt:
+            mocked_worker_publisher.assert_called_once_with(
+                mock.ANY,
+                mock.ANY,
+                user_id=with_started_project.runs.user_id,
+                project_id=with_started_project.runs.project_uuid,
+                iteration=with_started_project.runs.iteration,
+            )
+
+
+async def test_task_states_changed_triggers_new_scheduling_task(
+    mocked_worker_publisher: mock.Mock,
+    with_started_project: RunningProject,
+    scheduler_api: BaseCompScheduler,
+):
+    changed_job_ids = [
+        generate_dask_job_id(
+            task.image.name,
+            task.image.tag,
+            with_started_project.runs.user_id,
+            with_started_project.runs.project_uuid,
+            task.node_id,
+        )
+        for task in with_started_project.tasks
+    ]
+    await cast(  # noqa: SLF001
+        DaskScheduler, scheduler_api
+    )._task_states_changed_handler((arrow.utcnow().timestamp(), [*changed_job_ids, "some-task-not-from-osparc"]))
+
+    async for attempt in AsyncRetrying(
+        stop=stop_after_delay(5),
+        wait=wait_fixed(0.1),
+        retry=retry_if_exception_type(AssertionError),
+        reraise=True,
+    ):
+        with attempt:
+            mocked_worker_publisher.assert_called_once_with(
+                mock.ANY,
+                mock.ANY,
+                user_id=with_started_project.runs.user_id,
+                project_id=with_started_project.runs.project_uuid,
+                iteration=with_started_project.runs.iteration,
+            )
 
 
 async def test_broken_pipeline_configuration_is_not_scheduled_and_aborted(
@@ -1377,7 +1427,7 @@ async def test_handling_of_disconnected_scheduler_dask(
 ):
     # this will create a non connected backend issue that will trigger re-connection
     mocked_dask_client_send_task = mocker.patch(
-        "simcore_service_director_v2.modules.comp_scheduler._scheduler_dask.DaskClient.send_computation_tasks",
+        "simcore_service_director_v2.modules.comp_scheduler._scheduler_dask.DaskClient.send_computation_tasks_in_bulk",
         side_effect=backend_error,
     )
     assert mocked_dask_client_send_task
@@ -2105,7 +2155,7 @@ async def test_running_task_is_not_restarted_when_on_demand_cluster_transiently_
     # cluster becomes transiently unavailable (the production scenario)
     original_side_effect = mocked_get_or_create_cluster.side_effect
     mocked_get_or_create_cluster.side_effect = cluster_unavailable_exception
-    mocked_dask_client.send_computation_tasks.reset_mock()
+    mocked_dask_client.send_computation_tasks_in_bulk.reset_mock()
 
     # first apply: _get_tasks_status raises -> tasks go to WAITING_FOR_CLUSTER
     await scheduler_api.apply(
@@ -2114,7 +2164,7 @@ async def test_running_task_is_not_restarted_when_on_demand_cluster_transiently_
         iteration=run_in_db.iteration,
     )
     # the critical assertion: no task was resubmitted to dask
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
 
     # second apply: same condition, still no restart
     for _ in range(5):
@@ -2125,7 +2175,7 @@ async def test_running_task_is_not_restarted_when_on_demand_cluster_transiently_
         )
         # simulate some wait time
         await asyncio.sleep(0.2)
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
 
     # now make the cluster available again, and check that the task is still not restarted (since it was never stopped)
     mocked_get_or_create_cluster.side_effect = original_side_effect
@@ -2141,7 +2191,7 @@ async def test_running_task_is_not_restarted_when_on_demand_cluster_transiently_
         project_id=run_in_db.project_uuid,
         iteration=run_in_db.iteration,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     # check the task is back to STARTED
     await assert_comp_tasks_and_comp_run_snapshot_tasks(
         sqlalchemy_async_engine,
@@ -2181,7 +2231,7 @@ async def test_running_task_is_not_restarted_when_dask_scheduler_offline(
     assert all(t.job_id for t in started_tasks), "STARTED tasks must have a job_id"
 
     mocked_dask_client.get_tasks_status.side_effect = dask_offline_error
-    mocked_dask_client.send_computation_tasks.reset_mock()
+    mocked_dask_client.send_computation_tasks_in_bulk.reset_mock()
 
     # first apply: outer catch fires -> all PROCESSING_STATES -> WAITING_FOR_CLUSTER
     await scheduler_api.apply(
@@ -2190,7 +2240,7 @@ async def test_running_task_is_not_restarted_when_dask_scheduler_offline(
         iteration=run_in_db.iteration,
     )
     # critical: no task was resubmitted to dask
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
 
     # repeated applies must also never trigger resubmission
     for _ in range(5):
@@ -2199,7 +2249,7 @@ async def test_running_task_is_not_restarted_when_dask_scheduler_offline(
             project_id=run_in_db.project_uuid,
             iteration=run_in_db.iteration,
         )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
 
     # dask scheduler comes back online
     async def _return_tasks_started(job_ids: list[str]) -> list[RunningState]:
@@ -2212,7 +2262,7 @@ async def test_running_task_is_not_restarted_when_dask_scheduler_offline(
         project_id=run_in_db.project_uuid,
         iteration=run_in_db.iteration,
     )
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
     # task must be back to STARTED, never double-submitted
     await assert_comp_tasks_and_comp_run_snapshot_tasks(
         sqlalchemy_async_engine,
@@ -2273,7 +2323,7 @@ async def test_running_task_is_failed_when_dask_scheduler_changes(
         ),
     )
     # no task was resubmitted
-    mocked_dask_client.send_computation_tasks.assert_not_called()
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_not_called()
 
     # the pipeline shall be aborted in the next cycles since the tasks are failed
     await scheduler_api.apply(
@@ -2918,6 +2968,80 @@ async def test_variable_resolution_timeout_while_starting_tasks_sets_waiting_for
     )
 
 
+async def test_partially_sent_tasks_are_started_and_the_others_wait_for_cluster(
+    with_disabled_auto_scheduling: mock.Mock,
+    with_disabled_scheduler_publisher: mock.Mock,
+    mocked_dask_client: mock.MagicMock,
+    initialized_app: FastAPI,
+    scheduler_api: BaseCompScheduler,
+    sqlalchemy_async_engine: AsyncEngine,
+    published_project: PublishedProject,
+    run_metadata: RunMetadataDict,
+    computational_pipeline_rabbit_client_parser: mock.AsyncMock,
+    fake_collection_run_id: CollectionRunID,
+    faker: Faker,
+):
+    run_in_db, published_tasks = await _assert_start_pipeline(
+        initialized_app,
+        sqlalchemy_async_engine=sqlalchemy_async_engine,
+        published_project=published_project,
+        run_metadata=run_metadata,
+        computational_pipeline_rabbit_client_parser=computational_pipeline_rabbit_client_parser,
+        collection_run_id=fake_collection_run_id,
+    )
+    sent_task, not_sent_task = published_tasks[1], published_tasks[3]
+
+    async def _send_computation_tasks(
+        *args, tasks: list[ComputationTaskToSend], **kwargs
+    ) -> list[PublishedComputationTask | BaseException]:
+        # NOTE: the tasks are prepared independently, one of them cannot be sent
+        return [
+            (
+                PublishedComputationTask(node_id=task.node_id, job_id=DaskJobID(f"fake-dask-job-id-for-{task.node_id}"))
+                if task.node_id == sent_task.node_id
+                else OsparcVariableResolveTimeoutError(
+                    variable_key="OSPARC_VARIABLE_API_SECRET",
+                    handler_name="request_api_secret",
+                    timeout_seconds=faker.pyfloat(min_value=1),
+                )
+            )
+            for task in tasks
+        ]
+
+    mocked_dask_client.send_computation_tasks_in_bulk.side_effect = _send_computation_tasks
+
+    await scheduler_api.apply(
+        user_id=run_in_db.user_id,
+        project_id=run_in_db.project_uuid,
+        iteration=run_in_db.iteration,
+    )
+
+    mocked_dask_client.send_computation_tasks_in_bulk.assert_called_once()
+    assert {task.node_id for task in mocked_dask_client.send_computation_tasks_in_bulk.call_args.kwargs["tasks"]} == {
+        sent_task.node_id,
+        not_sent_task.node_id,
+    }
+    # the sent task is started with its job id
+    await assert_comp_tasks_and_comp_run_snapshot_tasks(
+        sqlalchemy_async_engine,
+        project_uuid=published_project.project.uuid,
+        task_ids=[sent_task.node_id],
+        expected_state=RunningState.PENDING,
+        expected_progress=None,
+        run_id=run_in_db.run_id,
+    )
+    # the other one waits to be sent again
+    await assert_comp_tasks_and_comp_run_snapshot_tasks(
+        sqlalchemy_async_engine,
+        project_uuid=published_project.project.uuid,
+        task_ids=[not_sent_task.node_id],
+        expected_state=RunningState.WAITING_FOR_CLUSTER,
+        expected_processing_state_has_job_id=False,
+        expected_progress=None,
+        run_id=run_in_db.run_id,
+    )
+
+
 @pytest.mark.acceptance_test("https://github.com/ITISFoundation/osparc-issues/issues/2018")
 async def test_variable_resolution_error_while_starting_tasks_fails_ready_tasks(
     with_disabled_auto_scheduling: mock.Mock,
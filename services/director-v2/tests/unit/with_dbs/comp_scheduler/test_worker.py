@@ -14,6 +14,7 @@ from unittest import mock
 
 import pytest
 from _helpers import PublishedProject
+from faker import Faker
 from fastapi import FastAPI
 from models_library.computations import CollectionRunID
 from pytest_mock import MockerFixture
@@ -25,8 +26,11 @@ from simcore_service_director_v2.modules.comp_scheduler._manager import run_new_
 from simcore_service_director_v2.modules.comp_scheduler._models import (
     SchedulePipelineRabbitMessage,
 )
+from simcore_service_director_v2.modules.comp_scheduler._utils import get_redis_client_from_app
 from simcore_service_director_v2.modules.comp_scheduler._worker import (
     _get_scheduler_worker,
+    _handle_apply_distributed_schedule,
+    _pipeline_lock_key,
 )
 from tenacity import retry, stop_after_delay, wait_fixed
 
@@ -141,3 +145,35 @@ async def test_worker_scheduling_parallelism(
         assert mocked_scheduler_api.call_count == scheduling_concurrency
 
     _assert_expected_called()
+
+
+async def test_worker_defers_the_scheduling_of_a_locked_pipeline(
+    with_disabled_auto_scheduling: mock.Mock,
+    initialized_app: FastAPI,
+    mocked_get_scheduler_worker: mock.Mock,
+    mocker: MockerFixture,
+    faker: Faker,
+):
+    mocked_scheduler_worker = mocked_get_scheduler_worker.return_value
+    mocked_scheduler_worker.apply = mocker.AsyncMock()
+    message = SchedulePipelineRabbitMessage(user_id=faker.pyint(min_value=1), project_id=faker.uuid4(), iteration=1)
+    lock = get_redis_client_from_app(initialized_app).create_lock(
+        _pipeline_lock_key(
+            initialized_app, user_id=message.user_id, project_id=message.project_id, iteration=message.iteration
+        )
+    )
+
+    # the pipeline is being scheduled: the message is acknowledged, not redelivered
+    assert await lock.acquire()
+    assert await _handle_apply_distributed_schedule(initialized_app, message.model_dump_json().encode()) is True
+    mocked_scheduler_worker.apply.assert_not_called()
+    mocked_scheduler_worker.wake_ups.request.assert_not_called()
+    await lock.release()
+
+    # the next scheduling of the pipeline requests the deferred one, once
+    for _ in range(2):
+        assert await _handle_apply_distributed_schedule(initialized_app, message.model_dump_json().encode()) is True
+    assert mocked_scheduler_worker.apply.call_count == 2
+    mocked_scheduler_worker.wake_ups.request.assert_called_once_with(
+        user_id=message.user_id, project_id=message.project_id, iteration=message.iteration
+    )
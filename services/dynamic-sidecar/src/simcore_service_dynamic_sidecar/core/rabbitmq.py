@@ -14,6 +14,7 @@ from models_library.rabbitmq_messages import (
     RabbitMessageBase,
     RabbitResourceTrackingMessages,
 )
+from servicelib.fastapi.rabbitmq_lifespan import get_rabbitmq_rpc_client_metrics
 from servicelib.logging_utils import LogLevelInt, LogMessageStr, log_catch, log_context
 from servicelib.rabbitmq import RabbitMQClient, is_rabbitmq_responsive
 from servicelib.rabbitmq._client_rpc import RabbitMQRPCClient
@@ -126,6 +127,7 @@ def setup_rabbitmq(app: FastAPI) -> None:
             app.state.rabbitmq_rpc_client = await RabbitMQRPCClient.create(
                 client_name=f"dynamic-sidecar_rpc_client_{app_settings.DY_SIDECAR_NODE_ID}",
                 settings=settings,
+                metrics=get_rabbitmq_rpc_client_metrics(app),
             )
 
     async def on_shutdown() -> None:
@@ -4,6 +4,7 @@ from typing import cast
 from fastapi import FastAPI
 from fastapi.requests import Request
 from models_library.rabbitmq_messages import RabbitMessageBase
+from servicelib.fastapi.rabbitmq_lifespan import get_rabbitmq_rpc_client_metrics
 from servicelib.rabbitmq import (
     RabbitMQClient,
     RabbitMQRPCClient,
@@ -28,7 +29,7 @@ def setup_rabbitmq(app: FastAPI) -> None:
 
         app.state.rabbitmq_client = RabbitMQClient(client_name="payments", settings=settings)
         app.state.rabbitmq_rpc_client = await RabbitMQRPCClient.create(
-            client_name="payments_rpc_client", settings=settings
+            client_name="payments_rpc_client", settings=settings, metrics=get_rabbitmq_rpc_client_metrics(app)
         )
 
     async def _on_shutdown() -> None:
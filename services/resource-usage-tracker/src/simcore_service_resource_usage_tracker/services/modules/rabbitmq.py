@@ -3,6 +3,7 @@ from typing import cast
 
 from fastapi import FastAPI
 from fastapi.requests import Request
+from servicelib.fastapi.rabbitmq_lifespan import get_rabbitmq_rpc_client_metrics
 from servicelib.logging_utils import log_context
 from servicelib.rabbitmq import (
     RabbitMQClient,
@@ -30,7 +31,9 @@ def setup(app: FastAPI) -> None:
             await wait_till_rabbitmq_responsive(settings.dsn)
             app.state.rabbitmq_client = RabbitMQClient(client_name="resource-usage-tracker", settings=settings)
             app.state.rabbitmq_rpc_client = await RabbitMQRPCClient.create(
-                client_name="resource_usage_tracker_rpc_client", settings=settings
+                client_name="resource_usage_tracker_rpc_client",
+                settings=settings,
+                metrics=get_rabbitmq_rpc_client_metrics(app),
             )
 
     async def on_shutdown() -> None:
@@ -44,3 +44,6 @@ EXPAND_DIR_MAX_ITEM_COUNT: Final[int] = 1000
 
 
 EXPORTS_S3_PREFIX: Final[str] = "exports"
+
+# NOTE: content-addressed blobs shared by the files of projects copied in copy-on-write mode
+SHARED_BLOBS_S3_PREFIX: Final[str] = "shared-blobs"
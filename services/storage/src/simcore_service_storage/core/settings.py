@@ -50,6 +50,21 @@ class DsmCleanerSettings(BaseCustomSettings):
         Field(description=("How long an exported archive (exports/ S3 prefix) is kept before being removed.")),
     ] = timedelta(days=15)
 
+    STORAGE_CLEANER_PATH_AGGREGATES_RECONCILIATION_INTERVAL: Annotated[
+        PositiveTimedelta,
+        Field(
+            description=(
+                "How often the task that resolves unknown directory sizes and rebuilds the rolled-up "
+                "path sizes/number of objects runs."
+            ),
+        ),
+    ] = timedelta(days=1)
+
+    STORAGE_CLEANER_SHARED_BLOBS_INTERVAL: Annotated[
+        PositiveTimedelta,
+        Field(description=("How often the task that removes the unreferenced copy-on-write blobs runs.")),
+    ] = timedelta(hours=1)
+
     @model_validator(mode="after")
     def _exports_interval_lt_retention(self) -> "DsmCleanerSettings":
         if self.STORAGE_CLEANER_EXPIRED_EXPORTS_INTERVAL >= self.STORAGE_CLEANER_EXPORT_RETENTION_INTERVAL:
@@ -103,6 +118,16 @@ class ApplicationSettings(BaseApplicationSettings, MixinLoggingSettings):
 
     STORAGE_CLEANER: Annotated[DsmCleanerSettings, Field(json_schema_extra={"auto_default_from_env": True})]
 
+    STORAGE_COPY_ON_WRITE_ENABLED: Annotated[
+        bool,
+        Field(
+            description=(
+                "If enabled, copying a project does not duplicate the files with a known SHA256 checksum, "
+                "the copies share a content-addressed blob until they are overwritten"
+            ),
+        ),
+    ] = False
+
     STORAGE_S3_CLIENT_MAX_TRANSFER_CONCURRENCY: Annotated[
         int,
         Field(
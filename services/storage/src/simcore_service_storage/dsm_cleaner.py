@@ -1,4 +1,5 @@
-"""background task that periodically cleans up the DSM of expired uploads and exporter archives."""
+"""background task that periodically cleans up the DSM of expired uploads, exporter archives
+and unreferenced shared blobs, and reconciles the rolled-up path sizes."""
 
 import asyncio
 import logging
@@ -45,6 +46,18 @@ async def clean_expired_exports(app: FastAPI) -> None:
         await _get_simcore_s3_dsm(app).clean_expired_exports()
 
 
+@traced
+async def reconcile_path_aggregates(app: FastAPI) -> None:
+    with log_context(_logger, logging.INFO, "reconcile path aggregates"):
+        await _get_simcore_s3_dsm(app).reconcile_path_aggregates()
+
+
+@traced
+async def clean_unreferenced_shared_blobs(app: FastAPI) -> None:
+    with log_context(_logger, logging.INFO, "clean unreferenced shared blobs"):
+        await _get_simcore_s3_dsm(app).clean_unreferenced_shared_blobs()
+
+
 @asynccontextmanager
 async def _dsm_cleaner_lifespan(app: FastAPI) -> AsyncGenerator[None]:
     tasks: list[asyncio.Task] = []
@@ -72,6 +85,26 @@ async def _dsm_cleaner_lifespan(app: FastAPI) -> AsyncGenerator[None]:
 
         tasks.append(create_task(_run_clean_expired_exports()))
 
+        @exclusive_periodic(
+            lock_client,
+            task_interval=cfg.STORAGE_CLEANER.STORAGE_CLEANER_PATH_AGGREGATES_RECONCILIATION_INTERVAL,
+            retry_after=timedelta(minutes=5),
+        )
+        async def _run_reconcile_path_aggregates() -> None:
+            await reconcile_path_aggregates(app)
+
+        tasks.append(create_task(_run_reconcile_path_aggregates()))
+
+        @exclusive_periodic(
+            lock_client,
+            task_interval=cfg.STORAGE_CLEANER.STORAGE_CLEANER_SHARED_BLOBS_INTERVAL,
+            retry_after=timedelta(minutes=5),
+        )
+        async def _run_clean_unreferenced_shared_blobs() -> None:
+            await clean_unreferenced_shared_blobs(app)
+
+        tasks.append(create_task(_run_clean_unreferenced_shared_blobs()))
+
         yield
     finally:
         await limited_gather(
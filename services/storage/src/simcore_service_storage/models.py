@@ -7,7 +7,7 @@ from uuid import UUID
 
 import arrow
 from aws_library.s3 import UploadID
-from aws_library.s3._models import S3DirectoryMetaData, S3MetaData
+from aws_library.s3._models import S3DirectoryMetaData, S3MetaData, S3ObjectKey
 from models_library.api_schemas_storage.storage_schemas import (
     UNDEFINED_SIZE,
     UNDEFINED_SIZE_TYPE,
@@ -64,7 +64,8 @@ class FileMetaDataAtDB(BaseModel):
     location_id: Annotated[LocationID, PlainSerializer(lambda x: f"{x}", return_type=str)]
     location: LocationName
     bucket_name: S3BucketName
-    object_name: SimcoreS3FileID
+    # NOTE: equal to file_id unless the content is a shared blob (copy-on-write)
+    object_name: S3ObjectKey
     project_id: Annotated[
         ProjectID | None,
         PlainSerializer(lambda x: f"{x}" if x is not None else None, return_type=str | None),
@@ -84,6 +85,7 @@ class FileMetaDataAtDB(BaseModel):
     upload_expires_at: datetime.datetime | None = None
     is_directory: bool
     sha256_checksum: SHA256Str | None = None
+    num_objects: NonNegativeInt | None = None
 
     model_config = ConfigDict(from_attributes=True, extra="forbid")
 
@@ -99,6 +101,7 @@ class FileMetaData(FileMetaDataGet):
     node_id: NodeID | None
     user_id: UserID | None
     sha256_checksum: SHA256Str | None
+    num_objects: NonNegativeInt | None = None
 
     def update_display_fields(self, id_name_mapping: dict[str, str]) -> None:
         if self.project_id:
@@ -162,6 +165,7 @@ class FileMetaData(FileMetaDataGet):
                 "entity_tag": x.e_tag,
                 "sha256_checksum": x.sha256_checksum,
                 "is_directory": False,
+                "num_objects": 1,
                 "created_at": x.last_modified,
                 "last_modified": x.last_modified,
             }
@@ -319,6 +323,12 @@ class UserOrProjectFilter(NamedTuple):
     project_ids: list[ProjectID]
 
 
+class PathAggregates(NamedTuple):
+    total_size: ByteSize
+    num_objects: NonNegativeInt
+    num_unresolved: NonNegativeInt  # > 0 means total_size/num_objects are not exact
+
+
 @dataclass(frozen=True)
 class AccessRights:
     read: bool
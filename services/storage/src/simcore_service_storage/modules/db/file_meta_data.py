@@ -2,7 +2,7 @@ import contextlib
 import datetime
 from collections.abc import AsyncGenerator
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Final
 
 import sqlalchemy as sa
 from annotated_types import doc
@@ -11,8 +11,9 @@ from models_library.products import ProductName
 from models_library.projects import ProjectID
 from models_library.projects_nodes_io import NodeID, SimcoreS3FileID
 from models_library.users import UserID
-from pydantic import BaseModel
-from simcore_postgres_database.storage_models import file_meta_data
+from pydantic import BaseModel, ByteSize, NonNegativeInt
+from simcore_postgres_database.models.file_meta_data_paths import REBUILD_PROJECT_FILE_META_DATA_PATHS_SQL
+from simcore_postgres_database.storage_models import file_meta_data, file_meta_data_paths
 from simcore_postgres_database.utils_repos import (
     pass_or_acquire_connection,
     transaction_context,
@@ -27,6 +28,7 @@ from ...models import (
     FileMetaData,
     FileMetaDataAtDB,
     GenericCursor,
+    PathAggregates,
     PathMetaData,
     UserOrProjectFilter,
 )
@@ -35,10 +37,13 @@ from .access_layer import readable_project_ids_stmt
 
 type TotalChildren = int
 
+# NOTE: postgres accepts at most 32767 bind parameters per statement (16 columns per row here)
+_BULK_UPSERT_BATCH_SIZE: Final[int] = 1000
+
 
 class _PathsCursorParameters(BaseModel):
     # NOTE: this is a cursor do not put things that can grow unbounded as this goes then through REST APIs or such
-    offset: int
+    last_child_name: str | None
     file_prefix: Path | None
     partial: bool
 
@@ -52,20 +57,38 @@ def _init_pagination(
     if cursor:
         return _PathsCursorParameters.model_validate_json(cursor)
     return _PathsCursorParameters(
-        offset=0,
+        last_child_name=None,
         file_prefix=filter_by_file_prefix,
         partial=is_partial_prefix,
     )
 
 
 def _create_next_cursor(
-    total_count: TotalChildren, limit: int, cursor_params: _PathsCursorParameters
+    child_names: list[str], limit: int, cursor_params: _PathsCursorParameters
 ) -> GenericCursor | None:
-    if cursor_params.offset + limit < total_count:
-        return cursor_params.model_copy(update={"offset": cursor_params.offset + limit}).model_dump_json()
+    # NOTE: child_names contains up to limit + 1 entries, the extra one tells whether there is a next page
+    if len(child_names) > limit:
+        return cursor_params.model_copy(update={"last_child_name": child_names[limit - 1]}).model_dump_json()
     return None
 
 
+def _parent_path_and_child_conditions(
+    cursor_params: _PathsCursorParameters,
+) -> tuple[str, list[sa.ColumnElement[bool]]]:
+    if cursor_params.file_prefix is None:
+        return "", []
+    if cursor_params.partial:
+        parent_path = cursor_params.file_prefix.parent
+        return (
+            "" if parent_path == Path() else f"{parent_path}",
+            [file_meta_data_paths.c.child_name.startswith(cursor_params.file_prefix.name, autoescape=True)],
+        )
+    return f"{cursor_params.file_prefix}", []
+
+
+_REBUILD_PROJECT_PATHS_STMT = sa.text(REBUILD_PROJECT_FILE_META_DATA_PATHS_SQL)
+
+
 def _list_filter_with_partial_file_id_stmt(
     *,
     user_or_project_filter: UserOrProjectFilter,
@@ -143,6 +166,27 @@ class FileMetaDataRepository(BaseRepository):
                 ).one()
             )
 
+    async def bulk_upsert(
+        self,
+        *,
+        connection: AsyncConnection | None = None,
+        fmds: list[FileMetaDataAtDB],
+    ) -> list[FileMetaDataAtDB]:
+        """same as upsert but for many entries at once (one multi-row statement per batch)"""
+        upserted_fmds: list[FileMetaDataAtDB] = []
+        async with transaction_context(self.db_engine, connection) as conn:
+            for batch_start in range(0, len(fmds), _BULK_UPSERT_BATCH_SIZE):
+                rows = [fmd.model_dump() for fmd in fmds[batch_start : batch_start + _BULK_UPSERT_BATCH_SIZE]]
+                insert_stmt = pg_insert(file_meta_data).values(rows)
+                result = await conn.execute(
+                    insert_stmt.on_conflict_do_update(
+                        index_elements=[file_meta_data.c.file_id],
+                        set_={column: insert_stmt.excluded[column] for column in rows[0]},
+                    ).returning(literal_column("*"))
+                )
+                upserted_fmds.extend(FileMetaDataAtDB.model_validate(row) for row in result.all())
+        return upserted_fmds
+
     async def insert(self, *, connection: AsyncConnection | None = None, fmd: FileMetaData) -> FileMetaDataAtDB:
         fmd_db = FileMetaDataAtDB.model_validate(fmd)
         async with transaction_context(self.db_engine, connection) as conn:
@@ -216,104 +260,158 @@ class FileMetaDataRepository(BaseRepository):
         limit: int,
         is_partial_prefix: bool,
     ) -> tuple[list[PathMetaData], GenericCursor | None, TotalChildren]:
-        readable_projects_filter = file_meta_data.c.project_id.in_(
-            readable_project_ids_stmt(user_id=user_id, product_name=product_name)
-        )
-
         cursor_params = _init_pagination(
             cursor,
             filter_by_file_prefix=filter_by_file_prefix,
             is_partial_prefix=is_partial_prefix,
         )
+        parent_path, child_conditions = _parent_path_and_child_conditions(cursor_params)
+        children_filter = and_(
+            file_meta_data_paths.c.parent_path == parent_path,
+            file_meta_data_paths.c.project_id.in_(
+                readable_project_ids_stmt(user_id=user_id, product_name=product_name)
+            ),
+            *child_conditions,
+        )
 
-        if cursor_params.file_prefix:
-            prefix_levels = len(cursor_params.file_prefix.parts) - 1
-            search_prefix = (
-                f"{cursor_params.file_prefix}%" if cursor_params.partial else f"{cursor_params.file_prefix / '%'}"
-            )
-            search_regex = rf"^[^/]+(?:/[^/]+){{{prefix_levels}}}{'' if cursor_params.partial else '/[^/]+'}"
-            path_expression = sa.func.substring(file_meta_data.c.file_id, search_regex)
-            ranked_files = (
-                sa.select(
+        # NOTE: the paths index holds one row per child path with its smallest file_id as representative,
+        # a page is therefore an index range scan (keyset pagination on child_name)
+        files_query = (
+            sa.select(file_meta_data, file_meta_data_paths.c.child_name)
+            .select_from(
+                file_meta_data_paths.join(
                     file_meta_data,
-                    path_expression.label("path"),
-                    sa.func.row_number()
-                    .over(
-                        partition_by=path_expression,
-                        order_by=(file_meta_data.c.file_id.asc(),),
-                    )
-                    .label("row_num"),
+                    file_meta_data.c.file_id == file_meta_data_paths.c.first_file_id,
                 )
-                .where(
-                    and_(
-                        file_meta_data.c.file_id.like(search_prefix),
-                        readable_projects_filter,
-                    )
-                )
-                .cte("ranked_files")
             )
-        else:
-            path_expression = sa.func.split_part(file_meta_data.c.file_id, "/", 1)
-            ranked_files = (
-                sa.select(
-                    file_meta_data,
-                    path_expression.label("path"),
-                    sa.func.row_number()
-                    .over(
-                        partition_by=path_expression,
-                        order_by=(file_meta_data.c.file_id.asc(),),
-                    )
-                    .label("row_num"),
+            .where(
+                and_(
+                    children_filter,
+                    (
+                        file_meta_data_paths.c.child_name > cursor_params.last_child_name
+                        if cursor_params.last_child_name is not None
+                        else sa.true()
+                    ),
                 )
-                .where(readable_projects_filter)
-                .cte("ranked_files")
             )
-
-        files_query = (
-            sa.select(ranked_files, sa.func.count().over().label("total_count"))
-            .where(ranked_files.c.row_num == 1)
-            .order_by(ranked_files.c.file_id.asc())
-            .limit(limit)
-            .offset(cursor_params.offset)
+            .order_by(file_meta_data_paths.c.child_name.asc())
+            .limit(limit + 1)
         )
         async with pass_or_acquire_connection(self.db_engine, connection) as conn:
-            total_count = 0
-            items = []
-            async for row in await conn.stream(files_query):
-                total_count = row.total_count
-                items.append(
-                    PathMetaData(
-                        path=row.path or row.file_id,  # NOTE: if path_prefix is partial then path is None
-                        display_path=row.path or row.file_id,
-                        location_id=row.location_id,
-                        location=row.location,
-                        bucket_name=row.bucket_name,
-                        project_id=row.project_id,
-                        node_id=row.node_id,
-                        user_id=row.user_id,
-                        created_at=row.created_at,
-                        last_modified=row.last_modified,
-                        file_meta_data=(
-                            FileMetaData.from_db_model(FileMetaDataAtDB.model_validate(row))
-                            if row.file_id == row.path and not row.is_directory
-                            else None
-                        ),
-                    )
+            rows = [row async for row in await conn.stream(files_query)]
+            total_count = (
+                await conn.scalar(sa.select(sa.func.count()).select_from(file_meta_data_paths).where(children_filter))
+            ) or 0
+
+        items = []
+        for row in rows[:limit]:
+            path = f"{parent_path}/{row.child_name}" if parent_path else row.child_name
+            items.append(
+                PathMetaData(
+                    path=path,
+                    display_path=path,
+                    location_id=row.location_id,
+                    location=row.location,
+                    bucket_name=row.bucket_name,
+                    project_id=row.project_id,
+                    node_id=row.node_id,
+                    user_id=row.user_id,
+                    created_at=row.created_at,
+                    last_modified=row.last_modified,
+                    file_meta_data=(
+                        FileMetaData.from_db_model(FileMetaDataAtDB.model_validate(row))
+                        if row.file_id == path and not row.is_directory
+                        else None
+                    ),
                 )
-
-            if not items:
-                total_count = (
-                    await conn.scalar(
-                        sa.select(sa.func.count()).select_from(ranked_files).where(ranked_files.c.row_num == 1)
-                    )
-                ) or 0
+            )
 
         return (
             items,
-            _create_next_cursor(total_count, limit, cursor_params),
+            _create_next_cursor([row.child_name for row in rows], limit, cursor_params),
             total_count,
         )
 
+    async def get_path_aggregates(
+        self, *, connection: AsyncConnection | None = None, path: Path
+    ) -> PathAggregates | None:
+        """returns the rolled-up size and number of objects of all the entries at or below path
+        (None if there are no entries)"""
+        async with pass_or_acquire_connection(self.db_engine, connection) as conn:
+            result = await conn.execute(
+                sa.select(
+                    file_meta_data_paths.c.total_size,
+                    file_meta_data_paths.c.num_objects,
+                    file_meta_data_paths.c.num_unresolved,
+                ).where(
+                    (file_meta_data_paths.c.parent_path == ("" if path.parent == Path() else f"{path.parent}"))
+                    & (file_meta_data_paths.c.child_name == path.name)
+                )
+            )
+        if row := result.one_or_none():
+            return PathAggregates(
+                total_size=ByteSize(row.total_size),
+                num_objects=row.num_objects,
+                num_unresolved=row.num_unresolved,
+            )
+        return None
+
+    async def reconcile_path_aggregates(
+        self, *, connection: AsyncConnection | None = None, project_id: ProjectID
+    ) -> None:
+        """rebuilds the paths index entries of a project from file_meta_data (fixes any drift)
+
+        NOTE: every trigger run on the project's entries first upserts its root path row, locking it
+        serializes the rebuild with the concurrent triggers so that none of their deltas is lost
+        """
+        async with transaction_context(self.db_engine, connection) as conn:
+            await conn.execute(
+                sa.select(file_meta_data_paths.c.child_name)
+                .where(
+                    (file_meta_data_paths.c.parent_path == "") & (file_meta_data_paths.c.child_name == f"{project_id}")
+                )
+                .with_for_update()
+            )
+            await conn.execute(
+                file_meta_data_paths.delete().where(file_meta_data_paths.c.project_id == f"{project_id}")
+            )
+            await conn.execute(_REBUILD_PROJECT_PATHS_STMT, {"project_id": f"{project_id}"})
+
+    async def list_project_ids_with_entries(self, *, connection: AsyncConnection | None = None) -> list[ProjectID]:
+        async with pass_or_acquire_connection(self.db_engine, connection) as conn:
+            result = await conn.stream(
+                sa.select(file_meta_data.c.project_id).where(file_meta_data.c.project_id.is_not(None)).distinct()
+            )
+            return [ProjectID(row.project_id) async for row in result]
+
+    async def list_shared_object_names(
+        self, *, connection: AsyncConnection | None = None, file_id_prefix: str
+    ) -> dict[SimcoreS3FileID, str]:
+        """returns the entries under file_id_prefix whose content is a shared blob (file_id -> object_name)"""
+        async with pass_or_acquire_connection(self.db_engine, connection) as conn:
+            result = await conn.stream(
+                sa.select(file_meta_data.c.file_id, file_meta_data.c.object_name).where(
+                    file_meta_data.c.file_id.startswith(file_id_prefix, autoescape=True)
+                    & (file_meta_data.c.object_name != file_meta_data.c.file_id)
+                )
+            )
+            return {row.file_id: row.object_name async for row in result}
+
+    async def update_size_and_num_objects(
+        self,
+        *,
+        connection: AsyncConnection | None = None,
+        file_id: SimcoreS3FileID,
+        file_size: ByteSize,
+        num_objects: NonNegativeInt,
+    ) -> None:
+        async with transaction_context(self.db_engine, connection) as conn:
+            await conn.execute(
+                file_meta_data.update()
+                .where(file_meta_data.c.file_id == file_id)
+                .values(file_size=file_size, num_objects=num_objects)
+            )
+
     async def list_fmds(
         self,
         *,
@@ -354,6 +452,22 @@ class FileMetaDataRepository(BaseRepository):
             ):
                 yield FileMetaDataAtDB.model_validate(row)
 
+    async def list_unresolved_directories(
+        self,
+        *,
+        connection: AsyncConnection | None = None,
+    ) -> AsyncGenerator[FileMetaDataAtDB]:
+        """returns the uploaded directories whose content (size, number of objects) is not known"""
+        async with pass_or_acquire_connection(self.db_engine, connection) as conn:
+            async for row in await conn.stream(
+                sa.select(file_meta_data).where(
+                    file_meta_data.c.is_directory.is_(True)
+                    & file_meta_data.c.num_objects.is_(None)
+                    & file_meta_data.c.upload_expires_at.is_(None)  # lgtm [py/test-equals-none]
+                )
+            ):
+                yield FileMetaDataAtDB.model_validate(row)
+
     async def delete(
         self,
         *,
@@ -0,0 +1,75 @@
+import datetime
+
+import sqlalchemy as sa
+from aws_library.s3 import S3ObjectKey
+from models_library.api_schemas_storage.storage_schemas import ETag
+from models_library.basic_types import SHA256Str
+from simcore_postgres_database.storage_models import file_meta_data_blobs
+from simcore_postgres_database.utils_repos import transaction_context
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ._base import BaseRepository
+
+
+class FileMetaDataBlobsRepository(BaseRepository):
+    async def touch(
+        self,
+        *,
+        connection: AsyncConnection | None = None,
+        sha256_checksum: SHA256Str,
+        entity_tag: ETag,
+    ) -> S3ObjectKey | None:
+        """returns the object name of the blob with that content if it exists.
+        The blob is marked as used, so it is not removed by the cleaner in the meantime.
+        """
+        async with transaction_context(self.db_engine, connection) as conn:
+            return await conn.scalar(
+                file_meta_data_blobs.update()
+                .where(
+                    (file_meta_data_blobs.c.sha256_checksum == sha256_checksum)
+                    & (file_meta_data_blobs.c.entity_tag == entity_tag)
+                )
+                .values(modified=sa.func.now())
+                .returning(file_meta_data_blobs.c.object_name)
+            )
+
+    async def insert_or_get(
+        self,
+        *,
+        connection: AsyncConnection | None = None,
+        sha256_checksum: SHA256Str,
+        entity_tag: ETag,
+        object_name: S3ObjectKey,
+    ) -> S3ObjectKey:
+        """registers object_name as the blob with that content, if another blob with the same content
+        was registered in the meantime, its object name is returned instead
+        """
+        async with transaction_context(self.db_engine, connection) as conn:
+            # NOTE: the no-op update ensures the existing row is returned (and marked as used)
+            return await conn.scalar(
+                pg_insert(file_meta_data_blobs)
+                .values(sha256_checksum=sha256_checksum, entity_tag=entity_tag, object_name=object_name)
+                .on_conflict_do_update(
+                    index_elements=[file_meta_data_blobs.c.sha256_checksum, file_meta_data_blobs.c.entity_tag],
+                    set_={"modified": sa.func.now()},
+                )
+                .returning(file_meta_data_blobs.c.object_name)
+            )
+
+    async def delete_unreferenced(
+        self,
+        *,
+        connection: AsyncConnection | None = None,
+        unused_since: datetime.datetime,
+    ) -> list[S3ObjectKey]:
+        """deletes the blobs that are not referenced anymore and were not used since unused_since,
+        returns their object names
+        """
+        async with transaction_context(self.db_engine, connection) as conn:
+            result = await conn.execute(
+                file_meta_data_blobs.delete()
+                .where((file_meta_data_blobs.c.ref_count <= 0) & (file_meta_data_blobs.c.modified < unused_since))
+                .returning(file_meta_data_blobs.c.object_name)
+            )
+            return list(result.scalars())
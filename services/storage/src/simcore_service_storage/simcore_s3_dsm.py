@@ -4,6 +4,7 @@ import fnmatch
 import logging
 import tempfile
 import urllib.parse
+from collections import defaultdict
 from collections.abc import AsyncGenerator, Coroutine
 from contextlib import suppress
 from dataclasses import dataclass
@@ -12,6 +13,7 @@ from typing import Any, Final
 
 from aws_library.s3 import (
     CopiedBytesTransferredCallback,
+    S3CopyBudget,
     S3DirectoryMetaData,
     S3KeyNotFoundError,
     S3MetaData,
@@ -51,6 +53,7 @@ from .constants import (
     DATCORE_ID,
     EXPAND_DIR_MAX_ITEM_COUNT,
     EXPORTS_S3_PREFIX,
+    MAX_CONCURRENT_DB_TASKS,
     MAX_CONCURRENT_S3_TASKS,
     MAX_LINK_CHUNK_BYTE_SIZE,
     S3_UNDEFINED_OR_EXTERNAL_MULTIPART_ID,
@@ -81,6 +84,7 @@ from .modules.datcore_adapter import datcore_adapter
 from .modules.db import get_db_engine
 from .modules.db.access_layer import AccessLayerRepository
 from .modules.db.file_meta_data import FileMetaDataRepository
+from .modules.db.file_meta_data_blobs import FileMetaDataBlobsRepository
 from .modules.db.projects import ProjectRepository
 from .modules.db.tokens import TokenRepository
 from .modules.rabbitmq import post_file_notification
@@ -91,10 +95,12 @@ from .utils.simcore_s3_dsm_utils import (
     compute_file_id_prefix,
     create_and_upload_export,
     create_random_export_name,
+    create_shared_blob_object_name,
     ensure_user_selection_from_same_base_directory,
     expand_directory,
     get_accessible_project_ids,
     get_directory_file_id,
+    group_by_parent_s3_prefix,
     is_nested_level_file_id,
     list_child_paths_from_repository,
     list_child_paths_from_s3,
@@ -108,7 +114,12 @@ from .utils.utils import (
 
 _NO_CONCURRENCY: Final[int] = 1
 _MAX_PARALLEL_S3_CALLS: Final[NonNegativeInt] = 10
+# NOTE: a shared blob is kept this long after its last use, which covers the copies that are
+# about to reference it (see FileMetaDataBlobsRepository.touch)
+_SHARED_BLOBS_GRACE_PERIOD: Final[datetime.timedelta] = datetime.timedelta(hours=1)
 _PROJECT_FOLDER_MAX_PARTS: Final[int] = 2
+# NOTE: below this number of stale entries sharing the same S3 prefix, individual HEAD requests are cheaper than listing
+_MIN_ENTRIES_FOR_PREFIX_LISTING: Final[int] = 5
 
 
 _logger = logging.getLogger(__name__)
@@ -151,6 +162,12 @@ async def _add_frontend_needed_data(
     return clean_data
 
 
+def _can_share_object(fmd: FileMetaDataAtDB) -> bool:
+    # NOTE: the content is identified by the checksum AND the entity tag, as the
+    # checksum is given by the client while the entity tag is computed by S3
+    return not fmd.is_directory and fmd.sha256_checksum is not None and is_file_entry_valid(fmd)
+
+
 @dataclass
 class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-methods
     simcore_bucket_name: S3BucketName
@@ -318,6 +335,18 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             return s3_metadata.size
 
         # all other use-cases are in the DB
+        if (
+            project_id is not None
+            and (
+                aggregates := await FileMetaDataRepository.instance(get_db_engine(self.app)).get_path_aggregates(
+                    path=path
+                )
+            )
+            and aggregates.num_unresolved == 0
+        ):
+            # all the entries below path have a known size, the rolled-up value is exact
+            return aggregates.total_size
+
         fmds = await FileMetaDataRepository.instance(get_db_engine(self.app)).list_filter_with_partial_file_id(
             user_or_project_filter=UserOrProjectFilter(user_id=user_id, project_ids=accessible_projects_ids),
             file_id_prefix=f"{path}",
@@ -327,12 +356,7 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
         )
 
         # ensure file sizes are uptodate
-        updated_fmds = []
-        for metadata in fmds:
-            if is_file_entry_valid(metadata):
-                updated_fmds.append(convert_db_to_model(metadata))
-                continue
-            updated_fmds.append(convert_db_to_model(await self._update_database_from_storage(metadata)))
+        updated_fmds = await self._refresh_invalid_entries_from_storage(fmds, missing_ok=False)
 
         return ByteSize(sum(fmd.file_size for fmd in updated_fmds))
 
@@ -384,18 +408,13 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
         )
 
         # add all the entries from file_meta_data without
-        for metadata in file_and_directory_meta_data:
-            # below checks ensures that directories either appear as
-            if metadata.is_directory and expand_dirs:
-                # avoids directory files and does not add any directory entry to the result
-                continue
-
-            if is_file_entry_valid(metadata):
-                data.append(convert_db_to_model(metadata))
-                continue
-            with suppress(S3KeyNotFoundError):
-                updated_fmd = await self._update_database_from_storage(metadata)
-                data.append(convert_db_to_model(updated_fmd))
+        # below checks ensures that directories either appear as
+        # avoids directory files and does not add any directory entry to the result
+        data.extend(
+            await self._refresh_invalid_entries_from_storage(
+                [metadata for metadata in file_and_directory_meta_data if not (metadata.is_directory and expand_dirs)]
+            )
+        )
 
         # expand directories until the max number of files to return is reached
         directory_expands: list[Coroutine] = []
@@ -462,6 +481,9 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
         if (
             not is_directory
         ):  # NOTE: Delete is not needed for directories that are synced via an external tool (rclone).
+            # a file sharing its content (copy-on-write) gets its own copy first, so that it can be recovered
+            # if the upload is aborted
+            await self._materialize_shared_object(TypeAdapter(SimcoreS3FileID).validate_python(file_id))
             # ensure file is deleted first in case it already exists
             # https://github.com/ITISFoundation/osparc-simcore/pull/5108
             await self.delete_file(
@@ -658,7 +680,7 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             fmd = await self._update_database_from_storage(fmd)
         return await self._get_link(fmd.object_name, link_type)
 
-    async def _get_link(self, s3_file_id: SimcoreS3FileID, link_type: LinkType) -> AnyUrl:
+    async def _get_link(self, s3_file_id: S3ObjectKey, link_type: LinkType) -> AnyUrl:
         link: AnyUrl = TypeAdapter(AnyUrl).validate_python(
             f"s3://{self.simcore_bucket_name}/{urllib.parse.quote(s3_file_id)}"
         )
@@ -830,6 +852,9 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             total_num_of_files = sum(n for _, n in sizes_and_num_files)
             src_project_total_data_size = TypeAdapter(ByteSize).validate_python(sum(n for n, _ in sizes_and_num_files))
 
+        # NOTE: all the S3 copies of the project share the same budget
+        copy_budget = get_s3_client(self.app).create_copy_budget()
+        copy_on_write = get_application_settings(self.app).STORAGE_COPY_ON_WRITE_ENABLED
         async with S3TransferDataCB(
             task_progress,
             src_project_total_data_size,
@@ -856,9 +881,11 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
                                 user_id,
                                 src_fmd=src_fmd,
                                 dst_file_id=TypeAdapter(SimcoreS3FileID).validate_python(
-                                    f"{dst_project_uuid}/{new_node_id}/{src_fmd.object_name.split('/', maxsplit=2)[-1]}"
+                                    f"{dst_project_uuid}/{new_node_id}/{src_fmd.file_id.split('/', maxsplit=2)[-1]}"
                                 ),
                                 bytes_transferred_cb=s3_transferred_data_cb.copy_transfer_cb,
+                                copy_budget=copy_budget,
+                                copy_on_write=copy_on_write,
                             )
                         )
             with log_context(
@@ -893,6 +920,10 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
         if not fmd.is_directory:
             return fmd.file_size, 1
 
+        if fmd.num_objects is not None and fmd.file_size >= 0 and fmd.upload_id is None:
+            # already resolved when the directory was uploaded/copied/refreshed
+            return fmd.file_size, fmd.num_objects
+
         # in case of directory list files and return size
         total_size: int = 0
         total_num_s3_objects = 0
@@ -903,7 +934,12 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             total_size += sum(x.size for x in s3_objects)
             total_num_s3_objects += len(s3_objects)
 
-        return TypeAdapter(ByteSize).validate_python(total_size), total_num_s3_objects
+        directory_size = TypeAdapter(ByteSize).validate_python(total_size)
+        if fmd.upload_id is None:
+            await FileMetaDataRepository.instance(get_db_engine(self.app)).update_size_and_num_objects(
+                file_id=fmd.file_id, file_size=directory_size, num_objects=total_num_s3_objects
+            )
+        return directory_size, total_num_s3_objects
 
     async def search_owned_files(
         self,
@@ -925,15 +961,7 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             limit=limit,
             offset=offset,
         )
-        resolved_fmds = []
-        for fmd in file_metadatas:
-            if is_file_entry_valid(fmd):
-                resolved_fmds.append(convert_db_to_model(fmd))
-                continue
-            with suppress(S3KeyNotFoundError):
-                updated_fmd = await self._update_database_from_storage(fmd)
-                resolved_fmds.append(convert_db_to_model(updated_fmd))
-        return resolved_fmds
+        return await self._refresh_invalid_entries_from_storage(file_metadatas)
 
     async def _process_s3_page_results(
         self,
@@ -1189,6 +1217,12 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
                     upload_id=fmd.upload_id,
                 )
 
+    async def _is_pending_copy(self, file_id: SimcoreS3FileID) -> bool:
+        with suppress(FileMetaDataNotFoundError):
+            fmd = await FileMetaDataRepository.instance(get_db_engine(self.app)).get(file_id=file_id)
+            return fmd.upload_id == S3_UNDEFINED_OR_EXTERNAL_MULTIPART_ID
+        return False
+
     async def clean_expired_uploads(self) -> None:
         """Removes uploads that never completed.
 
@@ -1201,6 +1235,8 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
            actually finished and the client just forgot to notify us);
         2. if nothing exists in S3, deletes the file metadata entry and aborts the multipart
            upload, if any.
+        Server-side copies also create such an entry: when it expires, the copy was abandoned and
+        the multipart copies it left behind to be resumed (see SimcoreS3API.copy_object) are aborted.
         """
         now = datetime.datetime.now(tz=datetime.UTC).replace(tzinfo=None)
 
@@ -1215,6 +1251,19 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             [fmd.file_id for fmd in list_of_expired_uploads],
         )
 
+        s3_client = get_s3_client(self.app)
+        # NOTE: no concurrency here as we want to run low resources
+        await limited_gather(
+            *(
+                s3_client.abort_multipart_uploads(bucket=fmd.bucket_name, prefix=fmd.object_name)
+                for fmd in list_of_expired_uploads
+                if fmd.upload_id == S3_UNDEFINED_OR_EXTERNAL_MULTIPART_ID
+            ),
+            reraise=False,
+            log=_logger,
+            limit=_NO_CONCURRENCY,
+        )
+
         # try first to upload these from S3, they might have finished and the client forgot to tell us (conservative)
         # NOTE: no concurrency here as we want to run low resources
         updated_fmds = await limited_gather(
@@ -1242,7 +1291,6 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             await s3_client.undelete_object(bucket=fmd.bucket_name, object_key=fmd.file_id)
             return await self._update_database_from_storage(fmd)
 
-        s3_client = get_s3_client(self.app)
         # NOTE: no concurrency here as we want to run low resources
         reverted_fmds = await limited_gather(
             *(_revert_file(fmd) for fmd in list_of_fmds_to_delete),
@@ -1296,6 +1344,34 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
                 with log_context(_logger, logging.INFO, f"removing {fmd.file_id}"):
                     await self.delete_file(fmd.user_id, fmd.file_id, enforce_access_rights=False, connection=conn)
 
+    async def reconcile_path_aggregates(self) -> None:
+        """resolves the directories whose content is unknown and rebuilds the rolled-up
+        sizes/number of objects of every project (safety net against drift)
+
+        NOTE: each project is reconciled on its own (in its own transaction) so that the
+        triggers keep updating the other projects in the meantime
+        """
+        file_meta_data_repo = FileMetaDataRepository.instance(get_db_engine(self.app))
+        unresolved_directories: dict[ProjectID | None, list[FileMetaDataAtDB]] = defaultdict(list)
+        async for fmd in file_meta_data_repo.list_unresolved_directories():
+            unresolved_directories[fmd.project_id].append(fmd)
+
+        async def _reconcile_project(project_id: ProjectID) -> None:
+            if project_unresolved_directories := unresolved_directories.pop(project_id, None):
+                await self._update_database_from_storage_bulk(project_unresolved_directories)
+            await file_meta_data_repo.reconcile_path_aggregates(project_id=project_id)
+
+        project_ids = await file_meta_data_repo.list_project_ids_with_entries()
+        with log_context(_logger, logging.INFO, f"reconciling path aggregates of {len(project_ids)} projects"):
+            await limited_gather(
+                *(_reconcile_project(project_id) for project_id in project_ids),
+                limit=MAX_CONCURRENT_DB_TASKS,
+            )
+        if remaining_directories := [fmd for fmds in unresolved_directories.values() for fmd in fmds]:
+            # e.g. directories outside of projects
+            with log_context(_logger, logging.INFO, f"resolving {len(remaining_directories)} directories"):
+                await self._update_database_from_storage_bulk(remaining_directories)
+
     async def _update_fmd_from_other(
         self,
         *,
@@ -1309,9 +1385,11 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             fmd.file_size = TypeAdapter(ByteSize).validate_python(s3_metadata.size)
             fmd.last_modified = s3_metadata.last_modified
             fmd.entity_tag = s3_metadata.e_tag
+            fmd.num_objects = 1
         else:
             # we spare calling get_directory_metadata as it is not needed now and is costly
             fmd.file_size = copy_from.file_size
+            fmd.num_objects = copy_from.num_objects
 
         fmd.upload_expires_at = None
         fmd.upload_id = None
@@ -1336,14 +1414,120 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             fmd.file_size = TypeAdapter(ByteSize).validate_python(s3_metadata.size)
             fmd.last_modified = s3_metadata.last_modified
             fmd.entity_tag = s3_metadata.e_tag
+            fmd.num_objects = 1
         elif fmd.is_directory:
             assert isinstance(s3_metadata, S3DirectoryMetaData)  # nosec
             fmd.file_size = TypeAdapter(ByteSize).validate_python(s3_metadata.size)
+            fmd.num_objects = s3_metadata.num_objects
         fmd.upload_expires_at = None
         fmd.upload_id = None
 
         return await FileMetaDataRepository.instance(get_db_engine(self.app)).upsert(fmd=convert_db_to_model(fmd))
 
+    async def _try_get_object_metadata(self, fmd: FileMetaDataAtDB) -> S3MetaData | None:
+        with suppress(S3KeyNotFoundError):
+            return await get_s3_client(self.app).get_object_metadata(bucket=fmd.bucket_name, object_key=fmd.object_name)
+        return None
+
+    async def _list_s3_metadata_under_prefix(
+        self, prefix: str, fmds: list[FileMetaDataAtDB]
+    ) -> dict[S3ObjectKey, S3MetaData]:
+        if len(fmds) < _MIN_ENTRIES_FOR_PREFIX_LISTING:
+            s3_metadata = await limited_gather(
+                *(self._try_get_object_metadata(fmd) for fmd in fmds),
+                limit=_MAX_PARALLEL_S3_CALLS,
+            )
+            return {
+                fmd.object_name: metadata
+                for fmd, metadata in zip(fmds, s3_metadata, strict=True)
+                if metadata is not None
+            }
+
+        # NOTE: the objects are looked up in the bucket of their entry, as with the HEAD requests above
+        wanted_object_names: dict[S3BucketName, set[S3ObjectKey]] = {}
+        for fmd in fmds:
+            wanted_object_names.setdefault(fmd.bucket_name, set()).add(fmd.object_name)
+        found_metadata: dict[S3ObjectKey, S3MetaData] = {}
+        for bucket_name, bucket_object_names in wanted_object_names.items():
+            async for s3_objects in get_s3_client(self.app).list_objects_paginated(
+                bucket=bucket_name, prefix=prefix, use_delimiter=True
+            ):
+                found_metadata |= {
+                    s3_object.object_key: s3_object
+                    for s3_object in s3_objects
+                    if s3_object.object_key in bucket_object_names
+                }
+        return found_metadata
+
+    async def _update_database_from_storage_bulk(self, fmds: list[FileMetaDataAtDB]) -> list[FileMetaDataAtDB]:
+        """same as _update_database_from_storage for many entries at once:
+        - files are resolved with one listing per common S3 prefix (or bounded concurrent HEADs for small groups)
+        - directories are resolved concurrently
+        - all results are written back in a single multi-row upsert
+        NOTE: entries whose object is not found in S3 are not returned
+        """
+        file_fmds = [fmd for fmd in fmds if not fmd.is_directory]
+        directory_fmds = [fmd for fmd in fmds if fmd.is_directory]
+
+        s3_metadata: dict[S3ObjectKey, S3MetaData] = {}
+        for prefix_metadata in await limited_gather(
+            *(
+                self._list_s3_metadata_under_prefix(prefix, prefix_fmds)
+                for prefix, prefix_fmds in group_by_parent_s3_prefix(file_fmds).items()
+            ),
+            limit=_MAX_PARALLEL_S3_CALLS,
+        ):
+            s3_metadata |= prefix_metadata
+
+        updated_fmds: list[FileMetaDataAtDB] = []
+        for fmd in file_fmds:
+            if (metadata := s3_metadata.get(fmd.object_name)) is None:
+                continue
+            fmd.file_size = TypeAdapter(ByteSize).validate_python(metadata.size)
+            fmd.last_modified = metadata.last_modified
+            fmd.entity_tag = metadata.e_tag
+            fmd.num_objects = 1
+            updated_fmds.append(fmd)
+
+        directories_metadata = await limited_gather(
+            *(
+                get_s3_client(self.app).get_directory_metadata(bucket=fmd.bucket_name, prefix=fmd.object_name)
+                for fmd in directory_fmds
+            ),
+            limit=_MAX_PARALLEL_S3_CALLS,
+        )
+        for fmd, directory_metadata in zip(directory_fmds, directories_metadata, strict=True):
+            fmd.file_size = TypeAdapter(ByteSize).validate_python(directory_metadata.size)
+            fmd.num_objects = directory_metadata.num_objects
+            updated_fmds.append(fmd)
+
+        for fmd in updated_fmds:
+            fmd.upload_expires_at = None
+            fmd.upload_id = None
+
+        return await FileMetaDataRepository.instance(get_db_engine(self.app)).bulk_upsert(fmds=updated_fmds)
+
+    async def _refresh_invalid_entries_from_storage(
+        self, fmds: list[FileMetaDataAtDB], *, missing_ok: bool = True
+    ) -> list[FileMetaData]:
+        """returns the entries in the same order, refreshing the invalid ones from S3 in bulk.
+        Entries that cannot be found in S3 are dropped.
+
+        Raises:
+            S3KeyNotFoundError -- if an invalid entry is not found in S3 and missing_ok is False
+        """
+        invalid_fmds = [fmd for fmd in fmds if not is_file_entry_valid(fmd)]
+        updated_fmds = {fmd.file_id: fmd for fmd in await self._update_database_from_storage_bulk(invalid_fmds)}
+        if not missing_ok and (
+            missing_fmd := next((fmd for fmd in invalid_fmds if fmd.file_id not in updated_fmds), None)
+        ):
+            raise S3KeyNotFoundError(key=missing_fmd.object_name, bucket=missing_fmd.bucket_name)
+        return [
+            convert_db_to_model(fmd if is_file_entry_valid(fmd) else updated_fmds[fmd.file_id])
+            for fmd in fmds
+            if is_file_entry_valid(fmd) or fmd.file_id in updated_fmds
+        ]
+
     async def _copy_file_datcore_s3(
         self,
         user_id: UserID,
@@ -1401,13 +1585,25 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
         src_fmd: FileMetaDataAtDB,
         dst_file_id: SimcoreS3FileID,
         bytes_transferred_cb: CopiedBytesTransferredCallback,
+        copy_budget: S3CopyBudget | None = None,
+        copy_on_write: bool = False,
     ) -> FileMetaData:
+        if copy_on_write and _can_share_object(src_fmd):
+            return await self._share_path_s3_s3(
+                user_id,
+                src_fmd=src_fmd,
+                dst_file_id=dst_file_id,
+                bytes_transferred_cb=bytes_transferred_cb,
+                copy_budget=copy_budget,
+            )
         with log_context(
             _logger,
             logging.INFO,
             f"copying {src_fmd.file_id=} to {dst_file_id=}, {src_fmd.is_directory=}",
         ):
-            # copying will happen using aioboto3, therefore multipart might happen
+            # NOTE: a pending copy entry at the destination means a previous attempt of this copy was interrupted
+            is_retried_copy = await self._is_pending_copy(dst_file_id)
+            # copying happens server-side, large objects are copied in parallel parts
             # NOTE: connection must be released to ensure database update
             new_fmd = await self._create_fmd_for_upload(
                 user_id,
@@ -1420,11 +1616,14 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
             s3_client = get_s3_client(self.app)
 
             if src_fmd.is_directory:
+                # NOTE: a retried copy picks up what was already copied, otherwise the destination must be empty
                 await s3_client.copy_objects_recursively(
                     bucket=self.simcore_bucket_name,
                     src_prefix=src_fmd.object_name,
                     dst_prefix=new_fmd.object_name,
                     bytes_transferred_cb=bytes_transferred_cb,
+                    copy_budget=copy_budget,
+                    resume=is_retried_copy,
                 )
             else:
                 await s3_client.copy_object(
@@ -1432,11 +1631,102 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
                     src_object_key=src_fmd.object_name,
                     dst_object_key=new_fmd.object_name,
                     bytes_transferred_cb=bytes_transferred_cb,
+                    copy_budget=copy_budget,
                 )
             # we are done, let's update the copy with the src
             updated_fmd = await self._update_fmd_from_other(fmd=new_fmd, copy_from=src_fmd)
             return convert_db_to_model(updated_fmd)
 
+    async def _share_path_s3_s3(
+        self,
+        user_id: UserID,
+        *,
+        src_fmd: FileMetaDataAtDB,
+        dst_file_id: SimcoreS3FileID,
+        bytes_transferred_cb: CopiedBytesTransferredCallback,
+        copy_budget: S3CopyBudget | None,
+    ) -> FileMetaData:
+        """copy-on-write copy: the new entry references the blob holding the content of src_fmd,
+        the blob is created (copied once from src_fmd) if no entry with that content was shared yet
+        """
+        assert src_fmd.sha256_checksum  # nosec
+        assert src_fmd.entity_tag  # nosec
+        with log_context(_logger, logging.INFO, f"sharing {src_fmd.file_id=} with {dst_file_id=}"):
+            blobs_repo = FileMetaDataBlobsRepository.instance(get_db_engine(self.app))
+            blob_object_name = await blobs_repo.touch(
+                sha256_checksum=src_fmd.sha256_checksum, entity_tag=src_fmd.entity_tag
+            )
+            if blob_object_name is None:
+                s3_client = get_s3_client(self.app)
+                new_blob_object_name = create_shared_blob_object_name(src_fmd.sha256_checksum)
+                await s3_client.copy_object(
+                    bucket=self.simcore_bucket_name,
+                    src_object_key=src_fmd.object_name,
+                    dst_object_key=new_blob_object_name,
+                    bytes_transferred_cb=None,
+                    copy_budget=copy_budget,
+                )
+                blob_object_name = await blobs_repo.insert_or_get(
+                    sha256_checksum=src_fmd.sha256_checksum,
+                    entity_tag=src_fmd.entity_tag,
+                    object_name=new_blob_object_name,
+                )
+                if blob_object_name != new_blob_object_name:
+                    # another copy created the same blob in the meantime
+                    await s3_client.delete_object(bucket=self.simcore_bucket_name, object_key=new_blob_object_name)
+
+            new_fmd = FileMetaData.from_simcore_node(
+                user_id=user_id,
+                file_id=dst_file_id,
+                bucket=self.simcore_bucket_name,
+                location_id=self.location_id,
+                location_name=self.location_name,
+                sha256_checksum=src_fmd.sha256_checksum,
+                object_name=blob_object_name,
+                file_size=src_fmd.file_size,
+                entity_tag=src_fmd.entity_tag,
+                last_modified=src_fmd.last_modified,
+                num_objects=1,
+            )
+            shared_fmd = await FileMetaDataRepository.instance(get_db_engine(self.app)).upsert(fmd=new_fmd)
+            bytes_transferred_cb(src_fmd.file_size, file_name=f"{dst_file_id}")
+            return convert_db_to_model(shared_fmd)
+
+    async def _materialize_shared_object(self, file_id: SimcoreS3FileID) -> None:
+        """gives file_id its own S3 object if it references a shared blob (i.e. before it gets overwritten)"""
+        file_meta_data_repo = FileMetaDataRepository.instance(get_db_engine(self.app))
+        try:
+            fmd = await file_meta_data_repo.get(file_id=file_id)
+        except FileMetaDataNotFoundError:
+            return
+        if fmd.is_directory or fmd.object_name == fmd.file_id:
+            return
+        with log_context(_logger, logging.INFO, f"materializing shared {fmd.object_name=} for {file_id=}"):
+            await get_s3_client(self.app).copy_object(
+                bucket=fmd.bucket_name,
+                src_object_key=fmd.object_name,
+                dst_object_key=fmd.file_id,
+                bytes_transferred_cb=None,
+            )
+            fmd.object_name = fmd.file_id
+            await file_meta_data_repo.upsert(fmd=fmd)
+
+    async def clean_unreferenced_shared_blobs(self) -> None:
+        """removes the copy-on-write blobs that are not referenced by any entry anymore"""
+        unreferenced_blobs = await FileMetaDataBlobsRepository.instance(get_db_engine(self.app)).delete_unreferenced(
+            unused_since=datetime.datetime.now(tz=datetime.UTC) - _SHARED_BLOBS_GRACE_PERIOD
+        )
+        if unreferenced_blobs:
+            _logger.info("removing %s unreferenced shared blobs", len(unreferenced_blobs))
+            s3_client = get_s3_client(self.app)
+            await limited_gather(
+                *(
+                    s3_client.delete_object(bucket=self.simcore_bucket_name, object_key=object_name)
+                    for object_name in unreferenced_blobs
+                ),
+                limit=_MAX_PARALLEL_S3_CALLS,
+            )
+
     async def _create_fmd_for_upload(
         self,
         user_id: UserID,
@@ -1504,12 +1794,24 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
                     location_id=SimcoreS3DataManager.get_location_id(),
                 )
 
+        # NOTE: the sizes from the listing spare a HEAD request per file when creating the archive
+        object_sizes: dict[StorageFileID, ByteSize] = {}
         for object_key in object_keys:
             async for meta_data_files in get_s3_client(self.app).list_objects_paginated(
                 self.simcore_bucket_name, object_key
             ):
                 for entry in meta_data_files:
                     source_object_keys.add((object_key, entry.object_key))
+                    object_sizes[entry.object_key] = entry.size
+
+        # NOTE: files sharing their content (copy-on-write) have no object under the selection
+        shared_object_names: dict[StorageFileID, S3ObjectKey] = {}
+        for object_key in object_keys:
+            selection_shared_object_names = await FileMetaDataRepository.instance(
+                get_db_engine(self.app)
+            ).list_shared_object_names(file_id_prefix=object_key)
+            source_object_keys.update((object_key, file_id) for file_id in selection_shared_object_names)
+            shared_object_names |= selection_shared_object_names
 
         _logger.debug(
             "User selection '%s' includes '%s' files",
@@ -1540,6 +1842,8 @@ class SimcoreS3DataManager(BaseDataManager):  # pylint:disable=too-many-public-m
                 source_object_keys=source_object_keys,
                 destination_object_keys=destination_object_key,
                 progress_bar=progress_bar,
+                shared_object_names=shared_object_names,
+                object_sizes=object_sizes,
             )
         except Exception:  # pylint:disable=broad-exception-caught
             await self.abort_file_upload(user_id=user_id, file_id=destination_object_key)
@@ -9,6 +9,7 @@ from aws_library.s3._constants import S3_OBJECT_DELIMITER, STREAM_READER_CHUNK_S
 from aws_library.s3._models import S3ObjectKey
 from common_library.json_serialization import json_dumps, json_loads
 from models_library.api_schemas_storage.storage_schemas import S3BucketName
+from models_library.basic_types import SHA256Str
 from models_library.products import ProductName
 from models_library.projects import ProjectID, ProjectIDStr
 from models_library.projects_nodes_io import (
@@ -25,7 +26,7 @@ from servicelib.s3_utils import FileLikeBytesIterReader
 from servicelib.utils import ensure_ends_with, limited_gather
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-from ..constants import EXPORTS_S3_PREFIX, MAX_CONCURRENT_S3_TASKS
+from ..constants import EXPORTS_S3_PREFIX, MAX_CONCURRENT_S3_TASKS, SHARED_BLOBS_S3_PREFIX
 from ..exceptions.errors import FileMetaDataNotFoundError, ProjectAccessRightError
 from ..models import FileMetaData, FileMetaDataAtDB, GenericCursor, PathMetaData
 from ..modules.db.access_layer import AccessLayerRepository
@@ -36,6 +37,11 @@ from .utils import convert_db_to_model
 _logger = logging.getLogger(__name__)
 
 ROOT_FILE_ID_LEVELS: Final[int] = 3
+# NOTE: while a file is archived, the next ones are already downloaded (with at most
+# _EXPORT_PREFETCH_MAX_CHUNKS chunks of DEFAULT_READ_CHUNK_SIZE each in memory), so that the
+# export does not wait for the first bytes of every file
+_EXPORT_PREFETCHED_FILES: Final[int] = MAX_CONCURRENT_S3_TASKS
+_EXPORT_PREFETCH_MAX_CHUNKS: Final[int] = 8
 
 
 async def _list_all_files_in_folder(
@@ -148,10 +154,24 @@ def is_nested_level_file_id(file_id: str) -> bool:
     return get_file_id_level(file_id) > ROOT_FILE_ID_LEVELS
 
 
+def group_by_parent_s3_prefix(fmds: list[FileMetaDataAtDB]) -> dict[str, list[FileMetaDataAtDB]]:
+    """groups the file entries by the S3 prefix (ending with `/`) of the object they point to"""
+    groups: dict[str, list[FileMetaDataAtDB]] = {}
+    for fmd in fmds:
+        parent_prefix, _, _ = fmd.object_name.rpartition(S3_OBJECT_DELIMITER)
+        groups.setdefault(f"{parent_prefix}{S3_OBJECT_DELIMITER}", []).append(fmd)
+    return groups
+
+
 def create_random_export_name(user_id: UserID) -> StorageFileID:
     return TypeAdapter(StorageFileID).validate_python(f"{EXPORTS_S3_PREFIX}/{user_id}/{uuid4()}.zip")
 
 
+def create_shared_blob_object_name(sha256_checksum: SHA256Str) -> S3ObjectKey:
+    # NOTE: every blob gets a unique key, a blob removed by the cleaner is never confused with a newer one
+    return f"{SHARED_BLOBS_S3_PREFIX}/{sha256_checksum}/{uuid4()}"
+
+
 def ensure_user_selection_from_same_base_directory(
     object_keys: list[S3ObjectKey],
 ) -> bool:
@@ -210,7 +230,18 @@ async def create_and_upload_export(
     source_object_keys: set[tuple[UserSelectionStr, StorageFileID]],
     destination_object_keys: StorageFileID,
     progress_bar: ProgressBarData,
+    shared_object_names: dict[StorageFileID, S3ObjectKey] | None = None,
+    object_sizes: dict[StorageFileID, ByteSize] | None = None,
 ) -> None:
+    """the archive is streamed from the source objects to the destination object: nothing is
+    stored on disk and memory usage does not depend on the size of the export
+
+    Keyword Arguments:
+        shared_object_names -- source files whose content is stored under another object key (copy-on-write)
+        object_sizes -- already known sizes of the source files (the others are retrieved from S3)
+    """
+    shared_object_names = shared_object_names or {}
+    object_sizes = object_sizes or {}
     ids_names_map = await project_repository.get_project_id_and_node_id_to_names_map(
         project_uuids=_get_project_ids(user_selection={x[0] for x in source_object_keys})
     )
@@ -218,9 +249,16 @@ async def create_and_upload_export(
     # Build list of (selection, s3_object) pairs to maintain order
     source_keys_list = list(source_object_keys)
 
-    # Parallelize HEAD requests for all files (required to get file sizes)
+    # Parallelize HEAD requests for the files of unknown size (required to get file sizes)
     byte_streamers = await limited_gather(
-        *[s3_client.get_bytes_streamer_from_object(bucket, s3_object) for (_, s3_object) in source_keys_list],
+        *[
+            s3_client.get_bytes_streamer_from_object(
+                bucket,
+                shared_object_names.get(s3_object, s3_object),
+                data_size=object_sizes.get(s3_object),
+            )
+            for (_, s3_object) in source_keys_list
+        ],
         limit=MAX_CONCURRENT_S3_TASKS,
     )
 
@@ -245,6 +283,8 @@ async def create_and_upload_export(
                     archive_entries,
                     progress_bar=progress_bar,
                     chunk_size=STREAM_READER_CHUNK_SIZE,
+                    prefetch_members=_EXPORT_PREFETCHED_FILES,
+                    prefetch_max_chunks=_EXPORT_PREFETCH_MAX_CHUNKS,
                 )
             ),
         )
@@ -22,5 +22,26 @@ def disable_dsm_export_cleaner(mocker: MockerFixture) -> None:
 
 
 @pytest.fixture
-def disable_all_dsm_cleaner_tasks(disable_dsm_cleaner: None, disable_dsm_export_cleaner: None) -> None:
+def disable_dsm_path_aggregates_reconciler(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "simcore_service_storage.dsm_cleaner.reconcile_path_aggregates",
+        autospec=True,
+    )
+
+
+@pytest.fixture
+def disable_dsm_shared_blobs_cleaner(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "simcore_service_storage.dsm_cleaner.clean_unreferenced_shared_blobs",
+        autospec=True,
+    )
+
+
+@pytest.fixture
+def disable_all_dsm_cleaner_tasks(
+    disable_dsm_cleaner: None,
+    disable_dsm_export_cleaner: None,
+    disable_dsm_path_aggregates_reconciler: None,
+    disable_dsm_shared_blobs_cleaner: None,
+) -> None:
     pass
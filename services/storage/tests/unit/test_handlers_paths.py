@@ -264,9 +264,9 @@ async def test_list_child_paths_empty_page_still_reports_total(
     assert items
     assert total == len(project["workbench"])
 
-    # a page whose offset overshoots the last item is empty but must still report the real total
+    # a page starting after the last item is empty but must still report the real total
     overshoot_cursor = _PathsCursorParameters(
-        offset=total + 10, file_prefix=file_filter, partial=False
+        last_child_name=items[-1].path.name, file_prefix=file_filter, partial=False
     ).model_dump_json()
     empty_items, next_cursor, total_on_empty_page = await repo.list_child_paths(
         user_id=user_id,
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Any
 
 import pytest
+import sqlalchemy as sa
 from aws_library.s3 import S3KeyNotFoundError, SimcoreS3API
 from aws_library.s3._models import S3ObjectKey
 from faker import Faker
@@ -29,6 +30,7 @@ from servicelib.progress_bar import ProgressBarData
 from simcore_postgres_database.storage_models import (
     file_meta_data as file_meta_data_table,
 )
+from simcore_postgres_database.storage_models import file_meta_data_blobs, file_meta_data_paths
 from simcore_service_storage.constants import EXPORTS_S3_PREFIX, LinkType
 from simcore_service_storage.exceptions.errors import FileMetaDataNotFoundError
 from simcore_service_storage.models import FileMetaData, S3BucketName
@@ -143,6 +145,81 @@ async def test__copy_path_s3_s3(
     await _copy_s3_path(simcore_file_id)
 
 
+@pytest.mark.parametrize(
+    "location_id",
+    [SimcoreS3DataManager.get_location_id()],
+    ids=[SimcoreS3DataManager.get_location_name()],
+    indirect=True,
+)
+async def test__copy_path_s3_s3_copy_on_write(
+    user_id: UserID,
+    simcore_s3_dsm: SimcoreS3DataManager,
+    upload_file: Callable[..., Awaitable[tuple[Path, SimcoreS3FileID]]],
+    file_size: ByteSize,
+    faker: Faker,
+    mock_copy_transfer_cb: Callable[..., None],
+    sqlalchemy_async_engine: AsyncEngine,
+    cleanup_files_closure: Callable[[SimcoreS3FileID], None],
+):
+    _, src_file_id = await upload_file(
+        file_size, "a_file_name", sha256_checksum=TypeAdapter(SHA256Str).validate_python(faker.sha256())
+    )
+    repo = FileMetaDataRepository.instance(sqlalchemy_async_engine)
+    src_fmd = await repo.get(file_id=src_file_id)
+
+    copied_file_ids = [
+        TypeAdapter(SimcoreS3FileID).validate_python(f"{Path(src_file_id).parent}/the-copy-{n}") for n in range(2)
+    ]
+    for copied_file_id in copied_file_ids:
+        cleanup_files_closure(copied_file_id)
+        await simcore_s3_dsm._copy_path_s3_s3(  # noqa: SLF001
+            user_id=user_id,
+            src_fmd=src_fmd,
+            dst_file_id=copied_file_id,
+            bytes_transferred_cb=mock_copy_transfer_cb,
+            copy_on_write=True,
+        )
+
+    # both copies reference the same blob, no object is created under their file_id
+    copied_fmds = [await repo.get(file_id=copied_file_id) for copied_file_id in copied_file_ids]
+    blob_object_names = {fmd.object_name for fmd in copied_fmds}
+    assert len(blob_object_names) == 1
+    blob_object_name = blob_object_names.pop()
+    assert blob_object_name != src_fmd.object_name
+    s3_client = get_s3_client(simcore_s3_dsm.app)
+    for copied_file_id in copied_file_ids:
+        with pytest.raises(S3KeyNotFoundError):
+            await s3_client.get_object_metadata(bucket=simcore_s3_dsm.simcore_bucket_name, object_key=copied_file_id)
+    blob_metadata = await s3_client.get_object_metadata(
+        bucket=simcore_s3_dsm.simcore_bucket_name, object_key=blob_object_name
+    )
+    assert blob_metadata.size == file_size
+
+    async with sqlalchemy_async_engine.connect() as conn:
+        assert await conn.scalar(
+            sa.select(file_meta_data_blobs.c.ref_count).where(file_meta_data_blobs.c.object_name == blob_object_name)
+        ) == len(copied_file_ids)
+
+    # a referenced blob is not cleaned up
+    await simcore_s3_dsm.clean_unreferenced_shared_blobs()
+    await s3_client.get_object_metadata(bucket=simcore_s3_dsm.simcore_bucket_name, object_key=blob_object_name)
+
+    # once unreferenced (and unused for a while), it is
+    for copied_file_id in copied_file_ids:
+        await simcore_s3_dsm.delete_file(user_id, copied_file_id)
+    async with sqlalchemy_async_engine.begin() as conn:
+        await conn.execute(
+            file_meta_data_blobs.update()
+            .where(file_meta_data_blobs.c.object_name == blob_object_name)
+            .values(modified=datetime.datetime.now(tz=datetime.UTC) - datetime.timedelta(days=1))
+        )
+    await simcore_s3_dsm.clean_unreferenced_shared_blobs()
+    with pytest.raises(S3KeyNotFoundError):
+        await s3_client.get_object_metadata(bucket=simcore_s3_dsm.simcore_bucket_name, object_key=blob_object_name)
+    # the source is untouched
+    await s3_client.get_object_metadata(bucket=simcore_s3_dsm.simcore_bucket_name, object_key=src_file_id)
+
+
 @pytest.mark.parametrize(
     "location_id",
     [SimcoreS3DataManager.get_location_id()],
@@ -674,6 +751,70 @@ async def test_list_fmds_filters_by_created_before(
     assert excluded_file_id not in found_file_ids
 
 
+@pytest.mark.parametrize(
+    "location_id",
+    [SimcoreS3DataManager.get_location_id()],
+    ids=[SimcoreS3DataManager.get_location_name()],
+    indirect=True,
+)
+async def test_reconcile_path_aggregates(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    user_id: UserID,
+    product_name: ProductName,
+    sqlalchemy_async_engine: AsyncEngine,
+    upload_file: Callable[..., Awaitable[tuple[Path, SimcoreS3FileID]]],
+    file_size: ByteSize,
+):
+    _, file_id = await upload_file(file_size, "some_file.dat")
+    project_path = Path(Path(file_id).parts[0])
+    repo = FileMetaDataRepository.instance(sqlalchemy_async_engine)
+
+    aggregates = await repo.get_path_aggregates(path=project_path)
+    assert aggregates
+    assert aggregates.total_size == file_size
+    assert aggregates.num_objects == 1
+    assert aggregates.num_unresolved == 0
+    assert await simcore_s3_dsm.compute_path_size(user_id, product_name, path=project_path) == file_size
+
+    # the index drifts
+    async with sqlalchemy_async_engine.begin() as conn:
+        await conn.execute(file_meta_data_paths.update().values(total_size=0, num_objects=0))
+    assert await simcore_s3_dsm.compute_path_size(user_id, product_name, path=project_path) == 0
+
+    await simcore_s3_dsm.reconcile_path_aggregates()
+
+    assert await repo.get_path_aggregates(path=project_path) == aggregates
+    assert await simcore_s3_dsm.compute_path_size(user_id, product_name, path=project_path) == file_size
+
+
+@pytest.mark.parametrize(
+    "location_id",
+    [SimcoreS3DataManager.get_location_id()],
+    ids=[SimcoreS3DataManager.get_location_name()],
+    indirect=True,
+)
+async def test_compute_path_size_raises_if_unresolved_file_is_missing_in_s3(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    user_id: UserID,
+    product_name: ProductName,
+    sqlalchemy_async_engine: AsyncEngine,
+    upload_file: Callable[..., Awaitable[tuple[Path, SimcoreS3FileID]]],
+    file_size: ByteSize,
+):
+    _, file_id = await upload_file(file_size, "some_file.dat")
+    project_path = Path(Path(file_id).parts[0])
+
+    # the entry is unresolved and its object is gone
+    async with sqlalchemy_async_engine.begin() as conn:
+        await conn.execute(
+            file_meta_data_table.update().where(file_meta_data_table.c.file_id == file_id).values(file_size=-1)
+        )
+    await get_s3_client(simcore_s3_dsm.app).delete_object(bucket=simcore_s3_dsm.simcore_bucket_name, object_key=file_id)
+
+    with pytest.raises(S3KeyNotFoundError):
+        await simcore_s3_dsm.compute_path_size(user_id, product_name, path=project_path)
+
+
 @pytest.mark.parametrize(
     "location_id",
     [SimcoreS3DataManager.get_location_id()],
@@ -1,3 +1,4 @@
+import datetime
 from pathlib import Path
 from typing import Final
 from uuid import UUID
@@ -7,7 +8,7 @@ from aws_library.s3._models import S3ObjectKey
 from models_library.projects import ProjectID, ProjectIDStr
 from models_library.projects_nodes_io import NodeIDStr
 from pydantic import TypeAdapter
-from simcore_service_storage.models import NodeID
+from simcore_service_storage.models import FileMetaDataAtDB, NodeID
 from simcore_service_storage.utils.simcore_s3_dsm_utils import (
     UserSelectionStr,
     _base_path_parent,
@@ -15,6 +16,7 @@ from simcore_service_storage.utils.simcore_s3_dsm_utils import (
     compute_file_id_prefix,
     ensure_user_selection_from_same_base_directory,
     get_file_id_level,
+    group_by_parent_s3_prefix,
     is_nested_level_file_id,
 )
 
@@ -228,3 +230,35 @@ def test_get_file_id_level(file_id: str, expected_level: int):
 )
 def test_is_nested_level_file_id(file_id: str, expected_is_nested: bool):
     assert is_nested_level_file_id(file_id) == expected_is_nested
+
+
+def _create_fmd(object_name: str) -> FileMetaDataAtDB:
+    return FileMetaDataAtDB(
+        location_id=0,
+        location="simcore.s3",
+        bucket_name="a-bucket",
+        object_name=object_name,
+        user_id=1,
+        created_at=datetime.datetime.now(tz=datetime.UTC),
+        file_id=object_name,
+        file_size=-1,
+        last_modified=datetime.datetime.now(tz=datetime.UTC),
+        is_soft_link=False,
+        is_directory=False,
+    )
+
+
+def test_group_by_parent_s3_prefix():
+    fmds = [
+        _create_fmd("project_id/node_id/file1.txt"),
+        _create_fmd("project_id/node_id/file2.txt"),
+        _create_fmd("project_id/node_id/folder/file3.txt"),
+        _create_fmd("project_id/other_node_id/file1.txt"),
+    ]
+    groups = group_by_parent_s3_prefix(fmds)
+    assert {prefix: [fmd.object_name for fmd in grouped] for prefix, grouped in groups.items()} == {
+        "project_id/node_id/": ["project_id/node_id/file1.txt", "project_id/node_id/file2.txt"],
+        "project_id/node_id/folder/": ["project_id/node_id/folder/file3.txt"],
+        "project_id/other_node_id/": ["project_id/other_node_id/file1.txt"],
+    }
+    assert group_by_parent_s3_prefix([]) == {}
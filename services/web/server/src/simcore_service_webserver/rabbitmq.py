@@ -5,10 +5,12 @@ from typing import Final
 from aiohttp import web
 from common_library.network import redact_url
 from models_library.errors import RABBITMQ_CLIENT_UNHEALTHY_MSG
+from servicelib.aiohttp.monitoring import PROMETHEUS_METRICS_APPKEY
 from servicelib.logging_utils import log_context
 from servicelib.rabbitmq import (
     RabbitMQClient,
     RabbitMQRPCClient,
+    get_rpc_serialization_metrics,
     wait_till_rabbitmq_responsive,
 )
 
@@ -50,7 +52,12 @@ async def _rabbitmq_client_cleanup_ctx(app: web.Application) -> AsyncIterator[No
 
 async def _rabbitmq_rpc_client_lifespan(app: web.Application):
     settings: RabbitSettings = get_plugin_settings(app)
-    rpc_client = await RabbitMQRPCClient.create(client_name="webserver_rpc_client", settings=settings)
+    prometheus_metrics = app.get(PROMETHEUS_METRICS_APPKEY)
+    rpc_client = await RabbitMQRPCClient.create(
+        client_name="webserver_rpc_client",
+        settings=settings,
+        metrics=get_rpc_serialization_metrics(prometheus_metrics.registry) if prometheus_metrics else None,
+    )
 
     assert rpc_client  # nosec
 
@@ -0,0 +1,30 @@
+-- Removes a resource of a user session and its index entry
+-- KEYS[1]: resources_key (HASH of the resources of the session)
+-- KEYS[2]: sessions_index_key (ZSET of the sessions with resources)
+
+-- ARGV[1]: session (redis hash key of the user session)
+-- ARGV[2]: resource_index_key_prefix (SET of the sessions per resource name and value)
+-- ARGV[3]: resource_name
+--
+-- Returns: 1 if the resource was removed, 0 if there was none
+
+local resources_key = KEYS[1]
+local sessions_index_key = KEYS[2]
+
+local session = ARGV[1]
+local resource_index_key_prefix = ARGV[2]
+local resource_name = ARGV[3]
+
+local value = redis.call('HGET', resources_key, resource_name)
+if not value then
+    return 0
+end
+
+redis.call('SREM', resource_index_key_prefix .. resource_name .. '=' .. value, session)
+redis.call('HDEL', resources_key, resource_name)
+-- NOTE: redis deletes the hash together with its last field
+if redis.call('EXISTS', resources_key) == 0 then
+    redis.call('ZREM', sessions_index_key, session)
+end
+
+return 1
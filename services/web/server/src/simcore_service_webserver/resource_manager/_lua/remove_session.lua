@@ -0,0 +1,29 @@
+-- Removes a user session, its resources and all its index entries
+-- KEYS[1]: resources_key (HASH of the resources of the session)
+-- KEYS[2]: alive_key (STRING expiring with the session)
+-- KEYS[3]: sessions_index_key (ZSET of the sessions with resources)
+-- KEYS[4]: alive_index_key (ZSET of the sessions scored by expiration time)
+
+-- ARGV[1]: session (redis hash key of the user session)
+-- ARGV[2]: resource_index_key_prefix (SET of the sessions per resource name and value)
+--
+-- Returns: 0
+
+local resources_key = KEYS[1]
+local alive_key = KEYS[2]
+local sessions_index_key = KEYS[3]
+local alive_index_key = KEYS[4]
+
+local session = ARGV[1]
+local resource_index_key_prefix = ARGV[2]
+
+local resources = redis.call('HGETALL', resources_key)
+for i = 1, #resources, 2 do
+    redis.call('SREM', resource_index_key_prefix .. resources[i] .. '=' .. resources[i + 1], session)
+end
+
+redis.call('DEL', resources_key, alive_key)
+redis.call('ZREM', sessions_index_key, session)
+redis.call('ZREM', alive_index_key, session)
+
+return 0
@@ -0,0 +1,29 @@
+-- Sets a resource of a user session and indexes it
+-- KEYS[1]: resources_key (HASH of the resources of the session)
+-- KEYS[2]: sessions_index_key (ZSET of the sessions with resources, all with score 0 i.e. sorted lexicographically)
+
+-- ARGV[1]: session (redis hash key of the user session)
+-- ARGV[2]: resource_index_key_prefix (SET of the sessions per resource name and value)
+-- ARGV[3]: resource_name
+-- ARGV[4]: resource_value
+--
+-- Returns: 0
+
+local resources_key = KEYS[1]
+local sessions_index_key = KEYS[2]
+
+local session = ARGV[1]
+local resource_index_key_prefix = ARGV[2]
+local resource_name = ARGV[3]
+local resource_value = ARGV[4]
+
+local previous_value = redis.call('HGET', resources_key, resource_name)
+if previous_value then
+    redis.call('SREM', resource_index_key_prefix .. resource_name .. '=' .. previous_value, session)
+end
+
+redis.call('HSET', resources_key, resource_name, resource_value)
+redis.call('SADD', resource_index_key_prefix .. resource_name .. '=' .. resource_value, session)
+redis.call('ZADD', sessions_index_key, 0, session)
+
+return 0
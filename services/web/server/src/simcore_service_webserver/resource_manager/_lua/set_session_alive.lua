@@ -0,0 +1,23 @@
+-- Keeps a user session alive for some time
+-- KEYS[1]: alive_key (STRING expiring with the session)
+-- KEYS[2]: alive_index_key (ZSET of the sessions scored by expiration time)
+
+-- ARGV[1]: session (redis hash key of the user session)
+-- ARGV[2]: expiration_s (> 0)
+--
+-- Returns: 0
+
+local alive_key = KEYS[1]
+local alive_index_key = KEYS[2]
+
+local session = ARGV[1]
+local expiration_s = tonumber(ARGV[2])
+
+-- NOTE: the redis server time is shared by all the webserver replicas
+local now = redis.call('TIME')
+local expires_at = tonumber(now[1]) + tonumber(now[2]) / 1000000 + expiration_s
+
+redis.call('SET', alive_key, 1, 'EX', expiration_s)
+redis.call('ZADD', alive_index_key, string.format('%.6f', expires_at), session)
+
+return 0
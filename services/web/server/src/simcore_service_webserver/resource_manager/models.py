@@ -7,6 +7,10 @@ from pydantic.config import JsonDict
 
 ALIVE_SUFFIX: Final[str] = "alive"  # points to a string type
 RESOURCE_SUFFIX: Final[str] = "resources"  # points to a hash (like a dict) type
+# indexes of the sessions, kept in sync with the keys above
+SESSIONS_INDEX_KEY: Final[str] = "index:sessions"  # sorted set of the sessions with resources
+ALIVE_INDEX_KEY: Final[str] = "index:alive"  # sorted set of the sessions scored by expiration time
+RESOURCE_INDEX_KEY_PREFIX: Final[str] = "index:resource:"  # set of the sessions per resource e.g. "...:project_id=1234"
 RedisHashKey: TypeAlias = str
 
 
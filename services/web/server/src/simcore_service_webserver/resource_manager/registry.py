@@ -10,7 +10,8 @@ A same key can have a lot of fields provided they have a different name.
 A key can be set as "alive". This creates a secondary key (e.g. "user_id=a_user_id:some_other_id=123:alive").
 This key can have a timeout value. When the key times out then the key disappears from Redis automatically.
 
-
+The keys are also indexed (see SESSIONS_INDEX_KEY, ALIVE_INDEX_KEY, RESOURCE_INDEX_KEY_PREFIX) so that lookups
+do not scan the whole keyspace. Keys and indexes are modified together by the lua scripts in `_lua`.
 """
 
 import logging
@@ -18,27 +19,47 @@ from typing import Final
 
 import redis.asyncio as aioredis
 from aiohttp import web
+from redis.commands.core import AsyncScript
 from servicelib.redis import handle_redis_returns_union_types
+from servicelib.utils import load_script
 
 from ..redis import get_redis_resources_client
 from .models import (
+    ALIVE_INDEX_KEY,
     ALIVE_SUFFIX,
+    RESOURCE_INDEX_KEY_PREFIX,
     RESOURCE_SUFFIX,
+    SESSIONS_INDEX_KEY,
     AliveSessions,
     DeadSessions,
+    RedisHashKey,
     ResourcesDict,
     UserSession,
 )
 
 _logger = logging.getLogger(__name__)
 
+_LUA_PACKAGE: Final[str] = "simcore_service_webserver.resource_manager._lua"
+_ANY_CLIENT_SESSION_ID: Final[str] = "*"
+_REDIS_MISSING_KEY_TTL: Final[int] = -2
+
 # redis `resources` db has composed-keys formatted as '${user_id=}:${client_session_id=}:{suffix}'
 #    Example:
 #        Key: user_id=1:client_session_id=7f40353b-db02-4474-a44d-23ce6a6e428c:alive = 1
-#        Key: user_id=1:client_session_id=7f40353b-db02-4474-a44d-23ce6a6e428c:resources = {project_id: ... , socket_id: ...}
+#        Key: user_id=1:client_session_id=7f40353b-...:resources = {project_id: ... , socket_id: ...}
 #
 
 
+def _get_resource_index_key(resource: tuple[str, str]) -> str:
+    field, value = resource
+    return f"{RESOURCE_INDEX_KEY_PREFIX}{field}={value}"
+
+
+def _get_lex_range(prefix: str) -> tuple[str, str]:
+    # all the members of a sorted set (with equal scores) starting with prefix
+    return f"[{prefix}", f"({prefix[:-1]}{chr(ord(prefix[-1]) + 1)}"
+
+
 class RedisResourceRegistry:
     """Keeps a record of connected sockets per user
 
@@ -47,35 +68,39 @@ class RedisResourceRegistry:
 
     Example:
         Key: user_id=1:client_session_id=7f40353b-db02-4474-a44d-23ce6a6e428c:alive = 1
-        Key: user_id=1:client_session_id=7f40353b-db02-4474-a44d-23ce6a6e428c:resources = {project_id: ... , socket_id: ...}
+        Key: user_id=1:client_session_id=7f40353b-...:resources = {project_id: ... , socket_id: ...}
+        Key: index:sessions = {user_id=1:client_session_id=7f40353b-db02-4474-a44d-23ce6a6e428c, ...}
+        Key: index:alive = {user_id=1:client_session_id=7f40353b-db02-4474-a44d-23ce6a6e428c: expiration time, ...}
+        Key: index:resource:project_id=... = {user_id=1:client_session_id=7f40353b-db02-4474-a44d-23ce6a6e428c, ...}
     """
 
     def __init__(self, app: web.Application):
         self._app = app
+        self._scripts: dict[str, AsyncScript] = {}
 
     @property
     def app(self) -> web.Application:
         return self._app
 
-    @classmethod
-    def _decode_hash_key(cls, hash_key: str) -> UserSession:
-        tmp_key = (
-            hash_key[: -len(f":{RESOURCE_SUFFIX}")]
-            if hash_key.endswith(f":{RESOURCE_SUFFIX}")
-            else hash_key[: -len(f":{ALIVE_SUFFIX}")]
-        )
-        key = dict(x.split("=") for x in tmp_key.split(":"))
-        return UserSession(**key)  # type: ignore
-
     @property
     def client(self) -> aioredis.Redis:
         client: aioredis.Redis = get_redis_resources_client(self.app)
         return client
 
+    async def _run_script(self, script_name: str, *, keys: list[str], args: list[str | int]) -> int:
+        if (script := self._scripts.get(script_name)) is None:
+            script = self._scripts[script_name] = self.client.register_script(load_script(_LUA_PACKAGE, script_name))
+        result: int = await script(keys=keys, args=args, client=self.client)  # pylint: disable=not-callable
+        return result
+
     async def set_resource(self, key: UserSession, resource: tuple[str, str]) -> None:
-        hash_key = f"{key.to_redis_hash_key()}:{RESOURCE_SUFFIX}"
+        session = key.to_redis_hash_key()
         field, value = resource
-        await handle_redis_returns_union_types(self.client.hset(hash_key, mapping={field: value}))
+        await self._run_script(
+            "set_resource",
+            keys=[f"{session}:{RESOURCE_SUFFIX}", SESSIONS_INDEX_KEY],
+            args=[session, RESOURCE_INDEX_KEY_PREFIX, field, value],
+        )
 
     async def get_resources(self, key: UserSession) -> ResourcesDict:
         hash_key = f"{key.to_redis_hash_key()}:{RESOURCE_SUFFIX}"
@@ -83,56 +108,142 @@ class RedisResourceRegistry:
         return ResourcesDict(**fields)
 
     async def remove_resource(self, key: UserSession, resource_name: str) -> None:
-        hash_key = f"{key.to_redis_hash_key()}:{RESOURCE_SUFFIX}"
-        await handle_redis_returns_union_types(self.client.hdel(hash_key, resource_name))
+        session = key.to_redis_hash_key()
+        await self._run_script(
+            "remove_resource",
+            keys=[f"{session}:{RESOURCE_SUFFIX}", SESSIONS_INDEX_KEY],
+            args=[session, RESOURCE_INDEX_KEY_PREFIX, resource_name],
+        )
+
+    async def _find_sessions(self, key: UserSession) -> list[RedisHashKey]:
+        if key.client_session_id != _ANY_CLIENT_SESSION_ID:
+            return [key.to_redis_hash_key()]
+        # all the sessions of the user
+        sessions: list[RedisHashKey] = await self.client.zrangebylex(
+            SESSIONS_INDEX_KEY,
+            *_get_lex_range(key.to_redis_hash_key().removesuffix(_ANY_CLIENT_SESSION_ID)),
+        )
+        return sessions
 
     async def find_resources(self, key: UserSession, resource_name: str) -> list[str]:
-        resources: list[str] = []
-        # the key might only be partially complete
-        partial_hash_key = f"{key.to_redis_hash_key()}:{RESOURCE_SUFFIX}"
-        async for scanned_key in self.client.scan_iter(match=partial_hash_key):
-            if await handle_redis_returns_union_types(self.client.hexists(scanned_key, resource_name)):
-                key_value = await handle_redis_returns_union_types(self.client.hget(scanned_key, resource_name))
-                if key_value is not None:
-                    resources.append(key_value)
-        return resources
+        # the key might only be partially complete (i.e. any client session of the user)
+        sessions = await self._find_sessions(key)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session in sessions:
+                pipe.hget(f"{session}:{RESOURCE_SUFFIX}", resource_name)
+            values: list[str | None] = await pipe.execute()
+        return [value for value in values if value is not None]
 
     async def find_keys(self, resource: tuple[str, str]) -> list[UserSession]:
         field, value = resource
-        return [
-            self._decode_hash_key(hash_key)
-            async for hash_key in self.client.scan_iter(match=f"*:{RESOURCE_SUFFIX}")
-            if value == await handle_redis_returns_union_types(self.client.hget(hash_key, field))
-        ]
+        index_key = _get_resource_index_key(resource)
+        sessions: list[RedisHashKey] = list(await handle_redis_returns_union_types(self.client.smembers(index_key)))
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session in sessions:
+                pipe.hget(f"{session}:{RESOURCE_SUFFIX}", field)
+            current_values: list[str | None] = await pipe.execute()
+
+        found_sessions = []
+        for session, current_value in zip(sessions, current_values, strict=True):
+            if current_value == value:
+                found_sessions.append(UserSession.from_redis_hash_key(session))
+            else:
+                # NOTE: e.g. written by a replica that did not maintain the indexes yet
+                await handle_redis_returns_union_types(self.client.srem(index_key, session))
+        return found_sessions
 
     async def set_key_alive(self, key: UserSession, *, expiration_time: int) -> None:
         # setting the timeout to always expire, timeout > 0
         expiration_time = int(max(1, expiration_time))
-        hash_key = f"{key.to_redis_hash_key()}:{ALIVE_SUFFIX}"
-        await self.client.set(hash_key, 1, ex=expiration_time)
+        session = key.to_redis_hash_key()
+        await self._run_script(
+            "set_session_alive",
+            keys=[f"{session}:{ALIVE_SUFFIX}", ALIVE_INDEX_KEY],
+            args=[session, expiration_time],
+        )
 
     async def is_key_alive(self, key: UserSession) -> bool:
         hash_key = f"{key.to_redis_hash_key()}:{ALIVE_SUFFIX}"
         return bool(await self.client.exists(hash_key) > 0)
 
     async def remove_key(self, key: UserSession) -> None:
-        await self.client.delete(
-            f"{key.to_redis_hash_key()}:{RESOURCE_SUFFIX}",
-            f"{key.to_redis_hash_key()}:{ALIVE_SUFFIX}",
+        session = key.to_redis_hash_key()
+        await self._run_script(
+            "remove_session",
+            keys=[
+                f"{session}:{RESOURCE_SUFFIX}",
+                f"{session}:{ALIVE_SUFFIX}",
+                SESSIONS_INDEX_KEY,
+                ALIVE_INDEX_KEY,
+            ],
+            args=[session, RESOURCE_INDEX_KEY_PREFIX],
         )
 
+    async def _find_unindexed_alive_sessions(
+        self, candidate_sessions: list[RedisHashKey], *, now: float
+    ) -> set[RedisHashKey]:
+        # NOTE: a replica that does not maintain the indexes (e.g. during a rolling deploy) refreshes the alive
+        # keys without updating ALIVE_INDEX_KEY, these sessions are re-indexed instead of being reported dead
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session in candidate_sessions:
+                pipe.pttl(f"{session}:{ALIVE_SUFFIX}")
+            ttls_ms: list[int] = await pipe.execute()
+        unindexed_alive_sessions = {
+            session: now + max(ttl_ms, 0) / 1000
+            for session, ttl_ms in zip(candidate_sessions, ttls_ms, strict=True)
+            if ttl_ms != _REDIS_MISSING_KEY_TTL
+        }
+        if unindexed_alive_sessions:
+            await self.client.zadd(ALIVE_INDEX_KEY, unindexed_alive_sessions, gt=True)
+        return set(unindexed_alive_sessions)
+
     async def get_all_resource_keys(self) -> tuple[AliveSessions, DeadSessions]:
+        seconds, microseconds = await self.client.time()
+        now = seconds + microseconds / 1_000_000
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(ALIVE_INDEX_KEY, "-inf", now)
+            pipe.zrange(ALIVE_INDEX_KEY, 0, -1)
+            pipe.zrange(SESSIONS_INDEX_KEY, 0, -1)
+            _, alive_sessions, sessions = await pipe.execute()
+
+        alive_sessions_set = set(alive_sessions)
+        dead_candidate_sessions = [session for session in sessions if session not in alive_sessions_set]
+        unindexed_alive_sessions = await self._find_unindexed_alive_sessions(dead_candidate_sessions, now=now)
+
         alive_keys = [
-            self._decode_hash_key(hash_key) async for hash_key in self.client.scan_iter(match=f"*:{ALIVE_SUFFIX}")
+            UserSession.from_redis_hash_key(session) for session in [*alive_sessions, *unindexed_alive_sessions]
         ]
         dead_keys = [
-            self._decode_hash_key(hash_key)
-            async for hash_key in self.client.scan_iter(match=f"*:{RESOURCE_SUFFIX}")
-            if self._decode_hash_key(hash_key) not in alive_keys
+            UserSession.from_redis_hash_key(session)
+            for session in dead_candidate_sessions
+            if session not in unindexed_alive_sessions
         ]
-
         return (alive_keys, dead_keys)
 
+    async def rebuild_indexes(self) -> None:
+        """Indexes the keys written without indexes (e.g. before they existed). Adding to the indexes is
+        idempotent and the outdated entries are ignored or cleaned up while used
+        """
+        num_sessions = 0
+        async for hash_key in self.client.scan_iter(match=f"*:{RESOURCE_SUFFIX}"):
+            session = hash_key.removesuffix(f":{RESOURCE_SUFFIX}")
+            resources = await handle_redis_returns_union_types(self.client.hgetall(hash_key))
+            async with self.client.pipeline(transaction=True) as pipe:
+                for resource in resources.items():
+                    pipe.sadd(_get_resource_index_key(resource), session)
+                pipe.zadd(SESSIONS_INDEX_KEY, {session: 0})
+                await pipe.execute()
+            num_sessions += 1
+
+        async for alive_key in self.client.scan_iter(match=f"*:{ALIVE_SUFFIX}"):
+            if (ttl_ms := await self.client.pttl(alive_key)) > 0:
+                seconds, microseconds = await self.client.time()
+                session = alive_key.removesuffix(f":{ALIVE_SUFFIX}")
+                await self.client.zadd(
+                    ALIVE_INDEX_KEY, {session: seconds + microseconds / 1_000_000 + ttl_ms / 1000}, gt=True
+                )
+        _logger.info("Indexed %d user sessions in the resources registry", num_sessions)
+
 
 CLIENT_SOCKET_REGISTRY_APPKEY: Final = web.AppKey("CLIENT_SOCKET_REGISTRY", RedisResourceRegistry)
 
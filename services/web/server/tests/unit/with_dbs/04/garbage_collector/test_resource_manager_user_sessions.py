@@ -20,6 +20,7 @@ from servicelib.aiohttp.application import create_safe_application
 from servicelib.aiohttp.application_setup import is_setup_completed
 from simcore_service_webserver.application_settings import setup_settings
 from simcore_service_webserver.resource_manager.models import (
+    ALIVE_INDEX_KEY,
     ALIVE_SUFFIX,
     RESOURCE_SUFFIX,
     RedisHashKey,
@@ -196,6 +197,78 @@ async def test_redis_registry(
         assert len(await redis_registry.get_resources(user_session2)) == len(resources) - (resources.index(res) + 1)
 
 
+async def test_redis_registry_indexes(
+    redis_registry: RedisResourceRegistry,
+    create_user_session: Callable[[], UserSession],
+):
+    user_session = create_user_session()
+    other_tab_session = UserSession(user_id=user_session.user_id, client_session_id="other_tab")
+    other_user_session = UserSession(user_id=user_session.user_id + 1, client_session_id=user_session.client_session_id)
+    for session in (user_session, other_tab_session, other_user_session):
+        await redis_registry.set_resource(session, ("project_id", "project1"))
+
+    # all the tabs of a user, only
+    all_tabs_session = UserSession(user_id=user_session.user_id, client_session_id="*")
+    assert await redis_registry.find_resources(all_tabs_session, "project_id") == ["project1", "project1"]
+
+    # changing a resource value moves the session to the index of the new value
+    await redis_registry.set_resource(other_tab_session, ("project_id", "project2"))
+    assert set(await redis_registry.find_keys(("project_id", "project1"))) == {user_session, other_user_session}
+    assert await redis_registry.find_keys(("project_id", "project2")) == [other_tab_session]
+
+    # a session without resources is not registered anymore
+    await redis_registry.remove_resource(other_tab_session, "project_id")
+    assert not await redis_registry.find_keys(("project_id", "project2"))
+    _, dead_keys = await redis_registry.get_all_resource_keys()
+    assert set(dead_keys) == {user_session, other_user_session}
+
+    await redis_registry.remove_key(user_session)
+    assert await redis_registry.find_keys(("project_id", "project1")) == [other_user_session]
+    _, dead_keys = await redis_registry.get_all_resource_keys()
+    assert dead_keys == [other_user_session]
+
+
+async def test_redis_registry_rebuild_indexes(
+    redis_registry: RedisResourceRegistry,
+    redis_client: aioredis.Redis,
+    create_user_session: Callable[[], UserSession],
+):
+    # sessions registered without indexes
+    alive_session = create_user_session()
+    dead_session = create_user_session()
+    for session in (alive_session, dead_session):
+        await redis_client.hset(f"{session.to_redis_hash_key()}:{RESOURCE_SUFFIX}", mapping={"project_id": "project1"})
+    await redis_client.set(f"{alive_session.to_redis_hash_key()}:{ALIVE_SUFFIX}", 1, ex=60)
+    assert not await redis_registry.find_keys(("project_id", "project1"))
+
+    await redis_registry.rebuild_indexes()
+
+    assert set(await redis_registry.find_keys(("project_id", "project1"))) == {alive_session, dead_session}
+    assert await redis_registry.get_all_resource_keys() == ([alive_session], [dead_session])
+
+    # outdated index entries are ignored
+    await redis_client.hset(f"{dead_session.to_redis_hash_key()}:{RESOURCE_SUFFIX}", mapping={"project_id": "project2"})
+    assert await redis_registry.find_keys(("project_id", "project1")) == [alive_session]
+
+
+async def test_redis_registry_alive_keys_refreshed_without_index(
+    redis_registry: RedisResourceRegistry,
+    redis_client: aioredis.Redis,
+    create_user_session: Callable[[], UserSession],
+):
+    user_session = create_user_session()
+    await redis_registry.set_resource(user_session, ("project_id", "project1"))
+    await redis_registry.set_key_alive(user_session, expiration_time=1)
+
+    # e.g. a replica that does not maintain the indexes refreshes the alive key (rolling deploy)
+    await asyncio.sleep(1.5)
+    await redis_client.set(f"{user_session.to_redis_hash_key()}:{ALIVE_SUFFIX}", 1, ex=60)
+
+    assert await redis_registry.get_all_resource_keys() == ([user_session], [])
+    # the session is indexed as alive again
+    assert await redis_client.zscore(ALIVE_INDEX_KEY, user_session.to_redis_hash_key()) is not None
+
+
 async def test_redis_registry_key_will_always_expire(
     redis_registry: RedisResourceRegistry,
     create_user_session: Callable[[], UserSession],